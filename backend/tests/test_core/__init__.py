@@ -0,0 +1 @@
+"""Core trading engine test package for BensBot."""
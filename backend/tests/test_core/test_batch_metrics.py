@@ -0,0 +1,31 @@
+"""Tests for the batch performance metrics engine."""
+
+import numpy as np
+
+from trading_bot.core.backtesting.batch_metrics import compute_batch_metrics
+
+
+def _equity(*curves):
+    return np.array(curves, dtype=float)
+
+
+def test_profit_factor_all_winning_trades():
+    """Curves with winners and no losers rank above every finite profit factor."""
+    metrics = compute_batch_metrics(
+        _equity([100.0, 110.0, 125.0], [100.0, 105.0, 108.0]),
+        trade_pnls=[np.array([10.0, 15.0]), np.array([10.0, -5.0, 3.0])]
+    )
+    assert np.isinf(metrics["profit_factor"][0]) and metrics["profit_factor"][0] > 0
+    assert np.isclose(metrics["profit_factor"][1], 13.0 / 5.0)
+    assert metrics["profit_factor"][0] > metrics["profit_factor"][1]
+    assert metrics["win_rate"][0] == 100.0
+
+
+def test_profit_factor_without_winning_trades():
+    """Curves without winners, or without trades, have a profit factor of 0."""
+    metrics = compute_batch_metrics(
+        _equity([100.0, 95.0, 90.0], [100.0, 100.0, 100.0], [100.0, 100.0, 100.0]),
+        trade_pnls=[np.array([-5.0, -5.0]), np.array([]), np.array([0.0])]
+    )
+    assert metrics["profit_factor"].tolist() == [0.0, 0.0, 0.0]
+    assert metrics["trades"].tolist() == [2, 0, 1]
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Backtest result migration for BensBot.
+
+This script:
+1. Scans directories for the per-run JSON files written by earlier versions
+   of RealBacktester (backtest_<id>_<symbol>_<dates>.json) and BacktestGrid
+   (<grid_id>_results.json)
+2. Appends their results to an indexed result store
+3. Optionally deletes each file once it is imported
+
+Files already imported are skipped, so the script can be re-run.
+"""
+
+import os
+import sys
+import argparse
+
+# Add the project root to the path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+# Import components
+from trading_bot.utils.logging_setup import setup_logging, get_component_logger
+from trading_bot.core.backtesting.result_store import BacktestResultStore, migrate_json_results
+
+# Setup logging
+setup_logging()
+logger = get_component_logger('scripts.migrate_backtest_results')
+
+def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(description="Import legacy JSON backtest results into the result store")
+
+    parser.add_argument(
+        "directories",
+        nargs="*",
+        default=["./data/backtest_results", "./data/backtest_grid"],
+        help="Directories to scan for JSON result files"
+    )
+
+    parser.add_argument(
+        "--db",
+        type=str,
+        default=None,
+        help="Result store to import into (default: results.db in each scanned directory)"
+    )
+
+    parser.add_argument(
+        "--remove",
+        action="store_true",
+        help="Delete each JSON file after it has been imported"
+    )
+
+    args = parser.parse_args()
+
+    exit_code = 0
+    for directory in args.directories:
+        if not os.path.isdir(directory):
+            logger.warning(f"Skipping {directory}: not a directory")
+            continue
+        store = BacktestResultStore(args.db or os.path.join(directory, "results.db"))
+        summary = migrate_json_results(store, directory, remove_originals=args.remove)
+        print(f"{directory}: {summary['files']} files imported ({summary['rows']} results), "
+              f"{summary['skipped']} already imported, {summary['failed']} failed -> {store.db_path}")
+        if summary["failed"]:
+            exit_code = 1
+        store.close()
+
+    return exit_code
+
+if __name__ == "__main__":
+    sys.exit(main())
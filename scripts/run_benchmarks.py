@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Benchmark runner for BensBot.
+
+This script:
+1. Runs the benchmark scenarios on deterministic synthetic market data
+2. Optionally saves the report as a JSON baseline
+3. Optionally compares the report against a baseline and flags regressions
+
+Exits with status 1 when a scenario regressed beyond the tolerance.
+
+Throughput depends on the machine, so no baseline is shared in the repository;
+record one on the machine you compare on, before and after a change:
+
+    python scripts/run_benchmarks.py --save-baseline benchmarks/baseline.json
+    python scripts/run_benchmarks.py --baseline benchmarks/baseline.json
+"""
+
+import os
+import sys
+import json
+import argparse
+
+# Add the project root to the path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+# Import components
+from trading_bot.utils.logging_setup import setup_logging, get_component_logger
+from trading_bot.core.benchmarks import (
+    BenchmarkConfig,
+    SCENARIOS,
+    run_benchmarks,
+    save_baseline,
+    load_baseline,
+    compare_to_baseline,
+    format_comparison,
+)
+
+# Setup logging
+setup_logging()
+logger = get_component_logger('scripts.run_benchmarks')
+
+def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(description="Run BensBot performance benchmarks")
+
+    parser.add_argument(
+        "--scenarios",
+        nargs="+",
+        choices=list(SCENARIOS),
+        default=None,
+        help="Scenario groups to run (default: all)"
+    )
+
+    parser.add_argument(
+        "--baseline",
+        type=str,
+        default=None,
+        help="JSON baseline recorded on this machine to compare the run against"
+    )
+
+    parser.add_argument(
+        "--save-baseline",
+        type=str,
+        default=None,
+        help="Write this run's report as a JSON baseline to this path"
+    )
+
+    parser.add_argument(
+        "--output",
+        type=str,
+        default=None,
+        help="Also write this run's report to a JSON file"
+    )
+
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.10,
+        help="Allowed fractional throughput drop before a scenario counts as a regression"
+    )
+
+    parser.add_argument(
+        "--repeats",
+        type=int,
+        default=3,
+        help="Timed runs per scenario (the fastest is reported)"
+    )
+
+    parser.add_argument(
+        "--population",
+        type=int,
+        default=20,
+        help="Genomes per population backtest and GA generation"
+    )
+
+    parser.add_argument(
+        "--max-workers",
+        type=int,
+        default=None,
+        help="Largest worker count for the parallel scaling scenario (default: CPU count)"
+    )
+
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=42,
+        help="Seed of the synthetic market"
+    )
+
+    args = parser.parse_args()
+
+    config = BenchmarkConfig(
+        seed=args.seed,
+        repeats=args.repeats,
+        population_size=args.population,
+        max_workers=args.max_workers
+    )
+    report = run_benchmarks(config, scenarios=args.scenarios)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2, default=str)
+
+    baseline = load_baseline(args.baseline) if args.baseline else None
+    exit_code = 0
+    if baseline is not None:
+        comparison = compare_to_baseline(report, baseline, tolerance=args.tolerance)
+        print(format_comparison(comparison))
+        if not comparison["passed"]:
+            exit_code = 1
+    else:
+        if args.baseline:
+            logger.warning(f"No baseline at {args.baseline}; nothing to compare against")
+        for name, result in report["results"].items():
+            print(f"{name:<44} {result['throughput']:>14,.1f} {result['unit']}/s")
+
+    if args.save_baseline:
+        save_baseline(report, args.save_baseline)
+
+    return exit_code
+
+if __name__ == "__main__":
+    sys.exit(main())
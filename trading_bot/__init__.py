@@ -61,11 +61,13 @@ def initialize_system(config: Optional[Dict[str, Any]] = None) -> Dict[str, Any]
     from trading_bot.core.backtesting.historical_equity_backtester import HistoricalEquityBacktester
     from trading_bot.core.backtesting.historical_crypto_backtester import HistoricalCryptoBacktester
     from trading_bot.core.backtesting.historical_forex_backtester import HistoricalForexBacktester
+    from trading_bot.core.backtesting.portfolio_backtester import PortfolioBacktester
     
     backtester_registry = {
         "equity": HistoricalEquityBacktester(data_fetcher),
         "crypto": HistoricalCryptoBacktester(data_fetcher),
-        "forex": HistoricalForexBacktester(data_fetcher)
+        "forex": HistoricalForexBacktester(data_fetcher),
+        "portfolio": PortfolioBacktester(data_fetcher, asset_class="equity")  # Baskets, e.g. symbol "SPY,QQQ,IWM"
     }
     logger.info(f"Initialized backtester registry with {len(backtester_registry)} backtester types")
     
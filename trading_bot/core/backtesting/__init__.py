@@ -2,6 +2,16 @@
 # This file makes Python treat the `backtesting` directory as a package.
 
 from .base_backtester import BaseBacktester
+from .simulation_engine import simulate_portfolio, simulate_population, SimulationResult
+from .shared_market_data import SharedMarketData, SharedDataFetcher
+from .parallel_backtester import BacktestWorkerPool, ParallelBacktestManager
+from .result_cache import BacktestResultCache, compute_data_fingerprint, make_cache_key
+from .result_store import BacktestResultStore, migrate_json_results
+from .batch_metrics import compute_batch_metrics, metrics_rows, annualization_factor
+from .pruning import PruningRules
+from .profiling import BacktestProfiler, aggregate_profiles
+from .walk_forward import WalkForwardConfig, generate_folds
+from .portfolio_backtester import PortfolioBacktester, BasketDataFetcher
 # We will add specific backtester imports here as they are implemented
 # from .historical_equity_backtester import HistoricalEquityBacktester
 # from .historical_crypto_backtester import HistoricalCryptoBacktester
@@ -9,6 +19,28 @@ from .base_backtester import BaseBacktester
 
 __all__ = [
     "BaseBacktester",
+    "simulate_portfolio",
+    "simulate_population",
+    "SimulationResult",
+    "SharedMarketData",
+    "SharedDataFetcher",
+    "BacktestWorkerPool",
+    "ParallelBacktestManager",
+    "BacktestResultCache",
+    "compute_data_fingerprint",
+    "make_cache_key",
+    "BacktestResultStore",
+    "migrate_json_results",
+    "compute_batch_metrics",
+    "metrics_rows",
+    "annualization_factor",
+    "PruningRules",
+    "BacktestProfiler",
+    "aggregate_profiles",
+    "WalkForwardConfig",
+    "generate_folds",
+    "PortfolioBacktester",
+    "BasketDataFetcher",
     # "HistoricalEquityBacktester",
     # "HistoricalCryptoBacktester",
     # "HistoricalForexBacktester"
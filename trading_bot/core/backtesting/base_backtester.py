@@ -6,13 +6,26 @@ or implement a similar interface. This allows EvoTrader to use them
 polymorphically.
 """
 from abc import ABC, abstractmethod
+from dataclasses import asdict
 import pandas as pd
-from typing import Dict, Any, Optional, Tuple
+from typing import Dict, Any, Optional, Tuple, List, Union
 import numpy as np
 import logging
 from datetime import datetime
 
 from trading_bot.core.simulation.monte_carlo import MonteCarloSimulator
+from trading_bot.core.backtesting.simulation_engine import simulate_portfolio, simulate_population, SimulationResult
+from trading_bot.core.backtesting.batch_metrics import compute_batch_metrics, metrics_rows, annualization_factor
+from trading_bot.core.backtesting.pruning import PruningRules, penalize_metrics
+from trading_bot.core.backtesting.profiling import (
+    BacktestProfiler, PHASE_DATA_FETCH, PHASE_INSTANTIATION, PHASE_SIGNALS, PHASE_SIMULATION, PHASE_METRICS,
+    PHASE_WALK_FORWARD
+)
+from trading_bot.core.backtesting.walk_forward import (
+    WalkForwardConfig, generate_folds, score_walk_forward, SEGMENT_TRAIN, SEGMENT_TEST
+)
+from trading_bot.core.signals.bar_arrays import BarArrays
+from trading_bot.core.signals.sparse_signals import SparseSignals
 
 logger = logging.getLogger(__name__)
 
@@ -26,6 +39,9 @@ class PerformanceMetrics(Dict[str, Any]):
     max_drawdown: Optional[float] = None
     win_rate: Optional[float] = None
     trades: Optional[int] = None
+    annualized_return: Optional[float] = None
+    sortino_ratio: Optional[float] = None
+    profit_factor: Optional[float] = None
     # Add out-of-sample and Monte Carlo metrics
     oos_total_return: Optional[float] = None
     oos_sharpe_ratio: Optional[float] = None
@@ -34,11 +50,15 @@ class PerformanceMetrics(Dict[str, Any]):
     monte_carlo_percentile_5: Optional[float] = None
     monte_carlo_percentile_95: Optional[float] = None
     monte_carlo_max_dd_percentile_95: Optional[float] = None
+    # Walk-forward metrics (see walk_forward)
+    robustness_score: Optional[float] = None
+    wf_positive_fold_ratio: Optional[float] = None
+    wf_efficiency: Optional[float] = None
     # Add other common metrics as needed
 
 class BacktestResult(Dict[str, Any]):
     """TypedDict or Pydantic model for stricter backtest result definitions"""
-    status: str # e.g., "success", "failure", "error"
+    status: str # e.g., "success", "pruned", "failure", "error"
     strategy_id: str
     strategy_type: str # The type of strategy that was backtested (e.g., "equity_trend", "crypto_breakout")
     parameters: Dict[str, Any]
@@ -47,6 +67,12 @@ class BacktestResult(Dict[str, Any]):
     # Optional: trade_log: Optional[List[Dict[str, Any]]] = None
     # Optional: equity_curve: Optional[pd.Series] = None
     monte_carlo_plot: Optional[str] = None  # Base64 encoded plot
+    partial: bool = False  # Run was stopped early by a pruning rule (status "pruned")
+    equity_curve: Optional[List[float]] = None  # Portfolio value per bar, if the backtester keeps equity curves
+    pruning: Optional[Dict[str, Any]] = None  # Reason, prune bar and bars/seconds saved of a pruned run
+    profile: Optional[Dict[str, Any]] = None  # Wall/CPU seconds per phase, bars processed, peak memory (see profiling)
+    walk_forward: Optional[Dict[str, Any]] = None  # Per-fold windows and metrics of a walk-forward run
+    symbol_performance: Optional[Dict[str, Dict[str, Any]]] = None  # Per-symbol metrics of a basket backtest
 
 class BaseBacktester(ABC):
     """
@@ -61,18 +87,84 @@ class BaseBacktester(ABC):
         self.data_fetcher = historical_data_fetcher
         # self.trade_log = [] # Optional: for detailed trade logging
         
-        # Create Monte Carlo simulator instance
-        self.monte_carlo = MonteCarloSimulator(
-            num_simulations=1000,
-            confidence_interval=0.95,
-            preserve_autocorrelation=True
-        )
+        # Monte Carlo simulator, built on first use (only validation finalists need it)
+        self._monte_carlo: Optional[MonteCarloSimulator] = None
+        self.monte_carlo_simulations = 1000
         
         # Default out-of-sample split
         self.oos_split = 0.3  # 30% for out-of-sample testing
         
         # Default minimum data points required for valid backtest
         self.min_data_points = 30
+        
+        # Close positions intrabar at the stop_loss/take_profit levels strategies emit
+        self.use_intrabar_exits = True
+        
+        # Default early-abort rules, used when a run does not pass its own
+        self.pruning_rules: Optional[PruningRules] = None
+        
+        # Attach the equity curve to results (needed by Monte Carlo validation)
+        self.keep_equity_curves = False
+        
+        # Measure peak Python allocations per backtest with tracemalloc (slow)
+        self.trace_memory = False
+        
+        # Default walk-forward folds, used when a run does not pass its own
+        self.walk_forward_config: Optional[WalkForwardConfig] = None
+
+    def get_constructor_kwargs(self) -> Dict[str, Any]:
+        """
+        Keyword arguments that rebuild an equivalent backtester, e.g. in a worker
+        process. Subclasses with extra constructor arguments extend this.
+        """
+        return {"historical_data_fetcher": self.data_fetcher}
+
+    def get_result_options(self) -> Dict[str, Any]:
+        """
+        Backtester settings that change the results of a run, for result cache keys.
+
+        Covers the constructor arguments other than the data fetcher and the
+        instance defaults a run falls back to. Subclasses with further
+        result-affecting attributes extend this.
+        """
+        options = {
+            name: value for name, value in self.get_constructor_kwargs().items()
+            if name != "historical_data_fetcher"
+        }
+        options.update({
+            "use_intrabar_exits": self.use_intrabar_exits,
+            "keep_equity_curves": self.keep_equity_curves,
+            "pruning_rules": asdict(self.pruning_rules) if self.pruning_rules is not None else None,
+            "walk_forward_config": asdict(self.walk_forward_config) if self.walk_forward_config is not None else None,
+        })
+        return options
+
+    @property
+    def monte_carlo_simulations(self) -> int:
+        """Number of simulations per Monte Carlo run."""
+        return self._monte_carlo_simulations
+
+    @monte_carlo_simulations.setter
+    def monte_carlo_simulations(self, num_simulations: int) -> None:
+        self._monte_carlo_simulations = num_simulations
+        # Rebuild the simulator on next use if it was created with another count
+        if self._monte_carlo is not None and self._monte_carlo.num_simulations != num_simulations:
+            self._monte_carlo = None
+
+    @property
+    def monte_carlo(self) -> MonteCarloSimulator:
+        """Monte Carlo simulator used by _run_monte_carlo_simulation, created lazily."""
+        if self._monte_carlo is None:
+            self._monte_carlo = MonteCarloSimulator(
+                num_simulations=self.monte_carlo_simulations,
+                confidence_interval=0.95,
+                preserve_autocorrelation=True
+            )
+        return self._monte_carlo
+
+    @monte_carlo.setter
+    def monte_carlo(self, simulator: MonteCarloSimulator) -> None:
+        self._monte_carlo = simulator
 
     @abstractmethod
     def run_backtest(
@@ -88,8 +180,10 @@ class BaseBacktester(ABC):
         initial_capital: float = 100000.0,
         commission_pct: float = 0.001, # 0.1% commission per trade
         slippage_pct: float = 0.0005,  # 0.05% slippage per trade
-        run_oos_validation: bool = True,  # Whether to run out-of-sample validation
-        run_monte_carlo: bool = True      # Whether to run Monte Carlo simulation
+        run_oos_validation: bool = False, # Whether to run out-of-sample validation (see ValidationPipeline)
+        run_monte_carlo: bool = False,    # Whether to run Monte Carlo simulation (see ValidationPipeline)
+        pruning: Optional[Dict[str, Any]] = None,  # Early-abort rules (PruningRules fields)
+        walk_forward: Optional[Dict[str, Any]] = None  # Walk-forward folds (WalkForwardConfig fields)
     ) -> BacktestResult:
         """
         Runs a backtest for a given strategy, parameters, and market data.
@@ -108,6 +202,10 @@ class BaseBacktester(ABC):
             slippage_pct: Slippage percentage per trade.
             run_oos_validation: Whether to run out-of-sample validation.
             run_monte_carlo: Whether to run Monte Carlo simulation.
+            pruning: Optional early-abort rules; a run that breaks one returns a
+                     partial result with status "pruned" and a penalized fitness.
+            walk_forward: Optional walk-forward folds; the result then also carries
+                          a robustness_score over the folds' test windows.
 
         Returns:
             A BacktestResult dictionary containing performance metrics and status.
@@ -143,7 +241,8 @@ class BaseBacktester(ABC):
     def _run_monte_carlo_simulation(
         self,
         equity_curve: pd.Series,
-        initial_capital: float
+        initial_capital: float,
+        include_plot: bool = True
     ) -> Dict[str, Any]:
         """
         Run Monte Carlo simulation on the backtest results.
@@ -151,6 +250,7 @@ class BaseBacktester(ABC):
         Args:
             equity_curve: The equity curve from the backtest
             initial_capital: Initial capital used in the backtest
+            include_plot: Whether to render the simulation plot
             
         Returns:
             Dictionary with Monte Carlo simulation results
@@ -165,7 +265,7 @@ class BaseBacktester(ABC):
         returns = equity_curve.pct_change().dropna()
         
         # Run Monte Carlo simulation
-        mc_result = self.monte_carlo.simulate(returns, initial_capital)
+        mc_result = self.monte_carlo.simulate(returns, initial_capital, include_plot=include_plot)
         
         if mc_result["status"] != "success":
             logger.warning(f"Monte Carlo simulation failed: {mc_result.get('message', 'Unknown error')}")
@@ -181,7 +281,8 @@ class BaseBacktester(ABC):
         initial_capital: float,
         oos_equity_curve: Optional[pd.Series] = None,
         oos_trades: Optional[pd.DataFrame] = None,
-        monte_carlo_results: Optional[Dict[str, Any]] = None
+        monte_carlo_results: Optional[Dict[str, Any]] = None,
+        periods_per_year: float = 252.0
     ) -> PerformanceMetrics:
         """
         Calculates standard performance metrics from an equity curve and trade log.
@@ -194,6 +295,7 @@ class BaseBacktester(ABC):
             oos_equity_curve: Out-of-sample equity curve (if available)
             oos_trades: Out-of-sample trades (if available)
             monte_carlo_results: Results from Monte Carlo simulation (if available)
+            periods_per_year: Bars per year for annualization (see batch_metrics.annualization_factor)
             
         Returns:
             PerformanceMetrics dictionary with calculated metrics
@@ -202,66 +304,65 @@ class BaseBacktester(ABC):
         if equity_curve.empty:
             return metrics
 
-        metrics["total_return"] = ((equity_curve.iloc[-1] / initial_capital) - 1) * 100
-        
-        daily_returns = equity_curve.pct_change().dropna()
-        if not daily_returns.empty:
-            # Assuming risk-free rate is 0 for simplicity for Sharpe Ratio
-            # And assuming daily data for annualization factor of 252 trading days
-            # This needs to be adjusted based on actual data frequency (e.g. for hourly data)
-            annualization_factor = 252 # TODO: Make this dependent on interval
-            sharpe_ratio = (daily_returns.mean() / daily_returns.std()) * np.sqrt(annualization_factor)
-            metrics["sharpe_ratio"] = sharpe_ratio if pd.notnull(sharpe_ratio) else 0.0
-        else:
-            metrics["sharpe_ratio"] = 0.0
-
-        # Max Drawdown
-        cumulative_max = equity_curve.cummax()
-        drawdown = (equity_curve - cumulative_max) / cumulative_max
-        metrics["max_drawdown"] = drawdown.min() * 100 if pd.notnull(drawdown.min()) else 0.0
-
-        if not trades.empty:
-            metrics["trades"] = len(trades)
-            winning_trades = trades[trades['pnl'] > 0]
-            metrics["win_rate"] = (len(winning_trades) / len(trades)) * 100 if len(trades) > 0 else 0.0
-        else:
-            metrics["trades"] = 0
-            metrics["win_rate"] = 0.0
+        # Single-curve case of the batch metrics engine, so per-strategy and
+        # population results share one definition of every metric
+        batch = compute_batch_metrics(
+            equity_curve.to_numpy(dtype=float)[np.newaxis, :],
+            trade_pnls=[self._trade_pnls(trades)],
+            initial_capital=initial_capital,
+            periods_per_year=periods_per_year
+        )
+        metrics.update(metrics_rows(batch)[0])
             
         # Calculate out-of-sample metrics if available
         if oos_equity_curve is not None and not oos_equity_curve.empty:
-            oos_initial = oos_equity_curve.iloc[0]
-            metrics["oos_total_return"] = ((oos_equity_curve.iloc[-1] / oos_initial) - 1) * 100
-            
-            oos_daily_returns = oos_equity_curve.pct_change().dropna()
-            if not oos_daily_returns.empty:
-                oos_sharpe = (oos_daily_returns.mean() / oos_daily_returns.std()) * np.sqrt(annualization_factor)
-                metrics["oos_sharpe_ratio"] = oos_sharpe if pd.notnull(oos_sharpe) else 0.0
-            else:
-                metrics["oos_sharpe_ratio"] = 0.0
-            
-            # OOS Max Drawdown
-            oos_cumulative_max = oos_equity_curve.cummax()
-            oos_drawdown = (oos_equity_curve - oos_cumulative_max) / oos_cumulative_max
-            metrics["oos_max_drawdown"] = oos_drawdown.min() * 100 if pd.notnull(oos_drawdown.min()) else 0.0
+            oos_metrics = metrics_rows(compute_batch_metrics(
+                oos_equity_curve.to_numpy(dtype=float)[np.newaxis, :], periods_per_year=periods_per_year
+            ))[0]
+            metrics["oos_total_return"] = oos_metrics["total_return"]
+            metrics["oos_sharpe_ratio"] = oos_metrics["sharpe_ratio"]
+            metrics["oos_max_drawdown"] = oos_metrics["max_drawdown"]
         
         # Add Monte Carlo metrics if available
-        if monte_carlo_results and monte_carlo_results.get("status") == "success":
-            # Consistency score from Monte Carlo
-            metrics["consistency_score"] = monte_carlo_results["simulation_result"].get("consistency_score", 0.0)
-            
-            # Final equity percentiles
-            final_equity_dist = monte_carlo_results["final_equity_distribution"]
-            metrics["monte_carlo_percentile_5"] = final_equity_dist.get("lower")
-            metrics["monte_carlo_percentile_95"] = final_equity_dist.get("upper")
-            
-            # Max drawdown percentiles
-            dd_dist = monte_carlo_results["drawdown_distribution"]
-            metrics["monte_carlo_max_dd_percentile_95"] = dd_dist.get("95th_percentile", 0.0) * 100  # Convert to percentage
+        metrics.update(self._monte_carlo_metrics(monte_carlo_results))
             
         logger.debug(f"Calculated performance metrics: {metrics}")
         return metrics
         
+    @staticmethod
+    def _monte_carlo_metrics(monte_carlo_results: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Extract the PerformanceMetrics fields from a Monte Carlo simulation.
+        
+        Args:
+            monte_carlo_results: Output of _run_monte_carlo_simulation
+            
+        Returns:
+            Dictionary of Monte Carlo metrics (empty if the simulation failed)
+        """
+        if not monte_carlo_results or monte_carlo_results.get("status") != "success":
+            return {}
+        final_equity_dist = monte_carlo_results["final_equity_distribution"]
+        dd_dist = monte_carlo_results["drawdown_distribution"]
+        return {
+            # Consistency score from Monte Carlo
+            "consistency_score": monte_carlo_results["simulation_result"].get("consistency_score", 0.0),
+            # Final equity percentiles
+            "monte_carlo_percentile_5": final_equity_dist.get("lower"),
+            "monte_carlo_percentile_95": final_equity_dist.get("upper"),
+            # Max drawdown percentiles
+            "monte_carlo_max_dd_percentile_95": dd_dist.get("95th_percentile", 0.0) * 100  # Convert to percentage
+        }
+
+    @staticmethod
+    def _trade_pnls(trades: pd.DataFrame) -> np.ndarray:
+        """Per-trade P&L array of a trades DataFrame (NaN when the log has no 'pnl' column)."""
+        if trades is None or trades.empty:
+            return np.empty(0)
+        if 'pnl' not in trades.columns:
+            return np.full(len(trades), np.nan)
+        return trades['pnl'].to_numpy(dtype=float)
+
     def _apply_slippage_and_commission(
         self, 
         price: float, 
@@ -295,4 +396,513 @@ class BaseBacktester(ABC):
             # Subtract commission (decreases effective sell price)
             effective_price = price_with_slippage * (1 - commission_pct)
             
-        return effective_price 
\ No newline at end of file
+        return effective_price
+
+    def _generate_signals(self, strategy_instance: Any, historical_data: pd.DataFrame) -> Union[pd.DataFrame, SparseSignals]:
+        """
+        Signals of a strategy for a single backtest: computed from read-only
+        bar arrays without copying the data if the strategy supports them
+        (see BaseStrategy.supports_bar_arrays), sparse events if it emits
+        them natively (see BaseStrategy.supports_sparse_signals), its
+        per-bar signal frame otherwise.
+        """
+        if getattr(strategy_instance, "supports_bar_arrays", lambda: False)():
+            return strategy_instance.generate_signals_from_bars(BarArrays.from_frame(historical_data))
+        if getattr(strategy_instance, "supports_sparse_signals", lambda: False)():
+            return strategy_instance.generate_sparse_signals(historical_data.copy())
+        return strategy_instance.generate_signals(historical_data.copy())
+
+    def _simulate_portfolio(
+        self,
+        historical_data: pd.DataFrame,
+        signals_df: Union[pd.DataFrame, SparseSignals],
+        initial_capital: float,
+        slippage_pct: float,
+        commission_pct: float,
+        mode: str,
+        pruning: Optional[PruningRules] = None,
+        **mode_kwargs
+    ) -> Tuple[pd.Series, SimulationResult]:
+        """
+        Run the shared array-based portfolio simulation for a set of signals.
+        
+        A run stopped by a pruning rule returns an equity curve that ends on
+        the prune bar.
+        
+        Args:
+            historical_data: OHLCV data the signals were generated from
+            signals_df: Strategy output with a 'signal' column, or SparseSignals
+            initial_capital: Starting capital
+            slippage_pct: Percentage slippage
+            commission_pct: Percentage commission
+            mode: Simulation mode ("equity", "crypto" or "forex")
+            pruning: Optional early-abort rules (see _get_pruning_rules)
+            **mode_kwargs: Mode-specific options passed to the engine
+            
+        Returns:
+            Tuple of (equity curve Series indexed like historical_data, SimulationResult)
+        """
+        if isinstance(signals_df, SparseSignals):
+            signals = self._prepare_sparse_signals(historical_data, signals_df)
+            if signals.has_levels:
+                mode_kwargs.update(self._get_bar_ranges(historical_data))
+        else:
+            signals = signals_df['signal'].to_numpy(dtype=float)
+            levels = self._get_signal_levels(historical_data, signals_df)
+            if levels is not None:
+                stop_loss, take_profit = levels
+                mode_kwargs.update(self._get_bar_ranges(historical_data), stop_loss=stop_loss, take_profit=take_profit)
+        simulation = simulate_portfolio(
+            close=historical_data['Close'].to_numpy(dtype=float),
+            signals=signals,
+            index=historical_data.index,
+            initial_capital=initial_capital,
+            slippage_pct=slippage_pct,
+            commission_pct=commission_pct,
+            price_adjuster=self._apply_slippage_and_commission,
+            mode=mode,
+            pruning=pruning,
+            **mode_kwargs
+        )
+        portfolio_values = pd.Series(simulation.equity_curve, index=historical_data.index[:simulation.bars_processed])
+        return portfolio_values, simulation
+
+    def _get_pruning_rules(self, pruning: Optional[Any] = None) -> Optional[PruningRules]:
+        """
+        Resolve the early-abort rules for a run.
+        
+        Args:
+            pruning: PruningRules, a dictionary of PruningRules fields (as found in
+                     a backtest config) or None to use self.pruning_rules
+            
+        Returns:
+            PruningRules with at least one rule set, or None
+        """
+        if pruning is None:
+            pruning = self.pruning_rules
+        if isinstance(pruning, PruningRules):
+            return pruning if pruning.enabled else None
+        return PruningRules.from_dict(pruning)
+
+    def _get_walk_forward_config(self, walk_forward: Optional[Any] = None) -> Optional[WalkForwardConfig]:
+        """
+        Resolve the walk-forward folds for a run.
+        
+        Args:
+            walk_forward: WalkForwardConfig, a dictionary of WalkForwardConfig fields
+                          (as found in a backtest config) or None to use
+                          self.walk_forward_config
+            
+        Returns:
+            WalkForwardConfig, or None to skip walk-forward evaluation
+        """
+        if walk_forward is None:
+            walk_forward = self.walk_forward_config
+        if isinstance(walk_forward, WalkForwardConfig):
+            return walk_forward
+        return WalkForwardConfig.from_dict(walk_forward)
+
+    def _run_walk_forward(
+        self,
+        historical_data: pd.DataFrame,
+        signals: List[SparseSignals],
+        initial_capital: float,
+        slippage_pct: float,
+        commission_pct: float,
+        mode: str,
+        periods_per_year: float,
+        config: WalkForwardConfig,
+        **mode_kwargs
+    ) -> List[Dict[str, Any]]:
+        """
+        Evaluate signals on every walk-forward fold.
+        
+        The signals (and stop/target levels) are generated once over the full
+        series, so indicators are warmed up on the bars before each window and
+        never recomputed; each fold only slices their events (a position
+        already signalled when a window opens is entered on its first bar,
+        with the levels of the event that signalled it). Every train and test
+        window is simulated from fresh capital, for all genomes at once.
+        
+        Args:
+            historical_data: OHLCV data the signals were generated from
+            signals: Sparse signals (with any stop/target levels) per genome, see _prepare_sparse_signals
+            initial_capital: Starting capital of every window
+            slippage_pct: Percentage slippage
+            commission_pct: Percentage commission
+            mode: Simulation mode ("equity", "crypto" or "forex")
+            periods_per_year: Bars per year for annualization
+            config: Fold layout and scoring
+            **mode_kwargs: Mode-specific options passed to the engine
+            
+        Returns:
+            One score_walk_forward summary per genome row
+            
+        Raises:
+            ValueError: If the data is too short for the configured folds
+        """
+        folds = generate_folds(len(historical_data), config)
+        segments = (SEGMENT_TRAIN, SEGMENT_TEST) if config.evaluate_train else (SEGMENT_TEST,)
+        close = historical_data['Close'].to_numpy(dtype=float)
+        ranges = self._get_bar_ranges(historical_data) if any(row.has_levels for row in signals) else {}
+        fold_metrics: List[List[Dict[str, Dict[str, Any]]]] = [[{} for _ in folds] for _ in signals]
+        
+        for fold in folds:
+            for segment in segments:
+                window = fold.window(segment)
+                window_kwargs = dict(mode_kwargs)
+                window_kwargs.update({name: values[window] for name, values in ranges.items()})
+                simulations = simulate_population(
+                    close=close[window],
+                    signal_matrix=[row.window(window.start, window.stop) for row in signals],
+                    index=historical_data.index[window],
+                    initial_capital=initial_capital,
+                    slippage_pct=slippage_pct,
+                    commission_pct=commission_pct,
+                    price_adjuster=self._apply_slippage_and_commission,
+                    mode=mode,
+                    **window_kwargs
+                )
+                batch = compute_batch_metrics(
+                    np.vstack([simulation.equity_curve for simulation in simulations]),
+                    trade_pnls=[self._trade_pnls(self._build_trades_df(simulation.trades_log)) for simulation in simulations],
+                    initial_capital=initial_capital,
+                    periods_per_year=periods_per_year
+                )
+                for row, metrics in enumerate(metrics_rows(batch)):
+                    fold_metrics[row][fold.index][segment] = metrics
+        
+        return [score_walk_forward(folds, metrics, config, historical_data.index) for metrics in fold_metrics]
+
+    def _walk_forward_signals(
+        self,
+        historical_data: pd.DataFrame,
+        signals_df: Union[pd.DataFrame, SparseSignals],
+        initial_capital: float,
+        slippage_pct: float,
+        commission_pct: float,
+        mode: str,
+        periods_per_year: float,
+        config: WalkForwardConfig,
+        **mode_kwargs
+    ) -> Dict[str, Any]:
+        """Single-strategy case of _run_walk_forward."""
+        return self._run_walk_forward(
+            historical_data,
+            [self._prepare_sparse_signals(historical_data, signals_df)],
+            initial_capital, slippage_pct, commission_pct, mode, periods_per_year, config,
+            **mode_kwargs
+        )[0]
+
+    def _finalize_result(
+        self,
+        result: BacktestResult,
+        simulation: SimulationResult,
+        total_bars: int,
+        rules: Optional[PruningRules],
+        seconds_per_bar: float,
+        profiler: Optional[BacktestProfiler] = None,
+        walk_forward: Optional[Dict[str, Any]] = None
+    ) -> BacktestResult:
+        """
+        Complete a backtest result built from a simulation.
+        
+        Attaches the phase profile, the walk-forward summary (whose
+        robustness_score, positive fold ratio and efficiency also go into the
+        performance) and the equity curve (if keep_equity_curves is set), and
+        marks the result as partial if a pruning rule stopped its
+        simulation. The performance is then replaced by a penalized fitness (see
+        penalize_metrics), status becomes "pruned" and 'pruning' records why
+        and where the run was stopped, together with the bars skipped and an
+        estimate of the seconds saved (skipped bars times the measured
+        simulation cost per bar).
+        
+        Args:
+            result: Result built from the (possibly truncated) simulation
+            simulation: Simulation the result was built from
+            total_bars: Number of bars in the full data
+            rules: Rules the simulation ran with
+            seconds_per_bar: Measured simulation cost per processed bar
+            profiler: Phase timings of the run
+            walk_forward: Summary of _run_walk_forward, if the run was walk-forward evaluated
+            
+        Returns:
+            The same result
+        """
+        if walk_forward is not None:
+            result["walk_forward"] = walk_forward
+            result["performance"]["robustness_score"] = walk_forward["robustness_score"]
+            result["performance"]["wf_positive_fold_ratio"] = walk_forward["positive_fold_ratio"]
+            result["performance"]["wf_efficiency"] = walk_forward["efficiency"]
+        if profiler is not None:
+            profiler.bars_processed = simulation.bars_processed
+            result["profile"] = profiler.to_dict()
+        if self.keep_equity_curves:
+            result["equity_curve"] = simulation.equity_curve.tolist()
+        if rules is None or simulation.prune_reason is None:
+            return result
+        bars_saved = max(total_bars - simulation.bars_processed, 0)
+        penalize_metrics(result["performance"], rules)
+        result["status"] = "pruned"
+        result["partial"] = True
+        result["pruning"] = {
+            "reason": simulation.prune_reason,
+            "pruned_at_bar": simulation.pruned_at,
+            "bars_processed": simulation.bars_processed,
+            "bars_total": total_bars,
+            "bars_saved": bars_saved,
+            "seconds_saved": bars_saved * seconds_per_bar
+        }
+        return result
+
+    def _get_signal_levels(
+        self,
+        historical_data: pd.DataFrame,
+        signals_df: pd.DataFrame
+    ) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """
+        Extract the stop-loss/take-profit levels a strategy attached to its signals.
+        
+        Args:
+            historical_data: OHLCV data the signals were generated from
+            signals_df: Strategy output
+            
+        Returns:
+            Tuple of (stop_loss, take_profit) float arrays with NaN where unset, or
+            None if intrabar exits are disabled, the strategy set no levels or
+            the data has no High/Low columns
+        """
+        if not self.use_intrabar_exits or 'High' not in historical_data or 'Low' not in historical_data:
+            return None
+        levels = []
+        for column in ('stop_loss', 'take_profit'):
+            if column in signals_df.columns:
+                levels.append(pd.to_numeric(signals_df[column], errors='coerce').to_numpy(dtype=float))
+            else:
+                levels.append(np.full(len(signals_df), np.nan))
+        if np.isnan(levels[0]).all() and np.isnan(levels[1]).all():
+            return None
+        return levels[0], levels[1]
+
+    def _prepare_sparse_signals(
+        self,
+        historical_data: pd.DataFrame,
+        signals: Union[pd.DataFrame, SparseSignals]
+    ) -> SparseSignals:
+        """
+        Sparse signals for the engine, with levels only where intrabar exits apply
+        (same conditions as _get_signal_levels).
+        
+        Args:
+            historical_data: OHLCV data the signals were generated from
+            signals: Strategy output frame or SparseSignals
+            
+        Returns:
+            SparseSignals over the bars of historical_data
+            
+        Raises:
+            ValueError: If the signals do not span the data
+        """
+        if not isinstance(signals, SparseSignals):
+            signals = SparseSignals.from_frame(signals)
+        if signals.n_bars != len(historical_data):
+            raise ValueError(f"expected {len(historical_data)} signal rows, got {signals.n_bars}")
+        if signals.has_levels and (
+            not self.use_intrabar_exits or 'High' not in historical_data or 'Low' not in historical_data
+        ):
+            return signals.without_levels()
+        return signals
+
+    @staticmethod
+    def _get_bar_ranges(historical_data: pd.DataFrame) -> Dict[str, np.ndarray]:
+        """High, Low and (if present) Open arrays for the intrabar fill engine."""
+        ranges = {
+            'high': historical_data['High'].to_numpy(dtype=float),
+            'low': historical_data['Low'].to_numpy(dtype=float)
+        }
+        if 'Open' in historical_data:
+            ranges['open_prices'] = historical_data['Open'].to_numpy(dtype=float)
+        return ranges
+
+    def _build_trades_df(self, trades_log: List[Dict[str, Any]]) -> pd.DataFrame:
+        """
+        Turn the engine's raw fills into the trades DataFrame used for metrics.
+        Backtesters that pair entries and exits into round trips override this.
+        
+        Args:
+            trades_log: Raw fills from the simulation engine
+            
+        Returns:
+            DataFrame of trades
+        """
+        return pd.DataFrame(trades_log)
+
+    def _run_population_backtest(
+        self,
+        strategy_class: Any,
+        genomes: List[Tuple[str, Dict[str, Any]]],
+        asset_class: str,
+        symbol: str,
+        start_date: str,
+        end_date: str,
+        interval: str,
+        initial_capital: float,
+        commission_pct: float,
+        slippage_pct: float,
+        mode: str,
+        type_prefix: str,
+        pruning: Optional[Any] = None,
+        walk_forward: Optional[Any] = None,
+        **mode_kwargs
+    ) -> Dict[str, BacktestResult]:
+        """
+        Backtest many parameter sets of one strategy class on shared data.
+        
+        Data is fetched once, each genome's signals are reduced to their
+        changes (see BaseStrategy.generate_sparse_signals; strategies that
+        support BarArrays all read one shared, uncopied instance) and the whole
+        population is simulated in one vectorized pass. Results are identical to calling run_backtest per genome.
+        Each genome's profile holds its own instantiation and signal times plus
+        an equal share of the fetch, simulation and metrics time.
+        
+        Args:
+            strategy_class: The strategy class to instantiate for every genome
+            genomes: List of (strategy_id, parameters) tuples
+            asset_class: The asset class of the symbol
+            symbol: The trading symbol to backtest on
+            start_date: Backtest start date
+            end_date: Backtest end date
+            interval: Data interval for the backtest
+            initial_capital: Starting capital for each genome
+            commission_pct: Commission percentage per trade
+            slippage_pct: Slippage percentage per trade
+            mode: Simulation mode ("equity", "crypto" or "forex")
+            type_prefix: Prefix for the reported strategy_type (e.g. "equity")
+            pruning: Optional early-abort rules (see _get_pruning_rules); genomes
+                     that break a rule get a partial, penalized result
+            walk_forward: Optional walk-forward folds (see _get_walk_forward_config),
+                          evaluated for the whole population in one pass per window
+            **mode_kwargs: Mode-specific options passed to the engine
+            
+        Returns:
+            Dictionary mapping strategy_id to BacktestResult, in genome order
+        """
+        strategy_name = str(strategy_class.__name__)
+        results: Dict[str, BacktestResult] = {}
+        shared_profiler = BacktestProfiler(trace_memory=self.trace_memory)
+        genome_profilers: Dict[str, BacktestProfiler] = {}
+        
+        with shared_profiler.phase(PHASE_DATA_FETCH):
+            historical_data = self.data_fetcher.fetch(symbol, asset_class, start_date, end_date, interval)
+        if historical_data is None or historical_data.empty:
+            for strategy_id, parameters in genomes:
+                results[strategy_id] = BacktestResult(
+                    status="failure", strategy_id=strategy_id, strategy_type=strategy_name,
+                    parameters=parameters, performance=PerformanceMetrics(), error_message="Failed to fetch historical data."
+                )
+            return results
+        
+        # Generate every genome's signals and keep only their changes (with any stop/target levels)
+        bars = BarArrays.from_frame(historical_data)
+        signal_rows: List[SparseSignals] = []
+        simulated_genomes = []
+        for strategy_id, parameters in genomes:
+            profiler = genome_profilers[strategy_id] = BacktestProfiler(trace_memory=self.trace_memory)
+            try:
+                with profiler.phase(PHASE_INSTANTIATION):
+                    strategy_instance = strategy_class(strategy_id=strategy_id, parameters=parameters)
+            except Exception as e:
+                logger.error(f"Error instantiating strategy {strategy_id} ({strategy_name}): {e}", exc_info=True)
+                results[strategy_id] = BacktestResult(
+                    status="error", strategy_id=strategy_id, strategy_type=strategy_name,
+                    parameters=parameters, performance=PerformanceMetrics(), error_message=f"Strategy instantiation error: {e}"
+                )
+                continue
+            try:
+                with profiler.phase(PHASE_SIGNALS):
+                    if strategy_instance.supports_bar_arrays():
+                        signals = strategy_instance.generate_signals_from_bars(bars)
+                    else:
+                        signals = strategy_instance.generate_sparse_signals(historical_data.copy())
+                signal_rows.append(self._prepare_sparse_signals(historical_data, signals))
+                simulated_genomes.append((strategy_id, parameters))
+            except Exception as e:
+                logger.error(f"Error generating signals for {strategy_id}: {e}", exc_info=True)
+                results[strategy_id] = BacktestResult(
+                    status="error", strategy_id=strategy_id, strategy_type=strategy_name,
+                    parameters=parameters, performance=PerformanceMetrics(), error_message=f"Signal generation error: {e}"
+                )
+        
+        if signal_rows:
+            level_kwargs = {}
+            if any(signals.has_levels for signals in signal_rows):
+                level_kwargs = self._get_bar_ranges(historical_data)
+            rules = self._get_pruning_rules(pruning)
+            with shared_profiler.phase(PHASE_SIMULATION):
+                simulations = simulate_population(
+                    close=historical_data['Close'].to_numpy(dtype=float),
+                    signal_matrix=signal_rows,
+                    index=historical_data.index,
+                    initial_capital=initial_capital,
+                    slippage_pct=slippage_pct,
+                    commission_pct=commission_pct,
+                    price_adjuster=self._apply_slippage_and_commission,
+                    mode=mode,
+                    pruning=rules,
+                    **level_kwargs,
+                    **mode_kwargs
+                )
+            bars_processed = sum(simulation.bars_processed for simulation in simulations)
+            seconds_per_bar = shared_profiler.wall(PHASE_SIMULATION) / max(bars_processed, 1)
+            
+            # Score the population in one batch metrics call per curve length
+            # (a single call unless pruning truncated some curves)
+            with shared_profiler.phase(PHASE_METRICS):
+                rows_by_length: Dict[int, List[int]] = {}
+                for row, simulation in enumerate(simulations):
+                    rows_by_length.setdefault(simulation.bars_processed, []).append(row)
+                metric_rows: List[Dict[str, Any]] = [{} for _ in simulations]
+                for rows in rows_by_length.values():
+                    batch = compute_batch_metrics(
+                        np.vstack([simulations[row].equity_curve for row in rows]),
+                        trade_pnls=[self._trade_pnls(self._build_trades_df(simulations[row].trades_log)) for row in rows],
+                        initial_capital=initial_capital,
+                        periods_per_year=annualization_factor(interval, mode)
+                    )
+                    for row, metrics in zip(rows, metrics_rows(batch)):
+                        metric_rows[row] = metrics
+            
+            walk_forward_summaries: List[Optional[Dict[str, Any]]] = [None] * len(simulations)
+            wf_config = self._get_walk_forward_config(walk_forward)
+            wf_error = None
+            if wf_config is not None:
+                try:
+                    with shared_profiler.phase(PHASE_WALK_FORWARD):
+                        walk_forward_summaries = self._run_walk_forward(
+                            historical_data, signal_rows, initial_capital, slippage_pct, commission_pct,
+                            mode, annualization_factor(interval, mode), wf_config, **mode_kwargs
+                        )
+                except ValueError as e:
+                    logger.error(f"Walk-forward evaluation of {strategy_name} genomes failed: {e}")
+                    wf_error = f"Walk-forward error: {e}"
+            
+            share = 1.0 / len(simulations)
+            for (strategy_id, parameters), simulation, row, summary in zip(
+                simulated_genomes, simulations, metric_rows, walk_forward_summaries
+            ):
+                if wf_error is not None:
+                    results[strategy_id] = BacktestResult(
+                        status="error", strategy_id=strategy_id, strategy_type=strategy_name,
+                        parameters=parameters, performance=PerformanceMetrics(), error_message=wf_error
+                    )
+                    continue
+                results[strategy_id] = self._finalize_result(BacktestResult(
+                    status="success", strategy_id=strategy_id, strategy_type=f"{type_prefix}_{strategy_name}",
+                    parameters=parameters, performance=PerformanceMetrics(row)
+                ), simulation, len(historical_data), rules, seconds_per_bar,
+                    genome_profilers[strategy_id].merge(shared_profiler, scale=share), summary)
+        
+        pruned = sum(1 for result in results.values() if result.get("status") == "pruned")
+        logger.info(f"Population backtest of {len(genomes)} {strategy_name} genomes on {symbol}: "
+                    f"{len(signal_rows)} simulated ({pruned} pruned), {len(genomes) - len(signal_rows)} failed")
+        return {strategy_id: results[strategy_id] for strategy_id, _ in genomes}
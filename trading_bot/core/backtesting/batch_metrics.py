@@ -0,0 +1,196 @@
+"""
+Batch Performance Metrics for BensBot.
+
+Computes the PerformanceMetrics fields for many equity curves at once. The
+curves of a generation (or a parameter grid) are stacked into a
+(curves x bars) array and every metric is a vectorized NumPy reduction along
+the bar axis; per-trade statistics are computed from ragged P&L arrays with
+grouped sums. Scoring a whole generation is therefore a single call instead
+of one pandas pass per genome.
+
+Definitions match BaseBacktester._calculate_performance_metrics (which
+delegates here), so batch and single-curve metrics are identical.
+"""
+
+import logging
+import re
+import warnings
+import numpy as np
+from contextlib import contextmanager
+from typing import Dict, Any, List, Optional, Sequence, Union
+
+logger = logging.getLogger(__name__)
+
+# Trading days per year and trading hours per day, by asset class
+TRADING_DAYS_PER_YEAR = {"equity": 252, "crypto": 365, "forex": 260}
+TRADING_HOURS_PER_DAY = {"equity": 6.5, "crypto": 24.0, "forex": 24.0}
+
+_INTERVAL_PATTERN = re.compile(r"^\s*(\d*)\s*(mo|wk|min|m|h|d|w|y)\s*$", re.IGNORECASE)
+
+# Metric keys shared with PerformanceMetrics, in reporting order
+METRIC_KEYS = (
+    "total_return", "sharpe_ratio", "max_drawdown", "trades", "win_rate",
+    "annualized_return", "sortino_ratio", "profit_factor"
+)
+OOS_METRIC_KEYS = ("oos_total_return", "oos_sharpe_ratio", "oos_max_drawdown")
+
+def annualization_factor(interval: Optional[str] = "1d", asset_class: Optional[str] = "equity") -> float:
+    """
+    Number of bars per year for a data interval.
+
+    Intraday bars are scaled by the asset class's session length (6.5 hours
+    for equities, around the clock for crypto and forex).
+
+    Args:
+        interval: Bar interval such as '1m', '15m', '1h', '4h', '1d', '1wk', '1mo'
+        asset_class: 'equity', 'crypto' or 'forex' (unknown classes use equity sessions)
+
+    Returns:
+        Bars per year; 252 if the interval cannot be parsed
+    """
+    match = _INTERVAL_PATTERN.match(interval or "")
+    if not match:
+        logger.debug(f"Unrecognized interval {interval!r}; annualizing with 252 periods")
+        return 252.0
+    count = int(match.group(1) or 1)
+    unit = match.group(2).lower()
+    days = TRADING_DAYS_PER_YEAR.get(asset_class, TRADING_DAYS_PER_YEAR["equity"])
+    hours = TRADING_HOURS_PER_DAY.get(asset_class, TRADING_HOURS_PER_DAY["equity"])
+
+    if unit in ("m", "min"):
+        bars = days * hours * 60 / count
+    elif unit == "h":
+        bars = days * hours / count
+    elif unit == "d":
+        bars = days / count
+    elif unit in ("w", "wk"):
+        bars = 52 / count
+    elif unit == "mo":
+        bars = 12 / count
+    else:
+        bars = 1 / count
+    return float(bars)
+
+@contextmanager
+def _quiet_reductions():
+    """Silence the warnings NumPy emits for zero divisions and all-NaN or single-value rows."""
+    with np.errstate(divide="ignore", invalid="ignore"), warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)
+        yield
+
+def _period_returns(equity: np.ndarray) -> np.ndarray:
+    """Simple returns between consecutive bars (curves x bars-1)."""
+    with _quiet_reductions():
+        return equity[:, 1:] / equity[:, :-1] - 1
+
+def _sharpe(returns: np.ndarray, periods_per_year: float) -> np.ndarray:
+    """Annualized mean/std of returns (sample std); 0 where undefined."""
+    with _quiet_reductions():
+        sharpe = np.nanmean(returns, axis=1) / np.nanstd(returns, axis=1, ddof=1) * np.sqrt(periods_per_year)
+    return np.where(np.isnan(sharpe), 0.0, sharpe)
+
+def _max_drawdown(equity: np.ndarray) -> np.ndarray:
+    """Most negative peak-to-trough decline, in percent; 0 where undefined."""
+    running_max = np.maximum.accumulate(equity, axis=1)
+    with _quiet_reductions():
+        drawdown = np.nanmin((equity - running_max) / running_max, axis=1) * 100
+    return np.where(np.isnan(drawdown), 0.0, drawdown)
+
+def compute_batch_metrics(
+    equity_curves: np.ndarray,
+    trade_pnls: Optional[Sequence[np.ndarray]] = None,
+    initial_capital: Optional[Union[float, np.ndarray]] = None,
+    periods_per_year: float = 252.0,
+    oos_start: Optional[int] = None,
+    risk_free_rate: float = 0.0
+) -> Dict[str, np.ndarray]:
+    """
+    Compute performance metrics for a batch of equity curves.
+
+    Args:
+        equity_curves: (curves x bars) array of portfolio values; all curves share the bar axis
+        trade_pnls: One array of per-trade P&L per curve (NaN entries count as non-winning trades)
+        initial_capital: Starting capital per curve (scalar or array); defaults to the first bar
+        periods_per_year: Bars per year used for annualization (see annualization_factor)
+        oos_start: Bar at which an out-of-sample segment starts; adds the oos_* metrics
+        risk_free_rate: Annual risk-free rate subtracted from returns for the Sortino ratio
+
+    Returns:
+        Dictionary mapping metric name to an array with one value per curve:
+        total_return, annualized_return and max_drawdown in percent; sharpe_ratio
+        and sortino_ratio annualized; trades, win_rate (percent) and profit_factor
+        (gross profit / gross loss; inf with winning and no losing trades, 0 without winners)
+    """
+    equity = np.atleast_2d(np.asarray(equity_curves, dtype=float))
+    n_curves, n_bars = equity.shape
+    if n_bars == 0:
+        raise ValueError("Equity curves must contain at least one bar")
+    initial = equity[:, 0] if initial_capital is None else np.broadcast_to(
+        np.asarray(initial_capital, dtype=float), (n_curves,))
+
+    returns = _period_returns(equity)
+    growth = equity[:, -1] / initial
+    metrics: Dict[str, np.ndarray] = {
+        "total_return": (growth - 1) * 100,
+        "sharpe_ratio": _sharpe(returns, periods_per_year),
+        "max_drawdown": _max_drawdown(equity),
+    }
+
+    # Per-trade statistics from the ragged P&L arrays, grouped by curve
+    if trade_pnls is None:
+        trade_pnls = [np.empty(0)] * n_curves
+    if len(trade_pnls) != n_curves:
+        raise ValueError(f"Got {len(trade_pnls)} trade P&L arrays for {n_curves} equity curves")
+    counts = np.array([len(pnl) for pnl in trade_pnls], dtype=np.int64)
+    pnl = np.concatenate([np.asarray(p, dtype=float) for p in trade_pnls]) if counts.sum() else np.empty(0)
+    owner = np.repeat(np.arange(n_curves), counts)
+    winning = pnl > 0
+    losing = pnl <= 0
+    wins = np.bincount(owner, weights=winning, minlength=n_curves)
+    gross_profit = np.bincount(owner, weights=np.where(winning, pnl, 0.0), minlength=n_curves)
+    gross_loss = np.bincount(owner, weights=np.where(losing, pnl, 0.0), minlength=n_curves)
+    has_losses = np.bincount(owner, weights=losing, minlength=n_curves) > 0
+    with _quiet_reductions():
+        metrics["trades"] = counts
+        metrics["win_rate"] = np.where(counts > 0, wins / np.maximum(counts, 1) * 100, 0.0)
+        # Winners without losses have an unbounded profit factor; no winners give 0
+        metrics["profit_factor"] = np.where(
+            has_losses & (gross_loss != 0), np.abs(gross_profit / gross_loss),
+            np.where(gross_profit > 0, np.inf, 0.0))
+
+        # Compound annual growth over the bars covered; a wiped-out account is -100%
+        years = returns.shape[1] / periods_per_year
+        if years > 0:
+            annualized = np.where(growth > 0, np.power(np.abs(growth), 1 / years) - 1, -1.0)
+        else:
+            annualized = np.zeros(n_curves)
+        metrics["annualized_return"] = np.where(np.isnan(annualized), 0.0, annualized) * 100
+
+        # Sortino: mean excess return over downside deviation (target = risk-free rate)
+        excess = returns - ((1 + risk_free_rate) ** (1 / periods_per_year) - 1)
+        downside = np.sqrt(np.nanmean(np.minimum(excess, 0.0) ** 2, axis=1))
+        sortino = np.nanmean(excess, axis=1) / downside * np.sqrt(periods_per_year)
+        metrics["sortino_ratio"] = np.where(np.isnan(sortino), 0.0, sortino)
+
+    if oos_start is not None and 0 <= oos_start < n_bars:
+        oos_equity = equity[:, oos_start:]
+        with _quiet_reductions():
+            metrics["oos_total_return"] = (oos_equity[:, -1] / oos_equity[:, 0] - 1) * 100
+        metrics["oos_sharpe_ratio"] = _sharpe(_period_returns(oos_equity), periods_per_year)
+        metrics["oos_max_drawdown"] = _max_drawdown(oos_equity)
+    return metrics
+
+def metrics_rows(metrics: Dict[str, np.ndarray]) -> List[Dict[str, Any]]:
+    """
+    Split batch metrics into one plain dictionary per curve.
+
+    Args:
+        metrics: Output of compute_batch_metrics
+
+    Returns:
+        List of {metric: value} dictionaries with Python floats (and int trade counts)
+    """
+    keys = [key for key in METRIC_KEYS + OOS_METRIC_KEYS if key in metrics]
+    columns = {key: metrics[key].tolist() for key in keys}
+    n_curves = len(next(iter(columns.values()))) if columns else 0
+    return [{key: columns[key][row] for key in keys} for row in range(n_curves)]
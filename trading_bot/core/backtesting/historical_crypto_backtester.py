@@ -3,9 +3,14 @@ Historical Backtester for Crypto Assets.
 """
 import logging
 import pandas as pd
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional, Tuple
 
 from trading_bot.core.backtesting.base_backtester import BaseBacktester, BacktestResult, PerformanceMetrics
+from trading_bot.core.backtesting.batch_metrics import annualization_factor
+from trading_bot.core.backtesting.profiling import (
+    BacktestProfiler, PHASE_DATA_FETCH, PHASE_INSTANTIATION, PHASE_SIGNALS, PHASE_SIMULATION, PHASE_METRICS,
+    PHASE_WALK_FORWARD
+)
 
 logger = logging.getLogger(__name__)
 
@@ -25,18 +30,23 @@ class HistoricalCryptoBacktester(BaseBacktester):
         interval: str,
         initial_capital: float = 10000.0, # Crypto often traded with smaller capital
         commission_pct: float = 0.00075,  # Binance VIP 0 maker/taker fee example or similar
-        slippage_pct: float = 0.001     # Crypto can have higher slippage
+        slippage_pct: float = 0.001,     # Crypto can have higher slippage
+        pruning: Optional[Dict[str, Any]] = None,
+        walk_forward: Optional[Dict[str, Any]] = None
     ) -> BacktestResult:
         logger.info(f"Running CRYPTO backtest for {strategy_id} on {symbol} from {start_date} to {end_date}")
 
-        historical_data = self.data_fetcher.fetch(symbol, asset_class, start_date, end_date, interval)
+        profiler = BacktestProfiler(trace_memory=self.trace_memory)
+        with profiler.phase(PHASE_DATA_FETCH):
+            historical_data = self.data_fetcher.fetch(symbol, asset_class, start_date, end_date, interval)
         if historical_data is None or historical_data.empty:
             return BacktestResult(
                 status="failure", strategy_id=strategy_id, strategy_type=str(strategy_class.__name__),
                 parameters=parameters, performance=PerformanceMetrics(), error_message="Failed to fetch crypto data."
             )
         try:
-            strategy_instance = strategy_class(strategy_id=strategy_id, parameters=parameters)
+            with profiler.phase(PHASE_INSTANTIATION):
+                strategy_instance = strategy_class(strategy_id=strategy_id, parameters=parameters)
         except Exception as e:
             logger.error(f"Error instantiating crypto strategy {strategy_id}: {e}", exc_info=True)
             return BacktestResult(
@@ -44,7 +54,8 @@ class HistoricalCryptoBacktester(BaseBacktester):
                 parameters=parameters, performance=PerformanceMetrics(), error_message=f"Strategy instantiation error: {e}"
             )
         try:
-            signals_df = strategy_instance.generate_signals(historical_data.copy())
+            with profiler.phase(PHASE_SIGNALS):
+                signals_df = self._generate_signals(strategy_instance, historical_data)
         except Exception as e:
             logger.error(f"Error generating signals for crypto strategy {strategy_id}: {e}", exc_info=True)
             return BacktestResult(
@@ -53,47 +64,75 @@ class HistoricalCryptoBacktester(BaseBacktester):
             )
 
         # Simplified portfolio simulation for crypto (long-only example)
-        positions = pd.Series(index=signals_df.index, dtype=float).fillna(0.0)
-        portfolio_values = pd.Series(index=signals_df.index, dtype=float).fillna(initial_capital)
-        cash = initial_capital
-        current_asset_qty = 0.0
-        last_signal = 0
-        trades_log = []
+        rules = self._get_pruning_rules(pruning)
+        with profiler.phase(PHASE_SIMULATION):
+            portfolio_values, simulation = self._simulate_portfolio(
+                historical_data, signals_df, initial_capital, slippage_pct, commission_pct, mode="crypto", pruning=rules
+            )
+        seconds_per_bar = profiler.wall(PHASE_SIMULATION) / max(simulation.bars_processed, 1)
+
+        with profiler.phase(PHASE_METRICS):
+            trades_df = self._build_trades_df(simulation.trades_log)
+
+            performance = self._calculate_performance_metrics(
+                portfolio_values, trades_df, initial_capital, periods_per_year=annualization_factor(interval, "crypto")
+            )
 
-        for i, timestamp in enumerate(historical_data.index):
-            signal = signals_df['signal'].iloc[i]
-            current_price = historical_data['Close'].iloc[i]
+        walk_forward_summary = None
+        wf_config = self._get_walk_forward_config(walk_forward)
+        if wf_config is not None:
+            try:
+                with profiler.phase(PHASE_WALK_FORWARD):
+                    walk_forward_summary = self._walk_forward_signals(
+                        historical_data, signals_df, initial_capital, slippage_pct, commission_pct, "crypto",
+                        annualization_factor(interval, "crypto"), wf_config
+                    )
+            except ValueError as e:
+                logger.error(f"Walk-forward evaluation of crypto strategy {strategy_id} failed: {e}")
+                return BacktestResult(
+                    status="error", strategy_id=strategy_id, strategy_type=str(strategy_class.__name__),
+                    parameters=parameters, performance=PerformanceMetrics(), error_message=f"Walk-forward error: {e}"
+                )
 
-            if i > 0:
-                portfolio_values.iloc[i] = portfolio_values.iloc[i-1]
-                if current_asset_qty > 0:
-                    price_change = current_price - historical_data['Close'].iloc[i-1]
-                    portfolio_values.iloc[i] += current_asset_qty * price_change
+        return self._finalize_result(BacktestResult(
+            status="success", strategy_id=strategy_id, strategy_type=f"crypto_{strategy_class.__name__}",
+            parameters=parameters, performance=performance
+        ), simulation, len(historical_data), rules, seconds_per_bar, profiler, walk_forward_summary)
+
+    def run_population_backtest(
+        self,
+        strategy_class: Any,
+        genomes: List[Tuple[str, Dict[str, Any]]],
+        asset_class: str,
+        symbol: str,
+        start_date: str,
+        end_date: str,
+        interval: str,
+        initial_capital: float = 10000.0,
+        commission_pct: float = 0.00075,
+        slippage_pct: float = 0.001,
+        pruning: Optional[Dict[str, Any]] = None,
+        walk_forward: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, BacktestResult]:
+        """
+        Backtest many parameter sets of one strategy class in a single vectorized pass.
+        
+        Args:
+            strategy_class: Strategy class shared by all genomes
+            genomes: List of (strategy_id, parameters) tuples
+            (remaining arguments as for run_backtest)
             
-            if signal == 1 and last_signal == 0: # Buy signal and not already in a position
-                entry_price_eff = self._apply_slippage_and_commission(current_price, "buy", slippage_pct, commission_pct, is_entry=True)
-                asset_to_buy = cash / entry_price_eff
-                if asset_to_buy > 0:
-                    cash -= asset_to_buy * entry_price_eff
-                    current_asset_qty = asset_to_buy
-                    trades_log.append({'timestamp': timestamp, 'type': 'buy', 'price': entry_price_eff, 'qty': asset_to_buy})
-                    positions.iloc[i] = current_asset_qty
-                portfolio_values.iloc[i] = cash + (current_asset_qty * current_price)
-                last_signal = 1
-            elif signal == -1 and current_asset_qty > 0: # Sell signal and currently holding assets
-                exit_price_eff = self._apply_slippage_and_commission(current_price, "sell", slippage_pct, commission_pct, is_entry=False)
-                cash += current_asset_qty * exit_price_eff
-                trades_log.append({'timestamp': timestamp, 'type': 'sell', 'price': exit_price_eff, 'qty': current_asset_qty})
-                current_asset_qty = 0
-                positions.iloc[i] = 0 # Position is now flat
-                portfolio_values.iloc[i] = cash 
-                last_signal = -1 # Or 0 if strategy implies exiting and staying out
-            else: # Hold or no clear signal to change position
-                positions.iloc[i] = current_asset_qty
-                if i == 0: portfolio_values.iloc[i] = initial_capital
-                # last_signal remains unchanged unless a new trade is made or explicitly reset by strategy
-                if signal == 0 : last_signal = 0 # if hold signal, reset last_signal to allow re-entry on next signal
+        Returns:
+            Dictionary mapping strategy_id to BacktestResult
+        """
+        logger.info(f"Running CRYPTO population backtest of {len(genomes)} genomes on {symbol} from {start_date} to {end_date}")
+        return self._run_population_backtest(
+            strategy_class, genomes, asset_class, symbol, start_date, end_date, interval,
+            initial_capital, commission_pct, slippage_pct, mode="crypto", type_prefix="crypto", pruning=pruning, walk_forward=walk_forward
+        )
 
+    def _build_trades_df(self, trades_log: List[Dict[str, Any]]) -> pd.DataFrame:
+        """Pair buy/sell fills into long round trips with per-trade P&L."""
         processed_trades = []
         active_trade = None
         for trade in trades_log:
@@ -102,14 +141,8 @@ class HistoricalCryptoBacktester(BaseBacktester):
             elif trade['type'] == 'sell' and active_trade and active_trade['type'] == 'long':
                 pnl = (trade['price'] - active_trade['entry_price']) * active_trade['qty']
                 processed_trades.append({
-                    **active_trade, 'exit_time': trade['timestamp'], 'exit_price': trade['price'], 'pnl': pnl
+                    **active_trade, 'exit_time': trade['timestamp'], 'exit_price': trade['price'],
+                    'exit_reason': trade.get('exit_reason', 'signal'), 'pnl': pnl
                 })
                 active_trade = None
-        trades_df = pd.DataFrame(processed_trades)
-        
-        performance = self._calculate_performance_metrics(portfolio_values, trades_df, initial_capital)
-
-        return BacktestResult(
-            status="success", strategy_id=strategy_id, strategy_type=f"crypto_{strategy_class.__name__}",
-            parameters=parameters, performance=performance
-        ) 
\ No newline at end of file
+        return pd.DataFrame(processed_trades)
@@ -3,9 +3,14 @@ Historical Backtester for Equity Assets.
 """
 import logging
 import pandas as pd
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional, Tuple
 
 from trading_bot.core.backtesting.base_backtester import BaseBacktester, BacktestResult, PerformanceMetrics
+from trading_bot.core.backtesting.batch_metrics import annualization_factor
+from trading_bot.core.backtesting.profiling import (
+    BacktestProfiler, PHASE_DATA_FETCH, PHASE_INSTANTIATION, PHASE_SIGNALS, PHASE_SIMULATION, PHASE_METRICS,
+    PHASE_WALK_FORWARD
+)
 # from trading_bot.core.strategies.base_strategy import BaseStrategy # Or specific equity strategies
 # from trading_bot.core.data.historical_data_fetcher import HistoricalDataFetcher
 
@@ -27,12 +32,16 @@ class HistoricalEquityBacktester(BaseBacktester):
         interval: str,
         initial_capital: float = 100000.0,
         commission_pct: float = 0.001,
-        slippage_pct: float = 0.0005
+        slippage_pct: float = 0.0005,
+        pruning: Optional[Dict[str, Any]] = None,
+        walk_forward: Optional[Dict[str, Any]] = None
     ) -> BacktestResult:
         logger.info(f"Running EQUITY backtest for {strategy_id} on {symbol} from {start_date} to {end_date}")
 
         # 1. Fetch Data
-        historical_data = self.data_fetcher.fetch(symbol, asset_class, start_date, end_date, interval)
+        profiler = BacktestProfiler(trace_memory=self.trace_memory)
+        with profiler.phase(PHASE_DATA_FETCH):
+            historical_data = self.data_fetcher.fetch(symbol, asset_class, start_date, end_date, interval)
         if historical_data is None or historical_data.empty:
             return BacktestResult(
                 status="failure", strategy_id=strategy_id, strategy_type=str(strategy_class.__name__),
@@ -41,7 +50,8 @@ class HistoricalEquityBacktester(BaseBacktester):
 
         # 2. Instantiate Strategy
         try:
-            strategy_instance = strategy_class(strategy_id=strategy_id, parameters=parameters)
+            with profiler.phase(PHASE_INSTANTIATION):
+                strategy_instance = strategy_class(strategy_id=strategy_id, parameters=parameters)
         except Exception as e:
             logger.error(f"Error instantiating strategy {strategy_id} ({strategy_class.__name__}): {e}", exc_info=True)
             return BacktestResult(
@@ -51,7 +61,8 @@ class HistoricalEquityBacktester(BaseBacktester):
 
         # 3. Generate Signals
         try:
-            signals_df = strategy_instance.generate_signals(historical_data.copy()) # Pass a copy
+            with profiler.phase(PHASE_SIGNALS):
+                signals_df = self._generate_signals(strategy_instance, historical_data)
         except Exception as e:
             logger.error(f"Error generating signals for {strategy_id}: {e}", exc_info=True)
             return BacktestResult(
@@ -59,79 +70,81 @@ class HistoricalEquityBacktester(BaseBacktester):
                 parameters=parameters, performance=PerformanceMetrics(), error_message=f"Signal generation error: {e}"
             )
 
-        # 4. Portfolio Simulation (Vectorized Backtesting Example - can be made event-driven for more realism)
+        # 4. Portfolio Simulation (array-based engine shared by the historical backtesters)
         # This is a simplified example. A full backtester would handle position sizing, cash management, etc.
-        positions = pd.Series(index=signals_df.index, dtype=float).fillna(0.0)
-        portfolio_values = pd.Series(index=signals_df.index, dtype=float).fillna(initial_capital)
-        cash = initial_capital
-        current_position_qty = 0 # Number of shares/contracts
-        last_signal = 0
-        trades_log = []
-        entry_price = 0.0
+        rules = self._get_pruning_rules(pruning)
+        with profiler.phase(PHASE_SIMULATION):
+            portfolio_values, simulation = self._simulate_portfolio(
+                historical_data, signals_df, initial_capital, slippage_pct, commission_pct, mode="equity", pruning=rules
+            )
+        seconds_per_bar = profiler.wall(PHASE_SIMULATION) / max(simulation.bars_processed, 1)
+        with profiler.phase(PHASE_METRICS):
+            trades_df = self._build_trades_df(simulation.trades_log)
 
-        for i, timestamp in enumerate(historical_data.index):
-            signal = signals_df['signal'].iloc[i]
-            current_price = historical_data['Close'].iloc[i] # Assume trading at close for simplicity
-            
-            # Update portfolio value for holding periods if position exists
-            if i > 0:
-                portfolio_values.iloc[i] = portfolio_values.iloc[i-1] # Start with previous day's value
-                if current_position_qty != 0: # If holding a position
-                    price_change = current_price - historical_data['Close'].iloc[i-1]
-                    portfolio_values.iloc[i] += current_position_qty * price_change
-            
-            if signal == 1 and last_signal <= 0: # Buy signal and not already long
-                if current_position_qty < 0: # Close short position first
-                    buy_price_eff = self._apply_slippage_and_commission(current_price, "buy", slippage_pct, commission_pct, is_entry=False)
-                    cash += abs(current_position_qty) * buy_price_eff
-                    trades_log.append({'timestamp': timestamp, 'type': 'cover', 'price': buy_price_eff, 'qty': abs(current_position_qty)})
-                    current_position_qty = 0
-                
-                # Go long
-                entry_price_eff = self._apply_slippage_and_commission(current_price, "buy", slippage_pct, commission_pct, is_entry=True)
-                shares_to_buy = cash / entry_price_eff # Simple: use all available cash
-                if shares_to_buy > 0:
-                    cash -= shares_to_buy * entry_price_eff
-                    current_position_qty = shares_to_buy
-                    entry_price = entry_price_eff # For P&L calculation later
-                    trades_log.append({'timestamp': timestamp, 'type': 'buy', 'price': entry_price_eff, 'qty': shares_to_buy})
-                    positions.iloc[i] = shares_to_buy
-                portfolio_values.iloc[i] = cash + (current_position_qty * current_price) # Update with current price
-                last_signal = 1
+            # 5. Calculate Performance Metrics
+            performance = self._calculate_performance_metrics(
+                portfolio_values, trades_df, initial_capital, periods_per_year=annualization_factor(interval, "equity")
+            )
 
-            elif signal == -1 and last_signal >= 0: # Sell signal and not already short
-                if current_position_qty > 0: # Close long position first
-                    sell_price_eff = self._apply_slippage_and_commission(current_price, "sell", slippage_pct, commission_pct, is_entry=False)
-                    cash += current_position_qty * sell_price_eff
-                    trades_log.append({'timestamp': timestamp, 'type': 'sell', 'price': sell_price_eff, 'qty': current_position_qty})
-                    current_position_qty = 0
-                
-                # Go short (optional, for simplicity, this example might not fully implement shorting P&L correctly)
-                # entry_price_eff = self._apply_slippage_and_commission(current_price, "sell", slippage_pct, commission_pct, is_entry=True)
-                # shares_to_sell = cash / entry_price_eff # Simplified: base shares on cash / price
-                # if shares_to_sell > 0:
-                #     cash += shares_to_sell * entry_price_eff # Selling short increases cash initially
-                #     current_position_qty = -shares_to_sell
-                #     entry_price = entry_price_eff
-                #     trades_log.append({'timestamp': timestamp, 'type': 'short', 'price': entry_price_eff, 'qty': shares_to_sell})
-                #     positions.iloc[i] = -shares_to_sell
-                portfolio_values.iloc[i] = cash # If short, value is cash minus liability of borrowed shares
-                last_signal = -1
+        # 6. Walk-Forward Folds (re-using the signals computed above)
+        walk_forward_summary = None
+        wf_config = self._get_walk_forward_config(walk_forward)
+        if wf_config is not None:
+            try:
+                with profiler.phase(PHASE_WALK_FORWARD):
+                    walk_forward_summary = self._walk_forward_signals(
+                        historical_data, signals_df, initial_capital, slippage_pct, commission_pct, "equity",
+                        annualization_factor(interval, "equity"), wf_config
+                    )
+            except ValueError as e:
+                logger.error(f"Walk-forward evaluation of strategy {strategy_id} failed: {e}")
+                return BacktestResult(
+                    status="error", strategy_id=strategy_id, strategy_type=str(strategy_class.__name__),
+                    parameters=parameters, performance=PerformanceMetrics(), error_message=f"Walk-forward error: {e}"
+                )
+
+        return self._finalize_result(BacktestResult(
+            status="success",
+            strategy_id=strategy_id,
+            strategy_type=f"equity_{strategy_class.__name__}", # more specific type
+            parameters=parameters,
+            performance=performance
+        ), simulation, len(historical_data), rules, seconds_per_bar, profiler, walk_forward_summary)
+
+    def run_population_backtest(
+        self,
+        strategy_class: Any,
+        genomes: List[Tuple[str, Dict[str, Any]]],
+        asset_class: str,
+        symbol: str,
+        start_date: str,
+        end_date: str,
+        interval: str,
+        initial_capital: float = 100000.0,
+        commission_pct: float = 0.001,
+        slippage_pct: float = 0.0005,
+        pruning: Optional[Dict[str, Any]] = None,
+        walk_forward: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, BacktestResult]:
+        """
+        Backtest many parameter sets of one strategy class in a single vectorized pass.
+        
+        Args:
+            strategy_class: Strategy class shared by all genomes
+            genomes: List of (strategy_id, parameters) tuples
+            (remaining arguments as for run_backtest)
             
-            elif signal == 0 and current_position_qty != 0: # Hold signal, but need to close if previous signal was exit
-                 if last_signal == 1 and signals_df['signal'].iloc[i-1] == -1: # Was long, got sell signal prev, now hold -> means exit on sell
-                    sell_price_eff = self._apply_slippage_and_commission(current_price, "sell", slippage_pct, commission_pct, is_entry=False)
-                    cash += current_position_qty * sell_price_eff
-                    trades_log.append({'timestamp': timestamp, 'type': 'sell_exit', 'price': sell_price_eff, 'qty': current_position_qty})
-                    current_position_qty = 0
-                    portfolio_values.iloc[i] = cash
-                    last_signal = 0
-                 # Add similar logic for exiting shorts if implemented
-            else:
-                positions.iloc[i] = current_position_qty # Carry forward position
-                if i == 0: portfolio_values.iloc[i] = initial_capital # Ensure first value is capital
-                last_signal = signal # Or 0 if no new trade signal
+        Returns:
+            Dictionary mapping strategy_id to BacktestResult
+        """
+        logger.info(f"Running EQUITY population backtest of {len(genomes)} genomes on {symbol} from {start_date} to {end_date}")
+        return self._run_population_backtest(
+            strategy_class, genomes, asset_class, symbol, start_date, end_date, interval,
+            initial_capital, commission_pct, slippage_pct, mode="equity", type_prefix="equity", pruning=pruning, walk_forward=walk_forward
+        )
 
+    def _build_trades_df(self, trades_log: List[Dict[str, Any]]) -> pd.DataFrame:
+        """Pair buy/sell fills into long round trips with per-trade P&L."""
         #Simplified trade log for performance calculation (needs more detail for PnL per trade)
         #This part needs significant enhancement for proper P&L attribution per trade.
         #For now, _calculate_performance_metrics uses the equity curve primarily.
@@ -148,19 +161,9 @@ class HistoricalEquityBacktester(BaseBacktester):
                     **active_trade,
                     'exit_time': trade['timestamp'],
                     'exit_price': trade['price'],
+                    'exit_reason': trade.get('exit_reason', 'signal'),
                     'pnl': pnl
                 })
                 active_trade = None
             # Add short trade processing here
-        trades_df = pd.DataFrame(processed_trades)
-
-        # 5. Calculate Performance Metrics
-        performance = self._calculate_performance_metrics(portfolio_values, trades_df, initial_capital)
-
-        return BacktestResult(
-            status="success",
-            strategy_id=strategy_id,
-            strategy_type=f"equity_{strategy_class.__name__}", # more specific type
-            parameters=parameters,
-            performance=performance
-        ) 
\ No newline at end of file
+        return pd.DataFrame(processed_trades)
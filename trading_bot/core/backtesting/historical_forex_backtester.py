@@ -5,13 +5,20 @@ Note: Forex backtesting requires careful handling of pip values, lot sizes,
 leverage, and margin, which are simplified in this placeholder.
 """
 import logging
-import pandas as pd
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional, Tuple
 
 from trading_bot.core.backtesting.base_backtester import BaseBacktester, BacktestResult, PerformanceMetrics
+from trading_bot.core.backtesting.batch_metrics import annualization_factor
+from trading_bot.core.backtesting.profiling import (
+    BacktestProfiler, PHASE_DATA_FETCH, PHASE_INSTANTIATION, PHASE_SIGNALS, PHASE_SIMULATION, PHASE_METRICS,
+    PHASE_WALK_FORWARD
+)
 
 logger = logging.getLogger(__name__)
 
+# Example: Fixed micro lot size for each trade for simplicity
+TRADE_LOT_SIZE = 10000
+
 class HistoricalForexBacktester(BaseBacktester):
     def __init__(self, historical_data_fetcher: Any):
         super().__init__(historical_data_fetcher)
@@ -29,8 +36,10 @@ class HistoricalForexBacktester(BaseBacktester):
         initial_capital: float = 10000.0, # Forex often traded with leveraged accounts
         commission_pct: float = 0.00005, # Example: $5 per $100k lot, if price is 1.0, then 5/100000 = 0.00005
         slippage_pips: float = 0.5, # Slippage in pips (e.g., 0.5 pips)
-        pip_value: float = 0.0001 # For most XXX/YYY pairs; JPY pairs are 0.01
+        pip_value: float = 0.0001, # For most XXX/YYY pairs; JPY pairs are 0.01
         # lot_size: int = 100000 # Standard lot, or can be mini/micro
+        pruning: Optional[Dict[str, Any]] = None,
+        walk_forward: Optional[Dict[str, Any]] = None
     ) -> BacktestResult:
         logger.info(f"Running FOREX backtest for {strategy_id} on {symbol} from {start_date} to {end_date}")
 
@@ -41,17 +50,19 @@ class HistoricalForexBacktester(BaseBacktester):
         # A more robust way is to adjust price by (slippage_pips * pip_value) directly in simulation loop.
         # For now, we'll make a rough conversion for the existing helper.
         # Let's assume an average price of 1.0 for simplicity in this conversion. A better way is needed.
-        average_price_for_slippage_conversion = 1.0 
-        slippage_pct_from_pips = (slippage_pips * pip_value) / average_price_for_slippage_conversion
+        slippage_pct_from_pips = self._pips_to_slippage_pct(slippage_pips, pip_value)
 
-        historical_data = self.data_fetcher.fetch(symbol, asset_class, start_date, end_date, interval)
+        profiler = BacktestProfiler(trace_memory=self.trace_memory)
+        with profiler.phase(PHASE_DATA_FETCH):
+            historical_data = self.data_fetcher.fetch(symbol, asset_class, start_date, end_date, interval)
         if historical_data is None or historical_data.empty:
             return BacktestResult(
                 status="failure", strategy_id=strategy_id, strategy_type=str(strategy_class.__name__),
                 parameters=parameters, performance=PerformanceMetrics(), error_message="Failed to fetch forex data."
             )
         try:
-            strategy_instance = strategy_class(strategy_id=strategy_id, parameters=parameters)
+            with profiler.phase(PHASE_INSTANTIATION):
+                strategy_instance = strategy_class(strategy_id=strategy_id, parameters=parameters)
         except Exception as e:
             logger.error(f"Error instantiating forex strategy {strategy_id}: {e}", exc_info=True)
             return BacktestResult(
@@ -59,7 +70,8 @@ class HistoricalForexBacktester(BaseBacktester):
                 parameters=parameters, performance=PerformanceMetrics(), error_message=f"Strategy instantiation error: {e}"
             )
         try:
-            signals_df = strategy_instance.generate_signals(historical_data.copy())
+            with profiler.phase(PHASE_SIGNALS):
+                signals_df = self._generate_signals(strategy_instance, historical_data)
         except Exception as e:
             logger.error(f"Error generating signals for forex strategy {strategy_id}: {e}", exc_info=True)
             return BacktestResult(
@@ -68,86 +80,81 @@ class HistoricalForexBacktester(BaseBacktester):
             )
 
         # Simplified portfolio simulation for Forex (handles long/short)
-        positions = pd.Series(index=signals_df.index, dtype=float).fillna(0.0) # Stores units of base currency
-        portfolio_values = pd.Series(index=signals_df.index, dtype=float).fillna(initial_capital)
-        cash = initial_capital
-        current_units = 0.0 # Units of the base currency (e.g., EUR in EUR/USD)
-        last_signal = 0
-        trades_log = []
-        trade_lot_size = 10000 # Example: Fixed micro lot size for each trade for simplicity
+        # Cash tracks realized P&L; portfolio value is cash plus mark-to-market of the open position.
+        # This is a simplification. A proper forex backtester needs margin calculations.
+        rules = self._get_pruning_rules(pruning)
+        with profiler.phase(PHASE_SIMULATION):
+            portfolio_values, simulation = self._simulate_portfolio(
+                historical_data, signals_df, initial_capital, slippage_pct_from_pips, commission_pct,
+                mode="forex", pruning=rules, lot_size=TRADE_LOT_SIZE
+            )
+        seconds_per_bar = profiler.wall(PHASE_SIMULATION) / max(simulation.bars_processed, 1)
 
-        for i, timestamp in enumerate(historical_data.index):
-            signal = signals_df['signal'].iloc[i]
-            current_price = historical_data['Close'].iloc[i]
+        with profiler.phase(PHASE_METRICS):
+            processed_trades = self._build_trades_df(simulation.trades_log)
+            # P&L is already in trades_log for this version
 
-            if i > 0:
-                portfolio_values.iloc[i] = portfolio_values.iloc[i-1]
-                if current_units != 0:
-                    price_change = current_price - historical_data['Close'].iloc[i-1]
-                    # P&L for forex: units * price_change (in quote currency per unit of base)
-                    # If holding 10k EUR and EURUSD goes up by 0.0010, P&L = 10000 * 0.0010 = $10
-                    portfolio_values.iloc[i] += current_units * price_change 
-            
-            # Decision to trade
-            if signal == 1 and last_signal <= 0: # Buy signal
-                if current_units < 0: # If short, cover first
-                    buy_price_eff = self._apply_slippage_and_commission(current_price, "buy", slippage_pct_from_pips, commission_pct, is_entry=False)
-                    cash_change = abs(current_units) * (entry_price - buy_price_eff) # PnL from short
-                    cash += abs(current_units) * entry_price + cash_change # Add back initial margin + PnL
-                    trades_log.append({'timestamp': timestamp, 'type': 'cover', 'price': buy_price_eff, 'qty': abs(current_units), 'pnl': cash_change})
-                    current_units = 0
-                
-                units_to_buy = trade_lot_size
-                entry_price_eff = self._apply_slippage_and_commission(current_price, "buy", slippage_pct_from_pips, commission_pct, is_entry=True)
-                # For forex, cash doesn't decrease by units*price directly due to margin/leverage
-                # We'll track units and value them. Cash is mainly for realized P&L and margin.
-                # This is a simplification. A proper forex backtester needs margin calculations.
-                current_units = units_to_buy
-                entry_price = entry_price_eff # Store actual entry price for PnL
-                trades_log.append({'timestamp': timestamp, 'type': 'buy', 'price': entry_price_eff, 'qty': units_to_buy})
-                positions.iloc[i] = current_units
-                last_signal = 1
+            performance = self._calculate_performance_metrics(
+                portfolio_values, processed_trades, initial_capital, periods_per_year=annualization_factor(interval, "forex")
+            )
 
-            elif signal == -1 and last_signal >= 0: # Sell signal
-                if current_units > 0: # If long, sell first
-                    sell_price_eff = self._apply_slippage_and_commission(current_price, "sell", slippage_pct_from_pips, commission_pct, is_entry=False)
-                    cash_change = current_units * (sell_price_eff - entry_price)
-                    cash += cash_change # Realized PnL from long
-                    trades_log.append({'timestamp': timestamp, 'type': 'sell_long', 'price': sell_price_eff, 'qty': current_units, 'pnl': cash_change})
-                    current_units = 0
-                
-                units_to_sell = trade_lot_size
-                entry_price_eff = self._apply_slippage_and_commission(current_price, "sell", slippage_pct_from_pips, commission_pct, is_entry=True)
-                current_units = -units_to_sell # Negative for short position
-                entry_price = entry_price_eff # Store entry price for short
-                trades_log.append({'timestamp': timestamp, 'type': 'short', 'price': entry_price_eff, 'qty': units_to_sell})
-                positions.iloc[i] = current_units
-                last_signal = -1
-            else: # Hold
-                positions.iloc[i] = current_units
-                if signal == 0 : last_signal = 0
+        walk_forward_summary = None
+        wf_config = self._get_walk_forward_config(walk_forward)
+        if wf_config is not None:
+            try:
+                with profiler.phase(PHASE_WALK_FORWARD):
+                    walk_forward_summary = self._walk_forward_signals(
+                        historical_data, signals_df, initial_capital, slippage_pct_from_pips, commission_pct, "forex",
+                        annualization_factor(interval, "forex"), wf_config, lot_size=TRADE_LOT_SIZE
+                    )
+            except ValueError as e:
+                logger.error(f"Walk-forward evaluation of forex strategy {strategy_id} failed: {e}")
+                return BacktestResult(
+                    status="error", strategy_id=strategy_id, strategy_type=str(strategy_class.__name__),
+                    parameters=parameters, performance=PerformanceMetrics(), error_message=f"Walk-forward error: {e}"
+                )
 
-            # Update portfolio value based on current position and price
-            # Realized P&L is in cash. Unrealized is units * current_price.
-            # For simplicity, portfolio_values tracks cash + mark-to-market of open position.
-            # If short, MTM is (entry_price_of_short - current_price) * abs(units)
-            mtm_value = 0
-            if current_units > 0: # Long position
-                mtm_value = current_units * current_price
-            elif current_units < 0: # Short position
-                mtm_value = abs(current_units) * entry_price + abs(current_units) * (entry_price - current_price) 
-                # This reflects initial cash from short sell + P&L on short
-            
-            # This is still a simplification. True margin account value is more complex.
-            if i == 0: portfolio_values.iloc[i] = initial_capital
-            else: portfolio_values.iloc[i] = cash + mtm_value if current_units != 0 else cash
+        return self._finalize_result(BacktestResult(
+            status="success", strategy_id=strategy_id, strategy_type=f"forex_{strategy_class.__name__}",
+            parameters=parameters, performance=performance
+        ), simulation, len(historical_data), rules, seconds_per_bar, profiler, walk_forward_summary)
 
-        processed_trades = pd.DataFrame(trades_log)
-        # P&L is already in trades_log for this version
+    def run_population_backtest(
+        self,
+        strategy_class: Any,
+        genomes: List[Tuple[str, Dict[str, Any]]],
+        asset_class: str,
+        symbol: str,
+        start_date: str,
+        end_date: str,
+        interval: str,
+        initial_capital: float = 10000.0,
+        commission_pct: float = 0.00005,
+        slippage_pips: float = 0.5,
+        pip_value: float = 0.0001,
+        pruning: Optional[Dict[str, Any]] = None,
+        walk_forward: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, BacktestResult]:
+        """
+        Backtest many parameter sets of one strategy class in a single vectorized pass.
         
-        performance = self._calculate_performance_metrics(portfolio_values, processed_trades, initial_capital)
+        Args:
+            strategy_class: Strategy class shared by all genomes
+            genomes: List of (strategy_id, parameters) tuples
+            (remaining arguments as for run_backtest)
+            
+        Returns:
+            Dictionary mapping strategy_id to BacktestResult
+        """
+        logger.info(f"Running FOREX population backtest of {len(genomes)} genomes on {symbol} from {start_date} to {end_date}")
+        return self._run_population_backtest(
+            strategy_class, genomes, asset_class, symbol, start_date, end_date, interval,
+            initial_capital, commission_pct, self._pips_to_slippage_pct(slippage_pips, pip_value),
+            mode="forex", type_prefix="forex", pruning=pruning, walk_forward=walk_forward, lot_size=TRADE_LOT_SIZE
+        )
 
-        return BacktestResult(
-            status="success", strategy_id=strategy_id, strategy_type=f"forex_{strategy_class.__name__}",
-            parameters=parameters, performance=performance
-        ) 
\ No newline at end of file
+    @staticmethod
+    def _pips_to_slippage_pct(slippage_pips: float, pip_value: float) -> float:
+        """Convert pip slippage to a percentage, assuming an average price of 1.0."""
+        average_price_for_slippage_conversion = 1.0
+        return (slippage_pips * pip_value) / average_price_for_slippage_conversion
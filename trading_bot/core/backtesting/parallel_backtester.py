@@ -5,16 +5,33 @@ This module provides utilities for running backtests in parallel
 using multiprocessing, accelerating the evaluation of strategy genomes.
 """
 
+import atexit
+import hashlib
 import logging
+import math
 import time
 import multiprocessing as mp
+from collections import OrderedDict
+from dataclasses import dataclass
 from typing import Dict, Any, List, Callable, Optional, Tuple
-from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures import ProcessPoolExecutor, as_completed, wait
 
 from trading_bot.core.backtesting.base_backtester import BacktestResult
+from trading_bot.core.backtesting.shared_market_data import SharedMarketData, SharedDataFetcher
+from trading_bot.core.backtesting.profiling import aggregate_profiles, format_profile, slowest_strategy_ids, capture_cprofile
 
 logger = logging.getLogger(__name__)
 
+# Constructor keyword under which backtesters receive their data fetcher
+DATA_FETCHER_KWARG = "historical_data_fetcher"
+
+# Per-process state of shared-data workers, set once by _init_shared_data_worker
+_worker_state: Dict[str, Any] = {}
+
+# Warm backtest contexts kept by persistent pool workers, least recently used first
+_warm_contexts: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+MAX_WARM_CONTEXTS = 4
+
 def _run_backtest_worker(
     backtester_constructor: Callable,
     backtester_kwargs: Dict[str, Any],
@@ -59,17 +76,204 @@ def _run_backtest_worker(
         )
         return strategy_id, error_result
 
+def _run_population_batch_worker(
+    backtester_constructor: Callable,
+    backtester_kwargs: Dict[str, Any],
+    batch_args: Tuple
+) -> List[Tuple[str, BacktestResult]]:
+    """
+    Worker function that backtests a batch of genomes of one strategy class.
+    
+    The batch is simulated in one vectorized pass when the backtester supports
+    run_population_backtest, otherwise each genome is backtested in turn.
+    
+    Args:
+        backtester_constructor: A function that returns a configured backtester instance
+        backtester_kwargs: Keyword args for creating the backtester
+        batch_args: Tuple containing (strategy_class, [(strategy_id, parameters), ...], backtest_config)
+        
+    Returns:
+        List of (strategy_id, BacktestResult) tuples
+    """
+    strategy_class, genomes, backtest_config = batch_args
+    
+    try:
+        backtester = backtester_constructor(**backtester_kwargs)
+        
+        if hasattr(backtester, "run_population_backtest"):
+            results = backtester.run_population_backtest(
+                strategy_class=strategy_class,
+                genomes=genomes,
+                **backtest_config
+            )
+        else:
+            results = {
+                strategy_id: backtester.run_backtest(
+                    strategy_id=strategy_id,
+                    strategy_class=strategy_class,
+                    parameters=parameters,
+                    **backtest_config
+                )
+                for strategy_id, parameters in genomes
+            }
+        
+        return list(results.items())
+    except Exception as e:
+        logger.error(f"Error in batch backtest worker for {len(genomes)} genomes: {e}")
+        return [
+            (strategy_id, BacktestResult(
+                status="error",
+                strategy_id=strategy_id,
+                strategy_type=strategy_class.__name__ if strategy_class else "unknown",
+                parameters=parameters,
+                performance={},
+                error_message=f"Parallel backtest error: {str(e)}"
+            ))
+            for strategy_id, parameters in genomes
+        ]
+
+def _group_into_batches(
+    backtest_args: List[Tuple],
+    max_workers: int,
+    batch_size: Optional[int] = None
+) -> List[Tuple]:
+    """
+    Group per-genome backtest arguments into same-class batches.
+    
+    Args:
+        backtest_args: List of (strategy_id, strategy_class, parameters, backtest_config)
+        max_workers: Number of worker processes
+        batch_size: Genomes per batch (default: split each class evenly across workers)
+        
+    Returns:
+        List of (strategy_class, [(strategy_id, parameters), ...], backtest_config) tuples
+    """
+    by_class: Dict[Any, List[Tuple[str, Dict[str, Any]]]] = {}
+    config_by_class: Dict[Any, Dict[str, Any]] = {}
+    for strategy_id, strategy_class, parameters, backtest_config in backtest_args:
+        by_class.setdefault(strategy_class, []).append((strategy_id, parameters))
+        config_by_class[strategy_class] = backtest_config
+    
+    batches = []
+    for strategy_class, genomes in by_class.items():
+        size = batch_size or math.ceil(len(genomes) / max_workers)
+        for start in range(0, len(genomes), size):
+            batches.append((strategy_class, genomes[start:start + size], config_by_class[strategy_class]))
+    return batches
+
+def _publish_generation_data(
+    backtester_kwargs: Dict[str, Any],
+    backtest_config: Dict[str, Any]
+) -> Optional[SharedMarketData]:
+    """
+    Fetch the generation's bars once in the parent and publish them to shared memory.
+    
+    Args:
+        backtester_kwargs: Keyword args for creating the backtester (must hold the data fetcher)
+        backtest_config: Configuration for the backtest (symbol, dates, etc.)
+        
+    Returns:
+        Owning SharedMarketData, or None if the data cannot be shared (workers then fetch themselves)
+    """
+    data_fetcher = backtester_kwargs.get(DATA_FETCHER_KWARG)
+    if data_fetcher is None:
+        return None
+    
+    fetch_key = tuple(backtest_config.get(key) for key in ("symbol", "asset_class", "start_date", "end_date", "interval"))
+    try:
+        historical_data = data_fetcher.fetch(*fetch_key)
+        if historical_data is None or historical_data.empty:
+            logger.warning(f"No data for {fetch_key}; workers will fetch individually")
+            return None
+        return SharedMarketData.publish(historical_data, fetch_key=fetch_key)
+    except Exception as e:
+        logger.warning(f"Could not share market data for {fetch_key}, workers will fetch individually: {e}")
+        return None
+
+def _init_shared_data_worker(
+    backtester_constructor: Callable,
+    backtester_kwargs: Dict[str, Any],
+    data_handle: Any,
+    strategy_classes: Dict[str, Any],
+    backtest_config: Dict[str, Any]
+) -> None:
+    """
+    Process-pool initializer: attach to the shared bars and build this worker's backtester once.
+    
+    Args:
+        backtester_constructor: A function that returns a configured backtester instance
+        backtester_kwargs: Keyword args for the backtester; its data fetcher (if any) serves
+                           requests other than the published one
+        data_handle: SharedMarketDataHandle published by the parent
+        strategy_classes: Dictionary mapping strategy types to actual strategy classes
+        backtest_config: Configuration for the backtest
+    """
+    shared_data = SharedMarketData.attach(data_handle)
+    kwargs = dict(backtester_kwargs)
+    kwargs[DATA_FETCHER_KWARG] = SharedDataFetcher(shared_data, fallback_fetcher=kwargs.get(DATA_FETCHER_KWARG))
+    _worker_state.update(
+        shared_data=shared_data,
+        backtester=backtester_constructor(**kwargs),
+        strategy_classes=strategy_classes,
+        backtest_config=backtest_config
+    )
+
+def _shared_backtester() -> Any:
+    """Return this worker's backtester bound to the shared market data."""
+    return _worker_state["backtester"]
+
+def _run_shared_backtest_worker(task: Tuple[str, str, Dict[str, Any]]) -> Tuple[str, BacktestResult]:
+    """
+    Run a single backtest in a shared-data worker.
+    
+    Args:
+        task: Tuple of (strategy_id, strategy_type, parameters)
+        
+    Returns:
+        Tuple of (strategy_id, BacktestResult)
+    """
+    strategy_id, strategy_type, parameters = task
+    strategy_class = _worker_state["strategy_classes"][strategy_type]
+    return _run_backtest_worker(
+        _shared_backtester, {}, (strategy_id, strategy_class, parameters, _worker_state["backtest_config"])
+    )
+
+def _run_shared_batch_worker(task: Tuple[str, List[Tuple[str, Dict[str, Any]]]]) -> List[Tuple[str, BacktestResult]]:
+    """
+    Run a population batch in a shared-data worker.
+    
+    Args:
+        task: Tuple of (strategy_type, [(strategy_id, parameters), ...])
+        
+    Returns:
+        List of (strategy_id, BacktestResult) tuples
+    """
+    strategy_type, genomes = task
+    strategy_class = _worker_state["strategy_classes"][strategy_type]
+    return _run_population_batch_worker(
+        _shared_backtester, {}, (strategy_class, genomes, _worker_state["backtest_config"])
+    )
+
 def run_parallel_backtests(
     backtester_constructor: Callable,
     backtester_kwargs: Dict[str, Any],
     strategy_genomes: List[Dict[str, Any]],
     strategy_classes: Dict[str, Any],
     backtest_config: Dict[str, Any],
-    max_workers: Optional[int] = None
+    max_workers: Optional[int] = None,
+    batched: bool = False,
+    batch_size: Optional[int] = None,
+    share_data: bool = True,
+    profile_slowest: int = 0,
+    profile_dir: Optional[str] = None
 ) -> Dict[str, BacktestResult]:
     """
     Run multiple backtests in parallel using a process pool.
     
+    With share_data, the parent fetches the bars once and publishes them to
+    shared memory; each worker attaches once and builds a single backtester,
+    so tasks carry only (strategy_id, strategy_type, parameters).
+    
     Args:
         backtester_constructor: A function that returns a configured backtester instance
         backtester_kwargs: Keyword args for creating the backtester (like historical_data_fetcher)
@@ -77,11 +281,18 @@ def run_parallel_backtests(
         strategy_classes: Dictionary mapping strategy types to actual strategy classes
         backtest_config: Configuration for the backtest (symbol, dates, etc.)
         max_workers: Maximum number of parallel processes (default: CPU count)
+        batched: Send same-class genomes to workers in batches that share one data
+                 fetch and one vectorized population simulation
+        batch_size: Genomes per batch when batched (default: one batch per worker and class)
+        share_data: Load market data once and share it with workers through shared memory
+        profile_slowest: Re-run this many of the slowest genomes under cProfile in
+                         the parent process and dump their stats to profile_dir
+        profile_dir: Directory for the cProfile dumps (default: ./profiles)
         
     Returns:
-        Dictionary mapping strategy_id to BacktestResult
+        Dictionary mapping strategy_id to BacktestResult (each with a phase 'profile')
     """
-    if max_workers is None:
+    if not max_workers:
         max_workers = mp.cpu_count()
     
     # Prepare backtest arguments
@@ -102,24 +313,58 @@ def run_parallel_backtests(
     start_time = time.time()
     logger.info(f"Starting parallel backtest of {len(backtest_args)} strategies using {max_workers} workers")
     
+    shared_data = _publish_generation_data(backtester_kwargs, backtest_config) if share_data else None
+    if shared_data is not None:
+        # Tasks refer to strategies by type; the classes go to each worker once
+        type_by_class = {strategy_classes[genome['type']]: genome['type']
+                         for genome in strategy_genomes if genome['type'] in strategy_classes}
+        task_args = [(strategy_id, type_by_class[strategy_class], parameters, None)
+                     for strategy_id, strategy_class, parameters, _ in backtest_args]
+        executor = ProcessPoolExecutor(
+            max_workers=max_workers,
+            initializer=_init_shared_data_worker,
+            initargs=(backtester_constructor, backtester_kwargs, shared_data.handle,
+                      {strategy_type: cls for cls, strategy_type in type_by_class.items()}, backtest_config)
+        )
+    else:
+        executor = ProcessPoolExecutor(max_workers=max_workers)
+    
     try:
-        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        with executor:
             # Submit all backtest jobs
-            future_to_id = {
-                executor.submit(_run_backtest_worker, backtester_constructor, backtester_kwargs, args): args[0]
-                for args in backtest_args
-            }
+            if batched:
+                batches = _group_into_batches(task_args if shared_data else backtest_args, max_workers, batch_size)
+                logger.info(f"Grouped {len(backtest_args)} strategies into {len(batches)} population batches")
+                if shared_data is not None:
+                    futures = [executor.submit(_run_shared_batch_worker, batch[:2]) for batch in batches]
+                else:
+                    futures = [
+                        executor.submit(_run_population_batch_worker, backtester_constructor, backtester_kwargs, batch)
+                        for batch in batches
+                    ]
+            elif shared_data is not None:
+                futures = [executor.submit(_run_shared_backtest_worker, args[:3]) for args in task_args]
+            else:
+                futures = [
+                    executor.submit(_run_backtest_worker, backtester_constructor, backtester_kwargs, args)
+                    for args in backtest_args
+                ]
             
             # Collect results as they complete
-            for future in as_completed(future_to_id):
-                strategy_id, result = future.result()
-                results[strategy_id] = result
+            for future in as_completed(futures):
+                completed = future.result() if batched else [future.result()]
+                for strategy_id, result in completed:
+                    results[strategy_id] = result
                 
                 # Log progress
-                if len(results) % 10 == 0 or len(results) == len(backtest_args):
+                if batched or len(results) % 10 == 0 or len(results) == len(backtest_args):
                     logger.info(f"Completed {len(results)}/{len(backtest_args)} backtests")
     except Exception as e:
         logger.error(f"Error in parallel backtesting: {e}")
+    finally:
+        if shared_data is not None:
+            shared_data.close()
+            shared_data.unlink()
     
     # Check for missing results and report
     missing_ids = set(genome['id'] for genome in strategy_genomes) - set(results.keys())
@@ -131,9 +376,374 @@ def run_parallel_backtests(
     strategies_per_second = len(results) / duration if duration > 0 else 0
     logger.info(f"Parallel backtesting completed in {duration:.2f} seconds "
                 f"({strategies_per_second:.2f} strategies/second)")
+    logger.info(f"Worker time by phase: {format_profile(aggregate_profiles(results.values()))}")
+    
+    if profile_slowest > 0 and results:
+        args_by_id = {args[0]: args for args in backtest_args}
+        def rerun(strategy_id: str) -> BacktestResult:
+            return _run_backtest_worker(backtester_constructor, backtester_kwargs, args_by_id[strategy_id])[1]
+        capture_cprofile(
+            [strategy_id for strategy_id in slowest_strategy_ids(results, profile_slowest) if strategy_id in args_by_id],
+            rerun, profile_dir or "profiles"
+        )
     
     return results
 
+@dataclass(frozen=True)
+class WorkerContext:
+    """
+    Everything a persistent pool worker needs to evaluate genomes for one backtest setup.
+    
+    Workers cache the backtester (and attached market data) built from a
+    context under its key, so later chunks and generations with the same
+    setup reuse them.
+    """
+    key: str
+    backtester_constructor: Callable
+    backtester_kwargs: Dict[str, Any]
+    data_handle: Optional[Any]
+    strategy_classes: Dict[str, Any]
+    backtest_config: Dict[str, Any]
+
+def _get_warm_context(context: WorkerContext) -> Dict[str, Any]:
+    """
+    Return this worker's cached state for a context, building it on first use.
+    
+    Args:
+        context: WorkerContext sent with the task chunk
+        
+    Returns:
+        Dictionary with the backtester, strategy classes and backtest config
+    """
+    state = _warm_contexts.get(context.key)
+    if state is None:
+        kwargs = dict(context.backtester_kwargs)
+        shared_data = None
+        if context.data_handle is not None:
+            shared_data = SharedMarketData.attach(context.data_handle)
+            kwargs[DATA_FETCHER_KWARG] = SharedDataFetcher(shared_data, fallback_fetcher=kwargs.get(DATA_FETCHER_KWARG))
+        state = {
+            "shared_data": shared_data,
+            "backtester": context.backtester_constructor(**kwargs),
+            "strategy_classes": {},
+            "backtest_config": context.backtest_config
+        }
+        _warm_contexts[context.key] = state
+        while len(_warm_contexts) > MAX_WARM_CONTEXTS:
+            _, evicted = _warm_contexts.popitem(last=False)
+            if evicted["shared_data"] is not None:
+                evicted["shared_data"].close()
+    else:
+        _warm_contexts.move_to_end(context.key)
+    state["strategy_classes"].update(context.strategy_classes)
+    return state
+
+def _run_pool_chunk(
+    context: WorkerContext,
+    genomes: List[Tuple[str, str, Dict[str, Any]]],
+    batched: bool
+) -> List[Tuple[str, BacktestResult]]:
+    """
+    Evaluate a chunk of genomes in a persistent pool worker.
+    
+    Args:
+        context: Backtest setup for the chunk
+        genomes: List of (strategy_id, strategy_type, parameters)
+        batched: Simulate same-type genomes of the chunk as one population
+        
+    Returns:
+        List of (strategy_id, BacktestResult) tuples
+    """
+    state = _get_warm_context(context)
+    strategy_classes, backtest_config = state["strategy_classes"], state["backtest_config"]
+    warm_backtester = lambda: state["backtester"]
+    
+    if batched:
+        genomes_by_type: Dict[str, List[Tuple[str, Dict[str, Any]]]] = {}
+        for strategy_id, strategy_type, parameters in genomes:
+            genomes_by_type.setdefault(strategy_type, []).append((strategy_id, parameters))
+        results = []
+        for strategy_type, group in genomes_by_type.items():
+            results.extend(_run_population_batch_worker(
+                warm_backtester, {}, (strategy_classes[strategy_type], group, backtest_config)
+            ))
+        return results
+    
+    return [
+        _run_backtest_worker(
+            warm_backtester, {}, (strategy_id, strategy_classes[strategy_type], parameters, backtest_config)
+        )
+        for strategy_id, strategy_type, parameters in genomes
+    ]
+
+class BacktestWorkerPool:
+    """
+    Long-lived process pool for backtesting across evolution generations.
+    
+    Workers survive between generations and keep their imports, strategy
+    classes, backtesters and attached market data warm. Genomes are submitted
+    in chunks. To bound memory growth, workers can be recycled between
+    generations once they have handled a given number of chunks.
+    """
+    
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        max_tasks_per_worker: int = 0,
+        chunk_size: int = 0,
+        max_published_datasets: int = 2
+    ):
+        """
+        Initialize the pool (call start() or use it as a context manager).
+        
+        Args:
+            max_workers: Number of worker processes (default: CPU count)
+            max_tasks_per_worker: Chunks a worker handles before it is replaced (0 = never recycle)
+            chunk_size: Genomes per submitted chunk (0 = about four chunks per worker)
+            max_published_datasets: Market datasets kept in shared memory between generations
+        """
+        self.max_workers = max_workers or mp.cpu_count()
+        self.max_tasks_per_worker = max_tasks_per_worker
+        self.chunk_size = chunk_size
+        self.max_published_datasets = max(1, max_published_datasets)
+        
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._pending: set = set()
+        self._published: "OrderedDict[Tuple, SharedMarketData]" = OrderedDict()
+        self._chunks_since_start = 0
+        self._atexit_registered = False
+        self.generations_run = 0
+    
+    @property
+    def is_running(self) -> bool:
+        """Whether the worker processes are up."""
+        return self._executor is not None
+    
+    def start(self) -> "BacktestWorkerPool":
+        """Start the worker processes (no-op if already running)."""
+        if self._executor is not None:
+            return self
+        
+        self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+        self._chunks_since_start = 0
+        
+        if not self._atexit_registered:
+            atexit.register(self.shutdown)
+            self._atexit_registered = True
+        logger.info(f"Started backtest worker pool with {self.max_workers} workers"
+                    + (f", recycling after {self.max_tasks_per_worker} tasks" if self.max_tasks_per_worker else ""))
+        return self
+    
+    def drain(self) -> None:
+        """Block until every submitted chunk has finished."""
+        if self._pending:
+            logger.info(f"Draining {len(self._pending)} pending backtest chunks")
+            wait(list(self._pending))
+    
+    def resize(self, max_workers: int) -> None:
+        """
+        Change the number of workers.
+        
+        In-flight work is drained and the processes are restarted; published
+        market data stays in shared memory.
+        
+        Args:
+            max_workers: New number of worker processes
+        """
+        max_workers = max_workers or mp.cpu_count()
+        if max_workers == self.max_workers and self.is_running:
+            return
+        was_running = self.is_running
+        self._stop_executor()
+        self.max_workers = max_workers
+        if was_running:
+            self.start()
+    
+    def shutdown(self, wait: bool = True) -> None:
+        """
+        Stop the workers and release published market data.
+        
+        Args:
+            wait: Wait for pending chunks to finish before stopping
+        """
+        if wait:
+            self._stop_executor()
+        elif self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+            self._pending.clear()
+        
+        while self._published:
+            _, shared_data = self._published.popitem()
+            shared_data.close()
+            shared_data.unlink()
+        
+        if self._atexit_registered:
+            atexit.unregister(self.shutdown)
+            self._atexit_registered = False
+    
+    def __enter__(self) -> "BacktestWorkerPool":
+        return self.start()
+    
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.shutdown()
+    
+    def run_backtests(
+        self,
+        backtester_constructor: Callable,
+        backtester_kwargs: Dict[str, Any],
+        strategy_genomes: List[Dict[str, Any]],
+        strategy_classes: Dict[str, Any],
+        backtest_config: Dict[str, Any],
+        batched: bool = False,
+        batch_size: Optional[int] = None,
+        share_data: bool = True
+    ) -> Dict[str, BacktestResult]:
+        """
+        Backtest a generation of genomes on the warm workers.
+        
+        Args:
+            backtester_constructor: A function that returns a configured backtester instance
+            backtester_kwargs: Keyword args for creating the backtester (like historical_data_fetcher)
+            strategy_genomes: List of strategy genome dictionaries with id, type, parameters, etc.
+            strategy_classes: Dictionary mapping strategy types to actual strategy classes
+            backtest_config: Configuration for the backtest (symbol, dates, etc.)
+            batched: Simulate same-type genomes of each chunk as one population
+            batch_size: Genomes per chunk when batched (overrides chunk_size)
+            share_data: Serve market data to workers from shared memory
+            
+        Returns:
+            Dictionary mapping strategy_id to BacktestResult
+        """
+        self.start()
+        start_time = time.time()
+        
+        genomes = []
+        for genome in strategy_genomes:
+            if genome['type'] not in strategy_classes:
+                logger.error(f"Strategy type {genome['type']} not found in registry")
+                continue
+            genomes.append((genome['id'], genome['type'], genome['parameters']))
+        if batched:
+            # Keep same-type genomes together so each chunk forms few populations
+            genomes.sort(key=lambda genome: genome[1])
+        
+        context = self._build_context(backtester_constructor, backtester_kwargs, strategy_classes, backtest_config, share_data)
+        if batched and batch_size:
+            chunk_size = batch_size
+        elif self.chunk_size:
+            chunk_size = self.chunk_size
+        else:
+            chunks_per_worker = 1 if batched else 4
+            chunk_size = max(1, math.ceil(len(genomes) / (self.max_workers * chunks_per_worker)))
+        chunks = [genomes[start:start + chunk_size] for start in range(0, len(genomes), chunk_size)]
+        
+        results = {}
+        futures = []
+        try:
+            for chunk in chunks:
+                future = self._executor.submit(_run_pool_chunk, context, chunk, batched)
+                self._pending.add(future)
+                future.add_done_callback(self._pending.discard)
+                futures.append(future)
+            self._chunks_since_start += len(chunks)
+            
+            for future in as_completed(futures):
+                for strategy_id, result in future.result():
+                    results[strategy_id] = result
+        except Exception as e:
+            logger.error(f"Error in worker pool backtesting: {e}")
+            # A crashed worker breaks the executor; start fresh next generation
+            self._stop_executor(wait=False)
+        
+        missing_ids = set(genome[0] for genome in genomes) - set(results.keys())
+        if missing_ids:
+            logger.warning(f"Missing results for {len(missing_ids)} strategies: {missing_ids}")
+        
+        self.generations_run += 1
+        self._recycle_if_due()
+        
+        duration = time.time() - start_time
+        logger.info(f"Worker pool backtested {len(results)} strategies in {len(chunks)} chunks "
+                    f"in {duration:.2f} seconds (generation {self.generations_run})")
+        logger.info(f"Worker time by phase: {format_profile(aggregate_profiles(results.values()))}")
+        return results
+    
+    def _build_context(
+        self,
+        backtester_constructor: Callable,
+        backtester_kwargs: Dict[str, Any],
+        strategy_classes: Dict[str, Any],
+        backtest_config: Dict[str, Any],
+        share_data: bool
+    ) -> WorkerContext:
+        """Publish (or reuse) the generation's data and describe the setup for the workers."""
+        shared_data = self._get_published_data(backtester_kwargs, backtest_config) if share_data else None
+        worker_kwargs = dict(backtester_kwargs)
+        
+        fingerprint = repr((
+            backtester_constructor.__module__,
+            backtester_constructor.__qualname__,
+            sorted((key, id(value)) for key, value in worker_kwargs.items()),
+            shared_data.handle.segment_name if shared_data is not None else None,
+            sorted(map(repr, backtest_config.items()))
+        ))
+        return WorkerContext(
+            key=hashlib.sha1(fingerprint.encode()).hexdigest(),
+            backtester_constructor=backtester_constructor,
+            backtester_kwargs=worker_kwargs,
+            data_handle=shared_data.handle if shared_data is not None else None,
+            strategy_classes=dict(strategy_classes),
+            backtest_config=backtest_config
+        )
+    
+    def _get_published_data(
+        self,
+        backtester_kwargs: Dict[str, Any],
+        backtest_config: Dict[str, Any]
+    ) -> Optional[SharedMarketData]:
+        """Return shared data for the config's fetch key, publishing it on first use."""
+        fetch_key = tuple(backtest_config.get(key) for key in ("symbol", "asset_class", "start_date", "end_date", "interval"))
+        shared_data = self._published.get(fetch_key)
+        if shared_data is not None:
+            self._published.move_to_end(fetch_key)
+            return shared_data
+        
+        shared_data = _publish_generation_data(backtester_kwargs, backtest_config)
+        if shared_data is not None:
+            self._published[fetch_key] = shared_data
+            while len(self._published) > self.max_published_datasets:
+                # Workers still attached keep their mapping; the block goes away when they let go
+                _, evicted = self._published.popitem(last=False)
+                evicted.close()
+                evicted.unlink()
+        return shared_data
+    
+    def _recycle_if_due(self) -> None:
+        """
+        Replace the workers once they have handled max_tasks_per_worker chunks on average.
+        
+        Recycling happens between generations rather than through the executor's
+        max_tasks_per_child, which deadlocks on some Python versions and
+        requires the slower spawn start method.
+        """
+        if not self.max_tasks_per_worker:
+            return
+        if self._chunks_since_start >= self.max_tasks_per_worker * self.max_workers:
+            logger.info(f"Recycling backtest worker pool after {self._chunks_since_start} chunks")
+            self._stop_executor()
+            self.start()
+    
+    def _stop_executor(self, wait: bool = True) -> None:
+        """Shut down the worker processes, keeping published data."""
+        if self._executor is None:
+            return
+        if wait:
+            self.drain()
+        self._executor.shutdown(wait=wait)
+        self._executor = None
+        self._pending.clear()
+
 class ParallelBacktestManager:
     """
     Manager class for parallel backtesting that integrates with EvoTrader.
@@ -153,22 +763,73 @@ class ParallelBacktestManager:
         """
         self.backtester_constructors = backtester_constructors
         self.backtester_constructor_kwargs = backtester_constructor_kwargs
+        self.worker_pool: Optional[BacktestWorkerPool] = None
+    
+    def start_pool(
+        self,
+        max_workers: Optional[int] = None,
+        max_tasks_per_worker: int = 0,
+        chunk_size: int = 0
+    ) -> BacktestWorkerPool:
+        """
+        Start a persistent worker pool used by all following generations.
+        
+        Args:
+            max_workers: Number of worker processes (default: CPU count)
+            max_tasks_per_worker: Chunks a worker handles before it is replaced (0 = never recycle)
+            chunk_size: Genomes per submitted chunk (0 = automatic)
+            
+        Returns:
+            The running BacktestWorkerPool
+        """
+        if self.worker_pool is None:
+            self.worker_pool = BacktestWorkerPool(
+                max_workers=max_workers,
+                max_tasks_per_worker=max_tasks_per_worker,
+                chunk_size=chunk_size
+            )
+        return self.worker_pool.start()
+    
+    def resize_pool(self, max_workers: int) -> None:
+        """Change the number of workers of the persistent pool."""
+        if self.worker_pool is not None:
+            self.worker_pool.resize(max_workers)
+    
+    def drain_pool(self) -> None:
+        """Wait for all work submitted to the persistent pool to finish."""
+        if self.worker_pool is not None:
+            self.worker_pool.drain()
+    
+    def shutdown_pool(self, wait: bool = True) -> None:
+        """Stop the persistent pool and release its shared market data."""
+        if self.worker_pool is not None:
+            self.worker_pool.shutdown(wait=wait)
+            self.worker_pool = None
     
     def run_generation_backtests(
         self,
         strategy_genomes: List[Dict[str, Any]],
         strategy_classes: Dict[str, Any],
         backtest_config: Dict[str, Any],
-        max_workers: Optional[int] = None
+        max_workers: Optional[int] = None,
+        batched: bool = False,
+        batch_size: Optional[int] = None,
+        share_data: bool = True
     ) -> Dict[str, BacktestResult]:
         """
         Run backtests for an entire generation of strategies in parallel.
         
+        Uses the persistent worker pool when one has been started, otherwise
+        a process pool created for this generation only.
+        
         Args:
             strategy_genomes: List of strategy genome dictionaries
             strategy_classes: Dictionary mapping strategy types to actual strategy classes
             backtest_config: Configuration for the backtest
             max_workers: Maximum number of parallel processes
+            batched: Evaluate same-class genomes as vectorized population batches
+            batch_size: Genomes per batch when batched
+            share_data: Load the generation's market data once and share it with workers
             
         Returns:
             Dictionary mapping strategy_id to BacktestResult
@@ -183,11 +844,28 @@ class ParallelBacktestManager:
         
         backtester_kwargs = self.backtester_constructor_kwargs.get(asset_class, {})
         
+        if self.worker_pool is not None:
+            if max_workers and max_workers != self.worker_pool.max_workers:
+                self.worker_pool.resize(max_workers)
+            return self.worker_pool.run_backtests(
+                backtester_constructor=backtester_constructor,
+                backtester_kwargs=backtester_kwargs,
+                strategy_genomes=strategy_genomes,
+                strategy_classes=strategy_classes,
+                backtest_config=backtest_config,
+                batched=batched,
+                batch_size=batch_size,
+                share_data=share_data
+            )
+        
         return run_parallel_backtests(
             backtester_constructor=backtester_constructor,
             backtester_kwargs=backtester_kwargs,
             strategy_genomes=strategy_genomes,
             strategy_classes=strategy_classes,
             backtest_config=backtest_config,
-            max_workers=max_workers
+            max_workers=max_workers,
+            batched=batched,
+            batch_size=batch_size,
+            share_data=share_data
         ) 
\ No newline at end of file
@@ -0,0 +1,297 @@
+"""
+Multi-Symbol Portfolio Backtester for BensBot.
+
+Runs one strategy over a basket of symbols as a single portfolio: the bars
+of all symbols are aligned into a (symbols x time) panel, signals for the
+whole basket are generated in one call (vectorized where the strategy
+supports it, see BaseStrategy.generate_panel_signals) and every symbol
+trades from a shared cash balance under position limits.
+
+A basket is passed as the backtest config's 'symbol', comma-separated
+(e.g. "SPY,QQQ,IWM"), so it works as a cache, shared-memory and
+registry key like any single symbol. Register the backtester under its own
+asset class, e.g. {"portfolio": PortfolioBacktester(fetcher, asset_class="equity")}.
+"""
+import logging
+import numpy as np
+import pandas as pd
+from typing import Dict, Any, List, Optional, Sequence, Union
+
+from trading_bot.core.backtesting.base_backtester import BaseBacktester, BacktestResult, PerformanceMetrics
+from trading_bot.core.backtesting.simulation_engine import simulate_basket
+from trading_bot.core.backtesting.shared_market_data import SharedDataFetcher
+from trading_bot.core.backtesting.batch_metrics import compute_batch_metrics, metrics_rows, annualization_factor
+from trading_bot.core.backtesting.profiling import (
+    BacktestProfiler, PHASE_DATA_FETCH, PHASE_INSTANTIATION, PHASE_SIGNALS, PHASE_SIMULATION, PHASE_METRICS
+)
+
+logger = logging.getLogger(__name__)
+
+PANEL_FIELDS = ("Open", "High", "Low", "Close", "Volume")
+
+# Separates symbol and field in the column names of a basket frame ("SPY:Close")
+PANEL_COLUMN_SEPARATOR = ":"
+
+def parse_symbols(symbol: Union[str, Sequence[str]]) -> List[str]:
+    """Symbols of a basket given as a comma-separated string or a list."""
+    if isinstance(symbol, str):
+        symbol = symbol.split(",")
+    return [s.strip() for s in symbol if s and s.strip()]
+
+def split_basket_frame(data: pd.DataFrame) -> Dict[str, pd.DataFrame]:
+    """
+    Turn a basket frame ("<symbol>:<field>" columns) into a panel.
+
+    Returns:
+        Mapping of OHLCV field to a (time x symbols) DataFrame
+    """
+    panel: Dict[str, Dict[str, pd.Series]] = {}
+    for column in data.columns:
+        symbol, _, field = str(column).rpartition(PANEL_COLUMN_SEPARATOR)
+        panel.setdefault(field, {})[symbol] = data[column]
+    return {field: pd.DataFrame(columns, index=data.index) for field, columns in panel.items()}
+
+class BasketDataFetcher:
+    """
+    Fetcher that answers a basket of symbols with one aligned frame.
+
+    Each member is fetched from the wrapped fetcher, the bars are aligned on
+    the union of their timestamps and prices are carried forward over the
+    bars a symbol is missing (volume is zero there); before a symbol's first
+    bar its prices stay NaN. The columns are named "<symbol>:<field>", so the
+    frame can be published to shared memory and fingerprinted like the bars
+    of a single symbol.
+    """
+
+    def __init__(self, fetcher: Any, asset_class: str = "equity"):
+        """
+        Args:
+            fetcher: Single-symbol fetcher (e.g. HistoricalDataFetcher)
+            asset_class: Asset class of the basket members
+        """
+        self.fetcher = fetcher
+        self.asset_class = asset_class
+
+    def fetch(
+        self,
+        symbol: Union[str, Sequence[str]],
+        asset_class: str,
+        start_date: str,
+        end_date: str,
+        interval: str = "1d"
+    ) -> Optional[pd.DataFrame]:
+        """Same contract as HistoricalDataFetcher.fetch, with a basket as symbol."""
+        frames = {}
+        for member in parse_symbols(symbol):
+            data = self.fetcher.fetch(member, self.asset_class, start_date, end_date, interval)
+            if data is None or data.empty:
+                logger.warning(f"No data for basket member {member}; leaving it out of the basket.")
+                continue
+            frames[member] = data
+        if not frames:
+            return None
+
+        index = frames[next(iter(frames))].index
+        for data in frames.values():
+            index = index.union(data.index)
+        columns = {}
+        for member, data in frames.items():
+            aligned = data.reindex(index)
+            for field in PANEL_FIELDS:
+                if field not in aligned:
+                    continue
+                values = aligned[field].fillna(0.0) if field == "Volume" else aligned[field].ffill()
+                columns[f"{member}{PANEL_COLUMN_SEPARATOR}{field}"] = values.astype(float)
+        return pd.DataFrame(columns, index=index)
+
+class PortfolioBacktester(BaseBacktester):
+    """
+    Backtests a strategy on a basket of symbols with shared cash.
+
+    Each entry buys up to position_size_pct of the portfolio value, and at
+    most max_positions symbols are held at once (see simulate_basket).
+    Results carry portfolio-level performance plus a 'symbol_performance'
+    entry with P&L, contribution, exposure and standard metrics per symbol.
+    """
+
+    def __init__(
+        self,
+        historical_data_fetcher: Any,
+        asset_class: str = "equity",
+        max_positions: Optional[int] = None,
+        position_size_pct: Optional[float] = None
+    ):
+        """
+        Args:
+            historical_data_fetcher: Single-symbol fetcher, or a fetcher that already
+                                     serves basket frames (BasketDataFetcher, or the
+                                     SharedDataFetcher of a parallel worker)
+            asset_class: Asset class of the basket members (fetching, annualization)
+            max_positions: Most symbols held at once (default: every symbol)
+            position_size_pct: Fraction of portfolio value per entry (default: 1 / max_positions)
+        """
+        if not isinstance(historical_data_fetcher, (BasketDataFetcher, SharedDataFetcher)):
+            historical_data_fetcher = BasketDataFetcher(historical_data_fetcher, asset_class)
+        super().__init__(historical_data_fetcher)
+        self.asset_class = asset_class
+        self.max_positions = max_positions
+        self.position_size_pct = position_size_pct
+        self._warned_unsupported = False
+
+    def get_constructor_kwargs(self) -> Dict[str, Any]:
+        return {
+            **super().get_constructor_kwargs(),
+            "asset_class": self.asset_class,
+            "max_positions": self.max_positions,
+            "position_size_pct": self.position_size_pct,
+        }
+
+    def run_backtest(
+        self,
+        strategy_id: str,
+        strategy_class: Any,
+        parameters: Dict[str, Any],
+        asset_class: str,
+        symbol: Union[str, Sequence[str]],  # Basket, e.g. "SPY,QQQ,IWM"
+        start_date: str,
+        end_date: str,
+        interval: str,
+        initial_capital: float = 100000.0,
+        commission_pct: float = 0.001,
+        slippage_pct: float = 0.0005,
+        pruning: Optional[Dict[str, Any]] = None,
+        walk_forward: Optional[Dict[str, Any]] = None
+    ) -> BacktestResult:
+        logger.info(f"Running PORTFOLIO backtest for {strategy_id} on {symbol} from {start_date} to {end_date}")
+        if (pruning or walk_forward) and not self._warned_unsupported:
+            logger.warning("Pruning and walk-forward folds are not supported by the portfolio backtester; ignoring them.")
+            self._warned_unsupported = True
+
+        profiler = BacktestProfiler(trace_memory=self.trace_memory)
+        with profiler.phase(PHASE_DATA_FETCH):
+            basket_data = self.data_fetcher.fetch(symbol, asset_class, start_date, end_date, interval)
+        if basket_data is None or basket_data.empty:
+            return BacktestResult(
+                status="failure", strategy_id=strategy_id, strategy_type=str(strategy_class.__name__),
+                parameters=parameters, performance=PerformanceMetrics(), error_message="Failed to fetch basket data."
+            )
+        panel = split_basket_frame(basket_data)
+        symbols = list(panel['Close'].columns)
+
+        try:
+            with profiler.phase(PHASE_INSTANTIATION):
+                strategy_instance = strategy_class(strategy_id=strategy_id, parameters=parameters)
+        except Exception as e:
+            logger.error(f"Error instantiating strategy {strategy_id} ({strategy_class.__name__}): {e}", exc_info=True)
+            return BacktestResult(
+                status="error", strategy_id=strategy_id, strategy_type=str(strategy_class.__name__),
+                parameters=parameters, performance=PerformanceMetrics(), error_message=f"Strategy instantiation error: {e}"
+            )
+
+        try:
+            with profiler.phase(PHASE_SIGNALS):
+                signals = strategy_instance.generate_panel_signals(panel).reindex(
+                    index=basket_data.index, columns=symbols
+                ).fillna(0)
+        except Exception as e:
+            logger.error(f"Error generating basket signals for {strategy_id}: {e}", exc_info=True)
+            return BacktestResult(
+                status="error", strategy_id=strategy_id, strategy_type=str(strategy_class.__name__),
+                parameters=parameters, performance=PerformanceMetrics(), error_message=f"Signal generation error: {e}"
+            )
+
+        with profiler.phase(PHASE_SIMULATION):
+            simulation = simulate_basket(
+                close=panel['Close'].to_numpy(dtype=float).T,
+                signal_matrix=signals.to_numpy(dtype=float).T,
+                index=basket_data.index,
+                symbols=symbols,
+                initial_capital=initial_capital,
+                slippage_pct=slippage_pct,
+                commission_pct=commission_pct,
+                price_adjuster=self._apply_slippage_and_commission,
+                max_positions=self.max_positions,
+                position_size_pct=self.position_size_pct
+            )
+        profiler.bars_processed = simulation.bars_processed * len(symbols)
+
+        with profiler.phase(PHASE_METRICS):
+            periods_per_year = annualization_factor(interval, self.asset_class)
+            trades_df = self._build_trades_df(simulation.trades_log)
+            performance = self._calculate_performance_metrics(
+                pd.Series(simulation.equity_curve, index=basket_data.index), trades_df, initial_capital,
+                periods_per_year=periods_per_year
+            )
+            performance["exposure"] = float(np.mean(simulation.positions.any(axis=0))) if simulation.bars_processed else 0.0
+            symbol_performance = self._symbol_metrics(simulation, symbols, trades_df, initial_capital, periods_per_year)
+
+        result = BacktestResult(
+            status="success", strategy_id=strategy_id, strategy_type=f"portfolio_{strategy_class.__name__}",
+            parameters=parameters, performance=performance
+        )
+        result["symbol_performance"] = symbol_performance
+        result["profile"] = profiler.to_dict()
+        if self.keep_equity_curves:
+            result["equity_curve"] = simulation.equity_curve.tolist()
+        return result
+
+    def _symbol_metrics(
+        self,
+        simulation: Any,
+        symbols: List[str],
+        trades_df: pd.DataFrame,
+        initial_capital: float,
+        periods_per_year: float
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Per-symbol metrics of a basket simulation.
+
+        Each symbol is scored on its P&L curve on top of the capital of one
+        position slot (initial_capital * position size), in one batch metrics
+        call for the whole basket.
+        """
+        n_symbols = len(symbols)
+        slots = min(self.max_positions or n_symbols, n_symbols)
+        allocation = initial_capital * (self.position_size_pct if self.position_size_pct is not None else 1.0 / max(slots, 1))
+        trade_pnls = []
+        for symbol in symbols:
+            symbol_trades = trades_df[trades_df['symbol'] == symbol] if not trades_df.empty else trades_df
+            trade_pnls.append(self._trade_pnls(symbol_trades))
+        batch = compute_batch_metrics(
+            allocation + simulation.symbol_pnl,
+            trade_pnls=trade_pnls,
+            initial_capital=allocation,
+            periods_per_year=periods_per_year
+        )
+        symbol_performance = {}
+        for row, (symbol, metrics) in enumerate(zip(symbols, metrics_rows(batch))):
+            pnl = float(simulation.symbol_pnl[row, -1]) if simulation.bars_processed else 0.0
+            symbol_performance[symbol] = {
+                **metrics,
+                "pnl": pnl,
+                "contribution_pct": pnl / initial_capital * 100 if initial_capital else 0.0,
+                "exposure": float(np.mean(simulation.positions[row] > 0)) if simulation.bars_processed else 0.0,
+            }
+        return symbol_performance
+
+    def _build_trades_df(self, trades_log: List[Dict[str, Any]]) -> pd.DataFrame:
+        """Pair each symbol's buy/sell fills into long round trips with per-trade P&L."""
+        processed_trades = []
+        open_trades: Dict[str, Dict[str, Any]] = {}
+        for trade in trades_log:
+            symbol = trade['symbol']
+            if trade['type'] == 'buy':
+                open_trades[symbol] = {
+                    'symbol': symbol, 'entry_time': trade['timestamp'], 'entry_price': trade['price'],
+                    'type': 'long', 'qty': trade['qty']
+                }
+            elif trade['type'] == 'sell' and symbol in open_trades:
+                entry = open_trades.pop(symbol)
+                processed_trades.append({
+                    **entry,
+                    'exit_time': trade['timestamp'],
+                    'exit_price': trade['price'],
+                    'exit_reason': 'signal',
+                    'pnl': (trade['price'] - entry['entry_price']) * entry['qty']
+                })
+        return pd.DataFrame(processed_trades)
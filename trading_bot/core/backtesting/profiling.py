@@ -0,0 +1,243 @@
+"""
+Backtest Profiling for BensBot.
+
+Records wall-clock and CPU time per backtest phase (data fetch, strategy
+instantiation, signal generation, simulation, metrics, walk-forward folds,
+OOS, Monte Carlo), bars processed and peak memory, aggregates those
+profiles per generation, and can capture cProfile dumps of the slowest
+genomes.
+"""
+
+import cProfile
+import logging
+import os
+import re
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+from typing import Dict, Any, List, Optional, Callable, Iterable, Iterator
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+logger = logging.getLogger(__name__)
+
+# Backtest phases, in pipeline order
+PHASE_DATA_FETCH = "data_fetch"
+PHASE_INSTANTIATION = "instantiation"
+PHASE_SIGNALS = "signals"
+PHASE_SIMULATION = "simulation"
+PHASE_METRICS = "metrics"
+PHASE_WALK_FORWARD = "walk_forward"
+PHASE_OOS = "oos"
+PHASE_MONTE_CARLO = "monte_carlo"
+PHASES = (
+    PHASE_DATA_FETCH, PHASE_INSTANTIATION, PHASE_SIGNALS, PHASE_SIMULATION,
+    PHASE_METRICS, PHASE_WALK_FORWARD, PHASE_OOS, PHASE_MONTE_CARLO,
+)
+
+def peak_rss_mb() -> Optional[float]:
+    """Peak resident set size of this process in MB (None where unavailable)."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and kilobytes elsewhere
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+class BacktestProfiler:
+    """
+    Per-phase timer for one backtest (or the shared part of a population run).
+
+    Phases may be entered several times; their times and call counts add up.
+    With trace_memory, the peak Python allocation during the profiled phases
+    is measured with tracemalloc (which slows allocation-heavy code down, so
+    it is off by default).
+    """
+
+    def __init__(self, trace_memory: bool = False):
+        self.phases: Dict[str, Dict[str, float]] = {}
+        self.bars_processed = 0
+        self.trace_memory = trace_memory
+        self.peak_traced_mb: Optional[float] = None
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Time the enclosed block as phase name."""
+        owns_trace = False
+        if self.trace_memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                owns_trace = True
+            else:
+                tracemalloc.reset_peak()
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - wall_start, time.process_time() - cpu_start)
+            if self.trace_memory:
+                peak = tracemalloc.get_traced_memory()[1] / (1024 * 1024)
+                self.peak_traced_mb = max(self.peak_traced_mb or 0.0, peak)
+                if owns_trace:
+                    tracemalloc.stop()
+
+    def add(self, name: str, wall: float, cpu: float, calls: int = 1) -> None:
+        """Add measured time to a phase."""
+        entry = self.phases.setdefault(name, {"wall": 0.0, "cpu": 0.0, "calls": 0})
+        entry["wall"] += wall
+        entry["cpu"] += cpu
+        entry["calls"] += calls
+
+    def wall(self, name: str) -> float:
+        """Wall-clock seconds spent in a phase so far."""
+        return self.phases.get(name, {}).get("wall", 0.0)
+
+    def merge(self, other: "BacktestProfiler", scale: float = 1.0) -> "BacktestProfiler":
+        """
+        Add another profiler's phases, scaled (e.g. 1 / population size to
+        charge each genome its share of a population's shared phases).
+        """
+        for name, entry in other.phases.items():
+            self.add(name, entry["wall"] * scale, entry["cpu"] * scale, 0)
+            self.phases[name]["calls"] = max(self.phases[name]["calls"], 1)
+        if other.peak_traced_mb is not None:
+            self.peak_traced_mb = max(self.peak_traced_mb or 0.0, other.peak_traced_mb)
+        return self
+
+    def to_dict(self) -> Dict[str, Any]:
+        """The profile as stored under BacktestResult['profile']."""
+        ordered = [name for name in PHASES if name in self.phases]
+        ordered += [name for name in self.phases if name not in PHASES]
+        wall_total = sum(entry["wall"] for entry in self.phases.values())
+        simulation_wall = self.wall(PHASE_SIMULATION)
+        return {
+            "phases": {name: dict(self.phases[name]) for name in ordered},
+            "wall_total": wall_total,
+            "cpu_total": sum(entry["cpu"] for entry in self.phases.values()),
+            "bars_processed": self.bars_processed,
+            "bars_per_second": self.bars_processed / simulation_wall if simulation_wall > 0 else None,
+            "peak_rss_mb": peak_rss_mb(),
+            "peak_traced_mb": self.peak_traced_mb,
+        }
+
+def add_phase_time(result: Dict[str, Any], name: str, wall: float, cpu: float) -> None:
+    """Add a phase measured outside the backtester (e.g. OOS, Monte Carlo) to a result's profile."""
+    profile = result.setdefault("profile", {"phases": {}, "wall_total": 0.0, "cpu_total": 0.0, "bars_processed": 0})
+    entry = profile["phases"].setdefault(name, {"wall": 0.0, "cpu": 0.0, "calls": 0})
+    entry["wall"] += wall
+    entry["cpu"] += cpu
+    entry["calls"] += 1
+    profile["wall_total"] = profile.get("wall_total", 0.0) + wall
+    profile["cpu_total"] = profile.get("cpu_total", 0.0) + cpu
+
+def aggregate_profiles(results: Iterable[Dict[str, Any]], slowest: int = 5) -> Dict[str, Any]:
+    """
+    Combine the profiles of many backtest results (e.g. one generation).
+
+    Args:
+        results: BacktestResults or validation candidates (entries without a profile are skipped)
+        slowest: Number of slowest genomes to list
+
+    Returns:
+        Dictionary with per-phase totals and shares of wall time, overall
+        wall/CPU seconds, bars processed, simulated bars per second, the
+        highest peak memory seen, and the slowest genomes by wall time
+    """
+    phases: Dict[str, Dict[str, float]] = {}
+    timings = []
+    bars = 0
+    peak_rss = None
+    peak_traced = None
+    for result in results:
+        profile = result.get("profile") if result else None
+        if not profile:
+            continue
+        for name, entry in profile.get("phases", {}).items():
+            total = phases.setdefault(name, {"wall": 0.0, "cpu": 0.0, "calls": 0})
+            total["wall"] += entry.get("wall", 0.0)
+            total["cpu"] += entry.get("cpu", 0.0)
+            total["calls"] += entry.get("calls", 0)
+        bars += profile.get("bars_processed", 0) or 0
+        if profile.get("peak_rss_mb") is not None:
+            peak_rss = max(peak_rss or 0.0, profile["peak_rss_mb"])
+        if profile.get("peak_traced_mb") is not None:
+            peak_traced = max(peak_traced or 0.0, profile["peak_traced_mb"])
+        timings.append((profile.get("wall_total", 0.0), result.get("strategy_id", result.get("id"))))
+
+    wall_total = sum(entry["wall"] for entry in phases.values())
+    for entry in phases.values():
+        entry["share"] = entry["wall"] / wall_total if wall_total > 0 else 0.0
+    simulation_wall = phases.get(PHASE_SIMULATION, {}).get("wall", 0.0)
+    timings.sort(key=lambda item: item[0], reverse=True)
+    ordered = [name for name in PHASES if name in phases] + [name for name in phases if name not in PHASES]
+    return {
+        "backtests": len(timings),
+        "phases": {name: phases[name] for name in ordered},
+        "wall_total": wall_total,
+        "cpu_total": sum(entry["cpu"] for entry in phases.values()),
+        "bars_processed": bars,
+        "bars_per_second": bars / simulation_wall if simulation_wall > 0 else None,
+        "peak_rss_mb": peak_rss,
+        "peak_traced_mb": peak_traced,
+        "slowest": [{"strategy_id": strategy_id, "wall_total": wall} for wall, strategy_id in timings[:slowest]],
+    }
+
+def format_profile(profile: Dict[str, Any]) -> str:
+    """One-line summary of an aggregated profile: wall-time share per phase."""
+    phases = ", ".join(
+        f"{name} {entry.get('share', 0.0):.0%}" for name, entry in profile.get("phases", {}).items()
+    )
+    bars_per_second = profile.get("bars_per_second")
+    rate = f", {bars_per_second:,.0f} bars/s simulated" if bars_per_second else ""
+    return f"{profile.get('backtests', 0)} backtests, {profile.get('wall_total', 0.0):.2f}s ({phases}){rate}"
+
+def slowest_strategy_ids(results: Dict[str, Dict[str, Any]], n: int) -> List[str]:
+    """IDs of the n results with the highest profiled wall time."""
+    profiled = [
+        (result["profile"].get("wall_total", 0.0), strategy_id)
+        for strategy_id, result in results.items()
+        if result and result.get("profile")
+    ]
+    profiled.sort(reverse=True)
+    return [strategy_id for _, strategy_id in profiled[:n]]
+
+def capture_cprofile(
+    strategy_ids: List[str],
+    rerun: Callable[[str], Any],
+    output_dir: str,
+    prefix: str = ""
+) -> Dict[str, str]:
+    """
+    Re-run backtests under cProfile and dump their stats.
+
+    Profiling is done on a re-run rather than on every genome so a
+    generation pays the cProfile overhead only for the genomes it dumps.
+
+    Args:
+        strategy_ids: Genomes to profile (see slowest_strategy_ids)
+        rerun: Callable that runs the backtest of one strategy_id
+        output_dir: Directory for the .prof files (created if missing)
+        prefix: File name prefix, e.g. "gen3_"
+
+    Returns:
+        Dictionary mapping strategy_id to the written .prof path
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    paths = {}
+    for strategy_id in strategy_ids:
+        path = os.path.join(output_dir, f"{prefix}{re.sub(r'[^A-Za-z0-9_.-]', '_', strategy_id)}.prof")
+        profiler = cProfile.Profile()
+        try:
+            profiler.runcall(rerun, strategy_id)
+        except Exception as e:
+            logger.error(f"cProfile re-run of {strategy_id} failed: {e}")
+            continue
+        profiler.dump_stats(path)
+        paths[strategy_id] = path
+    if paths:
+        logger.info(f"Wrote cProfile stats of {len(paths)} slowest genomes to {output_dir}")
+    return paths
@@ -0,0 +1,140 @@
+"""
+Early-Abort Pruning Rules for BensBot backtests.
+
+Many offspring of mutation and crossover are obviously bad long before the
+end of the data. Pruning rules let the simulation engine stop following such
+a genome as soon as a rule trips: its run ends at that bar and the backtester
+reports a partial result whose fitness is penalized so that it ranks below
+every complete run.
+"""
+
+import logging
+from dataclasses import dataclass
+from typing import Dict, Any, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Reasons recorded on pruned runs
+PRUNE_MAX_DRAWDOWN = "max_drawdown"
+PRUNE_EQUITY_FLOOR = "equity_floor"
+PRUNE_NO_TRADES = "no_trades"
+
+@dataclass
+class PruningRules:
+    """Conditions under which a backtest is stopped early. Unset rules are not checked."""
+    max_drawdown_pct: Optional[float] = None  # Stop once equity is this many percent below its peak
+    equity_floor_pct: Optional[float] = None  # Stop once equity falls below this percent of initial capital
+    no_trade_bars: Optional[int] = None       # Stop if no trade has been made within the first N bars
+    return_penalty: float = 100.0             # Subtracted from the (non-positive part of the) total return
+    sharpe_penalty: float = 5.0               # Subtracted from the (non-positive part of the) Sharpe ratio
+
+    @property
+    def enabled(self) -> bool:
+        """Whether any rule is set."""
+        return any(rule is not None for rule in (self.max_drawdown_pct, self.equity_floor_pct, self.no_trade_bars))
+
+    @classmethod
+    def from_dict(cls, config: Optional[Dict[str, Any]]) -> Optional["PruningRules"]:
+        """
+        Build rules from a plain dictionary (e.g. a JSON backtest config).
+
+        Args:
+            config: Mapping of PruningRules field names to values, or None
+
+        Returns:
+            PruningRules, or None if config is empty or sets no rule
+        """
+        if not config:
+            return None
+        rules = cls(**{key: value for key, value in config.items() if key in cls.__dataclass_fields__})
+        return rules if rules.enabled else None
+
+def first_rule_violations(
+    equity: np.ndarray,
+    start: int,
+    peak: np.ndarray,
+    initial_capital: float,
+    rules: PruningRules,
+    traded: Optional[np.ndarray] = None
+) -> Tuple[np.ndarray, List[Optional[str]], np.ndarray]:
+    """
+    Find the first bar on which each equity curve breaks a pruning rule.
+
+    Args:
+        equity: (curves x bars) equity segment starting at bar `start`
+        start: Absolute bar index of the segment's first column
+        peak: Highest equity of each curve before the segment
+        initial_capital: Starting capital (reference for the equity floor)
+        rules: Pruning rules to check
+        traded: Whether each curve has made a trade by the end of the segment
+                (required for the no-trade rule)
+
+    Returns:
+        Tuple of (absolute violation bar per curve or -1, reason per curve or None,
+        updated peak per curve)
+    """
+    n_curves, n_bars = equity.shape
+    hit_bars = np.full(n_curves, -1, dtype=np.int64)
+    reasons: List[Optional[str]] = [None] * n_curves
+    if n_bars == 0:
+        return hit_bars, reasons, peak
+
+    running_peak = np.maximum(peak[:, None], np.maximum.accumulate(equity, axis=1))
+    drawdown_hit = np.zeros(equity.shape, dtype=bool)
+    floor_hit = np.zeros(equity.shape, dtype=bool)
+    if rules.max_drawdown_pct is not None:
+        drawdown_hit = equity <= running_peak * (1 - rules.max_drawdown_pct / 100)
+    if rules.equity_floor_pct is not None:
+        floor_hit = equity < initial_capital * rules.equity_floor_pct / 100
+    violated = drawdown_hit | floor_hit
+
+    # No-trade rule: the deadline bar counts as a violation for curves without trades
+    deadline = None if rules.no_trade_bars is None else rules.no_trade_bars - 1
+    no_trade_hit = np.zeros(n_curves, dtype=bool)
+    if deadline is not None and start <= deadline < start + n_bars and traded is not None:
+        no_trade_hit = ~traded
+        violated[:, deadline - start] |= no_trade_hit
+
+    has_hit = violated.any(axis=1)
+    first = np.argmax(violated, axis=1)
+    for row in np.flatnonzero(has_hit).tolist():
+        offset = int(first[row])
+        hit_bars[row] = start + offset
+        if drawdown_hit[row, offset]:
+            reasons[row] = PRUNE_MAX_DRAWDOWN
+        elif floor_hit[row, offset]:
+            reasons[row] = PRUNE_EQUITY_FLOOR
+        else:
+            reasons[row] = PRUNE_NO_TRADES
+    return hit_bars, reasons, running_peak[:, -1]
+
+def penalize_metrics(performance: Dict[str, Any], rules: PruningRules) -> Dict[str, Any]:
+    """
+    Turn the metrics of a pruned (partial) run into a penalized fitness.
+
+    The metrics measured up to the prune bar are kept under 'partial_*' keys;
+    total_return and sharpe_ratio (and a walk-forward robustness_score) are
+    capped at zero and reduced by the configured penalties, so a pruned genome never outranks a complete run
+    that lost less than everything.
+
+    Args:
+        performance: Metrics of the partial run (modified in place)
+        rules: Rules that pruned the run (supply the penalties)
+
+    Returns:
+        The same performance dictionary
+    """
+    total_return = performance.get("total_return") or 0.0
+    sharpe_ratio = performance.get("sharpe_ratio") or 0.0
+    performance["partial_total_return"] = total_return
+    performance["partial_sharpe_ratio"] = sharpe_ratio
+    performance["total_return"] = min(total_return, 0.0) - rules.return_penalty
+    performance["sharpe_ratio"] = min(sharpe_ratio, 0.0) - rules.sharpe_penalty
+    if performance.get("robustness_score") is not None:
+        # Walk-forward folds are not pruned, but the genome must still rank below complete runs
+        performance["partial_robustness_score"] = performance["robustness_score"]
+        performance["robustness_score"] = min(performance["robustness_score"], 0.0) - rules.sharpe_penalty
+    performance["pruned"] = True
+    return performance
@@ -9,15 +9,37 @@ import logging
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
-from typing import Dict, Any, List, Type, Optional, Tuple
+from typing import Dict, Any, List, Type, Optional, Tuple, Iterator
 import os
-import json
 
 from trading_bot.core.backtesting.base_backtester import BaseBacktester, BacktestResult
+from trading_bot.core.backtesting.batch_metrics import annualization_factor
+from trading_bot.core.backtesting.result_store import BacktestResultStore
+from trading_bot.core.data.bar_store import BarStore, interval_to_timedelta
 from trading_bot.core.strategies.base_strategy import BaseStrategy
+from trading_bot.core.strategies.incremental import IncrementalStrategyRunner
 
 logger = logging.getLogger(__name__)
 
+# Provider casing of the OHLCV columns (as returned by HistoricalDataFetcher)
+OHLCV_COLUMNS = ("Open", "High", "Low", "Close", "Volume")
+
+def _normalize_ohlcv_columns(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Rename OHLCV columns of any case ('close', 'CLOSE', ...) to the provider casing.
+    
+    Legacy CSV files and some fetchers use lower-case names, while strategies
+    read bars as bar['Close'].
+    """
+    canonical = {name.lower(): name for name in OHLCV_COLUMNS}
+    renames = {
+        column: canonical[column.lower()]
+        for column in df.columns
+        if isinstance(column, str) and column.lower() in canonical
+        and column != canonical[column.lower()] and canonical[column.lower()] not in df.columns
+    }
+    return df.rename(columns=renames) if renames else df
+
 class RealBacktester(BaseBacktester):
     """
     Real backtester implementation that uses actual historical market data
@@ -30,17 +52,22 @@ class RealBacktester(BaseBacktester):
         results_dir: str = "./data/backtest_results",
         commission_pct: float = 0.001,
         slippage_pct: float = 0.0005,
-        historical_data_fetcher=None  # Optional data fetcher service
+        historical_data_fetcher=None,  # Optional data fetcher service
+        result_store: Optional[BacktestResultStore] = None,
+        bar_store: Optional[BarStore] = None
     ):
         """
         Initialize the real backtester.
         
         Args:
-            data_dir: Directory for historical data
-            results_dir: Directory to store backtest results
+            data_dir: Directory for historical data (default bar store, legacy CSV files)
+            results_dir: Directory of the default result store
             commission_pct: Commission percentage for trades
             slippage_pct: Slippage percentage for trades
             historical_data_fetcher: Service to fetch historical data if not available locally
+            result_store: Store the results are appended to (default: results.db in results_dir)
+            bar_store: Local bar store historical data is read through (default: the data
+                       fetcher's store if it has one, else a BarStore in data_dir)
         """
         self.data_dir = data_dir
         self.results_dir = results_dir
@@ -51,6 +78,9 @@ class RealBacktester(BaseBacktester):
         # Create directories if they don't exist
         os.makedirs(data_dir, exist_ok=True)
         os.makedirs(results_dir, exist_ok=True)
+        
+        self.result_store = result_store or BacktestResultStore(os.path.join(results_dir, "results.db"))
+        self.bar_store = bar_store or getattr(historical_data_fetcher, "bar_store", None) or BarStore(data_dir)
     
     def run_backtest(
         self,
@@ -63,6 +93,7 @@ class RealBacktester(BaseBacktester):
         end_date: str,
         interval: str = "1d",
         initial_capital: float = 100000.0,
+        streaming: Optional[bool] = None,
         **kwargs
     ) -> BacktestResult:
         """
@@ -78,6 +109,10 @@ class RealBacktester(BaseBacktester):
             end_date: End date for backtest (YYYY-MM-DD)
             interval: Candle interval ('1m', '5m', '15m', '1h', '4h', '1d', etc.)
             initial_capital: Initial capital for the backtest
+            streaming: Stream bars through the incremental on_bar protocol instead of
+                       re-evaluating a growing lookback slice on every bar. None (default)
+                       streams only strategies that implement on_bar natively; True also
+                       streams other strategies through IncrementalStrategyAdapter.
             **kwargs: Additional arguments
             
         Returns:
@@ -117,17 +152,20 @@ class RealBacktester(BaseBacktester):
             holdings = 0
             current_position = None
             
+            # Choose how signals are produced: incremental on_bar updates (O(1) per bar
+            # for native strategies) or the legacy growing lookback slice (O(n) per bar)
+            if streaming is None:
+                streaming = isinstance(strategy, BaseStrategy) and strategy.supports_incremental()
+            if streaming:
+                signal_stream = IncrementalStrategyRunner(strategy).stream(historical_data, warmup_bars=1)
+            else:
+                signal_stream = self._lookback_signals(strategy, historical_data)
+            
             # Main backtest loop
-            for i in range(1, len(historical_data)):
-                current_bar = historical_data.iloc[i]
-                lookback_data = historical_data.iloc[:i+1]
-                
-                # Get the strategy's signal
-                signal = strategy.generate_signal(lookback_data)
-                
+            for i, current_bar, signal in signal_stream:
                 # Process the signal
                 if signal is not None:
-                    price = current_bar['close']
+                    price = current_bar['Close']
                     timestamp = current_bar.name
                     
                     # Close any existing position if signal is opposite
@@ -192,7 +230,7 @@ class RealBacktester(BaseBacktester):
                 # Update equity curve
                 portfolio_value = cash
                 if current_position is not None:
-                    portfolio_value += holdings * current_bar['close']
+                    portfolio_value += holdings * current_bar['Close']
                 
                 equity_curve.append(portfolio_value)
             
@@ -201,13 +239,8 @@ class RealBacktester(BaseBacktester):
                 equity_curve=equity_curve,
                 trades=trades,
                 start_date=start_date,
-                end_date=end_date
-            )
-            
-            # Store results
-            result_file = os.path.join(
-                self.results_dir,
-                f"backtest_{strategy_id}_{symbol}_{start_date}_{end_date}.json"
+                end_date=end_date,
+                periods_per_year=annualization_factor(interval, asset_class)
             )
             
             backtest_result = {
@@ -221,6 +254,7 @@ class RealBacktester(BaseBacktester):
                 "end_date": end_date,
                 "interval": interval,
                 "initial_capital": initial_capital,
+                "streaming": bool(streaming),
                 "performance": performance,
                 "runtime_seconds": 0  # Will be filled below
             }
@@ -229,9 +263,8 @@ class RealBacktester(BaseBacktester):
             max_trades = min(100, len(trades))
             backtest_result["trades_summary"] = trades[:max_trades]
             
-            # Save to file
-            with open(result_file, 'w') as f:
-                json.dump(backtest_result, f, indent=2)
+            # Append to the indexed result store
+            self.result_store.append(backtest_result, source="real_backtester")
             
             return backtest_result
             
@@ -243,6 +276,25 @@ class RealBacktester(BaseBacktester):
                 "strategy_id": strategy_id
             }
     
+    def _lookback_signals(
+        self,
+        strategy: BaseStrategy,
+        historical_data: pd.DataFrame
+    ) -> Iterator[Tuple[int, pd.Series, Optional[Dict[str, Any]]]]:
+        """
+        Legacy signal source: evaluate the strategy on all bars up to the current one.
+        
+        Args:
+            strategy: Strategy implementing generate_signal(lookback_data)
+            historical_data: Historical data for the backtest
+            
+        Yields:
+            Tuples of (bar position, bar, signal)
+        """
+        for i in range(1, len(historical_data)):
+            lookback_data = historical_data.iloc[:i+1]
+            yield i, historical_data.iloc[i], strategy.generate_signal(lookback_data)
+    
     def _load_historical_data(
         self,
         asset_class: str,
@@ -254,66 +306,82 @@ class RealBacktester(BaseBacktester):
         """
         Load historical market data for the specified asset and time period.
         
+        Bars are read through the bar store, which fetches only the parts of
+        the range it has not stored yet from the data fetcher. A legacy
+        {asset_class}_{symbol}_{interval}.csv file in data_dir is imported
+        into the store once.
+        
         Args:
             asset_class: Asset class (equity, crypto, forex)
             symbol: Trading symbol
             start_date: Start date
-            end_date: End date
+            end_date: End date (exclusive)
             interval: Candle interval
             
         Returns:
-            DataFrame with historical data or None if unavailable
+            DataFrame with historical data (OHLCV columns named Open, High,
+            Low, Close, Volume) or None if unavailable
         """
-        # Generate path for cached data
-        data_file = os.path.join(
-            self.data_dir,
-            f"{asset_class}_{symbol}_{interval}.csv"
-        )
-        
-        # Check if we have the data locally
-        if os.path.exists(data_file):
-            logger.debug(f"Loading historical data from {data_file}")
-            df = pd.read_csv(data_file)
-            df['timestamp'] = pd.to_datetime(df['timestamp'])
-            df.set_index('timestamp', inplace=True)
-            
-            # Filter for the requested date range
-            start = pd.to_datetime(start_date)
-            end = pd.to_datetime(end_date)
-            df = df[(df.index >= start) & (df.index <= end)]
-            
-            if len(df) > 0:
-                return df
-        
-        # If we don't have the data locally or it doesn't cover the requested range,
-        # try to fetch it if a data fetcher is available
-        if self.data_fetcher is not None:
-            logger.info(f"Fetching historical data for {symbol} from {start_date} to {end_date}")
+        if self.data_fetcher is not None and getattr(self.data_fetcher, "bar_store", None) is self.bar_store:
+            # The fetcher already reads through this store
+            df = self.data_fetcher.fetch(symbol, asset_class, start_date, end_date, interval)
+        else:
+            self._import_legacy_csv(asset_class, symbol, interval)
+            fetch = None
+            if self.data_fetcher is not None:
+                def fetch(segment_start: str, segment_end: str) -> Optional[pd.DataFrame]:
+                    logger.info(f"Fetching historical data for {symbol} from {segment_start} to {segment_end}")
+                    if hasattr(self.data_fetcher, "fetch"):
+                        return self.data_fetcher.fetch(symbol, asset_class, segment_start, segment_end, interval)
+                    return self.data_fetcher.fetch_historical_data(
+                        asset_class=asset_class,
+                        symbol=symbol,
+                        start_date=segment_start,
+                        end_date=segment_end,
+                        interval=interval
+                    )
             try:
-                df = self.data_fetcher.fetch_historical_data(
-                    asset_class=asset_class,
-                    symbol=symbol,
-                    start_date=start_date,
-                    end_date=end_date,
-                    interval=interval
-                )
-                
-                if df is not None and len(df) > 0:
-                    # Save the data for future use
-                    df.to_csv(data_file)
-                    return df
+                df = self.bar_store.load(symbol, asset_class, interval, start_date, end_date, fetch=fetch)
             except Exception as e:
                 logger.error(f"Error fetching historical data: {e}")
+                df = None
         
+        if df is not None and len(df) > 0:
+            return _normalize_ohlcv_columns(df)
         logger.warning(f"No historical data available for {symbol} from {start_date} to {end_date}")
         return None
     
+    def _import_legacy_csv(self, asset_class: str, symbol: str, interval: str) -> None:
+        """
+        Import a CSV file written by earlier versions into the bar store,
+        unless the store already holds bars of the series.
+        """
+        data_file = os.path.join(self.data_dir, f"{asset_class}_{symbol}_{interval}.csv")
+        if not os.path.exists(data_file) or self.bar_store.last_bar(symbol, asset_class, interval) is not None:
+            return
+        try:
+            df = pd.read_csv(data_file)
+            timestamp_column = next(
+                (column for column in ("timestamp", "Timestamp", "Date", "date") if column in df.columns),
+                df.columns[0]
+            )
+            df[timestamp_column] = pd.to_datetime(df[timestamp_column])
+            df = df.set_index(timestamp_column)
+            if df.empty:
+                return
+            covered = (df.index.min(), df.index.max() + interval_to_timedelta(interval))
+            self.bar_store.write(symbol, asset_class, interval, df, covered=covered)
+            logger.info(f"Imported {len(df)} bars from {data_file} into the bar store")
+        except Exception as e:
+            logger.error(f"Could not import legacy data file {data_file}: {e}")
+    
     def _calculate_performance_metrics(
         self,
         equity_curve: List[float],
         trades: List[Dict[str, Any]],
         start_date: str,
-        end_date: str
+        end_date: str,
+        periods_per_year: float = 252.0
     ) -> Dict[str, Any]:
         """
         Calculate performance metrics from backtest results.
@@ -323,6 +391,7 @@ class RealBacktester(BaseBacktester):
             trades: List of executed trades
             start_date: Start date of backtest
             end_date: End date of backtest
+            periods_per_year: Bars per year for annualizing Sharpe and Sortino ratios
             
         Returns:
             Dictionary of performance metrics
@@ -347,7 +416,7 @@ class RealBacktester(BaseBacktester):
                 "win_rate": 0,
                 "average_return": 0,
                 "max_drawdown": self._calculate_max_drawdown(equity) * 100,  # In percent
-                "sharpe_ratio": self._calculate_sharpe_ratio(returns) if len(returns) > 0 else 0,
+                "sharpe_ratio": self._calculate_sharpe_ratio(returns, periods_per_year=periods_per_year) if len(returns) > 0 else 0,
                 "equity_curve": equity_curve[::max(1, len(equity_curve) // 100)]  # Sample to reduce size
             }
         
@@ -358,7 +427,10 @@ class RealBacktester(BaseBacktester):
         win_rate = len(winning_trades) / len(trades) if trades else 0
         average_win = np.mean([t['pnl'] for t in winning_trades]) if winning_trades else 0
         average_loss = np.mean([t['pnl'] for t in losing_trades]) if losing_trades else 0
-        profit_factor = abs(sum(t['pnl'] for t in winning_trades) / sum(t['pnl'] for t in losing_trades)) if losing_trades and sum(t['pnl'] for t in losing_trades) != 0 else 0
+        gross_profit = sum(t['pnl'] for t in winning_trades)
+        gross_loss = sum(t['pnl'] for t in losing_trades)
+        # Same convention as compute_batch_metrics: winners without losses give inf
+        profit_factor = abs(gross_profit / gross_loss) if gross_loss != 0 else (float('inf') if gross_profit > 0 else 0)
         
         # Calculate time-based metrics
         start = pd.to_datetime(start_date)
@@ -378,8 +450,8 @@ class RealBacktester(BaseBacktester):
             "average_loss": average_loss,
             "profit_factor": profit_factor,
             "max_drawdown": self._calculate_max_drawdown(equity) * 100,  # In percent
-            "sharpe_ratio": self._calculate_sharpe_ratio(returns) if len(returns) > 0 else 0,
-            "sortino_ratio": self._calculate_sortino_ratio(returns) if len(returns) > 0 else 0,
+            "sharpe_ratio": self._calculate_sharpe_ratio(returns, periods_per_year=periods_per_year) if len(returns) > 0 else 0,
+            "sortino_ratio": self._calculate_sortino_ratio(returns, periods_per_year=periods_per_year) if len(returns) > 0 else 0,
             "equity_curve": equity_curve[::max(1, len(equity_curve) // 100)]  # Sample to reduce size
         }
     
@@ -402,41 +474,43 @@ class RealBacktester(BaseBacktester):
         # Return maximum drawdown
         return abs(drawdown.min()) if len(drawdown) > 0 else 0
     
-    def _calculate_sharpe_ratio(self, returns: np.ndarray, risk_free_rate: float = 0.02) -> float:
+    def _calculate_sharpe_ratio(self, returns: np.ndarray, risk_free_rate: float = 0.02, periods_per_year: float = 252.0) -> float:
         """
         Calculate the Sharpe ratio.
         
         Args:
             returns: Array of period returns
             risk_free_rate: Annualized risk-free rate
+            periods_per_year: Number of return periods per year
             
         Returns:
             Sharpe ratio
         """
-        # Convert risk-free rate to per-period rate (assuming daily returns)
-        period_risk_free = (1 + risk_free_rate) ** (1/252) - 1
+        # Convert risk-free rate to per-period rate
+        period_risk_free = (1 + risk_free_rate) ** (1/periods_per_year) - 1
         
         # Calculate excess returns
         excess_returns = returns - period_risk_free
         
         # Calculate Sharpe ratio
-        sharpe = np.mean(excess_returns) / (np.std(excess_returns) + 1e-10) * np.sqrt(252)
+        sharpe = np.mean(excess_returns) / (np.std(excess_returns) + 1e-10) * np.sqrt(periods_per_year)
         
         return sharpe
     
-    def _calculate_sortino_ratio(self, returns: np.ndarray, risk_free_rate: float = 0.02) -> float:
+    def _calculate_sortino_ratio(self, returns: np.ndarray, risk_free_rate: float = 0.02, periods_per_year: float = 252.0) -> float:
         """
         Calculate the Sortino ratio, which only considers downside deviation.
         
         Args:
             returns: Array of period returns
             risk_free_rate: Annualized risk-free rate
+            periods_per_year: Number of return periods per year
             
         Returns:
             Sortino ratio
         """
-        # Convert risk-free rate to per-period rate (assuming daily returns)
-        period_risk_free = (1 + risk_free_rate) ** (1/252) - 1
+        # Convert risk-free rate to per-period rate
+        period_risk_free = (1 + risk_free_rate) ** (1/periods_per_year) - 1
         
         # Calculate excess returns
         excess_returns = returns - period_risk_free
@@ -446,6 +520,6 @@ class RealBacktester(BaseBacktester):
         downside_deviation = np.std(downside_returns) if len(downside_returns) > 0 else 1e-10
         
         # Calculate Sortino ratio
-        sortino = np.mean(excess_returns) / (downside_deviation + 1e-10) * np.sqrt(252)
+        sortino = np.mean(excess_returns) / (downside_deviation + 1e-10) * np.sqrt(periods_per_year)
         
         return sortino 
\ No newline at end of file
@@ -0,0 +1,282 @@
+"""
+Content-addressed Backtest Result Cache for BensBot.
+
+Backtest results are stored on disk under a key that hashes everything the
+result depends on: strategy type, canonicalized parameters, a fingerprint of
+the market data (symbol, interval, range and a content hash) and the
+backtest configuration (capital, commission, slippage, ...). Re-evaluating an
+elite or a cloned genome on unchanged data then becomes a file read, across
+generations as well as across separate runs.
+
+Entries are JSON files; the cache is bounded in total size and evicts the
+least recently used entries first.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import numpy as np
+import pandas as pd
+from typing import Dict, Any, Optional, Tuple
+
+from trading_bot.core.backtesting.base_backtester import BacktestResult
+
+logger = logging.getLogger(__name__)
+
+# Bump when simulation or metric semantics change so stale results are not reused
+CACHE_VERSION = 5
+
+def _to_jsonable(value: Any) -> Any:
+    """Convert NumPy/pandas scalars and containers into plain JSON types."""
+    if isinstance(value, dict):
+        return {str(key): _to_jsonable(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_to_jsonable(item) for item in value]
+    if isinstance(value, np.ndarray):
+        return [_to_jsonable(item) for item in value.tolist()]
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, (pd.Timestamp, pd.Timedelta)):
+        return str(value)
+    return value
+
+def canonical_json(value: Any) -> str:
+    """
+    Serialize a value deterministically (sorted keys, plain types).
+
+    Args:
+        value: Parameters, configuration or any JSON-like structure
+
+    Returns:
+        Canonical JSON string
+    """
+    return json.dumps(_to_jsonable(value), sort_keys=True, separators=(",", ":"), default=str)
+
+def compute_data_fingerprint(
+    data: pd.DataFrame,
+    symbol: str,
+    interval: str,
+    start_date: Any = None,
+    end_date: Any = None
+) -> Dict[str, Any]:
+    """
+    Fingerprint a market data set by its identity and content.
+
+    Args:
+        data: OHLCV DataFrame the backtest runs on
+        symbol: Trading symbol
+        interval: Data interval
+        start_date: Requested start of the range
+        end_date: Requested end of the range
+
+    Returns:
+        Dictionary with symbol, interval, requested and actual range, row count and content hash
+    """
+    if data is None or data.empty:
+        content_hash, first, last = None, None, None
+    else:
+        row_hashes = pd.util.hash_pandas_object(data, index=True).to_numpy()
+        digest = hashlib.sha256(row_hashes.tobytes())
+        digest.update(canonical_json([str(column) for column in data.columns]).encode())
+        content_hash = digest.hexdigest()
+        first, last = str(data.index[0]), str(data.index[-1])
+    return {
+        "symbol": symbol,
+        "interval": interval,
+        "start_date": str(start_date) if start_date is not None else None,
+        "end_date": str(end_date) if end_date is not None else None,
+        "first_bar": first,
+        "last_bar": last,
+        "rows": 0 if data is None else len(data),
+        "content_hash": content_hash
+    }
+
+def make_cache_key(
+    strategy_type: str,
+    parameters: Dict[str, Any],
+    data_fingerprint: Dict[str, Any],
+    backtest_config: Dict[str, Any]
+) -> str:
+    """
+    Build the content address of a backtest.
+
+    Args:
+        strategy_type: Registered strategy type
+        parameters: Strategy parameters
+        data_fingerprint: Output of compute_data_fingerprint
+        backtest_config: Backtest configuration (capital, commission, slippage, ...)
+
+    Returns:
+        Hex SHA-256 key
+    """
+    payload = canonical_json({
+        "version": CACHE_VERSION,
+        "strategy_type": strategy_type,
+        "parameters": parameters,
+        "data": data_fingerprint,
+        "config": backtest_config
+    })
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+class BacktestResultCache:
+    """
+    Size-bounded on-disk LRU cache of backtest results.
+
+    Each entry is a JSON file named after its key, sharded by the first two
+    hex characters. Reads refresh the file's modification time, which is the
+    recency used for eviction. Writes are atomic, so several processes may
+    share a cache directory.
+    """
+
+    def __init__(self, cache_dir: str, max_size_mb: float = 512.0):
+        """
+        Args:
+            cache_dir: Directory holding the cache entries
+            max_size_mb: Maximum total size of the entries in megabytes
+        """
+        self.cache_dir = cache_dir
+        self.max_size_bytes = int(max_size_mb * 1024 * 1024)
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+
+        os.makedirs(cache_dir, exist_ok=True)
+        self._size_bytes, self._entries = self._scan()
+        logger.info(f"Backtest result cache at {cache_dir}: {self._entries} entries, "
+                    f"{self._size_bytes / 1e6:.1f} MB")
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key[:2], f"{key}.json")
+
+    def _scan(self) -> Tuple[int, int]:
+        """Return (total size in bytes, entry count) of the store."""
+        size, count = 0, 0
+        for root, _, files in os.walk(self.cache_dir):
+            for name in files:
+                if name.endswith(".json"):
+                    try:
+                        size += os.path.getsize(os.path.join(root, name))
+                        count += 1
+                    except OSError:
+                        continue
+        return size, count
+
+    def get(self, key: str) -> Optional[BacktestResult]:
+        """
+        Look up a cached result.
+
+        Args:
+            key: Cache key from make_cache_key
+
+        Returns:
+            Cached BacktestResult, or None on a miss
+        """
+        path = self._path(key)
+        try:
+            with open(path, "r") as f:
+                entry = json.load(f)
+            os.utime(path, None)
+        except (OSError, ValueError):
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+        return BacktestResult(entry["result"])
+
+    def put(self, key: str, result: BacktestResult) -> None:
+        """
+        Store a result and evict old entries if the cache grew past its bound.
+
+        Args:
+            key: Cache key from make_cache_key
+            result: BacktestResult to store
+        """
+        path = self._path(key)
+        payload = json.dumps({"key": key, "result": _to_jsonable(dict(result))}, default=str)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            existed = os.path.exists(path)
+            old_size = os.path.getsize(path) if existed else 0
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+            with os.fdopen(fd, "w") as f:
+                f.write(payload)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Could not write backtest cache entry {key[:12]}: {e}")
+            return
+
+        with self._lock:
+            self.writes += 1
+            self._size_bytes += len(payload) - old_size
+            self._entries += 0 if existed else 1
+        if self._size_bytes > self.max_size_bytes:
+            self._evict()
+
+    def _evict(self) -> None:
+        """Delete least recently used entries until the cache is below 90% of its bound."""
+        entries = []
+        for root, _, files in os.walk(self.cache_dir):
+            for name in files:
+                if name.endswith(".json"):
+                    path = os.path.join(root, name)
+                    try:
+                        stat = os.stat(path)
+                    except OSError:
+                        continue
+                    entries.append((stat.st_mtime, stat.st_size, path))
+        entries.sort()
+
+        size = sum(entry[1] for entry in entries)
+        target = int(self.max_size_bytes * 0.9)
+        removed = 0
+        for _, entry_size, path in entries:
+            if size <= target:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            size -= entry_size
+            removed += 1
+
+        with self._lock:
+            self._size_bytes = size
+            self._entries = len(entries) - removed
+            self.evictions += removed
+        logger.info(f"Evicted {removed} backtest cache entries ({size / 1e6:.1f} MB remaining)")
+
+    def clear(self) -> None:
+        """Remove every entry from the cache."""
+        for root, _, files in os.walk(self.cache_dir):
+            for name in files:
+                if name.endswith(".json"):
+                    try:
+                        os.remove(os.path.join(root, name))
+                    except OSError:
+                        continue
+        with self._lock:
+            self._size_bytes, self._entries = 0, 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Return hit/miss counters and store size.
+
+        Returns:
+            Dictionary with hits, misses, hit_rate, writes, evictions, entries and size_mb
+        """
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "writes": self.writes,
+            "evictions": self.evictions,
+            "entries": self._entries,
+            "size_mb": self._size_bytes / (1024 * 1024)
+        }
@@ -0,0 +1,533 @@
+"""
+Indexed Backtest Result Store for BensBot.
+
+An append-only SQLite database of backtest results. Each result becomes one
+row of the 'results' table. The row holds its identity columns (strategy
+type, symbol, asset class, date range, interval, generation, run) and one
+REAL column per performance metric. Both kinds of column can be filtered and
+ranked in SQL without decoding anything. The complete result is kept
+alongside as zlib-compressed JSON. Indexes cover strategy type, symbol, date
+range, generation, run and asset class / insertion time, so queries like
+"top 50 by Sharpe for crypto in the last week" read only the rows they return.
+
+Runs that group many results (e.g. a parameter grid) can record their own
+metadata in the 'runs' table. migrate_json_results imports
+the per-run JSON files written by earlier versions of RealBacktester and
+BacktestGrid.
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+import zlib
+from datetime import datetime, timedelta
+from typing import Dict, Any, List, Optional, Iterable, Sequence, Union
+
+import pandas as pd
+
+from trading_bot.core.backtesting.batch_metrics import METRIC_KEYS, OOS_METRIC_KEYS
+from trading_bot.core.backtesting.result_cache import _to_jsonable
+
+logger = logging.getLogger(__name__)
+
+SCHEMA_VERSION = 1
+
+# Performance metrics stored as their own columns (everything else stays in the payload)
+METRIC_COLUMNS = METRIC_KEYS + OOS_METRIC_KEYS + ("robustness_score", "wf_positive_fold_ratio", "wf_efficiency")
+
+# Non-metric columns results can be ordered by
+ORDER_COLUMNS = ("created_at", "start_date", "end_date", "generation", "strategy_id", "symbol", "id")
+
+# Result fields not kept in the stored payload unless asked for (they dominate its size)
+BULKY_FIELDS = ("equity_curve",)
+
+_SOURCE_REAL_BACKTESTER = "real_backtester"
+_SOURCE_GRID = "grid"
+
+TimeBound = Union[str, datetime, timedelta, None]
+
+def _normalize_date(value: Any) -> Optional[str]:
+    """ISO form of a date so string comparison orders dates correctly."""
+    if value is None or value == "":
+        return None
+    try:
+        return pd.Timestamp(value).isoformat()
+    except (ValueError, TypeError):
+        return str(value)
+
+def _time_bound(value: TimeBound) -> Optional[str]:
+    """ISO timestamp of a since/until bound; a timedelta counts back from now (UTC)."""
+    if value is None:
+        return None
+    if isinstance(value, timedelta):
+        return (datetime.utcnow() - value).isoformat()
+    return _normalize_date(value)
+
+def _as_float(value: Any) -> Optional[float]:
+    """Metric value as a float column entry (None for missing or non-numeric values)."""
+    if value is None or isinstance(value, bool):
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+class BacktestResultStore:
+    """
+    Append-only, indexed store of backtest results in one SQLite file.
+
+    The database runs in WAL mode, so several processes can append while
+    others query. Within a process one connection is shared behind a lock.
+    Rows are never updated. Only the run metadata in the 'runs' table is
+    replaced when a run is recorded again.
+    """
+
+    def __init__(self, db_path: str, compression_level: int = 6, keep_bulky_fields: bool = False):
+        """
+        Args:
+            db_path: Path of the SQLite database (created if missing)
+            compression_level: zlib level of the stored result payloads (1 fastest - 9 smallest)
+            keep_bulky_fields: Also store per-bar fields such as 'equity_curve' in the payload
+        """
+        self.db_path = db_path
+        self.compression_level = compression_level
+        self.keep_bulky_fields = keep_bulky_fields
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(os.path.abspath(db_path))
+        os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(db_path, timeout=30.0, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._create_schema()
+
+    def _create_schema(self) -> None:
+        metric_columns = ", ".join(f"{name} REAL" for name in METRIC_COLUMNS)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(f"""
+                CREATE TABLE IF NOT EXISTS results (
+                    id INTEGER PRIMARY KEY,
+                    created_at TEXT NOT NULL,
+                    source TEXT,
+                    run_id TEXT,
+                    generation INTEGER,
+                    strategy_id TEXT,
+                    strategy_type TEXT,
+                    asset_class TEXT,
+                    symbol TEXT,
+                    interval TEXT,
+                    start_date TEXT,
+                    end_date TEXT,
+                    status TEXT,
+                    {metric_columns},
+                    payload BLOB
+                )
+            """)
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS runs (
+                    run_id TEXT PRIMARY KEY,
+                    kind TEXT,
+                    created_at TEXT NOT NULL,
+                    metadata BLOB
+                )
+            """)
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS imported_files (
+                    path TEXT PRIMARY KEY,
+                    rows INTEGER,
+                    imported_at TEXT NOT NULL
+                )
+            """)
+            for name, columns in (
+                ("strategy_type", "strategy_type"),
+                ("symbol", "symbol"),
+                ("date_range", "start_date, end_date"),
+                ("generation", "generation"),
+                ("run", "run_id"),
+                ("asset_class_created", "asset_class, created_at"),
+                ("created", "created_at"),
+            ):
+                self._conn.execute(f"CREATE INDEX IF NOT EXISTS idx_results_{name} ON results ({columns})")
+            self._conn.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+
+    def _compress(self, value: Any) -> bytes:
+        payload = json.dumps(_to_jsonable(value), separators=(",", ":"), default=str)
+        return zlib.compress(payload.encode("utf-8"), self.compression_level)
+
+    @staticmethod
+    def _decompress(blob: Optional[bytes]) -> Any:
+        if blob is None:
+            return None
+        return json.loads(zlib.decompress(blob).decode("utf-8"))
+
+    def _row(self, result: Dict[str, Any], context: Dict[str, Any], created_at: str) -> tuple:
+        """Column values of one result; result fields win over the shared context."""
+        def field(name: str) -> Any:
+            value = result.get(name)
+            return context.get(name) if value is None else value
+
+        performance = result.get("performance") or {}
+        payload = dict(result) if self.keep_bulky_fields else {
+            key: value for key, value in result.items() if key not in BULKY_FIELDS
+        }
+        generation = field("generation")
+        return (
+            created_at,
+            field("source"),
+            field("run_id"),
+            int(generation) if generation is not None else None,
+            field("strategy_id"),
+            field("strategy_type"),
+            field("asset_class"),
+            field("symbol"),
+            field("interval"),
+            _normalize_date(field("start_date")),
+            _normalize_date(field("end_date")),
+            result.get("status"),
+            *(_as_float(performance.get(name)) for name in METRIC_COLUMNS),
+            self._compress(payload),
+        )
+
+    def append_many(self, results: Iterable[Dict[str, Any]], **context: Any) -> int:
+        """
+        Append results in one transaction.
+
+        Args:
+            results: BacktestResult-like dicts. Their 'symbol', 'asset_class',
+                'start_date', ... fields fill the indexed columns.
+            **context: Defaults for columns the results do not carry themselves:
+                source, run_id, generation, strategy_type, asset_class, symbol,
+                interval, start_date, end_date
+
+        Returns:
+            Number of rows appended
+        """
+        created_at = _normalize_date(context.pop("created_at", None)) or datetime.utcnow().isoformat()
+        rows = [self._row(result, context, created_at) for result in results if result]
+        if not rows:
+            return 0
+        placeholders = ", ".join("?" for _ in range(len(rows[0])))
+        columns = ("created_at, source, run_id, generation, strategy_id, strategy_type, asset_class, symbol, "
+                   f"interval, start_date, end_date, status, {', '.join(METRIC_COLUMNS)}, payload")
+        with self._lock, self._conn:
+            self._conn.executemany(f"INSERT INTO results ({columns}) VALUES ({placeholders})", rows)
+        return len(rows)
+
+    def append(self, result: Dict[str, Any], **context: Any) -> None:
+        """Append a single result (see append_many for the context keys)."""
+        self.append_many([result], **context)
+
+    def record_run(self, run_id: str, kind: str, metadata: Optional[Dict[str, Any]] = None) -> None:
+        """
+        Record (or replace) the metadata of a run that groups results, e.g. a parameter grid.
+
+        Args:
+            run_id: Run identifier, also passed as run_id when appending its results
+            kind: Run kind, e.g. "grid" or "evolution"
+            metadata: JSON-like description of the run
+        """
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO runs (run_id, kind, created_at, metadata) VALUES (?, ?, ?, ?)",
+                (run_id, kind, datetime.utcnow().isoformat(), self._compress(metadata or {}))
+            )
+
+    def get_run(self, run_id: str) -> Optional[Dict[str, Any]]:
+        """Metadata of a recorded run, or None if unknown."""
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM runs WHERE run_id = ?", (run_id,)).fetchone()
+        if row is None:
+            return None
+        return {"run_id": row["run_id"], "kind": row["kind"], "created_at": row["created_at"],
+                "metadata": self._decompress(row["metadata"])}
+
+    def list_runs(self, kind: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Recorded runs (optionally of one kind), newest first."""
+        sql, params = "SELECT * FROM runs", []
+        if kind is not None:
+            sql, params = sql + " WHERE kind = ?", [kind]
+        with self._lock:
+            rows = self._conn.execute(sql + " ORDER BY created_at DESC", params).fetchall()
+        return [{"run_id": row["run_id"], "kind": row["kind"], "created_at": row["created_at"],
+                 "metadata": self._decompress(row["metadata"])} for row in rows]
+
+    def _where(
+        self,
+        strategy_type: Union[str, Sequence[str], None] = None,
+        symbol: Union[str, Sequence[str], None] = None,
+        asset_class: Optional[str] = None,
+        generation: Optional[int] = None,
+        run_id: Optional[str] = None,
+        strategy_id: Optional[str] = None,
+        status: Union[str, Sequence[str], None] = "success",
+        start_date: Any = None,
+        end_date: Any = None,
+        since: TimeBound = None,
+        until: TimeBound = None,
+        **metric_bounds: float
+    ) -> tuple:
+        clauses, params = [], []
+
+        def match(column: str, value: Any) -> None:
+            if value is None:
+                return
+            if isinstance(value, (list, tuple, set)):
+                values = list(value)
+                clauses.append(f"{column} IN ({', '.join('?' for _ in values)})")
+                params.extend(values)
+            else:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+
+        match("strategy_type", strategy_type)
+        match("symbol", symbol)
+        match("asset_class", asset_class)
+        match("generation", generation)
+        match("run_id", run_id)
+        match("strategy_id", strategy_id)
+        match("status", status)
+        for column, op, value in (
+            ("start_date", ">=", _normalize_date(start_date)),
+            ("end_date", "<=", _normalize_date(end_date)),
+            ("created_at", ">=", _time_bound(since)),
+            ("created_at", "<=", _time_bound(until)),
+        ):
+            if value is not None:
+                clauses.append(f"{column} {op} ?")
+                params.append(value)
+        for key, value in metric_bounds.items():
+            # min_<metric>=x / max_<metric>=x
+            bound, _, metric = key.partition("_")
+            if bound not in ("min", "max") or metric not in METRIC_COLUMNS:
+                raise ValueError(f"Unknown result filter '{key}'")
+            clauses.append(f"{metric} {'>=' if bound == 'min' else '<='} ?")
+            params.append(float(value))
+        return (" WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+    def query(
+        self,
+        order_by: Optional[str] = None,
+        ascending: bool = False,
+        limit: Optional[int] = None,
+        include_result: bool = False,
+        **filters: Any
+    ) -> List[Dict[str, Any]]:
+        """
+        Select stored results.
+
+        Args:
+            order_by: Metric column (see METRIC_COLUMNS) or one of ORDER_COLUMNS; results
+                without a value for the metric sort last
+            ascending: Sort order
+            limit: Maximum number of rows
+            include_result: Decode the full stored result into each row's 'result'
+            **filters: strategy_type, symbol (a value or a list of values), asset_class,
+                generation, run_id, strategy_id, status (default "success", None for
+                any), start_date / end_date (backtest window lies within them),
+                since / until (insertion time, a datetime, ISO string or a timedelta
+                back from now), and min_<metric> / max_<metric> bounds
+
+        Returns:
+            List of row dictionaries with the identity and metric columns
+
+        Raises:
+            ValueError: On an unknown order_by column or filter
+        """
+        where, params = self._where(**filters)
+        sql = "SELECT *" if include_result else f"SELECT {', '.join(self._summary_columns())}"
+        sql += f" FROM results{where}"
+        if order_by is not None:
+            if order_by not in METRIC_COLUMNS and order_by not in ORDER_COLUMNS:
+                raise ValueError(f"Cannot order results by '{order_by}'")
+            sql += f" ORDER BY {order_by} IS NULL, {order_by} {'ASC' if ascending else 'DESC'}, id"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(int(limit))
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+
+        records = []
+        for row in rows:
+            record = {key: row[key] for key in row.keys() if key != "payload"}
+            if include_result:
+                record["result"] = self._decompress(row["payload"])
+            records.append(record)
+        return records
+
+    @staticmethod
+    def _summary_columns() -> List[str]:
+        return ["id", "created_at", "source", "run_id", "generation", "strategy_id", "strategy_type",
+                "asset_class", "symbol", "interval", "start_date", "end_date", "status", *METRIC_COLUMNS]
+
+    def top(self, metric: str = "sharpe_ratio", n: int = 50, ascending: bool = False, **filters: Any) -> List[Dict[str, Any]]:
+        """
+        Best n results by a metric, e.g. top("sharpe_ratio", 50, asset_class="crypto", since=timedelta(days=7)).
+
+        Args:
+            metric: Metric column to rank by
+            n: Number of results
+            ascending: Rank lowest first (e.g. for max_drawdown)
+            **filters: As for query
+
+        Returns:
+            List of row dictionaries, best first
+        """
+        if metric not in METRIC_COLUMNS:
+            raise ValueError(f"Unknown metric '{metric}'")
+        return self.query(order_by=metric, ascending=ascending, limit=n, **filters)
+
+    def count(self, **filters: Any) -> int:
+        """Number of stored results matching the filters (as for query)."""
+        where, params = self._where(**filters)
+        with self._lock:
+            return self._conn.execute(f"SELECT COUNT(*) FROM results{where}", params).fetchone()[0]
+
+    def get_result(self, row_id: int) -> Optional[Dict[str, Any]]:
+        """Full stored result of one row (by its 'id'), or None."""
+        with self._lock:
+            row = self._conn.execute("SELECT payload FROM results WHERE id = ?", (row_id,)).fetchone()
+        return self._decompress(row["payload"]) if row is not None else None
+
+    def is_imported(self, path: str) -> bool:
+        """Whether a legacy JSON file was already migrated into the store."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT 1 FROM imported_files WHERE path = ?", (os.path.abspath(path),)
+            ).fetchone()
+        return row is not None
+
+    def mark_imported(self, path: str, rows: int) -> None:
+        """Remember a migrated legacy JSON file."""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO imported_files (path, rows, imported_at) VALUES (?, ?, ?)",
+                (os.path.abspath(path), rows, datetime.utcnow().isoformat())
+            )
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Return store size and contents.
+
+        Returns:
+            Dictionary with results, runs, imported_files and size_mb
+        """
+        with self._lock:
+            counts = {
+                table: self._conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+                for table in ("results", "runs", "imported_files")
+            }
+        size = sum(
+            os.path.getsize(path) for path in (self.db_path, self.db_path + "-wal") if os.path.exists(path)
+        )
+        return {**counts, "size_mb": size / (1024 * 1024)}
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+
+def grid_cell_rows(results_grid: Dict[str, Any], parameters: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+    """
+    Flatten a BacktestGrid results document into one result per grid cell.
+
+    Args:
+        results_grid: Document as built by BacktestGrid.run_grid_backtest
+        parameters: Fixed parameters shared by all cells
+
+    Returns:
+        List of BacktestResult-like dicts tagged with their 'grid_cell' [row, column]
+    """
+    param1, param2 = results_grid["param1"], results_grid["param2"]
+    rows = []
+    for i, row_data in enumerate(results_grid.get("grid_data", [])):
+        for j, cell in enumerate(row_data):
+            cell_parameters = dict(parameters or {})
+            cell_parameters[param1["name"]] = param1["values"][i]
+            cell_parameters[param2["name"]] = param2["values"][j]
+            rows.append({
+                "status": "error" if cell.get("error") else "success",
+                "strategy_id": f"{results_grid['grid_id']}_{i}_{j}",
+                "strategy_type": results_grid.get("strategy_type"),
+                "parameters": cell_parameters,
+                "performance": cell.get("performance", {}),
+                "error_message": cell.get("error"),
+                "grid_cell": [i, j],
+                "value": cell.get("value"),
+            })
+    return rows
+
+def _migrate_file(store: BacktestResultStore, path: str, document: Any) -> int:
+    """Import one legacy JSON document; returns the number of rows written."""
+    name = os.path.basename(path)
+    if isinstance(document, dict) and "grid_data" in document and "grid_id" in document:
+        grid_id = document["grid_id"]
+        config_path = os.path.join(os.path.dirname(path), f"{grid_id}_config.json")
+        fixed_params = {}
+        if os.path.exists(config_path):
+            with open(config_path, "r") as f:
+                fixed_params = json.load(f).get("fixed_params", {})
+        metadata = {key: value for key, value in document.items() if key != "grid_data"}
+        metadata["fixed_params"] = fixed_params
+        store.record_run(grid_id, _SOURCE_GRID, metadata)
+        return store.append_many(
+            grid_cell_rows(document, fixed_params), source=_SOURCE_GRID, run_id=grid_id,
+            created_at=document.get("completed_at")
+        )
+    if isinstance(document, dict) and "performance" in document and "strategy_id" in document:
+        created_at = datetime.utcfromtimestamp(os.path.getmtime(path)).isoformat()
+        return store.append_many([document], source=_SOURCE_REAL_BACKTESTER, created_at=created_at)
+    logger.debug(f"Skipping {name}: not a backtest or grid result file")
+    return 0
+
+def migrate_json_results(
+    store: BacktestResultStore,
+    directory: str,
+    remove_originals: bool = False
+) -> Dict[str, int]:
+    """
+    Import the per-run JSON files of earlier versions into the store.
+
+    Understands RealBacktester's backtest_<id>_<symbol>_<dates>.json files and
+    BacktestGrid's <grid_id>_results.json files (with the fixed parameters
+    from <grid_id>_config.json). Files already imported are skipped, so the
+    migration can be re-run safely.
+
+    Args:
+        store: Destination store
+        directory: Directory searched recursively for result files
+        remove_originals: Delete each file once its rows are committed
+
+    Returns:
+        Dictionary with files imported, skipped and failed, and rows written
+    """
+    summary = {"files": 0, "skipped": 0, "failed": 0, "rows": 0}
+    for root, _, files in os.walk(directory):
+        for name in sorted(files):
+            if not (name.startswith("backtest_") or name.endswith("_results.json")) or not name.endswith(".json"):
+                continue
+            path = os.path.join(root, name)
+            if store.is_imported(path):
+                summary["skipped"] += 1
+                continue
+            try:
+                with open(path, "r") as f:
+                    document = json.load(f)
+                rows = _migrate_file(store, path, document)
+            except (OSError, ValueError, KeyError, IndexError, TypeError) as e:
+                logger.error(f"Could not migrate {path}: {e}")
+                summary["failed"] += 1
+                continue
+            store.mark_imported(path, rows)
+            summary["files"] += 1
+            summary["rows"] += rows
+            if remove_originals:
+                try:
+                    os.remove(path)
+                except OSError as e:
+                    logger.warning(f"Could not remove migrated file {path}: {e}")
+    logger.info(f"Migrated {summary['files']} result files ({summary['rows']} rows) from {directory} into "
+                f"{store.db_path}; {summary['skipped']} already imported, {summary['failed']} failed")
+    return summary
@@ -0,0 +1,213 @@
+"""
+Shared-Memory Market Data for BensBot parallel backtesting.
+
+The parent process loads a generation's OHLCV bars once and publishes them
+into a single shared-memory block: an int64 timestamp index followed by one
+typed buffer per column. Worker processes attach to the block by name and
+rebuild a read-only DataFrame view over the same memory, so no bars are
+pickled per task and the data source is hit once per generation.
+"""
+
+import logging
+import numpy as np
+import pandas as pd
+from dataclasses import dataclass, field
+from multiprocessing import shared_memory
+from typing import Any, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Buffers inside the block start on 64-byte boundaries
+_ALIGNMENT = 64
+
+def _aligned(offset: int) -> int:
+    return (offset + _ALIGNMENT - 1) // _ALIGNMENT * _ALIGNMENT
+
+def _open_segment(name: str) -> shared_memory.SharedMemory:
+    """Attach to an existing segment without handing it to the resource tracker (Python 3.13+)."""
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        return shared_memory.SharedMemory(name=name)
+
+@dataclass(frozen=True)
+class SharedMarketDataHandle:
+    """
+    Picklable description of a published OHLCV block.
+
+    Only this handle travels to worker processes; the bars stay in shared memory.
+    """
+    segment_name: str
+    length: int
+    index_kind: str                       # "datetime" or "integer"
+    index_unit: Optional[str]             # datetime64 unit, e.g. "ns"
+    index_tz: Optional[str]
+    index_name: Optional[str]
+    columns: Tuple[Tuple[str, str, int], ...]  # (name, dtype, byte offset)
+    fetch_key: Tuple[Any, ...] = field(default_factory=tuple)
+
+class SharedMarketData:
+    """
+    Owner or attached view of an OHLCV DataFrame stored in shared memory.
+
+    The parent calls publish() and must eventually call close() and unlink()
+    (or use it as a context manager). Workers call attach() and close().
+    """
+
+    def __init__(self, handle: SharedMarketDataHandle, segment: shared_memory.SharedMemory, owner: bool):
+        self.handle = handle
+        self._segment = segment
+        self._owner = owner
+        self._frame: Optional[pd.DataFrame] = None
+
+    @classmethod
+    def publish(cls, data: pd.DataFrame, fetch_key: Tuple[Any, ...] = ()) -> "SharedMarketData":
+        """
+        Copy a DataFrame of numeric bars into a new shared-memory block.
+
+        Args:
+            data: OHLCV DataFrame with a DatetimeIndex or integer index
+            fetch_key: (symbol, asset_class, start_date, end_date, interval) the data answers
+
+        Returns:
+            Owning SharedMarketData instance
+
+        Raises:
+            ValueError: If a column is not numeric or the index is not datetime/integer
+        """
+        for column in data.columns:
+            if not (pd.api.types.is_numeric_dtype(data[column]) or pd.api.types.is_bool_dtype(data[column])):
+                raise ValueError(f"Column '{column}' has non-numeric dtype {data[column].dtype}; cannot share it")
+
+        index = data.index
+        if isinstance(index, pd.DatetimeIndex):
+            index_kind, index_unit = "datetime", index.unit
+            index_tz = str(index.tz) if index.tz is not None else None
+            index_values = index.asi8
+        elif pd.api.types.is_integer_dtype(index):
+            index_kind, index_unit, index_tz = "integer", None, None
+            index_values = index.to_numpy(dtype=np.int64)
+        else:
+            raise ValueError(f"Unsupported index type {type(index).__name__}; expected datetime or integer")
+
+        length = len(data)
+        offset = _aligned(length * 8)
+        layout = []
+        for column in data.columns:
+            dtype = data[column].to_numpy().dtype
+            layout.append((str(column), dtype.str, offset))
+            offset = _aligned(offset + length * dtype.itemsize)
+
+        segment = shared_memory.SharedMemory(create=True, size=max(offset, 1))
+        handle = SharedMarketDataHandle(
+            segment_name=segment.name,
+            length=length,
+            index_kind=index_kind,
+            index_unit=index_unit,
+            index_tz=index_tz,
+            index_name=index.name,
+            columns=tuple(layout),
+            fetch_key=tuple(fetch_key)
+        )
+        np.ndarray(length, dtype=np.int64, buffer=segment.buf)[:] = index_values
+        for (name, dtype, column_offset), column in zip(layout, data.columns):
+            np.ndarray(length, dtype=np.dtype(dtype), buffer=segment.buf, offset=column_offset)[:] = data[column].to_numpy()
+
+        logger.info(f"Published {length} bars x {len(layout)} columns ({offset / 1e6:.1f} MB) to shared memory '{segment.name}'")
+        return cls(handle, segment, owner=True)
+
+    @classmethod
+    def attach(cls, handle: SharedMarketDataHandle) -> "SharedMarketData":
+        """
+        Attach to a block published by another process.
+
+        Args:
+            handle: Handle returned by the publishing process
+
+        Returns:
+            Non-owning SharedMarketData instance
+        """
+        return cls(handle, _open_segment(handle.segment_name), owner=False)
+
+    def to_frame(self) -> pd.DataFrame:
+        """
+        Return the bars as a read-only DataFrame backed by the shared buffers.
+
+        Column data is not copied; callers that need to modify it should copy().
+        """
+        if self._frame is not None:
+            return self._frame
+
+        handle, buf = self.handle, self._segment.buf
+        index_values = np.ndarray(handle.length, dtype=np.int64, buffer=buf)
+        if handle.index_kind == "datetime":
+            index = pd.DatetimeIndex(index_values.view(f"M8[{handle.index_unit}]"), name=handle.index_name)
+            if handle.index_tz is not None:
+                index = index.tz_localize("UTC").tz_convert(handle.index_tz)
+        else:
+            index = pd.Index(index_values, name=handle.index_name)
+
+        columns = {}
+        for name, dtype, offset in handle.columns:
+            values = np.ndarray(handle.length, dtype=np.dtype(dtype), buffer=buf, offset=offset)
+            values.flags.writeable = False
+            columns[name] = values
+        self._frame = pd.DataFrame(columns, index=index, copy=False)
+        return self._frame
+
+    def close(self) -> None:
+        """Release this process's mapping of the block."""
+        self._frame = None
+        try:
+            self._segment.close()
+        except BufferError:
+            # A DataFrame view is still referenced somewhere; the mapping is released at exit
+            logger.debug(f"Shared memory '{self.handle.segment_name}' still in use; deferring close")
+
+    def unlink(self) -> None:
+        """Destroy the block (owner only)."""
+        if self._owner:
+            self._segment.unlink()
+
+    def __enter__(self) -> "SharedMarketData":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+        self.unlink()
+
+class SharedDataFetcher:
+    """
+    Drop-in replacement for HistoricalDataFetcher inside worker processes.
+
+    Serves the published bars for the generation's fetch key without any
+    network or disk access. Requests for other data fall through to an
+    optional fallback fetcher.
+    """
+
+    def __init__(self, shared_data: SharedMarketData, fallback_fetcher: Optional[Any] = None):
+        """
+        Args:
+            shared_data: Attached SharedMarketData
+            fallback_fetcher: Fetcher used for requests that do not match the published key
+        """
+        self.shared_data = shared_data
+        self.fallback_fetcher = fallback_fetcher
+
+    def fetch(
+        self,
+        symbol: str,
+        asset_class: str,
+        start_date: Any,
+        end_date: Any,
+        interval: str = "1d"
+    ) -> Optional[pd.DataFrame]:
+        """Return the shared bars if they match the request, else defer to the fallback."""
+        key = (symbol, asset_class, start_date, end_date, interval)
+        fetch_key = self.shared_data.handle.fetch_key
+        if not fetch_key or key == fetch_key:
+            return self.shared_data.to_frame()
+        if self.fallback_fetcher is not None:
+            return self.fallback_fetcher.fetch(symbol, asset_class, start_date, end_date, interval)
+        logger.warning(f"No shared data for {key}; published key is {fetch_key}")
+        return None
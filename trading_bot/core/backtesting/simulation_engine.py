@@ -0,0 +1,1096 @@
+"""
+Array-based Portfolio Simulation Engine for BensBot.
+
+This module provides the portfolio simulation shared by the historical
+backtesters. Instead of reading and writing pandas objects bar by bar, the
+engine works on plain NumPy arrays: position changes are only evaluated on
+the bars where the signal changes, and the equity curve between those bars
+is marked to market with cumulative sums.
+
+The per-asset-class rules (long-only crypto, fixed-lot forex, ...) mirror the
+original per-bar loops exactly, so equity curves and trade logs are identical.
+
+When a strategy supplies stop-loss/take-profit levels, open positions are
+also closed intrabar on the first bar whose High/Low range crosses the level
+set on their entry bar. That bar is found with a vectorized first-hit search
+over the price arrays, evaluated for all open positions at once.
+
+Signals may also be passed as SparseSignals (the signal changes only, with
+their stop/target levels). Dense signal matrices are reduced to the same
+event list up front, so the per-genome state the engine keeps besides the
+equity curves scales with the number of signal changes, not bars.
+
+With PruningRules, runs that break a rule (drawdown, equity floor, no trades)
+are stopped at that bar and the engine stops evaluating their signals.
+
+simulate_basket runs one portfolio over a (symbols x bars) panel, with all
+symbols drawing on a shared cash balance under position limits.
+"""
+
+import logging
+from dataclasses import dataclass
+from typing import Dict, Any, List, Callable, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from trading_bot.core.backtesting.pruning import PruningRules, first_rule_violations
+from trading_bot.core.signals.sparse_signals import SparseSignals
+
+logger = logging.getLogger(__name__)
+
+# Supported simulation modes, named after the backtester whose rules they implement
+SIMULATION_MODES = ("equity", "crypto", "forex")
+
+# Bars scanned per step of the first-hit search; bounds the (positions x bars) masks
+HIT_SEARCH_BLOCK = 4096
+
+# Signature of BaseBacktester._apply_slippage_and_commission:
+# (price, side, slippage_pct, commission_pct, is_entry) -> effective price
+PriceAdjuster = Callable[..., float]
+
+@dataclass
+class SimulationResult:
+    """Output of a single portfolio simulation."""
+    equity_curve: np.ndarray      # Portfolio value at the end of each bar
+    positions: np.ndarray         # Quantity held at the end of each bar
+    trades_log: List[Dict[str, Any]]  # Raw fills: timestamp, type, price, qty (and pnl for forex)
+    final_cash: float
+    bars_processed: int
+    pruned_at: Optional[int] = None     # Bar on which a pruning rule stopped the run
+    prune_reason: Optional[str] = None  # Rule that stopped the run
+
+def signal_change_points(signals: np.ndarray) -> np.ndarray:
+    """
+    Find the bars on which a strategy's position can change.
+
+    A bar whose signal equals the previous bar's signal never changes the
+    portfolio state in any of the simulation modes, so only the first bar and
+    the bars where the signal changes need to be evaluated.
+
+    Args:
+        signals: Array of signals (1, -1, 0)
+
+    Returns:
+        Sorted array of bar indices
+    """
+    if len(signals) == 0:
+        return np.empty(0, dtype=np.int64)
+    # NaN != NaN, so bars with missing signals are always evaluated
+    changes = np.flatnonzero(signals[1:] != signals[:-1]) + 1
+    return np.concatenate((np.zeros(1, dtype=np.int64), changes))
+
+def first_level_hits(
+    high: np.ndarray,
+    low: np.ndarray,
+    start: int,
+    stop: int,
+    is_long: np.ndarray,
+    stop_levels: np.ndarray,
+    take_levels: np.ndarray,
+    block_size: int = HIT_SEARCH_BLOCK
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Find, for each open position, the first bar in [start, stop) that crosses its stop or target.
+
+    A long position's stop is crossed when Low <= stop and its target when
+    High >= target; shorts are mirrored. NaN levels never trigger. Bars are
+    scanned in blocks so positions that exit early stop being searched.
+
+    Args:
+        high: Array of bar highs
+        low: Array of bar lows
+        start: First bar to search
+        stop: Bar after the last one to search
+        is_long: Boolean array, True for long positions
+        stop_levels: Stop-loss price per position
+        take_levels: Take-profit price per position
+        block_size: Number of bars scanned per step
+
+    Returns:
+        Tuple of (hit bar per position or -1, whether the stop was crossed on that bar)
+    """
+    count = len(is_long)
+    hit_bars = np.full(count, -1, dtype=np.int64)
+    stop_hits = np.zeros(count, dtype=bool)
+    pending = np.arange(count)
+    for block_start in range(start, stop, block_size):
+        if pending.size == 0:
+            break
+        block_stop = min(block_start + block_size, stop)
+        block_high = high[block_start:block_stop]
+        block_low = low[block_start:block_stop]
+        longs = is_long[pending, None]
+        stop_level = stop_levels[pending, None]
+        take_level = take_levels[pending, None]
+        stop_crossed = np.where(longs, block_low <= stop_level, block_high >= stop_level)
+        crossed = stop_crossed | np.where(longs, block_high >= take_level, block_low <= take_level)
+        found = crossed.any(axis=1)
+        if found.any():
+            rows = np.flatnonzero(found)
+            first = crossed[rows].argmax(axis=1)
+            hit_bars[pending[rows]] = block_start + first
+            stop_hits[pending[rows]] = stop_crossed[rows, first]
+            pending = pending[~found]
+    return hit_bars, stop_hits
+
+def level_fill_price(level: float, open_price: float, is_long: bool, is_stop: bool) -> float:
+    """
+    Price at which a crossed stop or target fills.
+
+    Levels fill at the level itself unless the bar opened beyond it, in which
+    case the fill is at the open. When a bar crosses both levels the stop is
+    assumed to have been hit first.
+
+    Args:
+        level: Stop-loss or take-profit price
+        open_price: Open of the hit bar (NaN if unknown)
+        is_long: Whether the position is long
+        is_stop: Whether the crossed level is the stop
+
+    Returns:
+        Fill price before slippage and commission
+    """
+    if np.isnan(open_price):
+        return level
+    # Long stops and short targets sit below the market, the others above it
+    if is_long == is_stop:
+        return min(open_price, level)
+    return max(open_price, level)
+
+def _carry_equity(
+    equity: np.ndarray,
+    close: np.ndarray,
+    start: int,
+    stop: int,
+    quantity: float
+) -> None:
+    """
+    Roll equity[start:stop] forward from equity[start - 1] while holding a position.
+
+    Uses the same running-sum arithmetic as a per-bar loop
+    (value[i] = value[i-1] + quantity * (close[i] - close[i-1])).
+    """
+    if start >= stop:
+        return
+    if quantity != 0:
+        increments = quantity * (close[start:stop] - close[start - 1:stop - 1])
+        increments[0] += equity[start - 1]
+        equity[start:stop] = np.cumsum(increments)
+    else:
+        equity[start:stop] = equity[start - 1]
+
+def _simulate_equity(
+    close: np.ndarray,
+    signals: np.ndarray,
+    index: Sequence[Any],
+    initial_capital: float,
+    slippage_pct: float,
+    commission_pct: float,
+    price_adjuster: PriceAdjuster,
+    **kwargs
+) -> SimulationResult:
+    """All-in long positions, flat on sell signals (HistoricalEquityBacktester rules)."""
+    n = len(close)
+    equity = np.full(n, initial_capital, dtype=float)
+    positions = np.zeros(n, dtype=float)
+    close_values = close.tolist()
+    signal_values = signals.tolist()
+
+    cash = initial_capital
+    qty = 0
+    last_signal = 0
+    trades_log = []
+    prev = 0
+
+    for i in signal_change_points(signals).tolist():
+        _carry_equity(equity, close, prev + 1, i + 1, qty)
+        positions[prev:i] = qty
+        signal = signal_values[i]
+        price = close_values[i]
+        timestamp = index[i]
+
+        if signal == 1 and last_signal <= 0: # Buy signal and not already long
+            if qty < 0: # Close short position first
+                buy_price_eff = price_adjuster(price, "buy", slippage_pct, commission_pct, is_entry=False)
+                cash += abs(qty) * buy_price_eff
+                trades_log.append({'timestamp': timestamp, 'type': 'cover', 'price': buy_price_eff, 'qty': abs(qty)})
+                qty = 0
+
+            entry_price_eff = price_adjuster(price, "buy", slippage_pct, commission_pct, is_entry=True)
+            shares_to_buy = cash / entry_price_eff # Use all available cash
+            if shares_to_buy > 0:
+                cash -= shares_to_buy * entry_price_eff
+                qty = shares_to_buy
+                trades_log.append({'timestamp': timestamp, 'type': 'buy', 'price': entry_price_eff, 'qty': shares_to_buy})
+            equity[i] = cash + (qty * price)
+            last_signal = 1
+
+        elif signal == -1 and last_signal >= 0: # Sell signal and not already short
+            if qty > 0: # Close long position
+                sell_price_eff = price_adjuster(price, "sell", slippage_pct, commission_pct, is_entry=False)
+                cash += qty * sell_price_eff
+                trades_log.append({'timestamp': timestamp, 'type': 'sell', 'price': sell_price_eff, 'qty': qty})
+                qty = 0
+            equity[i] = cash
+            last_signal = -1
+
+        elif signal == 0 and qty != 0:
+            if last_signal == 1 and signal_values[i - 1] == -1:
+                sell_price_eff = price_adjuster(price, "sell", slippage_pct, commission_pct, is_entry=False)
+                cash += qty * sell_price_eff
+                trades_log.append({'timestamp': timestamp, 'type': 'sell_exit', 'price': sell_price_eff, 'qty': qty})
+                qty = 0
+                equity[i] = cash
+                last_signal = 0
+        else:
+            if i == 0:
+                equity[i] = initial_capital
+            last_signal = signal
+        prev = i
+
+    _carry_equity(equity, close, prev + 1, n, qty)
+    positions[prev:] = qty
+    return SimulationResult(equity, positions, trades_log, cash, n)
+
+def _simulate_crypto(
+    close: np.ndarray,
+    signals: np.ndarray,
+    index: Sequence[Any],
+    initial_capital: float,
+    slippage_pct: float,
+    commission_pct: float,
+    price_adjuster: PriceAdjuster,
+    **kwargs
+) -> SimulationResult:
+    """Long-only, re-entry only after a flat signal (HistoricalCryptoBacktester rules)."""
+    n = len(close)
+    equity = np.full(n, initial_capital, dtype=float)
+    positions = np.zeros(n, dtype=float)
+    close_values = close.tolist()
+    signal_values = signals.tolist()
+
+    cash = initial_capital
+    qty = 0.0
+    last_signal = 0
+    trades_log = []
+    prev = 0
+
+    for i in signal_change_points(signals).tolist():
+        _carry_equity(equity, close, prev + 1, i + 1, qty if qty > 0 else 0)
+        positions[prev:i] = qty
+        signal = signal_values[i]
+        price = close_values[i]
+        timestamp = index[i]
+
+        if signal == 1 and last_signal == 0: # Buy signal and not already in a position
+            entry_price_eff = price_adjuster(price, "buy", slippage_pct, commission_pct, is_entry=True)
+            asset_to_buy = cash / entry_price_eff
+            if asset_to_buy > 0:
+                cash -= asset_to_buy * entry_price_eff
+                qty = asset_to_buy
+                trades_log.append({'timestamp': timestamp, 'type': 'buy', 'price': entry_price_eff, 'qty': asset_to_buy})
+            equity[i] = cash + (qty * price)
+            last_signal = 1
+        elif signal == -1 and qty > 0: # Sell signal and currently holding assets
+            exit_price_eff = price_adjuster(price, "sell", slippage_pct, commission_pct, is_entry=False)
+            cash += qty * exit_price_eff
+            trades_log.append({'timestamp': timestamp, 'type': 'sell', 'price': exit_price_eff, 'qty': qty})
+            qty = 0
+            equity[i] = cash
+            last_signal = -1
+        else:
+            if i == 0:
+                equity[i] = initial_capital
+            if signal == 0:
+                last_signal = 0 # Hold signal allows re-entry on the next buy
+        prev = i
+
+    _carry_equity(equity, close, prev + 1, n, qty if qty > 0 else 0)
+    positions[prev:] = qty
+    return SimulationResult(equity, positions, trades_log, cash, n)
+
+def _simulate_forex(
+    close: np.ndarray,
+    signals: np.ndarray,
+    index: Sequence[Any],
+    initial_capital: float,
+    slippage_pct: float,
+    commission_pct: float,
+    price_adjuster: PriceAdjuster,
+    lot_size: int = 10000,
+    **kwargs
+) -> SimulationResult:
+    """Fixed-lot long/short positions marked to market (HistoricalForexBacktester rules)."""
+    n = len(close)
+    equity = np.empty(n, dtype=float)
+    positions = np.zeros(n, dtype=float)
+    close_values = close.tolist()
+    signal_values = signals.tolist()
+
+    cash = initial_capital
+    units = 0
+    entry_price = 0.0
+    last_signal = 0
+    trades_log = []
+
+    def _mark_segment(start: int, stop: int) -> None:
+        # Portfolio value is cash plus the mark-to-market of the open position
+        if units > 0:
+            equity[start:stop] = cash + units * close[start:stop]
+        elif units < 0:
+            equity[start:stop] = cash + (abs(units) * entry_price + abs(units) * (entry_price - close[start:stop]))
+        else:
+            equity[start:stop] = cash
+        positions[start:stop] = units
+
+    events = signal_change_points(signals).tolist()
+    for k, i in enumerate(events):
+        signal = signal_values[i]
+        price = close_values[i]
+        timestamp = index[i]
+
+        if signal == 1 and last_signal <= 0: # Buy signal
+            if units < 0: # If short, cover first
+                buy_price_eff = price_adjuster(price, "buy", slippage_pct, commission_pct, is_entry=False)
+                cash_change = abs(units) * (entry_price - buy_price_eff) # PnL from short
+                cash += abs(units) * entry_price + cash_change
+                trades_log.append({'timestamp': timestamp, 'type': 'cover', 'price': buy_price_eff, 'qty': abs(units), 'pnl': cash_change})
+                units = 0
+
+            entry_price_eff = price_adjuster(price, "buy", slippage_pct, commission_pct, is_entry=True)
+            units = lot_size
+            entry_price = entry_price_eff
+            trades_log.append({'timestamp': timestamp, 'type': 'buy', 'price': entry_price_eff, 'qty': lot_size})
+            last_signal = 1
+
+        elif signal == -1 and last_signal >= 0: # Sell signal
+            if units > 0: # If long, sell first
+                sell_price_eff = price_adjuster(price, "sell", slippage_pct, commission_pct, is_entry=False)
+                cash_change = units * (sell_price_eff - entry_price)
+                cash += cash_change # Realized PnL from long
+                trades_log.append({'timestamp': timestamp, 'type': 'sell_long', 'price': sell_price_eff, 'qty': units, 'pnl': cash_change})
+                units = 0
+
+            entry_price_eff = price_adjuster(price, "sell", slippage_pct, commission_pct, is_entry=True)
+            units = -lot_size
+            entry_price = entry_price_eff
+            trades_log.append({'timestamp': timestamp, 'type': 'short', 'price': entry_price_eff, 'qty': lot_size})
+            last_signal = -1
+        else:
+            if signal == 0:
+                last_signal = 0
+
+        next_event = events[k + 1] if k + 1 < len(events) else n
+        _mark_segment(i, next_event)
+
+    if n > 0:
+        equity[0] = initial_capital
+    return SimulationResult(equity, positions, trades_log, cash, n)
+
+_MODE_SIMULATORS = {
+    "equity": _simulate_equity,
+    "crypto": _simulate_crypto,
+    "forex": _simulate_forex,
+}
+
+def simulate_portfolio(
+    close: np.ndarray,
+    signals: Union[np.ndarray, SparseSignals],
+    index: Sequence[Any],
+    initial_capital: float,
+    slippage_pct: float,
+    commission_pct: float,
+    price_adjuster: PriceAdjuster,
+    mode: str = "equity",
+    high: Optional[np.ndarray] = None,
+    low: Optional[np.ndarray] = None,
+    open_prices: Optional[np.ndarray] = None,
+    stop_loss: Optional[np.ndarray] = None,
+    take_profit: Optional[np.ndarray] = None,
+    pruning: Optional[PruningRules] = None,
+    **mode_kwargs
+) -> SimulationResult:
+    """
+    Simulate a portfolio trading a signal series at bar close prices.
+
+    Entries and signal exits fill at the close. If stop_loss or take_profit
+    levels are given, positions are also closed intrabar at the levels set on
+    their entry bar (see simulate_population).
+
+    Args:
+        close: Array of close prices
+        signals: Array of signals (1 buy, -1 sell, 0 hold), same length as close,
+                 or SparseSignals (which carry their own stop/target levels)
+        index: Bar timestamps used in the trade log (e.g. the DataFrame index)
+        initial_capital: Starting capital
+        slippage_pct: Slippage percentage per fill
+        commission_pct: Commission percentage per fill
+        price_adjuster: Callable applying slippage and commission to a fill price,
+                        normally BaseBacktester._apply_slippage_and_commission
+        mode: One of SIMULATION_MODES
+        high: Array of bar highs (required with stop_loss/take_profit)
+        low: Array of bar lows (required with stop_loss/take_profit)
+        open_prices: Optional array of bar opens, used for fills on gaps through a level
+        stop_loss: Optional per-bar stop-loss prices, NaN where unset
+        take_profit: Optional per-bar take-profit prices, NaN where unset
+        pruning: Optional rules for stopping the run early (see simulate_population)
+        **mode_kwargs: Mode-specific options (e.g. lot_size for forex)
+
+    Returns:
+        SimulationResult with the equity curve, positions and raw trade log
+    """
+    simulator = _MODE_SIMULATORS.get(mode)
+    if simulator is None:
+        raise ValueError(f"Unknown simulation mode: {mode}. Expected one of {SIMULATION_MODES}")
+
+    if isinstance(signals, SparseSignals):
+        # Events are consumed by the population engine; a single row gives identical results
+        return simulate_population(
+            close, [signals], index, initial_capital, slippage_pct, commission_pct, price_adjuster, mode=mode,
+            high=high, low=low, open_prices=open_prices, pruning=pruning, **mode_kwargs
+        )[0]
+
+    if stop_loss is not None or take_profit is not None or (pruning is not None and pruning.enabled):
+        # Intrabar exits and pruning are handled by the population engine; a single row gives identical results
+        return simulate_population(
+            close, np.asarray(signals, dtype=float)[None, :], index, initial_capital,
+            slippage_pct, commission_pct, price_adjuster, mode=mode,
+            high=high, low=low, open_prices=open_prices,
+            stop_loss=None if stop_loss is None else np.asarray(stop_loss, dtype=float)[None, :],
+            take_profit=None if take_profit is None else np.asarray(take_profit, dtype=float)[None, :],
+            pruning=pruning,
+            **mode_kwargs
+        )[0]
+
+    close = np.asarray(close, dtype=float)
+    signals = np.asarray(signals, dtype=float)
+    if len(close) != len(signals):
+        raise ValueError(f"Signal length ({len(signals)}) does not match price length ({len(close)})")
+
+    return simulator(
+        close=close,
+        signals=signals,
+        index=index,
+        initial_capital=initial_capital,
+        slippage_pct=slippage_pct,
+        commission_pct=commission_pct,
+        price_adjuster=price_adjuster,
+        **mode_kwargs
+    )
+
+def _carry_population_equity(
+    equity: np.ndarray,
+    close: np.ndarray,
+    start: int,
+    stop: int,
+    quantity: np.ndarray
+) -> None:
+    """
+    Population version of _carry_equity: roll equity[:, start:stop] forward
+    for every genome, holding quantity[g] units.
+    """
+    if start >= stop:
+        return
+    holding = quantity != 0
+    equity[:, start:stop] = equity[:, start - 1:start]
+    if holding.any():
+        increments = quantity[holding, None] * (close[start:stop] - close[start - 1:stop - 1])
+        increments[:, 0] += equity[holding, start - 1]
+        equity[holding, start:stop] = np.cumsum(increments, axis=1)
+
+def population_change_points(signal_matrix: np.ndarray) -> np.ndarray:
+    """
+    Bars on which at least one genome's signal changes (first bar always included).
+
+    Args:
+        signal_matrix: (genomes x bars) array of signals
+
+    Returns:
+        Sorted array of bar indices
+    """
+    if signal_matrix.shape[1] == 0:
+        return np.empty(0, dtype=np.int64)
+    changed = (signal_matrix[:, 1:] != signal_matrix[:, :-1]).any(axis=0)
+    return np.concatenate((np.zeros(1, dtype=np.int64), np.flatnonzero(changed) + 1))
+
+@dataclass
+class PopulationEvents:
+    """
+    Signal changes of a population as one flat list, ordered by bar and genome.
+
+    Every genome has an event on bar 0. Levels are the stop-loss/take-profit
+    prices set on the event bar (None when no genome sets any).
+    """
+    n_genomes: int
+    n_bars: int
+    bars: np.ndarray
+    genomes: np.ndarray
+    direction: np.ndarray
+    stop_loss: Optional[np.ndarray] = None
+    take_profit: Optional[np.ndarray] = None
+
+    @property
+    def has_levels(self) -> bool:
+        return self.stop_loss is not None or self.take_profit is not None
+
+    def schedule(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Distinct event bars with the [start, end) range of their events in the flat list."""
+        if len(self.bars) == 0:
+            empty = np.empty(0, dtype=np.int64)
+            return empty, empty, empty
+        boundaries = np.flatnonzero(np.diff(self.bars)) + 1
+        starts = np.concatenate((np.zeros(1, dtype=np.int64), boundaries))
+        ends = np.append(boundaries, len(self.bars))
+        return self.bars[starts], starts, ends
+
+    def select(self, keep: np.ndarray) -> "PopulationEvents":
+        """Events where keep is True."""
+        return PopulationEvents(
+            self.n_genomes, self.n_bars, self.bars[keep], self.genomes[keep], self.direction[keep],
+            None if self.stop_loss is None else self.stop_loss[keep],
+            None if self.take_profit is None else self.take_profit[keep]
+        )
+
+def population_events(
+    signals: Union[np.ndarray, Sequence[SparseSignals]],
+    stop_loss: Optional[np.ndarray] = None,
+    take_profit: Optional[np.ndarray] = None
+) -> PopulationEvents:
+    """
+    Reduce a population's signals to its signal changes.
+
+    Args:
+        signals: (genomes x bars) array of signals, or one SparseSignals per genome
+        stop_loss: Optional (genomes x bars) stop-loss prices for a dense signal array
+        take_profit: Optional (genomes x bars) take-profit prices for a dense signal array
+
+    Returns:
+        PopulationEvents
+
+    Raises:
+        ValueError: If shapes disagree, or levels are passed alongside SparseSignals
+    """
+    if len(signals) and isinstance(signals[0], SparseSignals):
+        if stop_loss is not None or take_profit is not None:
+            raise ValueError("Sparse signals carry their own stop-loss/take-profit levels")
+        n = signals[0].n_bars
+        if any(row.n_bars != n for row in signals):
+            raise ValueError("All sparse signal rows must span the same number of bars")
+        bars = np.concatenate([row.bars for row in signals])
+        order = np.argsort(bars, kind="stable")
+        genomes = np.repeat(np.arange(len(signals)), [len(row.bars) for row in signals])
+
+        def levels(name: str) -> Optional[np.ndarray]:
+            if all(getattr(row, name) is None for row in signals):
+                return None
+            return np.concatenate([
+                np.full(len(row.bars), np.nan) if getattr(row, name) is None else getattr(row, name)
+                for row in signals
+            ])[order]
+
+        return PopulationEvents(
+            len(signals), n, bars[order], genomes[order],
+            np.concatenate([row.direction for row in signals])[order],
+            levels("stop_loss"), levels("take_profit")
+        )
+
+    matrix = np.atleast_2d(np.asarray(signals, dtype=float))
+    n_genomes, n = matrix.shape
+    changed = np.ones((n, n_genomes), dtype=bool)
+    # NaN != NaN, so bars with missing signals are always evaluated
+    changed[1:] = (matrix[:, 1:] != matrix[:, :-1]).T
+    bars, genomes = np.nonzero(changed)
+
+    def levels(values: Optional[np.ndarray]) -> Optional[np.ndarray]:
+        if values is None:
+            return None
+        values = np.atleast_2d(np.asarray(values, dtype=float))
+        if values.shape != matrix.shape:
+            raise ValueError(f"Stop-loss/take-profit levels must have the signal shape {matrix.shape}")
+        return values[genomes, bars]
+
+    return PopulationEvents(
+        n_genomes, n, bars.astype(np.int64), genomes.astype(np.int64), matrix[genomes, bars],
+        levels(stop_loss), levels(take_profit)
+    )
+
+def simulate_population(
+    close: np.ndarray,
+    signal_matrix: Union[np.ndarray, Sequence[SparseSignals]],
+    index: Sequence[Any],
+    initial_capital: float,
+    slippage_pct: float,
+    commission_pct: float,
+    price_adjuster: PriceAdjuster,
+    mode: str = "equity",
+    lot_size: int = 10000,
+    high: Optional[np.ndarray] = None,
+    low: Optional[np.ndarray] = None,
+    open_prices: Optional[np.ndarray] = None,
+    stop_loss: Optional[np.ndarray] = None,
+    take_profit: Optional[np.ndarray] = None,
+    pruning: Optional[PruningRules] = None
+) -> List[SimulationResult]:
+    """
+    Simulate many signal series on the same price data in one vectorized pass.
+
+    Each row of signal_matrix is one genome. The signals are reduced to
+    their changes (see population_events); portfolio state is held in
+    per-genome arrays and updated with 2-D NumPy operations on the bars where
+    any genome's signal changes, and equity in between is marked to market
+    with cumulative sums. Every genome follows exactly the same rules (and
+    arithmetic) as simulate_portfolio, so results are identical to
+    simulating the rows one at a time, and dense and sparse signals give
+    identical results.
+
+    With stop_loss/take_profit matrices, each position takes the levels of its
+    entry bar. Before every event bar the engine runs a first-hit search over
+    High/Low for all open positions and closes those whose level was crossed,
+    at the level (or at the open on a gap through it). Those fills carry an
+    'exit_reason' of "stop_loss" or "take_profit" and the triggering 'level';
+    signal exits are then tagged "signal". Re-entry needs a new signal.
+
+    With pruning rules, the equity of every running genome is checked before
+    each event bar. A genome that breaks a rule is stopped on the first
+    offending bar: it takes no further trades, bars on which only stopped
+    genomes change their signal are no longer evaluated, and its result is
+    truncated at that bar with pruned_at/prune_reason set. Genomes that are
+    never pruned get exactly the results they would get without rules.
+
+    Args:
+        close: Array of close prices (bars,)
+        signal_matrix: Array of signals (genomes x bars), or one SparseSignals per genome
+        index: Bar timestamps used in the trade logs
+        initial_capital: Starting capital for every genome
+        slippage_pct: Slippage percentage per fill
+        commission_pct: Commission percentage per fill
+        price_adjuster: Callable applying slippage and commission to a fill price
+        mode: One of SIMULATION_MODES
+        lot_size: Units per trade in forex mode
+        high: Array of bar highs (required with stop_loss/take_profit)
+        low: Array of bar lows (required with stop_loss/take_profit)
+        open_prices: Optional array of bar opens, used for fills on gaps through a level
+        stop_loss: Optional (genomes x bars) stop-loss prices, NaN where unset (dense signals only)
+        take_profit: Optional (genomes x bars) take-profit prices, NaN where unset (dense signals only)
+        pruning: Optional rules for stopping genomes early
+
+    Returns:
+        One SimulationResult per genome, in row order
+    """
+    if mode not in SIMULATION_MODES:
+        raise ValueError(f"Unknown simulation mode: {mode}. Expected one of {SIMULATION_MODES}")
+
+    close = np.asarray(close, dtype=float)
+    flat = population_events(signal_matrix, stop_loss, take_profit)
+    n_genomes, n = flat.n_genomes, flat.n_bars
+    if n != len(close):
+        raise ValueError(f"Signal length ({n}) does not match price length ({len(close)})")
+
+    equity = np.full((n_genomes, n), initial_capital, dtype=float)
+    positions = np.zeros((n_genomes, n), dtype=float)
+    cash = np.full(n_genomes, initial_capital, dtype=float)
+    qty = np.zeros(n_genomes, dtype=float)          # Shares, coins or forex units
+    entry_price = np.zeros(n_genomes, dtype=float)  # Forex only
+    last_signal = np.zeros(n_genomes, dtype=float)
+    trades_logs: List[List[Dict[str, Any]]] = [[] for _ in range(n_genomes)]
+
+    intrabar = flat.has_levels
+    if intrabar:
+        if high is None or low is None:
+            raise ValueError("High and Low prices are required for stop-loss/take-profit exits")
+        high = np.asarray(high, dtype=float)
+        low = np.asarray(low, dtype=float)
+        open_prices = np.full(n, np.nan) if open_prices is None else np.asarray(open_prices, dtype=float)
+    stop_now = np.full(n_genomes, np.nan)  # Levels set on the current event bar
+    take_now = np.full(n_genomes, np.nan)
+    stop_level = np.full(n_genomes, np.nan)  # Levels of each genome's open position
+    take_level = np.full(n_genomes, np.nan)
+    exit_reason = "signal" if intrabar else None
+
+    if pruning is not None and not pruning.enabled:
+        pruning = None
+    running = np.ones(n_genomes, dtype=bool)  # Genomes not stopped by a pruning rule
+    traded = np.zeros(n_genomes, dtype=bool)
+    pruned_at = np.full(n_genomes, -1, dtype=np.int64)
+    prune_reasons: List[Optional[str]] = [None] * n_genomes
+    peak = np.full(n_genomes, float(initial_capital))
+    checked = 0  # Bars [0, checked) have been checked against the pruning rules
+    held = np.zeros(n_genomes, dtype=float)  # Each genome's signal since its last event
+
+    def _log(mask: np.ndarray, timestamp: Any, trade_type: str, price: float,
+             quantities: Any, pnl: Any = None, reason: Optional[str] = None) -> None:
+        for g in np.flatnonzero(mask).tolist():
+            trade = {'timestamp': timestamp, 'type': trade_type, 'price': price,
+                     'qty': float(quantities[g]) if isinstance(quantities, np.ndarray) else quantities}
+            if pnl is not None:
+                trade['pnl'] = float(pnl[g])
+            if reason is not None:
+                trade['exit_reason'] = reason
+            trades_logs[g].append(trade)
+        traded[mask] = True
+
+    def _set_levels(mask: np.ndarray) -> None:
+        if intrabar:
+            stop_level[mask] = stop_now[mask]
+            take_level[mask] = take_now[mask]
+
+    def _exit_at_levels(start: int, stop: int, last_bar_signal: np.ndarray) -> None:
+        # Close positions whose stop or target is crossed on bars [start, stop); they are flat from the hit bar on.
+        # No signal changes before bar stop - 1, whose signals are last_bar_signal
+        open_rows = np.flatnonzero((qty != 0) & ~(np.isnan(stop_level) & np.isnan(take_level)))
+        if start >= stop or open_rows.size == 0:
+            return
+        is_long = qty[open_rows] > 0
+        hit_bars, stop_hits = first_level_hits(
+            high, low, start, stop, is_long, stop_level[open_rows], take_level[open_rows]
+        )
+        for row in np.flatnonzero(hit_bars >= 0).tolist():
+            g, j = int(open_rows[row]), int(hit_bars[row])
+            long_position, is_stop = bool(is_long[row]), bool(stop_hits[row])
+            level = float(stop_level[g] if is_stop else take_level[g])
+            fill_price = level_fill_price(level, float(open_prices[j]), long_position, is_stop)
+            if mode == "forex":
+                units = abs(qty[g])
+                if long_position:
+                    price_eff = price_adjuster(fill_price, "sell", slippage_pct, commission_pct, is_entry=False)
+                    cash_change = units * (price_eff - entry_price[g])
+                    cash[g] += cash_change
+                    trade = {'type': 'sell_long', 'price': price_eff, 'qty': lot_size, 'pnl': float(cash_change)}
+                else:
+                    price_eff = price_adjuster(fill_price, "buy", slippage_pct, commission_pct, is_entry=False)
+                    cash_change = units * (entry_price[g] - price_eff)
+                    cash[g] += units * entry_price[g] + cash_change
+                    trade = {'type': 'cover', 'price': price_eff, 'qty': lot_size, 'pnl': float(cash_change)}
+            else:
+                price_eff = price_adjuster(fill_price, "sell", slippage_pct, commission_pct, is_entry=False)
+                trade = {'type': 'sell', 'price': price_eff, 'qty': float(qty[g])}
+                cash[g] += qty[g] * price_eff
+            trades_logs[g].append({
+                'timestamp': index[j], **trade,
+                'exit_reason': "stop_loss" if is_stop else "take_profit", 'level': level
+            })
+            qty[g] = 0
+            if (last_bar_signal[g] if j == stop - 1 else held[g]) == 0:
+                last_signal[g] = 0 # A flat signal on the exit bar allows re-entry on the next buy
+            equity[g, j:stop] = cash[g]
+            positions[g, j:stop] = 0
+
+    def _prune(stop: int) -> bool:
+        # Check the settled bars [checked, stop) of running genomes and stop those that break a rule
+        nonlocal checked
+        rows = np.flatnonzero(running)
+        if stop <= checked or rows.size == 0:
+            return False
+        segment = equity[rows, checked:stop]
+        if mode == "forex" and checked == 0:
+            segment = segment.copy()
+            segment[:, 0] = initial_capital
+        hit_bars, reasons, peak[rows] = first_rule_violations(
+            segment, checked, peak[rows], initial_capital, pruning, traded[rows]
+        )
+        checked = stop
+        stopped = np.flatnonzero(hit_bars >= 0)
+        for row in stopped.tolist():
+            g = int(rows[row])
+            pruned_at[g] = hit_bars[row]
+            prune_reasons[g] = reasons[row]
+            running[g] = False
+        # Stopped genomes hold nothing from here on, so they cost no further work
+        qty[rows[stopped]] = 0
+        stop_level[rows[stopped]] = np.nan
+        take_level[rows[stopped]] = np.nan
+        return stopped.size > 0
+
+    events, starts, ends = flat.schedule()
+    prev = 0
+    k = 0
+    while k < len(events):
+        i = int(events[k])
+        changed = flat.genomes[starts[k]:ends[k]]
+        signal = held.copy()
+        signal[changed] = flat.direction[starts[k]:ends[k]]
+        active = np.zeros(n_genomes, dtype=bool)
+        active[changed] = True
+        if intrabar:
+            stop_now[changed] = np.nan if flat.stop_loss is None else flat.stop_loss[starts[k]:ends[k]]
+            take_now[changed] = np.nan if flat.take_profit is None else flat.take_profit[starts[k]:ends[k]]
+        price = float(close[i])
+        timestamp = index[i]
+
+        if mode != "forex":
+            _carry_population_equity(equity, close, prev + 1, i + 1, qty if mode == "equity" else np.where(qty > 0, qty, 0))
+        if intrabar:
+            _exit_at_levels(prev + 1, i + 1, signal)
+        if pruning is not None and _prune(i):
+            if not running.any():
+                # Bars up to i are settled; nothing after the prune bars is reported
+                prev = i
+                break
+            # Drop the upcoming events of stopped genomes (and bars on which only they change)
+            keep = np.ones(len(flat.bars), dtype=bool)
+            keep[ends[k]:] = running[flat.genomes[ends[k]:]]
+            flat = flat.select(keep)
+            events, starts, ends = flat.schedule()
+            active &= running
+
+        if mode == "equity":
+            buy = active & (signal == 1) & (last_signal <= 0)
+            sell = active & ~buy & (signal == -1) & (last_signal >= 0)
+            holding = active & ~buy & ~sell & (signal == 0) & (qty != 0)
+            other = active & ~buy & ~sell & ~holding
+            exit_long = holding & (last_signal == 1) & (held == -1) if i > 0 else holding & False
+
+            cover = buy & (qty < 0)
+            if cover.any():
+                buy_price_eff = price_adjuster(price, "buy", slippage_pct, commission_pct, is_entry=False)
+                cash[cover] += np.abs(qty[cover]) * buy_price_eff
+                _log(cover, timestamp, 'cover', buy_price_eff, np.abs(qty), reason=exit_reason)
+                qty[cover] = 0
+            if buy.any():
+                entry_price_eff = price_adjuster(price, "buy", slippage_pct, commission_pct, is_entry=True)
+                shares_to_buy = cash / entry_price_eff
+                filled = buy & (shares_to_buy > 0)
+                cash[filled] -= shares_to_buy[filled] * entry_price_eff
+                qty[filled] = shares_to_buy[filled]
+                _set_levels(filled)
+                _log(filled, timestamp, 'buy', entry_price_eff, shares_to_buy)
+                equity[buy, i] = cash[buy] + (qty[buy] * price)
+                last_signal[buy] = 1
+            close_long = sell & (qty > 0)
+            if close_long.any():
+                sell_price_eff = price_adjuster(price, "sell", slippage_pct, commission_pct, is_entry=False)
+                cash[close_long] += qty[close_long] * sell_price_eff
+                _log(close_long, timestamp, 'sell', sell_price_eff, qty, reason=exit_reason)
+                qty[close_long] = 0
+            equity[sell, i] = cash[sell]
+            last_signal[sell] = -1
+            if exit_long.any():
+                sell_price_eff = price_adjuster(price, "sell", slippage_pct, commission_pct, is_entry=False)
+                cash[exit_long] += qty[exit_long] * sell_price_eff
+                _log(exit_long, timestamp, 'sell_exit', sell_price_eff, qty, reason=exit_reason)
+                qty[exit_long] = 0
+                equity[exit_long, i] = cash[exit_long]
+                last_signal[exit_long] = 0
+            if i == 0:
+                equity[other, i] = initial_capital
+            last_signal[other] = signal[other]
+            next_event = int(events[k + 1]) if k + 1 < len(events) else n
+            positions[:, i:next_event] = qty[:, None]
+
+        elif mode == "crypto":
+            buy = active & (signal == 1) & (last_signal == 0)
+            sell = active & ~buy & (signal == -1) & (qty > 0)
+            other = active & ~buy & ~sell
+
+            if buy.any():
+                entry_price_eff = price_adjuster(price, "buy", slippage_pct, commission_pct, is_entry=True)
+                asset_to_buy = cash / entry_price_eff
+                filled = buy & (asset_to_buy > 0)
+                cash[filled] -= asset_to_buy[filled] * entry_price_eff
+                qty[filled] = asset_to_buy[filled]
+                _set_levels(filled)
+                _log(filled, timestamp, 'buy', entry_price_eff, asset_to_buy)
+                equity[buy, i] = cash[buy] + (qty[buy] * price)
+                last_signal[buy] = 1
+            if sell.any():
+                exit_price_eff = price_adjuster(price, "sell", slippage_pct, commission_pct, is_entry=False)
+                cash[sell] += qty[sell] * exit_price_eff
+                _log(sell, timestamp, 'sell', exit_price_eff, qty, reason=exit_reason)
+                qty[sell] = 0
+                equity[sell, i] = cash[sell]
+                last_signal[sell] = -1
+            if i == 0:
+                equity[other, i] = initial_capital
+            last_signal[other & (signal == 0)] = 0
+            next_event = int(events[k + 1]) if k + 1 < len(events) else n
+            positions[:, i:next_event] = qty[:, None]
+
+        else: # forex
+            buy = active & (signal == 1) & (last_signal <= 0)
+            sell = active & ~buy & (signal == -1) & (last_signal >= 0)
+            other = active & ~buy & ~sell
+
+            cover = buy & (qty < 0)
+            if cover.any():
+                buy_price_eff = price_adjuster(price, "buy", slippage_pct, commission_pct, is_entry=False)
+                cash_change = np.abs(qty) * (entry_price - buy_price_eff)
+                cash[cover] += np.abs(qty[cover]) * entry_price[cover] + cash_change[cover]
+                _log(cover, timestamp, 'cover', buy_price_eff, lot_size, cash_change, reason=exit_reason)
+                qty[cover] = 0
+            if buy.any():
+                entry_price_eff = price_adjuster(price, "buy", slippage_pct, commission_pct, is_entry=True)
+                qty[buy] = lot_size
+                _set_levels(buy)
+                entry_price[buy] = entry_price_eff
+                _log(buy, timestamp, 'buy', entry_price_eff, lot_size)
+                last_signal[buy] = 1
+            close_long = sell & (qty > 0)
+            if close_long.any():
+                sell_price_eff = price_adjuster(price, "sell", slippage_pct, commission_pct, is_entry=False)
+                cash_change = qty * (sell_price_eff - entry_price)
+                cash[close_long] += cash_change[close_long]
+                _log(close_long, timestamp, 'sell_long', sell_price_eff, lot_size, cash_change, reason=exit_reason)
+                qty[close_long] = 0
+            if sell.any():
+                entry_price_eff = price_adjuster(price, "sell", slippage_pct, commission_pct, is_entry=True)
+                qty[sell] = -lot_size
+                _set_levels(sell)
+                entry_price[sell] = entry_price_eff
+                _log(sell, timestamp, 'short', entry_price_eff, lot_size)
+                last_signal[sell] = -1
+            last_signal[other & (signal == 0)] = 0
+
+            # Mark every genome to market until the next event bar
+            next_event = int(events[k + 1]) if k + 1 < len(events) else n
+            segment = close[i:next_event]
+            long_rows = qty > 0
+            short_rows = qty < 0
+            equity[:, i:next_event] = cash[:, None]
+            if long_rows.any():
+                equity[long_rows, i:next_event] = cash[long_rows, None] + qty[long_rows, None] * segment
+            if short_rows.any():
+                units = np.abs(qty[short_rows, None])
+                entry = entry_price[short_rows, None]
+                equity[short_rows, i:next_event] = cash[short_rows, None] + (units * entry + units * (entry - segment))
+            positions[:, i:next_event] = qty[:, None]
+        held = signal
+        prev = i
+        k += 1
+
+    if mode == "forex":
+        if n > 0:
+            equity[:, 0] = initial_capital
+    else:
+        carried = qty if mode == "equity" else np.where(qty > 0, qty, 0)
+        _carry_population_equity(equity, close, prev + 1, n, carried)
+    if intrabar:
+        _exit_at_levels(prev + 1, n, held)
+    if pruning is not None:
+        _prune(n)
+
+    results = []
+    for g in range(n_genomes):
+        if pruned_at[g] < 0:
+            results.append(SimulationResult(equity[g], positions[g], trades_logs[g], float(cash[g]), n))
+            continue
+        # Partial result up to and including the prune bar; final_cash is the value marked on that bar
+        end = int(pruned_at[g]) + 1
+        last_timestamp = index[end - 1]
+        results.append(SimulationResult(
+            equity[g, :end].copy(), positions[g, :end].copy(),
+            [trade for trade in trades_logs[g] if trade['timestamp'] <= last_timestamp],
+            float(equity[g, end - 1]), end, pruned_at=end - 1, prune_reason=prune_reasons[g]
+        ))
+    return results
+
+@dataclass
+class BasketSimulationResult:
+    """Output of a basket simulation: one portfolio trading several symbols from shared cash."""
+    equity_curve: np.ndarray      # Portfolio value at the end of each bar
+    cash: np.ndarray              # Cash at the end of each bar
+    positions: np.ndarray         # (symbols x bars) quantity held at the end of each bar
+    symbol_pnl: np.ndarray        # (symbols x bars) realized plus open P&L of each symbol
+    trades_log: List[Dict[str, Any]]  # Raw fills: symbol, timestamp, type, price, qty
+    final_cash: float
+    bars_processed: int
+
+def simulate_basket(
+    close: np.ndarray,
+    signal_matrix: np.ndarray,
+    index: Sequence[Any],
+    symbols: Sequence[str],
+    initial_capital: float,
+    slippage_pct: float,
+    commission_pct: float,
+    price_adjuster: PriceAdjuster,
+    max_positions: Optional[int] = None,
+    position_size_pct: Optional[float] = None
+) -> BasketSimulationResult:
+    """
+    Simulate one portfolio trading a basket of symbols from a shared cash balance.
+
+    Each symbol is traded long-only: a change to signal 1 opens a position, a
+    change to -1 closes it and 0 keeps the current state. Instead of going
+    all-in, an entry buys up to position_size_pct of the current portfolio
+    value (limited by the cash left) and is skipped while max_positions
+    positions are open. On every bar exits are filled before entries, so the
+    cash and slots they free can be reused at once; competing entries are
+    filled in symbol order. Symbols without a price on a bar (NaN close, e.g.
+    before their first bar) do not trade on it.
+
+    As in simulate_population, only bars on which some symbol's signal
+    changes are evaluated; cash and positions are carried between them and
+    the whole equity curve is marked to market in one vectorized step.
+
+    Args:
+        close: (symbols x bars) close prices on a shared time axis
+        signal_matrix: (symbols x bars) signals (1 buy, -1 sell, 0 hold)
+        index: Bar timestamps used in the trade log
+        symbols: Symbol names, one per row
+        initial_capital: Starting cash of the whole portfolio
+        slippage_pct: Slippage percentage per fill
+        commission_pct: Commission percentage per fill
+        price_adjuster: Callable applying slippage and commission to a fill price
+        max_positions: Most positions open at once (default: one per symbol)
+        position_size_pct: Fraction of portfolio value per entry (default: 1 / max_positions)
+
+    Returns:
+        BasketSimulationResult with portfolio equity, cash, per-symbol positions and P&L
+    """
+    close = np.asarray(close, dtype=float)
+    signal_matrix = np.nan_to_num(np.asarray(signal_matrix, dtype=float))
+    if close.shape != signal_matrix.shape:
+        raise ValueError(f"Signal shape {signal_matrix.shape} does not match price shape {close.shape}")
+    n_symbols, n = close.shape
+    max_positions = min(max_positions or n_symbols, n_symbols)
+    position_size_pct = position_size_pct if position_size_pct is not None else 1.0 / max(max_positions, 1)
+
+    positions = np.zeros((n_symbols, n), dtype=float)
+    cash_curve = np.full(n, initial_capital, dtype=float)
+    flow_curve = np.zeros((n_symbols, n), dtype=float)  # Cumulative cash flow of each symbol
+    qty = np.zeros(n_symbols, dtype=float)
+    flows = np.zeros(n_symbols, dtype=float)
+    cash = initial_capital
+    trades_log = []
+    prev = 0
+
+    for i in population_change_points(signal_matrix).tolist():
+        positions[:, prev:i] = qty[:, None]
+        cash_curve[prev:i] = cash
+        flow_curve[:, prev:i] = flows[:, None]
+        prices = close[:, i]
+        signals = signal_matrix[:, i]
+        changed = np.ones(n_symbols, dtype=bool) if i == 0 else signals != signal_matrix[:, i - 1]
+        tradable = changed & np.isfinite(prices)
+        timestamp = index[i]
+
+        for j in np.flatnonzero(tradable & (signals == -1) & (qty > 0)).tolist():
+            exit_price_eff = price_adjuster(prices[j], "sell", slippage_pct, commission_pct, is_entry=False)
+            proceeds = qty[j] * exit_price_eff
+            cash += proceeds
+            flows[j] += proceeds
+            trades_log.append({'symbol': symbols[j], 'timestamp': timestamp, 'type': 'sell', 'price': exit_price_eff, 'qty': qty[j]})
+            qty[j] = 0.0
+
+        entries = np.flatnonzero(tradable & (signals == 1) & (qty == 0)).tolist()
+        if entries:
+            portfolio_value = cash + float(np.sum(qty * np.nan_to_num(prices)))
+            open_positions = int(np.count_nonzero(qty))
+            for j in entries:
+                budget = min(portfolio_value * position_size_pct, cash)
+                if open_positions >= max_positions or budget <= 0:
+                    break
+                entry_price_eff = price_adjuster(prices[j], "buy", slippage_pct, commission_pct, is_entry=True)
+                qty[j] = budget / entry_price_eff
+                cash -= budget
+                flows[j] -= budget
+                open_positions += 1
+                trades_log.append({'symbol': symbols[j], 'timestamp': timestamp, 'type': 'buy', 'price': entry_price_eff, 'qty': qty[j]})
+        prev = i
+
+    positions[:, prev:] = qty[:, None]
+    cash_curve[prev:] = cash
+    flow_curve[:, prev:] = flows[:, None]
+    holdings = np.where(positions != 0, positions * np.nan_to_num(close), 0.0)
+    equity = cash_curve + holdings.sum(axis=0)
+    return BasketSimulationResult(equity, cash_curve, positions, flow_curve + holdings, trades_log, cash, n)
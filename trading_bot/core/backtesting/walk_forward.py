@@ -0,0 +1,171 @@
+"""
+Walk-Forward Evaluation for BensBot backtests.
+
+Splits a backtest period into consecutive train/test folds (rolling or
+anchored), and condenses the per-fold metrics of a genome into a single
+robustness score: the mean test-window metric minus a penalty on its
+dispersion across folds. Backtesters compute indicators once over the full
+series and only slice the signals per fold (see
+BaseBacktester._run_walk_forward).
+"""
+
+import logging
+from dataclasses import dataclass
+from typing import Dict, Any, List, Optional, Sequence
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Fold segments
+SEGMENT_TRAIN = "train"
+SEGMENT_TEST = "test"
+
+@dataclass
+class WalkForwardConfig:
+    """How to split a backtest into walk-forward folds and score them."""
+    folds: int = 5
+    train_ratio: float = 0.7            # Train bars / (train + test bars) of one fold
+    anchored: bool = False              # Train windows grow from the first bar instead of rolling
+    min_train_bars: int = 30
+    min_test_bars: int = 20
+    score_metric: str = "sharpe_ratio"  # Test-window metric the robustness score is built from
+    dispersion_penalty: float = 1.0     # Multiple of the cross-fold std-dev subtracted from the mean
+    evaluate_train: bool = True         # Also simulate train windows (needed for walk-forward efficiency)
+
+    @classmethod
+    def from_dict(cls, config: Optional[Dict[str, Any]]) -> Optional["WalkForwardConfig"]:
+        """
+        Build a config from a plain dictionary (e.g. a JSON backtest config).
+
+        Args:
+            config: Mapping of WalkForwardConfig field names to values, or None
+
+        Returns:
+            WalkForwardConfig, or None if config is empty
+        """
+        if not config:
+            return None
+        return cls(**{key: value for key, value in config.items() if key in cls.__dataclass_fields__})
+
+@dataclass
+class WalkForwardFold:
+    """Bar positions of one fold; ends are exclusive."""
+    index: int
+    train_start: int
+    train_end: int
+    test_start: int
+    test_end: int
+
+    def window(self, segment: str) -> slice:
+        """Bar slice of the train or test segment."""
+        if segment == SEGMENT_TRAIN:
+            return slice(self.train_start, self.train_end)
+        return slice(self.test_start, self.test_end)
+
+def generate_folds(n_bars: int, config: WalkForwardConfig) -> List[WalkForwardFold]:
+    """
+    Split n_bars into walk-forward folds.
+
+    The test windows are equally long and tile the end of the data. Each
+    rolling train window ends where its test window starts and is
+    train_ratio / (1 - train_ratio) test windows long (the first one also
+    takes the bars that do not divide evenly); anchored train windows all
+    start on the first bar.
+
+    Args:
+        n_bars: Number of bars in the backtest
+        config: Fold layout
+
+    Returns:
+        List of WalkForwardFold in chronological order
+
+    Raises:
+        ValueError: If the configuration is invalid or the data too short for it
+    """
+    if config.folds < 1:
+        raise ValueError(f"Walk-forward needs at least one fold, got {config.folds}")
+    if not 0.0 < config.train_ratio < 1.0:
+        raise ValueError(f"train_ratio must be between 0 and 1, got {config.train_ratio}")
+
+    train_per_test = config.train_ratio / (1.0 - config.train_ratio)
+    test_bars = int(n_bars // (config.folds + train_per_test))
+    train_bars = n_bars - config.folds * test_bars
+    if test_bars < config.min_test_bars or train_bars < config.min_train_bars:
+        raise ValueError(
+            f"{n_bars} bars are too few for {config.folds} walk-forward folds "
+            f"(test windows of {test_bars} bars, train windows of {train_bars} bars; "
+            f"need at least {config.min_test_bars} and {config.min_train_bars})"
+        )
+
+    folds = []
+    for fold in range(config.folds):
+        test_start = train_bars + fold * test_bars
+        folds.append(WalkForwardFold(
+            index=fold,
+            train_start=0 if config.anchored else test_start - train_bars,
+            train_end=test_start,
+            test_start=test_start,
+            test_end=test_start + test_bars
+        ))
+    return folds
+
+def score_walk_forward(
+    folds: Sequence[WalkForwardFold],
+    fold_metrics: Sequence[Dict[str, Dict[str, Any]]],
+    config: WalkForwardConfig,
+    index: Optional[Sequence[Any]] = None
+) -> Dict[str, Any]:
+    """
+    Aggregate one genome's per-fold metrics into a robustness score.
+
+    Args:
+        folds: Folds the metrics were measured on
+        fold_metrics: Per fold, a mapping of segment ("train"/"test") to metrics
+        config: Scoring settings
+        index: Bar timestamps, used to label the fold windows with dates
+
+    Returns:
+        Dictionary with robustness_score (mean minus dispersion_penalty times
+        the std-dev of the test-window score_metric), its mean and std-dev,
+        positive_fold_ratio (share of test windows with a positive return),
+        efficiency (mean test over mean train annualized return, None without
+        profitable train windows) and the per-fold windows and metrics
+    """
+    test_scores = np.array(
+        [metrics[SEGMENT_TEST].get(config.score_metric, np.nan) for metrics in fold_metrics], dtype=float
+    )
+    test_scores = np.where(np.isfinite(test_scores), test_scores, 0.0)
+    mean_score = float(test_scores.mean()) if len(test_scores) else 0.0
+    std_score = float(test_scores.std()) if len(test_scores) else 0.0
+    test_returns = [metrics[SEGMENT_TEST].get("total_return") or 0.0 for metrics in fold_metrics]
+
+    efficiency = None
+    if config.evaluate_train:
+        train_annual = np.mean([metrics[SEGMENT_TRAIN].get("annualized_return") or 0.0 for metrics in fold_metrics])
+        test_annual = np.mean([metrics[SEGMENT_TEST].get("annualized_return") or 0.0 for metrics in fold_metrics])
+        if train_annual > 0:
+            efficiency = float(test_annual / train_annual)
+
+    def label(start: int, end: int) -> List[Any]:
+        if index is None:
+            return [start, end]
+        return [str(index[start]), str(index[end - 1])]
+
+    return {
+        "score_metric": config.score_metric,
+        "robustness_score": mean_score - config.dispersion_penalty * std_score,
+        "mean_test_score": mean_score,
+        "std_test_score": std_score,
+        "positive_fold_ratio": sum(1 for value in test_returns if value > 0) / len(test_returns) if test_returns else 0.0,
+        "efficiency": efficiency,
+        "folds": [
+            {
+                "fold": fold.index,
+                "train_window": label(fold.train_start, fold.train_end),
+                "test_window": label(fold.test_start, fold.test_end),
+                **{segment: dict(values) for segment, values in metrics.items()},
+            }
+            for fold, metrics in zip(folds, fold_metrics)
+        ],
+    }
@@ -0,0 +1,36 @@
+"""
+Benchmarks package for BensBot.
+
+Deterministic synthetic market data and benchmark scenarios for measuring
+backtester bars/second and EvoTrader generations/hour without network
+access, plus JSON baselines for catching performance regressions.
+"""
+
+from trading_bot.core.benchmarks.synthetic_data import (
+    MarketRegime,
+    SyntheticMarketConfig,
+    SyntheticMarketGenerator,
+    SyntheticDataFetcher,
+)
+from trading_bot.core.benchmarks.scenarios import BenchmarkConfig, BenchmarkResult, SCENARIOS, run_benchmarks
+from trading_bot.core.benchmarks.baseline import (
+    save_baseline,
+    load_baseline,
+    compare_to_baseline,
+    format_comparison,
+)
+
+__all__ = [
+    "MarketRegime",
+    "SyntheticMarketConfig",
+    "SyntheticMarketGenerator",
+    "SyntheticDataFetcher",
+    "BenchmarkConfig",
+    "BenchmarkResult",
+    "SCENARIOS",
+    "run_benchmarks",
+    "save_baseline",
+    "load_baseline",
+    "compare_to_baseline",
+    "format_comparison",
+]
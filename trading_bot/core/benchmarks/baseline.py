@@ -0,0 +1,144 @@
+"""
+Benchmark Baselines for BensBot.
+
+Stores benchmark reports as JSON baselines and compares new runs against
+them, flagging scenarios whose throughput dropped beyond a tolerance.
+"""
+
+import json
+import logging
+import os
+from typing import Dict, Any, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Comparison statuses
+STATUS_OK = "ok"
+STATUS_REGRESSION = "regression"
+STATUS_IMPROVEMENT = "improvement"
+STATUS_NEW = "new"
+STATUS_MISSING = "missing"
+
+def save_baseline(report: Dict[str, Any], path: str) -> None:
+    """Write a benchmark report to path as a JSON baseline."""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(report, f, indent=2, sort_keys=True, default=str)
+    logger.info(f"Saved benchmark baseline with {len(report.get('results', {}))} scenarios to {path}")
+
+def load_baseline(path: str) -> Optional[Dict[str, Any]]:
+    """Read a JSON baseline; None if the file does not exist or is unreadable."""
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, "r") as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError) as e:
+        logger.error(f"Could not read benchmark baseline {path}: {e}")
+        return None
+
+def compare_to_baseline(
+    current: Dict[str, Any],
+    baseline: Dict[str, Any],
+    tolerance: float = 0.10,
+    tolerances: Optional[Dict[str, float]] = None
+) -> Dict[str, Any]:
+    """
+    Compare scenario throughput of a report against a baseline.
+
+    Args:
+        current: Report from run_benchmarks
+        baseline: Earlier report (see save_baseline)
+        tolerance: Allowed fractional throughput drop before a scenario regresses
+        tolerances: Per-scenario overrides of tolerance, keyed by scenario name
+
+    Returns:
+        Dictionary with per-scenario rows, the names of regressed scenarios,
+        passed (True when nothing regressed) and the environment fields
+        (CPU count, platform, library versions) that differ from the baseline
+    """
+    tolerances = tolerances or {}
+    current_results = current.get("results", {})
+    baseline_results = baseline.get("results", {})
+
+    rows: List[Dict[str, Any]] = []
+    for name in sorted(set(current_results) | set(baseline_results)):
+        now = current_results.get(name)
+        before = baseline_results.get(name)
+        limit = tolerances.get(name, tolerance)
+        row = {
+            "name": name,
+            "unit": (now or before).get("unit"),
+            "baseline": before.get("throughput") if before else None,
+            "current": now.get("throughput") if now else None,
+            "change_pct": None,
+            "tolerance": limit,
+        }
+        if before is None:
+            row["status"] = STATUS_NEW
+        elif now is None:
+            row["status"] = STATUS_MISSING
+        elif not before.get("throughput"):
+            row["status"] = STATUS_OK
+        else:
+            change = now["throughput"] / before["throughput"] - 1.0
+            row["change_pct"] = change * 100.0
+            if change < -limit:
+                row["status"] = STATUS_REGRESSION
+            elif change > limit:
+                row["status"] = STATUS_IMPROVEMENT
+            else:
+                row["status"] = STATUS_OK
+        rows.append(row)
+
+    regressions = [row["name"] for row in rows if row["status"] == STATUS_REGRESSION]
+    # Throughput recorded on another machine or stack is only a rough reference
+    current_env = current.get("environment", {})
+    baseline_env = baseline.get("environment", {})
+    environment_changes = {
+        key: (baseline_env.get(key), current_env.get(key))
+        for key in sorted(set(current_env) | set(baseline_env))
+        if baseline_env.get(key) != current_env.get(key)
+    }
+    return {
+        "rows": rows,
+        "regressions": regressions,
+        "passed": not regressions,
+        "baseline_created_at": baseline.get("created_at"),
+        "current_created_at": current.get("created_at"),
+        "environment_changes": environment_changes,
+    }
+
+def format_comparison(comparison: Dict[str, Any]) -> str:
+    """Render a compare_to_baseline result as a plain-text table."""
+    header = f"{'scenario':<44} {'baseline':>14} {'current':>14} {'change':>9}  {'unit':<12} status"
+    lines = [
+        f"Benchmark comparison (baseline {comparison.get('baseline_created_at')}, "
+        f"current {comparison.get('current_created_at')})",
+    ]
+    changes = comparison.get("environment_changes")
+    if changes:
+        differences = ", ".join(f"{key} {before} -> {now}" for key, (before, now) in changes.items())
+        lines.append(f"Baseline was recorded on a different environment ({differences}); "
+                     f"throughput is not directly comparable")
+    lines += [header, "-" * len(header)]
+
+    def fmt(value: Optional[float]) -> str:
+        return f"{value:,.1f}" if value is not None else "-"
+
+    for row in comparison["rows"]:
+        change = f"{row['change_pct']:+.1f}%" if row["change_pct"] is not None else "-"
+        status = row["status"].upper() if row["status"] == STATUS_REGRESSION else row["status"]
+        lines.append(
+            f"{row['name']:<44} {fmt(row['baseline']):>14} {fmt(row['current']):>14} "
+            f"{change:>9}  {str(row['unit']) + '/s':<12} {status}"
+        )
+
+    regressions = comparison["regressions"]
+    if regressions:
+        lines.append(f"{len(regressions)} regression(s): {', '.join(regressions)}")
+    else:
+        lines.append("No regressions")
+    return "\n".join(lines)
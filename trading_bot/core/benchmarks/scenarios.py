@@ -0,0 +1,453 @@
+"""
+Benchmark Scenarios for BensBot.
+
+Times the hot paths of the backtesting and evolution stack on synthetic
+data: each historical backtester (single and population runs), every
+strategy's signal generation, frame versus BarArrays signal input,
+Monte Carlo simulation, one EvoTrader generation, and
+run_parallel_backtests across worker counts.
+"""
+
+import importlib
+import inspect
+import logging
+import multiprocessing as mp
+import os
+import pkgutil
+import platform
+import random
+import shutil
+import statistics
+import tempfile
+import time
+import tracemalloc
+from dataclasses import dataclass, field, asdict
+from datetime import datetime
+from typing import Dict, Any, List, Optional, Callable, Tuple
+
+import numpy as np
+import pandas as pd
+
+from trading_bot.core.backtesting.historical_equity_backtester import HistoricalEquityBacktester
+from trading_bot.core.backtesting.historical_crypto_backtester import HistoricalCryptoBacktester
+from trading_bot.core.backtesting.historical_forex_backtester import HistoricalForexBacktester
+from trading_bot.core.backtesting.parallel_backtester import run_parallel_backtests
+from trading_bot.core.benchmarks.synthetic_data import SyntheticDataFetcher, SyntheticMarketConfig
+from trading_bot.core.simulation.monte_carlo import MonteCarloSimulator
+from trading_bot.core.signals.bar_arrays import BarArrays
+from trading_bot.core.strategies.base_strategy import BaseStrategy
+from trading_bot.core.strategies.feature_cache import get_feature_cache
+from trading_bot.core.strategies.crypto.crypto_breakout_strategy import CryptoBreakoutStrategy
+from trading_bot.core.strategies.equity.equity_trend_strategy import EquityTrendStrategy
+from trading_bot.core.strategies.forex.forex_mean_reversion_strategy import ForexMeanReversionStrategy
+
+logger = logging.getLogger(__name__)
+
+# Strategy subpackages scanned for benchmarkable strategies; "general" runs as equity
+STRATEGY_PACKAGES = ("equity", "crypto", "forex", "general")
+
+# Backtester, default strategy and synthetic symbol per asset class
+BACKTESTER_CASES = {
+    "equity": (HistoricalEquityBacktester, EquityTrendStrategy, "SYN"),
+    "crypto": (HistoricalCryptoBacktester, CryptoBreakoutStrategy, "SYN/USDT"),
+    "forex": (HistoricalForexBacktester, ForexMeanReversionStrategy, "SYNUSD=X"),
+}
+
+@dataclass
+class BenchmarkConfig:
+    """Workload sizes for a benchmark run."""
+    seed: int = 42
+    start_date: str = "2015-01-01"
+    end_date: str = "2022-12-31"
+    interval: str = "1d"
+    repeats: int = 3  # Timed runs per scenario; the fastest is reported
+    warmup: int = 1  # Untimed runs before timing
+    population_size: int = 20
+    monte_carlo_simulations: int = 200
+    parallel_genomes: int = 32
+    max_workers: Optional[int] = None  # Upper bound for worker scaling (default: CPU count)
+
+@dataclass
+class BenchmarkResult:
+    """Timing of one scenario."""
+    name: str
+    category: str
+    seconds: float  # Fastest timed run
+    mean_seconds: float
+    work: float  # Work items per run (bars, genome-bars, simulations, generations)
+    unit: str
+    throughput: float  # work / seconds
+    extra: Dict[str, Any] = field(default_factory=dict)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+def _time_call(fn: Callable[[], Any], repeats: int, warmup: int) -> Tuple[float, float]:
+    """Return (best, mean) wall time of fn over repeats runs after warmup runs."""
+    for _ in range(max(warmup, 0)):
+        fn()
+    timings = []
+    for _ in range(max(repeats, 1)):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings), statistics.mean(timings)
+
+def _peak_allocation_mb(fn: Callable[[], Any]) -> float:
+    """Peak traced allocation of one fn() call above the memory in use before it, in megabytes."""
+    started = not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start()
+    tracemalloc.reset_peak()
+    current, _ = tracemalloc.get_traced_memory()
+    try:
+        fn()
+    finally:
+        _, peak = tracemalloc.get_traced_memory()
+        if started:
+            tracemalloc.stop()
+    return (peak - current) / (1024 * 1024)
+
+def _make_result(
+    name: str,
+    category: str,
+    timings: Tuple[float, float],
+    work: float,
+    unit: str,
+    **extra: Any
+) -> BenchmarkResult:
+    best, mean = timings
+    return BenchmarkResult(
+        name=name,
+        category=category,
+        seconds=best,
+        mean_seconds=mean,
+        work=work,
+        unit=unit,
+        throughput=work / best if best > 0 else 0.0,
+        extra=extra
+    )
+
+def default_parameters(strategy_class: Any) -> Dict[str, Any]:
+    """Schema defaults of a strategy class."""
+    schema = strategy_class.get_parameter_schema()
+    return {name: spec["default"] for name, spec in schema.items() if "default" in spec}
+
+def sample_parameters(strategy_class: Any, rng: random.Random) -> Dict[str, Any]:
+    """Draw a random parameter set within the strategy's schema ranges."""
+    parameters = default_parameters(strategy_class)
+    for name, spec in strategy_class.get_parameter_schema().items():
+        if "min" not in spec or "max" not in spec:
+            continue
+        if spec.get("type") == "int":
+            parameters[name] = rng.randint(spec["min"], spec["max"])
+        elif spec.get("type") == "float":
+            parameters[name] = rng.uniform(spec["min"], spec["max"])
+    return parameters
+
+def discover_strategy_classes() -> Dict[str, Tuple[Any, str]]:
+    """
+    Find the concrete strategies in core/strategies.
+
+    Returns:
+        Mapping of class name to (class, asset_class)
+    """
+    found: Dict[str, Tuple[Any, str]] = {}
+    for package_name in STRATEGY_PACKAGES:
+        package = importlib.import_module(f"trading_bot.core.strategies.{package_name}")
+        for module_info in pkgutil.iter_modules(package.__path__):
+            module_path = f"{package.__name__}.{module_info.name}"
+            try:
+                module = importlib.import_module(module_path)
+            except Exception as e:
+                logger.error(f"Could not import {module_path} for benchmarking: {e}")
+                continue
+            for name, obj in inspect.getmembers(module, inspect.isclass):
+                if (issubclass(obj, BaseStrategy) and obj.__module__ == module.__name__
+                        and not inspect.isabstract(obj)):
+                    asset_class = "equity" if package_name == "general" else package_name
+                    found[name] = (obj, asset_class)
+    return found
+
+def _backtest_config(config: BenchmarkConfig, asset_class: str, symbol: str) -> Dict[str, Any]:
+    return {
+        "asset_class": asset_class,
+        "symbol": symbol,
+        "start_date": config.start_date,
+        "end_date": config.end_date,
+        "interval": config.interval,
+    }
+
+def bench_backtesters(config: BenchmarkConfig, fetcher: SyntheticDataFetcher) -> List[BenchmarkResult]:
+    """Single and population backtests for each historical backtester."""
+    results = []
+    for asset_class, (backtester_class, strategy_class, symbol) in BACKTESTER_CASES.items():
+        backtester = backtester_class(fetcher)
+        run_config = _backtest_config(config, asset_class, symbol)
+        bars = len(fetcher.fetch(symbol, asset_class, config.start_date, config.end_date, config.interval))
+        parameters = default_parameters(strategy_class)
+
+        timings = _time_call(
+            lambda: backtester.run_backtest(
+                strategy_id="bench", strategy_class=strategy_class,
+                parameters=dict(parameters), **run_config
+            ),
+            config.repeats, config.warmup
+        )
+        results.append(_make_result(
+            f"backtester.{asset_class}.single", "backtester", timings, bars, "bars",
+            backtester=backtester_class.__name__, strategy=strategy_class.__name__
+        ))
+
+        rng = random.Random(config.seed)
+        genomes = [
+            (f"bench_{i}", sample_parameters(strategy_class, rng))
+            for i in range(config.population_size)
+        ]
+        timings = _time_call(
+            lambda: backtester.run_population_backtest(
+                strategy_class=strategy_class,
+                genomes=[(gid, dict(params)) for gid, params in genomes],
+                **run_config
+            ),
+            config.repeats, config.warmup
+        )
+        results.append(_make_result(
+            f"backtester.{asset_class}.population", "backtester", timings,
+            bars * len(genomes), "genome-bars",
+            backtester=backtester_class.__name__, strategy=strategy_class.__name__,
+            genomes=len(genomes), bars=bars
+        ))
+    return results
+
+def bench_strategies(config: BenchmarkConfig, fetcher: SyntheticDataFetcher) -> List[BenchmarkResult]:
+    """Signal generation of every strategy in core/strategies, with a cold feature cache."""
+    results = []
+    feature_cache = get_feature_cache()
+    for name, (strategy_class, asset_class) in sorted(discover_strategy_classes().items()):
+        symbol = BACKTESTER_CASES.get(asset_class, BACKTESTER_CASES["equity"])[2]
+        data = fetcher.fetch(symbol, asset_class, config.start_date, config.end_date, config.interval)
+        try:
+            strategy = strategy_class(strategy_id=f"bench_{name}", parameters=default_parameters(strategy_class))
+        except Exception as e:
+            logger.error(f"Could not build {name} with default parameters: {e}")
+            continue
+
+        def generate() -> None:
+            feature_cache.clear()
+            strategy.generate_signals(data.copy())
+
+        try:
+            timings = _time_call(generate, config.repeats, config.warmup)
+        except Exception as e:
+            logger.error(f"Signal generation failed for {name}: {e}")
+            continue
+        results.append(_make_result(
+            f"strategy.{name}", "strategy", timings, len(data), "bars", asset_class=asset_class
+        ))
+    return results
+
+def bench_signal_inputs(config: BenchmarkConfig, fetcher: SyntheticDataFetcher) -> List[BenchmarkResult]:
+    """
+    Frame versus BarArrays signal input for strategies that support BarArrays.
+
+    The frame path is how backtesters call other strategies: copy the OHLCV
+    frame and run generate_signals on the copy. The bars path wraps the frame
+    in BarArrays and runs generate_signals_from_bars, copying nothing.
+    """
+    results = []
+    feature_cache = get_feature_cache()
+    for name, (strategy_class, asset_class) in sorted(discover_strategy_classes().items()):
+        if not strategy_class.supports_bar_arrays():
+            continue
+        symbol = BACKTESTER_CASES.get(asset_class, BACKTESTER_CASES["equity"])[2]
+        data = fetcher.fetch(symbol, asset_class, config.start_date, config.end_date, config.interval)
+        try:
+            strategy = strategy_class(strategy_id=f"bench_{name}", parameters=default_parameters(strategy_class))
+        except Exception as e:
+            logger.error(f"Could not build {name} with default parameters: {e}")
+            continue
+
+        inputs = {
+            "frame": (lambda: strategy.generate_signals(data.copy()), int(data.memory_usage(deep=True).sum())),
+            "bars": (lambda: strategy.generate_signals_from_bars(BarArrays.from_frame(data)), 0),
+        }
+        frame_seconds = None
+        for input_name, (generate, copied_bytes) in inputs.items():
+            def run(generate: Callable[[], Any] = generate) -> None:
+                feature_cache.clear()
+                generate()
+
+            try:
+                timings = _time_call(run, config.repeats, config.warmup)
+                peak_mb = _peak_allocation_mb(run)
+            except Exception as e:
+                logger.error(f"{input_name} signal input failed for {name}: {e}")
+                break
+            result = _make_result(
+                f"signal_input.{name}.{input_name}", "signal_input", timings, len(data), "bars",
+                asset_class=asset_class, input_bytes_copied=copied_bytes, peak_mb=peak_mb
+            )
+            if frame_seconds is None:
+                frame_seconds = result.seconds
+            else:
+                result.extra["speedup"] = frame_seconds / result.seconds if result.seconds > 0 else 0.0
+            results.append(result)
+    return results
+
+def bench_monte_carlo(config: BenchmarkConfig, fetcher: SyntheticDataFetcher) -> List[BenchmarkResult]:
+    """MonteCarloSimulator.simulate on the daily returns of a synthetic equity."""
+    data = fetcher.fetch("SYN", "equity", config.start_date, config.end_date, config.interval)
+    returns = data["Close"].pct_change().dropna()
+    simulator = MonteCarloSimulator(num_simulations=config.monte_carlo_simulations, random_seed=config.seed)
+    timings = _time_call(
+        lambda: simulator.simulate(returns, include_plot=False),
+        config.repeats, config.warmup
+    )
+    return [_make_result(
+        "monte_carlo.simulate", "monte_carlo", timings, config.monte_carlo_simulations, "simulations",
+        bars=len(returns)
+    )]
+
+def bench_ga_generation(config: BenchmarkConfig, fetcher: SyntheticDataFetcher) -> List[BenchmarkResult]:
+    """One EvoTrader generation (backtest + evolve) with serial, uncached backtests."""
+    # Imported here: EvoTrader pulls in the whole evolution package
+    from trading_bot.core.evolution.evo_trader import EvoTrader
+    from trading_bot.core.strategies.strategy_factory import strategy_factory
+
+    strategy_type = "equity_equitytrendstrategy"
+    if strategy_factory.get_strategy_metadata(strategy_type) is None:
+        strategy_factory.register_strategy(strategy_type, EquityTrendStrategy, "equity", "Benchmark trend strategy")
+
+    run_config = _backtest_config(config, "equity", "SYN")
+    bars = len(fetcher.fetch("SYN", "equity", config.start_date, config.end_date, config.interval))
+    work_dir = tempfile.mkdtemp(prefix="bensbot_bench_")
+    try:
+        evo_trader = EvoTrader(
+            config_path=os.path.join(work_dir, "evolution.json"),
+            data_dir=os.path.join(work_dir, "evolution"),
+            backtester_registry={"equity": HistoricalEquityBacktester(fetcher)}
+        )
+        evo_trader.config.population_size = config.population_size
+        evo_trader.config.use_parallel_backtesting = False
+        evo_trader.result_cache = None  # Measure the work, not cache lookups
+        random.seed(config.seed)
+        evo_trader.start_evolution(strategy_type, run_config)
+
+        def generation() -> None:
+            evo_trader.run_backtest_generation(run_config)
+            evo_trader.evolve_generation()
+
+        timings = _time_call(generation, config.repeats, config.warmup)
+        evo_trader.shutdown()
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    result = _make_result(
+        "evolution.generation", "evolution", timings, 1, "generations",
+        population_size=config.population_size, bars=bars
+    )
+    result.extra["generations_per_hour"] = 3600.0 / result.seconds if result.seconds > 0 else 0.0
+    return [result]
+
+def _worker_counts(max_workers: int) -> List[int]:
+    counts = [1]
+    while counts[-1] * 2 <= max_workers:
+        counts.append(counts[-1] * 2)
+    if counts[-1] != max_workers:
+        counts.append(max_workers)
+    return counts
+
+def bench_parallel_scaling(config: BenchmarkConfig, fetcher: SyntheticDataFetcher) -> List[BenchmarkResult]:
+    """run_parallel_backtests over 1, 2, 4, ... max_workers processes."""
+    max_workers = config.max_workers or mp.cpu_count()
+    run_config = _backtest_config(config, "equity", "SYN")
+    bars = len(fetcher.fetch("SYN", "equity", config.start_date, config.end_date, config.interval))
+    rng = random.Random(config.seed)
+    genomes = [
+        {"id": f"bench_{i}", "type": "equity_trend", "parameters": sample_parameters(EquityTrendStrategy, rng)}
+        for i in range(config.parallel_genomes)
+    ]
+
+    results = []
+    baseline_seconds = None
+    for workers in _worker_counts(max_workers):
+        timings = _time_call(
+            lambda: run_parallel_backtests(
+                backtester_constructor=HistoricalEquityBacktester,
+                backtester_kwargs={"historical_data_fetcher": fetcher},
+                strategy_genomes=genomes,
+                strategy_classes={"equity_trend": EquityTrendStrategy},
+                backtest_config=run_config,
+                max_workers=workers
+            ),
+            config.repeats, 0
+        )
+        result = _make_result(
+            f"parallel.workers_{workers}", "parallel", timings, bars * len(genomes), "genome-bars",
+            workers=workers, genomes=len(genomes)
+        )
+        if baseline_seconds is None:
+            baseline_seconds = result.seconds
+        speedup = baseline_seconds / result.seconds if result.seconds > 0 else 0.0
+        result.extra["speedup"] = speedup
+        result.extra["efficiency"] = speedup / workers
+        results.append(result)
+    return results
+
+# Scenario groups in run order
+SCENARIOS: Dict[str, Callable[[BenchmarkConfig, SyntheticDataFetcher], List[BenchmarkResult]]] = {
+    "backtesters": bench_backtesters,
+    "strategies": bench_strategies,
+    "signal_inputs": bench_signal_inputs,
+    "monte_carlo": bench_monte_carlo,
+    "ga_generation": bench_ga_generation,
+    "parallel_scaling": bench_parallel_scaling,
+}
+
+def _environment() -> Dict[str, Any]:
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "processor": platform.processor(),
+        "cpu_count": mp.cpu_count(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+    }
+
+def run_benchmarks(
+    config: Optional[BenchmarkConfig] = None,
+    scenarios: Optional[List[str]] = None
+) -> Dict[str, Any]:
+    """
+    Run benchmark scenario groups on synthetic data.
+
+    Args:
+        config: Workload sizes (default: BenchmarkConfig())
+        scenarios: Names from SCENARIOS to run (default: all)
+
+    Returns:
+        Report with config, environment and per-scenario results keyed by name
+    """
+    config = config or BenchmarkConfig()
+    selected = scenarios or list(SCENARIOS)
+    unknown = [name for name in selected if name not in SCENARIOS]
+    if unknown:
+        raise ValueError(f"Unknown benchmark scenarios: {unknown}. Available: {list(SCENARIOS)}")
+
+    fetcher = SyntheticDataFetcher(SyntheticMarketConfig(seed=config.seed))
+    results: Dict[str, Any] = {}
+    for scenario in selected:
+        logger.info(f"Running benchmark scenario '{scenario}'")
+        start = time.perf_counter()
+        for result in SCENARIOS[scenario](config, fetcher):
+            results[result.name] = result.to_dict()
+            logger.info(f"{result.name}: {result.throughput:,.1f} {result.unit}/s ({result.seconds:.4f}s)")
+        logger.info(f"Scenario '{scenario}' finished in {time.perf_counter() - start:.1f}s")
+
+    return {
+        "created_at": datetime.utcnow().isoformat(),
+        "config": asdict(config),
+        "environment": _environment(),
+        "results": results,
+    }
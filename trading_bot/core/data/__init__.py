@@ -1,3 +1,16 @@
-from .historical_data_fetcher import HistoricalDataFetcher
+from .bar_file import BarFile, write_bar_file
+from .bar_store import BarStore
+from .historical_data_fetcher import BarUpdate, FetchManyResult, HistoricalDataFetcher
+from .indicator_window import IndicatorWindow
+from .rate_limiter import TokenBucket
 
-__all__ = ["HistoricalDataFetcher"] 
\ No newline at end of file
+__all__ = [
+    "BarFile",
+    "BarStore",
+    "BarUpdate",
+    "FetchManyResult",
+    "HistoricalDataFetcher",
+    "IndicatorWindow",
+    "TokenBucket",
+    "write_bar_file",
+]
@@ -0,0 +1,283 @@
+"""
+Memory-Mapped Columnar Bar Files for BensBot.
+
+Each worker process used to parse bars into its own pandas objects, so
+memory grew with workers x symbols x history. A bar file stores a series
+in a fixed layout that is mapped instead of read:
+
+    8-byte magic | uint32 header length | JSON header | padding
+    int64 epoch-nanosecond timestamps (naive UTC, ascending)
+    one fixed-width column after another (float64, float32 or int64)
+
+Every buffer starts on a 64-byte boundary. Opening a file parses only the
+header, so it costs the same for a day of bars as for years of minute
+bars; slices by date are found by binary search on the timestamp column
+and returned as read-only views of the mapping. Pages are loaded on first
+touch and shared through the OS page cache by every process that maps the
+same file.
+"""
+
+import json
+import os
+import struct
+import threading
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+MAGIC = b"BENSBAR1"
+FORMAT_VERSION = 1
+
+_PREFIX = struct.Struct("<8sI")  # Magic, header length
+_ALIGNMENT = 64
+
+TimeLike = Union[str, datetime, pd.Timestamp, int]
+
+def _aligned(offset: int) -> int:
+    return (offset + _ALIGNMENT - 1) // _ALIGNMENT * _ALIGNMENT
+
+def to_utc_timestamp(value: Union[str, datetime, pd.Timestamp]) -> pd.Timestamp:
+    """Naive UTC timestamp of a date, datetime or Timestamp (aware values are converted)."""
+    timestamp = pd.Timestamp(value)
+    if timestamp.tzinfo is not None:
+        timestamp = timestamp.tz_convert("UTC").tz_localize(None)
+    return timestamp
+
+def _to_nanoseconds(value: TimeLike) -> int:
+    if isinstance(value, (int, np.integer)):
+        return int(value)
+    return to_utc_timestamp(value).as_unit("ns").value
+
+class BarFileWriter:
+    """
+    Writes a bar file of known length, block by block.
+
+    Rows are written in order with write(), so a series can be assembled
+    from partitions without holding all of it in memory. The file only
+    appears at its path once commit() succeeds.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        length: int,
+        columns: Sequence[Tuple[str, Any]],
+        index_tz: Optional[str] = None,
+        index_name: Optional[str] = "Timestamp",
+        metadata: Optional[Dict[str, Any]] = None
+    ):
+        """
+        Args:
+            path: Destination file
+            length: Number of bars the file will hold
+            columns: (name, dtype) of every column, in order
+            index_tz: Timezone to present the timestamps in (stored as UTC)
+            index_name: Name of the index of frames read from the file
+            metadata: JSON-serializable values stored in the header
+        """
+        self.path = path
+        self.length = int(length)
+        self._position = 0
+        layout = []
+        offset = _aligned(self.length * 8)  # Timestamps come first
+        for name, dtype in columns:
+            dtype = np.dtype(dtype).newbyteorder("<")
+            layout.append([str(name), dtype.str, offset])
+            offset = _aligned(offset + self.length * dtype.itemsize)
+        header = json.dumps({
+            "version": FORMAT_VERSION,
+            "length": self.length,
+            "index_tz": index_tz,
+            "index_name": index_name,
+            "columns": layout,
+            "metadata": metadata or {}
+        }).encode()
+        data_start = _aligned(_PREFIX.size + len(header))
+
+        self._tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        self._map = np.memmap(self._tmp_path, dtype=np.uint8, mode="w+", shape=(max(data_start + offset, 1),))
+        _PREFIX.pack_into(self._map, 0, MAGIC, len(header))
+        self._map[_PREFIX.size:_PREFIX.size + len(header)] = np.frombuffer(header, dtype=np.uint8)
+        self._timestamps = np.ndarray(self.length, dtype="<i8", buffer=self._map, offset=data_start)
+        self._columns = {
+            name: np.ndarray(self.length, dtype=np.dtype(dtype), buffer=self._map, offset=data_start + column_offset)
+            for name, dtype, column_offset in layout
+        }
+
+    def write(self, timestamps: np.ndarray, columns: Dict[str, np.ndarray]) -> None:
+        """
+        Append a block of rows.
+
+        Args:
+            timestamps: Epoch-nanosecond timestamps of the block (naive UTC)
+            columns: Values per column name; columns missing from the block are
+                     written as NaN (float columns) or 0 (integer columns)
+
+        Raises:
+            ValueError: If the block would exceed the declared length
+        """
+        n = len(timestamps)
+        start, stop = self._position, self._position + n
+        if stop > self.length:
+            raise ValueError(f"Bar file declared {self.length} rows; cannot write rows {start}-{stop}")
+        self._timestamps[start:stop] = timestamps
+        for name, target in self._columns.items():
+            values = columns.get(name)
+            if values is None:
+                target[start:stop] = np.nan if target.dtype.kind == "f" else 0
+            else:
+                target[start:stop] = values
+        self._position = stop
+
+    def commit(self) -> None:
+        """Flush the file and move it into place."""
+        if self._position != self.length:
+            self.abort()
+            raise ValueError(f"Bar file declared {self.length} rows but {self._position} were written")
+        self._map.flush()
+        self._release()
+        os.replace(self._tmp_path, self.path)
+
+    def abort(self) -> None:
+        """Discard the partially written file."""
+        self._release()
+        if os.path.exists(self._tmp_path):
+            os.remove(self._tmp_path)
+
+    def _release(self) -> None:
+        self._timestamps = None
+        self._columns = {}
+        self._map = None
+
+def write_bar_file(
+    path: str,
+    data: pd.DataFrame,
+    float32: bool = False,
+    metadata: Optional[Dict[str, Any]] = None
+) -> None:
+    """
+    Write a DataFrame of numeric bars as a bar file.
+
+    Args:
+        path: Destination file
+        data: Bars with a DatetimeIndex, sorted by time
+        float32: Store float64 columns as float32 (half the size, ~7 significant digits)
+        metadata: JSON-serializable values stored in the header
+    """
+    index = pd.DatetimeIndex(data.index)
+    tz = str(index.tz) if index.tz is not None else None
+    if tz is not None:
+        index = index.tz_convert("UTC").tz_localize(None)
+    columns = []
+    for name in data.columns:
+        dtype = data[name].to_numpy().dtype
+        if dtype == np.bool_:
+            dtype = np.dtype(np.int64)
+        if float32 and dtype == np.float64:
+            dtype = np.dtype(np.float32)
+        columns.append((name, dtype))
+    writer = BarFileWriter(path, len(data), columns, index_tz=tz, index_name=data.index.name, metadata=metadata)
+    try:
+        writer.write(index.as_unit("ns").asi8, {str(name): data[name].to_numpy() for name in data.columns})
+    except Exception:
+        writer.abort()
+        raise
+    writer.commit()
+
+class BarFile:
+    """
+    Read-only memory mapping of a bar file.
+    """
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path: Bar file to map
+
+        Raises:
+            ValueError: If the file is not a bar file of a supported version
+        """
+        self.path = path
+        self._map = np.memmap(path, dtype=np.uint8, mode="r")
+        magic, header_length = _PREFIX.unpack_from(self._map, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a bar file")
+        header = json.loads(bytes(self._map[_PREFIX.size:_PREFIX.size + header_length]))
+        if header["version"] > FORMAT_VERSION:
+            raise ValueError(f"{path} has bar file version {header['version']}; this version reads up to {FORMAT_VERSION}")
+        data_start = _aligned(_PREFIX.size + header_length)
+
+        self.length: int = header["length"]
+        self.index_tz: Optional[str] = header["index_tz"]
+        self.index_name: Optional[str] = header["index_name"]
+        self.metadata: Dict[str, Any] = header["metadata"]
+        self.timestamps = np.ndarray(self.length, dtype="<i8", buffer=self._map, offset=data_start)
+        self._columns: Dict[str, np.ndarray] = {
+            name: np.ndarray(self.length, dtype=np.dtype(dtype), buffer=self._map, offset=data_start + offset)
+            for name, dtype, offset in header["columns"]
+        }
+
+    def __len__(self) -> int:
+        return self.length
+
+    @property
+    def columns(self) -> List[str]:
+        """Column names, in file order."""
+        return list(self._columns)
+
+    def column(self, name: str) -> np.ndarray:
+        """Read-only view of one whole column."""
+        return self._columns[name]
+
+    def positions(self, start: Optional[TimeLike] = None, end: Optional[TimeLike] = None) -> Tuple[int, int]:
+        """
+        Row range [lo, hi) of the bars in [start, end), by binary search.
+
+        Args:
+            start: First time to include (None: from the first bar)
+            end: Time to stop before (None: through the last bar)
+        """
+        lo = 0 if start is None else int(np.searchsorted(self.timestamps, _to_nanoseconds(start), side="left"))
+        hi = self.length if end is None else int(np.searchsorted(self.timestamps, _to_nanoseconds(end), side="left"))
+        return lo, max(lo, hi)
+
+    def to_frame(
+        self,
+        start: Optional[TimeLike] = None,
+        end: Optional[TimeLike] = None,
+        columns: Optional[Iterable[str]] = None
+    ) -> pd.DataFrame:
+        """
+        Bars of [start, end) as a DataFrame over the mapping.
+
+        Column data is not copied and is read-only; callers that need to
+        modify it should copy().
+
+        Args:
+            start: First time to include (None: from the first bar)
+            end: Time to stop before (None: through the last bar)
+            columns: Columns to include (default: all)
+        """
+        lo, hi = self.positions(start, end)
+        index = pd.DatetimeIndex(self.timestamps[lo:hi].view("M8[ns]"), name=self.index_name, copy=False)
+        if self.index_tz:
+            index = index.tz_localize("UTC").tz_convert(self.index_tz)
+        names = self.columns if columns is None else list(columns)
+        return pd.DataFrame({name: self._columns[name][lo:hi] for name in names}, index=index, copy=False)
+
+    @property
+    def nbytes(self) -> int:
+        """Size of the mapped file."""
+        return int(self._map.nbytes)
+
+    def close(self) -> None:
+        """
+        Drop this object's references to the mapping.
+
+        The mapping itself is released once no frame or array view of it is left.
+        """
+        self.timestamps = np.empty(0, dtype=np.int64)
+        self._columns = {}
+        self._map = None
@@ -0,0 +1,657 @@
+"""
+Partitioned Local OHLCV Bar Store for BensBot.
+
+HistoricalDataFetcher used to call yfinance or ccxt on every request, and
+RealBacktester kept its own CSV per series that it re-parsed on every run.
+BarStore keeps one local copy of every bar series instead, partitioned as
+
+    <root>/<asset_class>/<symbol>/<interval>/<YYYY-MM>.npz
+
+where each monthly partition holds an int64 epoch-nanosecond index and one
+binary array per column. A small per-series index (_index.json) records
+which time ranges have been fetched from the provider, so a request only
+fetches the segments it is missing, merges them into the partitions and
+serves the rest from disk.
+
+Reads are served from a compacted copy of each series (bars.bin, see
+bar_file.py) that is memory-mapped rather than parsed: opening it costs
+the same for any history length, date ranges are found by binary search,
+and the returned frames are read-only views of pages the OS shares
+between every process reading the series. The partitions stay the unit
+of writing, and the index records the revision at which each partition
+last changed. On the first read after a write only the changed months are
+compacted again: rows from the first changed month on are served from a
+small tail file (tail.bin) next to the unchanged prefix of bars.bin, and
+bars.bin itself is rebuilt once the tail spans more than
+MAX_TAIL_PARTITIONS months. Appending to the newest month therefore costs
+a rewrite of that month, not of the whole history.
+
+Ranges are half-open, [start, end), like yfinance's start/end. Bars of the
+most recent interval are stored but not marked covered, since the provider
+may still revise them; they are fetched again on the next request.
+"""
+
+import json
+import logging
+import os
+import re
+import threading
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
+from urllib.parse import quote
+
+import numpy as np
+import pandas as pd
+
+from trading_bot.core.data.bar_file import BarFile, BarFileWriter, to_utc_timestamp
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_STORE_DIR = "./data/historical"
+
+INDEX_FILE = "_index.json"
+INDEX_KEY = "__index__"  # Partition entry holding the epoch-nanosecond timestamps
+BAR_FILE = "bars.bin"
+TAIL_FILE = "tail.bin"
+MAX_TAIL_PARTITIONS = 3  # Months served from tail.bin before bars.bin is rebuilt
+
+# Interval suffixes (yfinance/ccxt style) and their approximate length
+_INTERVAL_UNITS = {
+    "m": pd.Timedelta(minutes=1),
+    "h": pd.Timedelta(hours=1),
+    "d": pd.Timedelta(days=1),
+    "wk": pd.Timedelta(weeks=1),
+    "w": pd.Timedelta(weeks=1),
+    "mo": pd.Timedelta(days=31),
+    "M": pd.Timedelta(days=31),
+}
+
+DateLike = Union[str, datetime, pd.Timestamp]
+FetchFunction = Callable[[str, str], Optional[pd.DataFrame]]
+Segment = Tuple[DateLike, DateLike, Optional[pd.DataFrame]]  # Provider answer for [start, end)
+
+def interval_to_timedelta(interval: str) -> pd.Timedelta:
+    """
+    Length of one bar of a yfinance/ccxt interval ("1m", "1h", "1d", "1wk", "1mo", ...).
+
+    Raises:
+        ValueError: If the interval is not recognized
+    """
+    match = re.fullmatch(r"(\d+)(m|h|d|wk|w|mo|M)", interval)
+    if not match:
+        raise ValueError(f"Unsupported interval: {interval}")
+    return int(match.group(1)) * _INTERVAL_UNITS[match.group(2)]
+
+def _merge_ranges(ranges: List[List[int]]) -> List[List[int]]:
+    """Sort half-open [start, end) ranges and merge the ones that overlap or touch."""
+    merged: List[List[int]] = []
+    for start, end in sorted(ranges):
+        if end <= start:
+            continue
+        if merged and start <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([start, end])
+    return merged
+
+def _subtract_ranges(start: int, end: int, covered: List[List[int]]) -> List[Tuple[int, int]]:
+    """Parts of [start, end) that no (merged) covered range contains."""
+    missing = []
+    cursor = start
+    for covered_start, covered_end in covered:
+        if covered_end <= cursor:
+            continue
+        if covered_start >= end:
+            break
+        if covered_start > cursor:
+            missing.append((cursor, covered_start))
+        cursor = max(cursor, covered_end)
+        if cursor >= end:
+            break
+    if cursor < end:
+        missing.append((cursor, end))
+    return missing
+
+def _month_runs(index: pd.DatetimeIndex) -> List[Tuple[str, int, int]]:
+    """
+    Monthly partitions of a sorted index as ("YYYY-MM", start row, stop row).
+
+    Months are compared as integer year * 100 + month keys, and a sorted
+    index holds each month as one contiguous run.
+    """
+    if len(index) == 0:
+        return []
+    keys = np.asarray(index.year, dtype=np.int64) * 100 + np.asarray(index.month, dtype=np.int64)
+    bounds = np.concatenate(([0], np.flatnonzero(np.diff(keys)) + 1, [len(keys)]))
+    return [
+        (f"{keys[lo] // 100:04d}-{keys[lo] % 100:02d}", int(lo), int(hi))
+        for lo, hi in zip(bounds[:-1], bounds[1:])
+    ]
+
+def normalize_bars(data: pd.DataFrame) -> Tuple[pd.DataFrame, Optional[str]]:
+    """
+    Bring provider output into the stored layout.
+
+    Single-ticker yfinance frames with (field, ticker) column levels are
+    flattened, non-numeric columns dropped, the index converted to naive
+    UTC timestamps and sorted, and duplicate timestamps reduced to the last.
+
+    Args:
+        data: Provider OHLCV DataFrame with a datetime index
+
+    Returns:
+        Tuple of (normalized DataFrame, original index timezone name or None)
+    """
+    frame = data
+    if isinstance(frame.columns, pd.MultiIndex):
+        frame = frame.copy()
+        frame.columns = frame.columns.get_level_values(0)
+    frame = frame.loc[:, [
+        column for column in frame.columns
+        if pd.api.types.is_numeric_dtype(frame[column]) or pd.api.types.is_bool_dtype(frame[column])
+    ]]
+    frame = frame.loc[:, ~frame.columns.duplicated()]
+
+    index = pd.DatetimeIndex(frame.index)
+    tz = None
+    if index.tz is not None:
+        tz = str(index.tz)
+        index = index.tz_convert("UTC").tz_localize(None)
+    frame = frame.set_axis(index.as_unit("ns"), axis=0)
+    if not frame.index.is_monotonic_increasing:
+        frame = frame.sort_index(kind="stable")
+    if frame.index.has_duplicates:
+        frame = frame[~frame.index.duplicated(keep="last")]
+    frame.index.name = "Timestamp"
+    return frame, tz
+
+class BarStore:
+    """
+    Local OHLCV store with per-series coverage tracking.
+
+    Safe for use from several threads; concurrent requests for the same
+    series are serialized so a missing segment is fetched only once.
+    Partition and index files are replaced atomically, so processes sharing
+    a store never read a half-written file (a lost index update between
+    processes only causes a segment to be fetched again).
+
+    Frames returned by read() and load() are read-only views of the mapped
+    bar file; adding columns works as usual, but existing values must be
+    copied before they are modified.
+    """
+
+    def __init__(self, root_dir: str = DEFAULT_STORE_DIR, float32_bars: bool = False):
+        """
+        Args:
+            root_dir: Directory holding the partitioned bar files
+            float32_bars: Map float64 columns as float32 (half the memory and
+                          page-cache footprint, ~7 significant digits)
+        """
+        self.root_dir = root_dir
+        self.float32_bars = float32_bars
+        os.makedirs(root_dir, exist_ok=True)
+        self._lock = threading.Lock()
+        self._series_locks: Dict[Tuple[str, str, str], threading.RLock] = {}
+        self._bar_files: Dict[Tuple[str, str, str], BarFile] = {}
+        self._tail_files: Dict[Tuple[str, str, str], BarFile] = {}
+        self.requests = 0
+        self.covered_requests = 0  # Requests served from disk without calling the provider
+        self.provider_fetches = 0
+        self.bars_written = 0
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Locks and mapped bar files belong to this process; an unpickled
+        # store maps the same files again on first read
+        state = self.__dict__.copy()
+        for key in ("_lock", "_series_locks", "_bar_files", "_tail_files"):
+            state.pop(key, None)
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+        self._series_locks = {}
+        self._bar_files = {}
+        self._tail_files = {}
+
+    # Layout
+
+    def _series_dir(self, symbol: str, asset_class: str, interval: str) -> str:
+        return os.path.join(self.root_dir, asset_class, quote(symbol, safe=""), interval)
+
+    def _series_lock(self, symbol: str, asset_class: str, interval: str) -> threading.RLock:
+        key = (symbol, asset_class, interval)
+        with self._lock:
+            lock = self._series_locks.get(key)
+            if lock is None:
+                lock = self._series_locks[key] = threading.RLock()
+            return lock
+
+    @staticmethod
+    def _write_atomic(path: str, write: Callable[[Any], None]) -> None:
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as fh:
+            write(fh)
+        os.replace(tmp_path, path)
+
+    def _load_index(self, series_dir: str) -> Dict[str, Any]:
+        path = os.path.join(series_dir, INDEX_FILE)
+        if not os.path.exists(path):
+            return {"coverage": [], "partitions": [], "partition_revisions": {}, "first": None, "last": None,
+                    "tz": None, "revision": 0}
+        with open(path, "r") as f:
+            return json.load(f)
+
+    def _save_index(self, series_dir: str, index: Dict[str, Any]) -> None:
+        payload = json.dumps(index, indent=2).encode()
+        self._write_atomic(os.path.join(series_dir, INDEX_FILE), lambda fh: fh.write(payload))
+
+    @staticmethod
+    def _load_partition(path: str) -> pd.DataFrame:
+        with np.load(path, allow_pickle=False) as npz:
+            timestamps = npz[INDEX_KEY]
+            columns = {name: npz[name] for name in npz.files if name != INDEX_KEY}
+        index = pd.DatetimeIndex(timestamps.view("datetime64[ns]"), name="Timestamp")
+        return pd.DataFrame(columns, index=index)
+
+    def _save_partition(self, path: str, frame: pd.DataFrame) -> None:
+        arrays = {INDEX_KEY: frame.index.asi8}
+        arrays.update({str(column): frame[column].to_numpy() for column in frame.columns})
+        self._write_atomic(path, lambda fh: np.savez(fh, **arrays))
+
+    def _build_bar_file(
+        self,
+        series_dir: str,
+        file_name: str,
+        months: Sequence[str],
+        tz: Optional[str],
+        metadata: Dict[str, Any]
+    ) -> BarFile:
+        """Compact the partitions of the given months into a bar file, one partition in memory at a time."""
+        paths = [os.path.join(series_dir, f"{month}.npz") for month in months]
+        length = 0
+        dtypes: Dict[str, np.dtype] = {}
+        partial = set()
+        for path in paths:
+            part = self._load_partition(path)
+            length += len(part)
+            for column in part.columns:
+                dtype = part[column].dtype
+                dtypes[column] = dtype if column not in dtypes else np.result_type(dtypes[column], dtype)
+            partial.update(set(dtypes) - set(part.columns))
+        for column in partial:
+            # Bars of partitions without the column are written as NaN
+            if dtypes[column].kind != "f":
+                dtypes[column] = np.dtype(np.float64)
+        if self.float32_bars:
+            dtypes = {column: np.dtype(np.float32) if dtype == np.float64 else dtype for column, dtype in dtypes.items()}
+
+        path = os.path.join(series_dir, file_name)
+        writer = BarFileWriter(path, length, list(dtypes.items()), index_tz=tz, metadata=metadata)
+        try:
+            for partition_path in paths:
+                part = self._load_partition(partition_path)
+                writer.write(part.index.asi8, {column: part[column].to_numpy() for column in part.columns})
+        except Exception:
+            writer.abort()
+            raise
+        writer.commit()
+        return BarFile(path)
+
+    def _open_bar_file(self, path: str) -> Optional[BarFile]:
+        """Map a bar file written by this store's settings, or None if missing or incompatible."""
+        if not os.path.exists(path):
+            return None
+        bar_file = BarFile(path)
+        if bar_file.metadata.get("float32") != self.float32_bars or "months" not in bar_file.metadata:
+            return None
+        return bar_file
+
+    def _mapped_files(
+        self,
+        symbol: str,
+        asset_class: str,
+        interval: str,
+        index: Dict[str, Any],
+        compact: bool = False
+    ) -> Tuple[BarFile, Optional[BarFile]]:
+        """
+        Mapped bar files of a series at the index's partition revisions.
+
+        Returns (base, tail): base holds the series up to the first month that
+        changed since it was built, tail (None if nothing changed) holds every
+        month from there on. Stale tails are rebuilt from their partitions;
+        bars.bin is rebuilt when it is missing, when the tail would span more
+        than MAX_TAIL_PARTITIONS months, or when compact is set.
+        """
+        key = (symbol, asset_class, interval)
+        series_dir = self._series_dir(symbol, asset_class, interval)
+        revisions = {month: index.get("partition_revisions", {}).get(month, 0) for month in index["partitions"]}
+
+        def stale_months(bar_file: BarFile) -> List[str]:
+            built = bar_file.metadata["months"]
+            return [month for month in index["partitions"] if built.get(month) != revisions[month]]
+
+        base = self._bar_files.get(key)
+        if base is None or stale_months(base):
+            # Another process may have compacted the series since
+            on_disk = self._open_bar_file(os.path.join(series_dir, BAR_FILE))
+            base = on_disk if on_disk is not None else base
+        stale = stale_months(base) if base is not None else index["partitions"]
+        tail_months = [month for month in index["partitions"] if stale and month >= stale[0]]
+
+        tail = None
+        if base is None or len(tail_months) > MAX_TAIL_PARTITIONS or (compact and stale):
+            logger.debug(f"Compacting {symbol} ({asset_class}, {interval}) into {BAR_FILE} at revision {index.get('revision', 0)}")
+            base = self._build_bar_file(series_dir, BAR_FILE, index["partitions"], index["tz"], {
+                "revision": index.get("revision", 0), "float32": self.float32_bars, "months": revisions
+            })
+        elif stale:
+            metadata = {
+                "base_revision": base.metadata["revision"],
+                "float32": self.float32_bars,
+                "months": {month: revisions[month] for month in tail_months},
+                "start": pd.Timestamp(f"{tail_months[0]}-01").value
+            }
+            tail = self._tail_files.get(key)
+            if tail is None or tail.metadata != metadata:
+                tail = self._open_bar_file(os.path.join(series_dir, TAIL_FILE))
+            if tail is None or tail.metadata != metadata:
+                tail = self._build_bar_file(series_dir, TAIL_FILE, tail_months, index["tz"], metadata)
+        with self._lock:
+            self._bar_files[key] = base
+            if tail is None:
+                self._tail_files.pop(key, None)
+            else:
+                self._tail_files[key] = tail
+        return base, tail
+
+    # Queries
+
+    def coverage(self, symbol: str, asset_class: str, interval: str) -> List[Tuple[pd.Timestamp, pd.Timestamp]]:
+        """
+        Time ranges fetched from the provider for a series.
+
+        Returns:
+            Sorted, non-overlapping [start, end) ranges as naive UTC timestamps
+        """
+        index = self._load_index(self._series_dir(symbol, asset_class, interval))
+        return [(pd.Timestamp(start), pd.Timestamp(end)) for start, end in index["coverage"]]
+
+    def last_bar(self, symbol: str, asset_class: str, interval: str) -> Optional[pd.Timestamp]:
+        """Timestamp (naive UTC) of the newest stored bar of a series, or None."""
+        last = self._load_index(self._series_dir(symbol, asset_class, interval))["last"]
+        return None if last is None else pd.Timestamp(last)
+
+    def missing_ranges(
+        self,
+        symbol: str,
+        asset_class: str,
+        interval: str,
+        start_date: DateLike,
+        end_date: DateLike
+    ) -> List[Tuple[pd.Timestamp, pd.Timestamp]]:
+        """
+        Parts of [start_date, end_date) the store has not fetched yet.
+
+        Returns:
+            [start, end) ranges as naive UTC timestamps
+        """
+        start, end = to_utc_timestamp(start_date).value, to_utc_timestamp(end_date).value
+        covered = self._load_index(self._series_dir(symbol, asset_class, interval))["coverage"]
+        return [(pd.Timestamp(a), pd.Timestamp(b)) for a, b in _subtract_ranges(start, end, covered)]
+
+    def open_bar_file(self, symbol: str, asset_class: str, interval: str) -> Optional[BarFile]:
+        """
+        Memory-mapped bar file of a whole series, for callers that slice it themselves.
+
+        Months changed since bars.bin was last built are compacted into it
+        first, so this costs a full rewrite after writes; read() does not.
+
+        Returns:
+            BarFile with naive UTC epoch-nanosecond timestamps, or None if
+            nothing is stored for the series
+        """
+        with self._series_lock(symbol, asset_class, interval):
+            index = self._load_index(self._series_dir(symbol, asset_class, interval))
+            if not index["partitions"]:
+                return None
+            return self._mapped_files(symbol, asset_class, interval, index, compact=True)[0]
+
+    def read(
+        self,
+        symbol: str,
+        asset_class: str,
+        interval: str,
+        start_date: Optional[DateLike] = None,
+        end_date: Optional[DateLike] = None
+    ) -> Optional[pd.DataFrame]:
+        """
+        Stored bars of [start_date, end_date), whether or not the range is covered.
+
+        The range is located by binary search in the mapped bar files and
+        returned without copying, so the frame is read-only (ranges spanning
+        both bars.bin and the tail of recently changed months are copied).
+
+        Args:
+            symbol: Trading symbol
+            asset_class: Asset class of the symbol
+            interval: Bar interval
+            start_date: First timestamp to include (default: first stored bar)
+            end_date: Timestamp to stop before (default: after the last stored bar)
+
+        Returns:
+            OHLCV DataFrame indexed by 'Timestamp' (in the provider's timezone,
+            if it had one), or None if no stored bar falls in the range
+        """
+        with self._series_lock(symbol, asset_class, interval):
+            index = self._load_index(self._series_dir(symbol, asset_class, interval))
+            if not index["partitions"]:
+                return None
+            base, tail = self._mapped_files(symbol, asset_class, interval, index)
+        if tail is None:
+            data = base.to_frame(start_date, end_date)
+        else:
+            split = tail.metadata["start"]
+            head_end = split if end_date is None else min(to_utc_timestamp(end_date).value, split)
+            frames = [frame for frame in (base.to_frame(start_date, head_end), tail.to_frame(start_date, end_date))
+                      if not frame.empty]
+            if not frames:
+                return None
+            data = frames[0] if len(frames) == 1 else pd.concat(frames)
+        return None if data.empty else data
+
+    # Updates
+
+    def write(
+        self,
+        symbol: str,
+        asset_class: str,
+        interval: str,
+        data: Optional[pd.DataFrame],
+        covered: Optional[Tuple[DateLike, DateLike]] = None
+    ) -> int:
+        """
+        Merge bars into the monthly partitions and optionally mark a range covered.
+
+        Bars whose timestamps are already stored replace the stored ones.
+
+        Args:
+            symbol: Trading symbol
+            asset_class: Asset class of the symbol
+            interval: Bar interval
+            data: Provider OHLCV DataFrame (may be None or empty)
+            covered: Optional [start, end) range the data completely answers
+
+        Returns:
+            Number of bars written
+        """
+        return self._write(symbol, asset_class, interval, data, [] if covered is None else [covered])
+
+    def _write(
+        self,
+        symbol: str,
+        asset_class: str,
+        interval: str,
+        data: Optional[pd.DataFrame],
+        covered: Sequence[Tuple[DateLike, DateLike]]
+    ) -> int:
+        series_dir = self._series_dir(symbol, asset_class, interval)
+        with self._series_lock(symbol, asset_class, interval):
+            os.makedirs(series_dir, exist_ok=True)
+            index = self._load_index(series_dir)
+            written = 0
+            if data is not None and not data.empty:
+                frame, tz = normalize_bars(data)
+                revision = index.get("revision", 0) + 1
+                partition_revisions = index.setdefault("partition_revisions", {})
+                months = []
+                for month, lo, hi in _month_runs(frame.index):
+                    part = frame.iloc[lo:hi]
+                    path = os.path.join(series_dir, f"{month}.npz")
+                    if os.path.exists(path):
+                        part = pd.concat([self._load_partition(path), part])
+                        part = part[~part.index.duplicated(keep="last")].sort_index(kind="stable")
+                    self._save_partition(path, part)
+                    partition_revisions[month] = revision
+                    months.append(month)
+                written = len(frame)
+                index["partitions"] = sorted(set(index["partitions"]) | set(months))
+                first, last = int(frame.index.asi8[0]), int(frame.index.asi8[-1])
+                index["first"] = first if index["first"] is None else min(index["first"], first)
+                index["last"] = last if index["last"] is None else max(index["last"], last)
+                index["tz"] = index["tz"] or tz
+                index["revision"] = revision
+            if covered:
+                ranges = [[to_utc_timestamp(start).value, to_utc_timestamp(end).value] for start, end in covered]
+                index["coverage"] = _merge_ranges(index["coverage"] + ranges)
+            self._save_index(series_dir, index)
+        with self._lock:
+            self.bars_written += written
+        return written
+
+    def store_segments(self, symbol: str, asset_class: str, interval: str, segments: Sequence[Segment]) -> int:
+        """
+        Store provider answers for [start, end) segments in one write and mark the complete ones covered.
+
+        A segment is complete when the provider returned bars for it, or when
+        the store holds a bar at or after its end (so an empty answer means
+        the market was closed). Covered ranges never extend into the most
+        recent interval.
+
+        Args:
+            symbol: Trading symbol
+            asset_class: Asset class of the symbol
+            interval: Bar interval
+            segments: (start, end, data) per requested segment; data may be None or empty
+
+        Returns:
+            Number of bars written
+        """
+        frames = [data for _, _, data in segments if data is not None and not data.empty]
+        settled = to_utc_timestamp(pd.Timestamp.now(tz="UTC")) - interval_to_timedelta(interval)
+        with self._series_lock(symbol, asset_class, interval):
+            last = self.last_bar(symbol, asset_class, interval)
+            for frame in frames:
+                frame_last = to_utc_timestamp(pd.DatetimeIndex(frame.index).max())
+                last = frame_last if last is None else max(last, frame_last)
+            covered = []
+            for start, end, data in segments:
+                start, end = to_utc_timestamp(start), to_utc_timestamp(end)
+                answered = (data is not None and not data.empty) or (last is not None and last >= end)
+                covered_end = min(end, settled)
+                if answered and covered_end > start:
+                    covered.append((start, covered_end))
+            data = None if not frames else frames[0] if len(frames) == 1 else pd.concat(frames)
+            return self._write(symbol, asset_class, interval, data, covered)
+
+    def fill(
+        self,
+        symbol: str,
+        asset_class: str,
+        interval: str,
+        start_date: DateLike,
+        end_date: DateLike,
+        fetch: FetchFunction
+    ) -> int:
+        """
+        Fetch and store the segments of [start_date, end_date) not yet covered, without reading them back.
+
+        Each missing segment is widened to whole days and requested with
+        fetch(start, end) as "YYYY-MM-DD" strings, and its answer is stored
+        with store_segments. A fetch function may also store bars itself
+        while it downloads (so an interrupted download keeps what it got)
+        and return None.
+
+        Args:
+            symbol: Trading symbol
+            asset_class: Asset class of the symbol
+            interval: Bar interval
+            start_date: First timestamp to include
+            end_date: Timestamp to stop before
+            fetch: Provider call for one segment
+
+        Returns:
+            Number of missing segments fetched from the provider
+        """
+        with self._series_lock(symbol, asset_class, interval):
+            missing = self.missing_ranges(symbol, asset_class, interval, start_date, end_date)
+            for segment_start, segment_end in missing:
+                day_start = segment_start.floor("D")
+                day_end = segment_end.ceil("D")
+                logger.debug(f"Fetching {symbol} ({asset_class}, {interval}) {day_start} to {day_end} from provider")
+                data = fetch(day_start.strftime("%Y-%m-%d"), day_end.strftime("%Y-%m-%d"))
+                with self._lock:
+                    self.provider_fetches += 1
+                self.store_segments(symbol, asset_class, interval, [(day_start, day_end, data)])
+            return len(missing)
+
+    def load(
+        self,
+        symbol: str,
+        asset_class: str,
+        interval: str,
+        start_date: DateLike,
+        end_date: DateLike,
+        fetch: Optional[FetchFunction] = None
+    ) -> Optional[pd.DataFrame]:
+        """
+        Bars of [start_date, end_date), fetching only the segments not yet covered (see fill).
+
+        Args:
+            symbol: Trading symbol
+            asset_class: Asset class of the symbol
+            interval: Bar interval
+            start_date: First timestamp to include
+            end_date: Timestamp to stop before
+            fetch: Provider call for one segment; None serves stored bars only
+
+        Returns:
+            OHLCV DataFrame, or None if there are no bars in the range
+        """
+        with self._series_lock(symbol, asset_class, interval):
+            if fetch is not None:
+                missing = self.fill(symbol, asset_class, interval, start_date, end_date, fetch)
+            else:
+                missing = len(self.missing_ranges(symbol, asset_class, interval, start_date, end_date))
+            with self._lock:
+                self.requests += 1
+                if not missing:
+                    self.covered_requests += 1
+            return self.read(symbol, asset_class, interval, start_date, end_date)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Return request counters.
+
+        Returns:
+            Dictionary with requests, covered_requests, hit_rate, provider_fetches and bars_written
+        """
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "covered_requests": self.covered_requests,
+                "hit_rate": self.covered_requests / self.requests if self.requests else 0.0,
+                "provider_fetches": self.provider_fetches,
+                "bars_written": self.bars_written
+            }
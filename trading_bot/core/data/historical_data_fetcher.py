@@ -2,27 +2,135 @@
 Historical Data Fetcher for multiple asset classes.
 
 This module provides a unified interface to download historical
-market data for equities, cryptocurrencies, and forex.
+market data for equities, cryptocurrencies, and forex. Requests are
+served through a local BarStore, so only the date ranges that have not
+been downloaded before are fetched from the provider.
+
+fetch_many downloads a set of symbols concurrently. Every provider
+(yfinance, each ccxt exchange) has one token bucket shared by all threads,
+and yfinance symbols are downloaded with a single multi-ticker request.
+
+update and update_many refresh series incrementally: they fetch only the
+bars after the newest stored one, append them to the store and notify
+subscribers with just those bars.
 """
 import logging
+import threading
 import pandas as pd
-import yfinance
-import ccxt
-from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from trading_bot.core.data.bar_file import to_utc_timestamp
+from trading_bot.core.data.bar_store import BarStore, DEFAULT_STORE_DIR, DateLike, Segment, normalize_bars
+from trading_bot.core.data.rate_limiter import TokenBucket
+
+try:
+    import yfinance
+except ImportError:
+    yfinance = None
+
+try:
+    import ccxt
+except ImportError:
+    ccxt = None
 
 logger = logging.getLogger(__name__)
 
+SUPPORTED_ASSET_CLASSES = ("equity", "crypto", "forex")
+
+# (requests per second, burst) per provider; ccxt exchanges default to their own rateLimit
+DEFAULT_RATE_LIMITS: Dict[str, Tuple[float, float]] = {
+    "yfinance": (2.0, 4.0),
+}
+
+CCXT_PAGE_LIMIT = 1000  # Candles per fetch_ohlcv request (the maximum for many exchanges)
+CCXT_FLUSH_BARS = 20000  # Candles buffered before completed windows are handed to the store
+
+SymbolKey = Tuple[str, str]  # (symbol, asset_class)
+
+def _slice_dates(data: pd.DataFrame, start_date: str, end_date: str) -> pd.DataFrame:
+    """Rows of [start_date, end_date), read in the index's timezone."""
+    tz = getattr(data.index, "tz", None)
+    start, end = pd.Timestamp(start_date, tz=tz), pd.Timestamp(end_date, tz=tz)
+    return data[(data.index >= start) & (data.index < end)]
+
+def _same_bars(a: pd.DataFrame, b: pd.DataFrame) -> bool:
+    """Whether two bar frames hold the same timestamps, columns and values (ignoring dtypes)."""
+    if not a.index.equals(b.index) or list(a.columns) != list(b.columns):
+        return False
+    return a.astype("float64").equals(b.astype("float64"))
+
+@dataclass
+class FetchManyResult:
+    """
+    Outcome of HistoricalDataFetcher.fetch_many.
+
+    Every requested (symbol, asset_class) appears in exactly one of data and errors.
+    """
+    data: Dict[SymbolKey, pd.DataFrame] = field(default_factory=dict)
+    errors: Dict[SymbolKey, str] = field(default_factory=dict)
+
+    @property
+    def complete(self) -> bool:
+        """Whether every symbol was fetched."""
+        return not self.errors
+
+@dataclass
+class BarUpdate:
+    """
+    Bars added to a series by an incremental update.
+
+    bars starts with the bar that was newest before the update, since the
+    provider may have revised it (e.g. a daily bar fetched during the day).
+    Consumers keeping state should replace their bars from bars.index[0] on.
+    """
+    symbol: str
+    asset_class: str
+    interval: str
+    bars: pd.DataFrame
+    previous_last: Optional[pd.Timestamp]  # Newest stored bar before the update (naive UTC), None if there was none
+
+UpdateCallback = Callable[[BarUpdate], Any]
+
 class HistoricalDataFetcher:
     """
     Fetches historical OHLCV data for specified symbols and asset classes.
     """
 
-    def __init__(self, crypto_exchange_name: str = 'binance'):
+    def __init__(
+        self,
+        crypto_exchange_name: str = 'binance',
+        bar_store: Optional[BarStore] = None,
+        store_dir: Optional[str] = DEFAULT_STORE_DIR,
+        rate_limits: Optional[Dict[str, Tuple[float, float]]] = None,
+        max_workers: int = 8
+    ):
         """
         Initializes the fetcher.
         Args:
             crypto_exchange_name: Name of the default crypto exchange to use from ccxt.
+            bar_store: Local bar store requests are served through (default: a BarStore in store_dir).
+            store_dir: Directory of the default bar store; None disables local storage
+                       so every request goes to the provider.
+            rate_limits: (requests per second, burst) per provider ("yfinance",
+                         "ccxt:<exchange>"), overriding DEFAULT_RATE_LIMITS.
+            max_workers: Threads used by fetch_many.
         """
+        self.crypto_exchange_name = crypto_exchange_name
+        self.bar_store = bar_store if bar_store is not None else (BarStore(store_dir) if store_dir else None)
+        self.rate_limits = {**DEFAULT_RATE_LIMITS, **(rate_limits or {})}
+        self.max_workers = max_workers
+        self._rate_limiters: Dict[str, TokenBucket] = {}
+        self._rate_limiters_lock = threading.Lock()
+        # yfinance.download collects results in module-level state, so calls must not overlap
+        self._yfinance_lock = threading.Lock()
+        self._subscribers: List[UpdateCallback] = []
+        self._last_bars: Dict[Tuple[str, str, str], pd.DataFrame] = {}  # Newest bar per series, kept by updates
+        if ccxt is None:
+            logger.warning("ccxt is not installed. Crypto data fetching is unavailable.")
+            self.crypto_exchange = None
+            return
         try:
             self.crypto_exchange = getattr(ccxt, crypto_exchange_name)()
         except (AttributeError, ccxt.NetworkError) as e:
@@ -32,6 +140,22 @@ class HistoricalDataFetcher:
             )
             self.crypto_exchange = None # Fallback or handle as needed
 
+    def __getstate__(self) -> Dict[str, Any]:
+        # Locks, rate limiters and update subscribers belong to this process;
+        # copies sent to worker processes start with their own
+        state = self.__dict__.copy()
+        for key in ("_rate_limiters", "_rate_limiters_lock", "_yfinance_lock", "_subscribers", "_last_bars"):
+            state.pop(key, None)
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._rate_limiters = {}
+        self._rate_limiters_lock = threading.Lock()
+        self._yfinance_lock = threading.Lock()
+        self._subscribers = []
+        self._last_bars = {}
+
     def fetch(
         self,
         symbol: str,
@@ -41,13 +165,14 @@ class HistoricalDataFetcher:
         interval: str = "1d" # e.g., 1m, 5m, 15m, 30m, 60m, 1h, 1d, 1wk, 1mo
     ) -> Optional[pd.DataFrame]:
         """
-        Fetches historical data.
+        Fetches historical data, from the local bar store where it already
+        covers the range and from the provider for the missing segments.
 
         Args:
             symbol: The ticker symbol (e.g., "SPY", "BTC/USDT", "EURUSD=X").
             asset_class: "equity", "crypto", or "forex".
             start_date: Start date in "YYYY-MM-DD" format.
-            end_date: End date in "YYYY-MM-DD" format.
+            end_date: End date in "YYYY-MM-DD" format (exclusive when served through the bar store).
             interval: Data frequency (yfinance/ccxt compatible).
 
         Returns:
@@ -57,23 +182,426 @@ class HistoricalDataFetcher:
         logger.info(
             f"Fetching data for {symbol} ({asset_class}) from {start_date} to {end_date} with interval {interval}"
         )
+        if asset_class not in SUPPORTED_ASSET_CLASSES:
+            logger.error(f"Unsupported asset class: {asset_class}")
+            return None
         try:
-            if asset_class == "equity":
-                return self._fetch_equity(symbol, start_date, end_date, interval)
-            elif asset_class == "crypto":
-                return self._fetch_crypto(symbol, start_date, end_date, interval)
-            elif asset_class == "forex":
-                # Using yfinance for FX pairs, e.g., "EURUSD=X"
-                return self._fetch_forex(symbol, start_date, end_date, interval)
-            else:
-                logger.error(f"Unsupported asset class: {asset_class}")
-                return None
+            return self._fetch(symbol, asset_class, start_date, end_date, interval)
         except Exception as e:
             logger.error(f"Error fetching data for {symbol} ({asset_class}): {e}", exc_info=True)
             return None
 
+    def fetch_many(
+        self,
+        requests: Iterable[SymbolKey],
+        start_date: str,
+        end_date: str,
+        interval: str = "1d",
+        max_workers: Optional[int] = None
+    ) -> FetchManyResult:
+        """
+        Fetches several symbols concurrently.
+
+        Equity and forex symbols the bar store does not fully cover are
+        downloaded with one multi-ticker yfinance request; every other
+        provider call runs on the thread pool, throttled by the provider's
+        token bucket. A failing symbol does not affect the others.
+
+        Args:
+            requests: (symbol, asset_class) pairs; duplicates are fetched once.
+            start_date: Start date in "YYYY-MM-DD" format.
+            end_date: End date in "YYYY-MM-DD" format (exclusive).
+            interval: Data frequency (yfinance/ccxt compatible).
+            max_workers: Threads to use (default: the fetcher's max_workers).
+
+        Returns:
+            FetchManyResult with a DataFrame or an error message per request
+        """
+        keys = list(dict.fromkeys(requests))
+        if not keys:
+            return FetchManyResult()
+        logger.info(f"Fetching {len(keys)} symbols from {start_date} to {end_date} with interval {interval}")
+        prefetched = self._prefetch_yfinance({key: (start_date, end_date) for key in keys}, interval)
+
+        def fetch_one(key: SymbolKey) -> Optional[pd.DataFrame]:
+            symbol, asset_class = key
+            return self._fetch(symbol, asset_class, start_date, end_date, interval, prefetched.get(key))
+
+        result = self._run_many(keys, fetch_one, max_workers)
+        for key, data in list(result.data.items()):
+            if data is None or data.empty:
+                del result.data[key]
+                result.errors[key] = "No data returned"
+        return result
+
+    def subscribe(self, callback: UpdateCallback) -> None:
+        """
+        Register a callback for the bars added by update and update_many.
+
+        Args:
+            callback: Function called with a BarUpdate per series that changed
+        """
+        if callback not in self._subscribers:
+            self._subscribers.append(callback)
+
+    def unsubscribe(self, callback: UpdateCallback) -> bool:
+        """
+        Remove a callback registered with subscribe.
+
+        Returns:
+            True if the callback was registered, False otherwise
+        """
+        if callback in self._subscribers:
+            self._subscribers.remove(callback)
+            return True
+        return False
+
+    def update(
+        self,
+        symbol: str,
+        asset_class: str,
+        interval: str = "1d",
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None
+    ) -> Optional[pd.DataFrame]:
+        """
+        Fetches only the bars after the newest stored bar of a series.
+
+        The new bars are appended to the bar store and subscribers are
+        notified with them. Requires a bar store.
+
+        Args:
+            symbol: The ticker symbol.
+            asset_class: "equity", "crypto", or "forex".
+            interval: Data frequency (yfinance/ccxt compatible).
+            start_date: Where to start if nothing is stored for the series yet.
+            end_date: Date to stop before (default: tomorrow, UTC, which includes
+                      the bar still forming today).
+
+        Returns:
+            The added bars, starting with the previously newest bar (see
+            BarUpdate); empty if nothing changed, None if the update failed.
+        """
+        try:
+            update = self._update(symbol, asset_class, interval, start_date, end_date)
+        except Exception as e:
+            logger.error(f"Error updating data for {symbol} ({asset_class}): {e}", exc_info=True)
+            return None
+        if update is None:
+            return None
+        self._notify(update)
+        return update.bars
+
+    def update_many(
+        self,
+        requests: Iterable[SymbolKey],
+        interval: str = "1d",
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        max_workers: Optional[int] = None
+    ) -> FetchManyResult:
+        """
+        Incrementally updates several series concurrently (see update).
+
+        Equity and forex symbols are refreshed with one multi-ticker yfinance
+        request spanning the oldest of their newest stored bars.
+
+        Returns:
+            FetchManyResult with the added bars (possibly empty) or an error message per request
+        """
+        keys = list(dict.fromkeys(requests))
+        if not keys:
+            return FetchManyResult()
+        if self.bar_store is None:
+            raise ValueError("Incremental updates require a bar store")
+        end_date = end_date or self._default_update_end()
+        ranges = {}
+        for symbol, asset_class in keys:
+            last = self.bar_store.last_bar(symbol, asset_class, interval)
+            ranges[(symbol, asset_class)] = (last if last is not None else start_date or end_date, end_date)
+        prefetched = self._prefetch_yfinance(ranges, interval)
+
+        def update_one(key: SymbolKey) -> Optional[BarUpdate]:
+            symbol, asset_class = key
+            return self._update(symbol, asset_class, interval, start_date, end_date, prefetched.get(key))
+
+        result = self._run_many(keys, update_one, max_workers)
+        # Subscribers are notified from the calling thread
+        for key, update in list(result.data.items()):
+            if update is None:
+                del result.data[key]
+                result.errors[key] = "No data returned"
+                continue
+            self._notify(update)
+            result.data[key] = update.bars
+        return result
+
+    def _update(
+        self,
+        symbol: str,
+        asset_class: str,
+        interval: str,
+        start_date: Optional[str],
+        end_date: Optional[str],
+        prefetched: Optional[Tuple[str, str, Optional[pd.DataFrame]]] = None
+    ) -> Optional[BarUpdate]:
+        """Fetch the bars after the newest stored one, raising on errors."""
+        if self.bar_store is None:
+            raise ValueError("Incremental updates require a bar store")
+        end_date = end_date or self._default_update_end()
+        previous = self.bar_store.last_bar(symbol, asset_class, interval)
+        if previous is None:
+            if start_date is None:
+                raise ValueError(f"Nothing stored for {symbol} ({asset_class}, {interval}); start_date is required")
+            stored = None
+            data = self._fetch(symbol, asset_class, start_date, end_date, interval, prefetched)
+        else:
+            # The newest bar is kept from the previous update, so a tick reads nothing back from the store
+            stored = self._last_bars.get((symbol, asset_class, interval))
+            if stored is None or to_utc_timestamp(stored.index[-1]) != previous:
+                stored = self.bar_store.read(symbol, asset_class, interval, previous)
+            if asset_class not in SUPPORTED_ASSET_CLASSES:
+                raise ValueError(f"Unsupported asset class: {asset_class}")
+            received: List[pd.DataFrame] = []
+            self.bar_store.fill(
+                symbol, asset_class, interval, previous, end_date,
+                self._segment_fetcher(symbol, asset_class, interval, prefetched, received)
+            )
+            data = self._bars_since(previous, stored, received, end_date)
+        if data is None:
+            return None
+        if not data.empty:
+            self._last_bars[(symbol, asset_class, interval)] = data.iloc[-1:]
+        if stored is not None and len(data) == 1 and _same_bars(data, stored.iloc[-1:]):
+            data = data.iloc[:0]
+        if not data.empty:
+            logger.debug(f"Updated {symbol} ({asset_class}, {interval}) with {len(data)} bars from {data.index[0]}")
+        return BarUpdate(symbol, asset_class, interval, data, previous)
+
+    @staticmethod
+    def _bars_since(
+        previous: pd.Timestamp,
+        stored: Optional[pd.DataFrame],
+        received: List[pd.DataFrame],
+        end_date: str
+    ) -> Optional[pd.DataFrame]:
+        """
+        Bars of [previous, end_date) from the stored newest bar and the provider answers of an update.
+
+        Provider bars replace stored ones with the same timestamp; all bars are
+        brought into the stored layout (numeric columns, the stored timezone).
+        """
+        if stored is None or stored.empty:
+            return None
+        tz = getattr(stored.index, "tz", None)
+        data, _ = normalize_bars(stored)
+        if received:
+            new, _ = normalize_bars(pd.concat([normalize_bars(frame)[0] for frame in received]))
+            data = pd.concat([data[~data.index.isin(new.index)], new]).sort_index(kind="stable")
+        data = data[(data.index >= previous) & (data.index < to_utc_timestamp(end_date))]
+        if tz is not None:
+            data.index = data.index.tz_localize("UTC").tz_convert(tz)
+        return data
+
+    def _notify(self, update: BarUpdate) -> None:
+        if update.bars.empty:
+            return
+        for callback in list(self._subscribers):
+            try:
+                callback(update)
+            except Exception as e:
+                logger.error(f"Error in bar update subscriber for {update.symbol} ({update.asset_class}): {e}")
+
+    @staticmethod
+    def _default_update_end() -> str:
+        return (pd.Timestamp.now(tz="UTC").floor("D") + pd.Timedelta(days=1)).strftime("%Y-%m-%d")
+
+    def _run_many(
+        self,
+        keys: List[SymbolKey],
+        work: Callable[[SymbolKey], Any],
+        max_workers: Optional[int]
+    ) -> FetchManyResult:
+        """Run work(key) for every key on the thread pool, collecting results and errors."""
+        result = FetchManyResult()
+        workers = max(1, min(max_workers or self.max_workers, len(keys)))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {key: executor.submit(work, key) for key in keys}
+            for key, future in futures.items():
+                try:
+                    result.data[key] = future.result()
+                except Exception as e:
+                    result.errors[key] = f"{type(e).__name__}: {e}"
+                    logger.warning(f"Error fetching data for {key[0]} ({key[1]}): {e}")
+        return result
+
+    def _fetch(
+        self,
+        symbol: str,
+        asset_class: str,
+        start_date: str,
+        end_date: str,
+        interval: str,
+        prefetched: Optional[Tuple[str, str, Optional[pd.DataFrame]]] = None
+    ) -> Optional[pd.DataFrame]:
+        """
+        Fetch through the bar store, raising on errors.
+
+        Args:
+            prefetched: Optional (start, end, data) already downloaded for the
+                        symbol; segments inside [start, end) are served from it.
+        """
+        if asset_class not in SUPPORTED_ASSET_CLASSES:
+            raise ValueError(f"Unsupported asset class: {asset_class}")
+        fetch_segment = self._segment_fetcher(symbol, asset_class, interval, prefetched)
+        if self.bar_store is None:
+            return fetch_segment(start_date, end_date)
+        return self.bar_store.load(symbol, asset_class, interval, start_date, end_date, fetch=fetch_segment)
+
+    def _segment_fetcher(
+        self,
+        symbol: str,
+        asset_class: str,
+        interval: str,
+        prefetched: Optional[Tuple[str, str, Optional[pd.DataFrame]]] = None,
+        received: Optional[List[pd.DataFrame]] = None
+    ) -> Callable[[str, str], Optional[pd.DataFrame]]:
+        """
+        Provider call for one [start, end) segment of a series, as passed to BarStore.load/fill.
+
+        Args:
+            prefetched: Optional (start, end, data) already downloaded for the symbol
+            received: Optional list every non-empty provider answer is appended to,
+                      including crypto windows the call stores itself
+        """
+        def fetch_segment(segment_start: str, segment_end: str) -> Optional[pd.DataFrame]:
+            if prefetched is not None and (
+                pd.Timestamp(prefetched[0]) <= pd.Timestamp(segment_start)
+                and pd.Timestamp(segment_end) <= pd.Timestamp(prefetched[1])
+            ):
+                data = prefetched[2]
+                if data is not None:
+                    data = _slice_dates(data, segment_start, segment_end)
+                    data = None if data.empty else data
+                stored = False
+            elif asset_class == "crypto" and self.bar_store is not None:
+                # Windows are stored as they arrive, so an interrupted download resumes where it stopped
+                data = self._fetch_crypto(
+                    symbol, segment_start, segment_end, interval,
+                    on_windows=lambda windows: self.bar_store.store_segments(symbol, asset_class, interval, windows)
+                )
+                stored = True
+            else:
+                data = self._fetch_from_provider(symbol, asset_class, segment_start, segment_end, interval)
+                stored = False
+            if received is not None and data is not None and not data.empty:
+                received.append(data)
+            return None if stored else data
+        return fetch_segment
+
+    def _prefetch_yfinance(
+        self,
+        ranges: Dict[SymbolKey, Tuple[DateLike, DateLike]],
+        interval: str
+    ) -> Dict[SymbolKey, Tuple[str, str, Optional[pd.DataFrame]]]:
+        """
+        Download the yfinance symbols that need provider data in one request.
+
+        Args:
+            ranges: [start, end) requested per (symbol, asset_class); the
+                    download spans all of them
+
+        Returns:
+            (start, end, data) per symbol covered by the download; data is None
+            for symbols yfinance returned nothing for. Empty if fewer than two
+            symbols need downloading or the download failed.
+        """
+        if yfinance is None:
+            return {}
+        tickers: Dict[str, SymbolKey] = {}
+        for (symbol, asset_class), (start_date, end_date) in ranges.items():
+            if asset_class not in ("equity", "forex"):
+                continue
+            if self.bar_store is not None and not self.bar_store.missing_ranges(
+                symbol, asset_class, interval, start_date, end_date
+            ):
+                continue
+            tickers[self._yfinance_ticker(symbol, asset_class)] = (symbol, asset_class)
+        if len(tickers) < 2:
+            return {}
+        window_start = min(pd.Timestamp(ranges[key][0]) for key in tickers.values()).floor("D").strftime("%Y-%m-%d")
+        window_end = max(pd.Timestamp(ranges[key][1]) for key in tickers.values()).ceil("D").strftime("%Y-%m-%d")
+
+        logger.debug(f"Downloading {len(tickers)} yfinance tickers from {window_start} to {window_end}")
+        self._rate_limiter("yfinance").acquire()
+        try:
+            with self._yfinance_lock:
+                data = yfinance.download(
+                    list(tickers), start=window_start, end=window_end, interval=interval,
+                    progress=False, group_by="ticker"
+                )
+        except Exception as e:
+            logger.warning(f"Multi-ticker yfinance download failed, fetching symbols one by one: {e}")
+            return {}
+        downloaded = set(data.columns.get_level_values(0)) if isinstance(data.columns, pd.MultiIndex) else set()
+
+        prefetched = {}
+        for ticker, key in tickers.items():
+            frame = None
+            if ticker in downloaded:
+                frame = data[ticker].dropna(how="all")
+                frame.index.name = 'Timestamp'
+                if frame.empty:
+                    frame = None
+            prefetched[key] = (window_start, window_end, frame)
+        return prefetched
+
+    @staticmethod
+    def _yfinance_ticker(symbol: str, asset_class: str) -> str:
+        # yfinance uses "=X" for forex pairs, e.g., "EURUSD=X"
+        if asset_class == "forex" and not symbol.endswith("=X"):
+            return f"{symbol}=X"
+        return symbol
+
+    def _rate_limiter(self, provider: str) -> TokenBucket:
+        """Token bucket shared by all requests to a provider ("yfinance", "ccxt:<exchange>")."""
+        with self._rate_limiters_lock:
+            limiter = self._rate_limiters.get(provider)
+            if limiter is None:
+                rate, burst = self.rate_limits.get(provider) or self._default_rate_limit(provider)
+                limiter = self._rate_limiters[provider] = TokenBucket(rate, burst)
+            return limiter
+
+    def _default_rate_limit(self, provider: str) -> Tuple[float, float]:
+        rate_limit_ms = getattr(self.crypto_exchange, 'rateLimit', None) if provider.startswith("ccxt:") else None
+        if rate_limit_ms:
+            # ccxt's rateLimit is the minimum delay between requests in milliseconds
+            return 1000.0 / rate_limit_ms, 1.0
+        return 1.0, 1.0
+
+    def _fetch_from_provider(
+        self,
+        symbol: str,
+        asset_class: str,
+        start_date: str,
+        end_date: str,
+        interval: str
+    ) -> Optional[pd.DataFrame]:
+        """Download one date range from the asset class's provider."""
+        if asset_class == "equity":
+            return self._fetch_equity(symbol, start_date, end_date, interval)
+        elif asset_class == "crypto":
+            return self._fetch_crypto(symbol, start_date, end_date, interval)
+        else:
+            # Using yfinance for FX pairs, e.g., "EURUSD=X"
+            return self._fetch_forex(symbol, start_date, end_date, interval)
+
     def _fetch_equity(self, symbol: str, start_date: str, end_date: str, interval: str) -> Optional[pd.DataFrame]:
-        data = yfinance.download(symbol, start=start_date, end=end_date, interval=interval, progress=False)
+        if yfinance is None:
+            raise ImportError("yfinance is required to fetch equity data")
+        self._rate_limiter("yfinance").acquire()
+        with self._yfinance_lock:
+            data = yfinance.download(symbol, start=start_date, end=end_date, interval=interval, progress=False)
         if data.empty:
             logger.warning(f"No equity data found for {symbol} in the given range/interval.")
             return None
@@ -81,16 +609,38 @@ class HistoricalDataFetcher:
         return data
 
     def _fetch_forex(self, symbol: str, start_date: str, end_date: str, interval: str) -> Optional[pd.DataFrame]:
-        # yfinance uses "=X" for forex pairs, e.g., "EURUSD=X"
-        forex_symbol = symbol if symbol.endswith("=X") else f"{symbol}=X"
-        data = yfinance.download(forex_symbol, start=start_date, end=end_date, interval=interval, progress=False)
+        forex_symbol = self._yfinance_ticker(symbol, "forex")
+        if yfinance is None:
+            raise ImportError("yfinance is required to fetch forex data")
+        self._rate_limiter("yfinance").acquire()
+        with self._yfinance_lock:
+            data = yfinance.download(forex_symbol, start=start_date, end=end_date, interval=interval, progress=False)
         if data.empty:
             logger.warning(f"No forex data found for {forex_symbol} using yfinance.")
             return None
         data.index.name = 'Timestamp'
         return data
 
-    def _fetch_crypto(self, symbol: str, start_date: str, end_date: str, interval: str) -> Optional[pd.DataFrame]:
+    def _fetch_crypto(
+        self,
+        symbol: str,
+        start_date: str,
+        end_date: str,
+        interval: str,
+        on_windows: Optional[Callable[[List[Segment]], Any]] = None
+    ) -> Optional[pd.DataFrame]:
+        """
+        Download [start_date, end_date) from the ccxt exchange.
+
+        The range is split into page-sized windows that are fetched
+        concurrently within the exchange's token bucket, then stitched in
+        order with duplicate candles removed.
+
+        Args:
+            on_windows: Optional callback receiving (start, end, data) of
+                        completed windows in batches, as they arrive (also when
+                        the download fails part way)
+        """
         if not self.crypto_exchange or not self.crypto_exchange.has.get('fetchOHLCV'):
             logger.error(
                 f"Crypto exchange {self.crypto_exchange_name if self.crypto_exchange else 'default'} "
@@ -103,64 +653,82 @@ class HistoricalDataFetcher:
         if not timeframe:
             logger.error(f"Unsupported interval for crypto: {interval}")
             return None
-            
-        start_dt = datetime.strptime(start_date, "%Y-%m-%d")
-        end_dt = datetime.strptime(end_date, "%Y-%m-%d")
-        
-        # CCXT expects timestamp in milliseconds
-        since = int(start_dt.timestamp() * 1000)
-        limit = 1000  # Max limit per request for many exchanges; may need to paginate for long periods / small intervals
-        all_ohlcv = []
 
-        current_dt = start_dt
-        while current_dt < end_dt:
-            try:
-                ohlcv = self.crypto_exchange.fetch_ohlcv(symbol, timeframe, since, limit)
-                if not ohlcv:
-                    logger.debug(f"No more crypto data for {symbol} from {since}")
-                    break 
-                
-                all_ohlcv.extend(ohlcv)
-                
-                # Get timestamp of the last record to use as `since` for the next iteration
-                # and to check if we have fetched all data up to end_date
-                last_timestamp_ms = ohlcv[-1][0]
-                since = last_timestamp_ms + self._timeframe_to_milliseconds(timeframe) # Start next fetch after the last one
-                current_dt = datetime.fromtimestamp(last_timestamp_ms / 1000)
-
-                if current_dt >= end_dt:
-                    break
-                
-                # Respect rate limits if any (simple sleep, can be more sophisticated)
-                if hasattr(self.crypto_exchange, 'rateLimit'):
-                    time.sleep(self.crypto_exchange.rateLimit / 1000)
-
-            except ccxt.NetworkError as e:
-                logger.error(f"CCXT NetworkError fetching {symbol}: {e}")
-                return None # Or retry logic
-            except ccxt.ExchangeError as e:
-                logger.error(f"CCXT ExchangeError fetching {symbol}: {e}")
-                return None # Or specific handling
-            except Exception as e:
-                logger.error(f"Generic error fetching crypto page for {symbol}: {e}", exc_info=True)
-                return None
+        # CCXT expects UTC timestamps in milliseconds
+        timeframe_ms = self._timeframe_to_milliseconds(timeframe)
+        since = pd.Timestamp(start_date).value // 1_000_000
+        until = pd.Timestamp(end_date).value // 1_000_000
+        page_ms = CCXT_PAGE_LIMIT * timeframe_ms
+        windows = [(start, min(start + page_ms, until)) for start in range(since, until, page_ms)]
+        if not windows:
+            return None
+        limiter = self._rate_limiter(f"ccxt:{self.crypto_exchange_name}")
 
+        def fetch_window(window: Tuple[int, int]) -> List[list]:
+            return self._fetch_crypto_window(symbol, timeframe, timeframe_ms, window[0], window[1], limiter)
 
-        if not all_ohlcv:
+        frames: Dict[int, Optional[pd.DataFrame]] = {}
+        pending: List[Segment] = []
+        pending_bars = 0
+        executor = ThreadPoolExecutor(max_workers=max(1, min(self.max_workers, len(windows))))
+        try:
+            futures = {executor.submit(fetch_window, window): window for window in windows}
+            for future in as_completed(futures):
+                window = futures[future]
+                frame = self._ohlcv_frame(future.result())
+                frames[window[0]] = frame
+                pending.append((pd.Timestamp(window[0], unit='ms'), pd.Timestamp(window[1], unit='ms'), frame))
+                pending_bars += 0 if frame is None else len(frame)
+                if on_windows is not None and pending_bars >= CCXT_FLUSH_BARS:
+                    on_windows(pending)
+                    pending, pending_bars = [], 0
+        except Exception as e:
+            logger.error(f"Error fetching crypto data for {symbol}: {e}", exc_info=True)
+            return None
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+            # Keep completed windows, so a failed or interrupted download resumes after them
+            if on_windows is not None and pending:
+                on_windows(pending)
+
+        found = [frames[start] for start, _ in windows if frames.get(start) is not None]
+        if not found:
             logger.warning(f"No crypto data found for {symbol}.")
             return None
+        df = pd.concat(found) if len(found) > 1 else found[0]
+        return df[~df.index.duplicated(keep='first')]
 
-        df = pd.DataFrame(all_ohlcv, columns=['Timestamp', 'Open', 'High', 'Low', 'Close', 'Volume'])
-        df['Timestamp'] = pd.to_datetime(df['Timestamp'], unit='ms')
-        df = df.set_index('Timestamp')
-        
-        # Filter exact date range as pagination might fetch beyond end_date
-        df = df[(df.index >= start_dt) & (df.index <= end_dt)]
-        if df.empty:
-            logger.warning(f"No crypto data for {symbol} within the precise date range after filtering.")
+    def _fetch_crypto_window(
+        self,
+        symbol: str,
+        timeframe: str,
+        timeframe_ms: int,
+        start_ms: int,
+        end_ms: int,
+        limiter: TokenBucket
+    ) -> List[list]:
+        """Candles of [start_ms, end_ms), continuing if the exchange returns short pages."""
+        candles = []
+        since = start_ms
+        while since < end_ms:
+            limiter.acquire()
+            ohlcv = self.crypto_exchange.fetch_ohlcv(symbol, timeframe, since, CCXT_PAGE_LIMIT)
+            if not ohlcv:
+                break
+            candles.extend(candle for candle in ohlcv if since <= candle[0] < end_ms)
+            last_timestamp_ms = ohlcv[-1][0]
+            if last_timestamp_ms < since or last_timestamp_ms + timeframe_ms >= end_ms:
+                break
+            since = last_timestamp_ms + timeframe_ms
+        return candles
+
+    @staticmethod
+    def _ohlcv_frame(candles: List[list]) -> Optional[pd.DataFrame]:
+        if not candles:
             return None
-            
-        return df
+        df = pd.DataFrame(candles, columns=['Timestamp', 'Open', 'High', 'Low', 'Close', 'Volume'])
+        df['Timestamp'] = pd.to_datetime(df['Timestamp'], unit='ms')
+        return df.set_index('Timestamp').sort_index(kind='stable')
 
     def _convert_interval_to_ccxt_timeframe(self, interval: str) -> Optional[str]:
         # Basic mapping, can be expanded. yfinance intervals vs ccxt timeframes
@@ -0,0 +1,74 @@
+"""
+Incrementally Extended Indicator Windows for BensBot.
+
+Regime and indicator calculations used to refetch and recompute their
+whole lookback window on every refresh. An IndicatorWindow keeps the bars
+and the indicator columns computed from them; extending it with the bars
+of an incremental update (see HistoricalDataFetcher.update) recomputes the
+indicators only for the new rows, from the last `warmup` bars before them,
+and drops rows that fall out of the window.
+"""
+
+from typing import Callable, List, Optional, Union
+
+import pandas as pd
+
+IndicatorFunction = Callable[[pd.DataFrame], pd.DataFrame]
+
+class IndicatorWindow:
+    """
+    Bars plus indicator columns that grow with bar updates.
+
+    compute(bars) must return the bars with indicator columns added, where
+    an indicator row depends only on that bar and the `warmup` bars before
+    it (rolling windows, differences, ...). Rows of the window then match a
+    full recomputation over the same history.
+    """
+
+    def __init__(self, compute: IndicatorFunction, warmup: int):
+        """
+        Args:
+            compute: Adds indicator columns to a bar DataFrame (must not modify its input)
+            warmup: Number of preceding bars the indicators of a bar depend on
+        """
+        self.compute = compute
+        self.warmup = warmup
+        self.data: Optional[pd.DataFrame] = None
+        self._bar_columns: List[str] = []
+
+    def __len__(self) -> int:
+        return 0 if self.data is None else len(self.data)
+
+    def extend(self, bars: pd.DataFrame, since: Optional[Union[str, pd.Timestamp]] = None) -> pd.DataFrame:
+        """
+        Add bars and compute their indicators.
+
+        Rows at or after the first new bar are replaced, so a revised last
+        bar is recomputed with its new values.
+
+        Args:
+            bars: New bars, sorted by time, with the same columns as earlier ones
+            since: Optional start of the window; older rows are dropped
+
+        Returns:
+            The window's bars and indicators
+        """
+        if self.data is None:
+            if bars.empty:
+                return bars
+            self._bar_columns = list(bars.columns)
+            self.data = self.compute(bars)
+        elif not bars.empty:
+            kept = self.data[self.data.index < bars.index[0]]
+            start = max(0, len(kept) - self.warmup)
+            history = pd.concat([kept[self._bar_columns].iloc[start:], bars[self._bar_columns]])
+            added = self.compute(history).iloc[len(kept) - start:]
+            self.data = pd.concat([kept, added])
+
+        if since is not None and not self.data.empty:
+            since = pd.Timestamp(since)
+            tz = getattr(self.data.index, "tz", None)
+            if tz is not None and since.tzinfo is None:
+                since = since.tz_localize(tz)
+            self.data = self.data[self.data.index >= since]
+        return self.data
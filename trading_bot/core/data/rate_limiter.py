@@ -0,0 +1,60 @@
+"""
+Token-Bucket Rate Limiting for market data providers.
+
+Every provider (yfinance, each ccxt exchange) gets one bucket shared by all
+threads fetching from it, so concurrent requests together stay within the
+provider's request budget instead of each thread sleeping on its own.
+"""
+
+import threading
+import time
+
+class TokenBucket:
+    """
+    Thread-safe token bucket.
+
+    Tokens accrue at `rate` per second up to `capacity`; acquire() takes
+    tokens and blocks until enough have accrued. Waiters are served in
+    arrival order, each reserving its tokens before sleeping.
+    """
+
+    def __init__(self, rate: float, capacity: float = 1.0):
+        """
+        Args:
+            rate: Tokens added per second (sustained requests per second)
+            capacity: Maximum tokens held (burst size)
+
+        Raises:
+            ValueError: If rate or capacity is not positive
+        """
+        if rate <= 0 or capacity <= 0:
+            raise ValueError("Token bucket rate and capacity must be positive")
+        self.rate = float(rate)
+        self.capacity = float(capacity)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+        self.waited = 0.0  # Total seconds callers were delayed
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        """
+        Take tokens, waiting until they are available.
+
+        Args:
+            tokens: Number of tokens to take (at most capacity)
+
+        Returns:
+            Seconds waited
+        """
+        tokens = min(float(tokens), self.capacity)
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            # Tokens may go negative: later callers then wait for this reservation too
+            self._tokens -= tokens
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+            self.waited += wait
+        if wait > 0:
+            time.sleep(wait)
+        return wait
@@ -8,5 +8,7 @@ for evolving trading strategies across different asset classes.
 from trading_bot.core.evolution.evo_trader import EvoTrader, StrategyGenome
 from trading_bot.core.evolution.market_adapter import MarketAdapter, MarketRegime
 from trading_bot.core.evolution.backtest_grid import BacktestGrid
+from trading_bot.core.evolution.validation_pipeline import ValidationPipeline, ValidationConfig
 
-__all__ = ["EvoTrader", "MarketAdapter", "MarketRegime", "BacktestGrid", "StrategyGenome"] 
\ No newline at end of file
+__all__ = ["EvoTrader", "MarketAdapter", "MarketRegime", "BacktestGrid", "StrategyGenome",
+           "ValidationPipeline", "ValidationConfig"] 
\ No newline at end of file
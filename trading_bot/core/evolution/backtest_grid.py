@@ -14,6 +14,9 @@ import os
 from datetime import datetime
 from typing import Dict, List, Any, Tuple, Optional
 
+from trading_bot.core.backtesting.batch_metrics import compute_batch_metrics, metrics_rows, annualization_factor
+from trading_bot.core.backtesting.result_store import BacktestResultStore, grid_cell_rows
+
 logger = logging.getLogger(__name__)
 
 class BacktestGrid:
@@ -25,13 +28,14 @@ class BacktestGrid:
     optimal parameters.
     """
     
-    def __init__(self, backtester=None, data_dir="./data/backtest_grid"):
+    def __init__(self, backtester=None, data_dir="./data/backtest_grid", result_store: Optional[BacktestResultStore] = None):
         """
         Initialize the backtest grid service.
         
         Args:
             backtester: Reference to backtesting service
-            data_dir: Directory for storing results
+            data_dir: Directory for storing grid configurations and the default result store
+            result_store: Store the grid cells are appended to (default: results.db in data_dir)
         """
         self.backtester = backtester
         self.data_dir = data_dir
@@ -39,6 +43,7 @@ class BacktestGrid:
         
         # Create directory if it doesn't exist
         os.makedirs(data_dir, exist_ok=True)
+        self.result_store = result_store or BacktestResultStore(os.path.join(data_dir, "results.db"))
     
     def create_parameter_grid(
         self,
@@ -131,18 +136,9 @@ class BacktestGrid:
             "completed_at": None
         }
         
-        # Initialize grid data structure
-        grid_data = []
-        
-        # Tracking best and worst performance
-        best_value = float('-inf')
-        best_params = None
-        worst_value = float('inf')
-        worst_params = None
-        
         # Run backtest for each parameter combination
+        cells = []
         for i, value1 in enumerate(param1_values):
-            row_data = []
             for j, value2 in enumerate(param2_values):
                 # Set parameters for this run
                 parameters = fixed_params.copy()
@@ -156,31 +152,51 @@ class BacktestGrid:
                         parameters=parameters,
                         market_data=market_data
                     )
-                    
-                    # Extract performance metric
-                    performance = result.get("performance", {})
-                    metric_value = performance.get(metric, 0)
-                    
-                    # Check if this is best or worst
-                    if metric_value > best_value:
-                        best_value = metric_value
-                        best_params = {param1_name: value1, param2_name: value2}
-                    
-                    if metric_value < worst_value:
-                        worst_value = metric_value
-                        worst_params = {param1_name: value1, param2_name: value2}
-                    
-                    # Add to row
-                    row_data.append({
-                        "value": metric_value,
-                        "performance": performance
-                    })
+                    cells.append((value1, value2, result, None))
                 except Exception as e:
                     logger.error(f"Error running backtest for {param1_name}={value1}, {param2_name}={value2}: {e}")
+                    cells.append((value1, value2, None, e))
+        
+        # Score every cell that returned a full equity curve in one batch call
+        self._score_cells(cells, market_data)
+        
+        # Initialize grid data structure
+        grid_data = []
+        
+        # Tracking best and worst performance
+        best_value = float('-inf')
+        best_params = None
+        worst_value = float('inf')
+        worst_params = None
+        
+        for i in range(len(param1_values)):
+            row_data = []
+            for value1, value2, result, error in cells[i * len(param2_values):(i + 1) * len(param2_values)]:
+                if error is not None:
                     row_data.append({
                         "value": None,
-                        "error": str(e)
+                        "error": str(error)
                     })
+                    continue
+                
+                # Extract performance metric
+                performance = result.get("performance", {})
+                metric_value = performance.get(metric, 0)
+                
+                # Check if this is best or worst
+                if metric_value > best_value:
+                    best_value = metric_value
+                    best_params = {param1_name: value1, param2_name: value2}
+                
+                if metric_value < worst_value:
+                    worst_value = metric_value
+                    worst_params = {param1_name: value1, param2_name: value2}
+                
+                # Add to row
+                row_data.append({
+                    "value": metric_value,
+                    "performance": performance
+                })
             
             # Add row to grid
             grid_data.append(row_data)
@@ -191,15 +207,59 @@ class BacktestGrid:
         results_grid["worst_params"] = worst_params
         results_grid["completed_at"] = datetime.utcnow().isoformat()
         
-        # Save results
-        with open(os.path.join(self.data_dir, f"{grid_id}_results.json"), 'w') as f:
-            json.dump(results_grid, f, indent=2)
+        # Save results: the grid layout as run metadata, one indexed row per cell
+        self.result_store.record_run(grid_id, "grid", {
+            **{key: value for key, value in results_grid.items() if key != "grid_data"},
+            "fixed_params": fixed_params
+        })
+        self.result_store.append_many(
+            grid_cell_rows(results_grid, fixed_params), source="grid", run_id=grid_id,
+            **{key: market_data.get(key) for key in ("asset_class", "symbol", "interval", "start_date", "end_date")}
+        )
         
         # Store in memory
         self.results[grid_id] = results_grid
         
         return results_grid
     
+    def _score_cells(self, cells: List[Tuple[Any, Any, Optional[Dict[str, Any]], Optional[Exception]]],
+                     market_data: Dict[str, Any]) -> None:
+        """
+        Fill in performance metrics for grid cells from their equity curves.
+        
+        Results that carry a full 'equity_curve' (and optionally per-trade
+        'trade_pnls') are stacked and scored with a single batch metrics call
+        per curve length. Metrics the backtester already reported are kept.
+        
+        Args:
+            cells: (value1, value2, result, error) tuples, modified in place
+            market_data: Market data for the grid (supplies 'interval' and 'asset_class')
+        """
+        by_length: Dict[int, List[Dict[str, Any]]] = {}
+        for _, _, result, error in cells:
+            if error is None and isinstance(result, dict) and result.get("equity_curve") is not None:
+                by_length.setdefault(len(result["equity_curve"]), []).append(result)
+        
+        periods_per_year = annualization_factor(
+            market_data.get("interval", "1d"), market_data.get("asset_class", "equity")
+        )
+        for length, results in by_length.items():
+            if length == 0:
+                continue
+            batch = compute_batch_metrics(
+                np.array([result["equity_curve"] for result in results], dtype=float),
+                trade_pnls=[np.asarray(result.get("trade_pnls", []), dtype=float) for result in results],
+                periods_per_year=periods_per_year
+            )
+            for result, row in zip(results, metrics_rows(batch)):
+                if "trade_pnls" not in result:
+                    # Trade statistics are unknown without the trade list
+                    for key in ("trades", "win_rate", "profit_factor"):
+                        row.pop(key)
+                performance = result.setdefault("performance", {})
+                for key, value in row.items():
+                    performance.setdefault(key, value)
+    
     def get_grid_results(self, grid_id: str) -> Optional[Dict[str, Any]]:
         """
         Get results for a specific grid.
@@ -214,12 +274,21 @@ class BacktestGrid:
         if grid_id in self.results:
             return self.results[grid_id]
         
-        # Try to load from disk
+        # Rebuild from the result store
         try:
-            results_file = os.path.join(self.data_dir, f"{grid_id}_results.json")
-            if os.path.exists(results_file):
-                with open(results_file, 'r') as f:
-                    results = json.load(f)
+            run = self.result_store.get_run(grid_id)
+            if run is not None:
+                results = dict(run["metadata"])
+                results.pop("fixed_params", None)
+                grid_data = [[None] * len(results["param2"]["values"]) for _ in results["param1"]["values"]]
+                for row in self.result_store.query(run_id=grid_id, status=None, include_result=True):
+                    cell = row["result"]
+                    i, j = cell["grid_cell"]
+                    if cell.get("error_message"):
+                        grid_data[i][j] = {"value": None, "error": cell["error_message"]}
+                    else:
+                        grid_data[i][j] = {"value": cell.get("value"), "performance": cell.get("performance", {})}
+                results["grid_data"] = grid_data
                 self.results[grid_id] = results
                 return results
         except Exception as e:
@@ -236,25 +305,16 @@ class BacktestGrid:
         """
         grids = []
         
-        # Look for grid result files
-        for filename in os.listdir(self.data_dir):
-            if filename.endswith("_results.json"):
-                grid_id = filename.replace("_results.json", "")
-                try:
-                    with open(os.path.join(self.data_dir, filename), 'r') as f:
-                        results = json.load(f)
-                    
-                    # Add a summary to the list
-                    grids.append({
-                        "id": grid_id,
-                        "strategy_type": results.get("strategy_type", "unknown"),
-                        "param1": results.get("param1", {}).get("name", ""),
-                        "param2": results.get("param2", {}).get("name", ""),
-                        "best_params": results.get("best_params"),
-                        "completed_at": results.get("completed_at")
-                    })
-                except Exception as e:
-                    logger.error(f"Error loading grid results {filename}: {e}")
+        for run in self.result_store.list_runs(kind="grid"):
+            results = run["metadata"]
+            grids.append({
+                "id": run["run_id"],
+                "strategy_type": results.get("strategy_type", "unknown"),
+                "param1": results.get("param1", {}).get("name", ""),
+                "param2": results.get("param2", {}).get("name", ""),
+                "best_params": results.get("best_params"),
+                "completed_at": results.get("completed_at")
+            })
         
         # Sort by completion time (newest first)
         grids.sort(key=lambda x: x.get("completed_at", ""), reverse=True)
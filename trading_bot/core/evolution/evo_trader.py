@@ -10,21 +10,30 @@ This service handles:
 
 import logging
 import json
+import math
 import os
 import random
 import time
 from datetime import datetime
 from typing import Dict, List, Any, Optional, Tuple, Type
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
 # Import base classes for typing
 from trading_bot.core.strategies.base_strategy import BaseStrategy
 from trading_bot.core.strategies.strategy_factory import strategy_factory
 from trading_bot.core.backtesting.base_backtester import BaseBacktester, BacktestResult
 from trading_bot.core.backtesting.parallel_backtester import ParallelBacktestManager
+from trading_bot.core.backtesting.result_cache import BacktestResultCache, compute_data_fingerprint, make_cache_key
+from trading_bot.core.backtesting.result_store import BacktestResultStore
+from trading_bot.core.backtesting.batch_metrics import annualization_factor
+from trading_bot.core.backtesting.profiling import aggregate_profiles, format_profile, slowest_strategy_ids, capture_cprofile
+from trading_bot.core.evolution.validation_pipeline import ValidationPipeline, ValidationConfig
 
 logger = logging.getLogger(__name__)
 
+# Backtest statuses whose performance is used as fitness ("pruned" results carry a penalized one)
+SCORED_STATUSES = ("success", "pruned")
+
 @dataclass
 class EvolutionConfig:
     """Configuration for evolutionary algorithm."""
@@ -38,6 +47,22 @@ class EvolutionConfig:
     auto_promotion_threshold: float = 0.2  # Top 20% can be auto-promoted
     use_parallel_backtesting: bool = True   # Whether to use parallel backtesting
     max_parallel_workers: int = 0           # 0 means use CPU count
+    use_batched_backtesting: bool = False   # Simulate same-type genomes together in vectorized batches
+    backtest_batch_size: int = 0            # Genomes per parallel batch, 0 means one batch per worker
+    share_market_data: bool = True          # Load bars once per generation and share them with workers
+    use_persistent_worker_pool: bool = True # Keep backtest workers warm across generations
+    worker_max_tasks: int = 0               # Recycle pool workers after this many task chunks, 0 means never
+    use_result_cache: bool = True           # Reuse results of identical backtests across generations and runs
+    result_cache_max_mb: float = 512.0      # Size bound of the on-disk result cache
+    use_successive_halving: bool = False    # Score genomes on cheap fidelities first, fully backtest only the best
+    halving_fidelities: List[Any] = field(default_factory=lambda: [0.25, 0.5])  # Recent-window fractions or coarser intervals, cheapest first
+    halving_promotion_ratio: float = 0.5    # Fraction of candidates promoted to the next fidelity
+    halving_min_survivors: int = 5          # Never promote fewer genomes than this
+    halving_budget: float = 0.0             # Max cost per generation in full backtests, 0 means unlimited
+    profile_slowest_genomes: int = 0        # Dump cProfile stats of this many slowest genomes per generation, 0 means off
+    profile_output_dir: str = ""            # Directory for cProfile dumps, empty means <data_dir>/profiles
+    fitness_metric: str = "total_return"    # Performance metric genomes are ranked and selected by, e.g. "robustness_score"
+    use_result_store: bool = True           # Append every generation's results to the indexed result store
 
 @dataclass
 class StrategyGenome:
@@ -98,7 +123,10 @@ class EvoTrader:
                 
                 if backtester_class and data_fetcher:
                     backtester_constructors[asset_class] = backtester_class
-                    backtester_kwargs[asset_class] = {"historical_data_fetcher": data_fetcher}
+                    if hasattr(backtester, 'get_constructor_kwargs'):
+                        backtester_kwargs[asset_class] = backtester.get_constructor_kwargs()
+                    else:
+                        backtester_kwargs[asset_class] = {"historical_data_fetcher": data_fetcher}
             
             if backtester_constructors:
                 self.parallel_backtest_manager = ParallelBacktestManager(
@@ -116,6 +144,21 @@ class EvoTrader:
         # Load configuration
         self.config = self._load_config()
         
+        # Persistent cache of backtest results
+        self.result_cache: Optional[BacktestResultCache] = None
+        if self.config.use_result_cache:
+            self.result_cache = BacktestResultCache(
+                os.path.join(data_dir, "backtest_cache"),
+                max_size_mb=self.config.result_cache_max_mb
+            )
+        self._data_fingerprints: Dict[Tuple, Dict[str, Any]] = {}
+        
+        # Queryable history of every backtest result, tagged with its generation
+        self.result_store: Optional[BacktestResultStore] = None
+        if self.config.use_result_store:
+            self.result_store = BacktestResultStore(os.path.join(data_dir, "results.db"))
+        self.run_id: Optional[str] = None  # ID of the evolution run started last (see start_evolution)
+        
         # Initialize population and history
         self.current_population: List[StrategyGenome] = []
         self.history: Dict[str, List[StrategyGenome]] = {}
@@ -145,7 +188,23 @@ class EvoTrader:
                     "tournament_size": default_config.tournament_size,
                     "auto_promotion_threshold": default_config.auto_promotion_threshold,
                     "use_parallel_backtesting": default_config.use_parallel_backtesting,
-                    "max_parallel_workers": default_config.max_parallel_workers
+                    "max_parallel_workers": default_config.max_parallel_workers,
+                    "use_batched_backtesting": default_config.use_batched_backtesting,
+                    "backtest_batch_size": default_config.backtest_batch_size,
+                    "share_market_data": default_config.share_market_data,
+                    "use_persistent_worker_pool": default_config.use_persistent_worker_pool,
+                    "worker_max_tasks": default_config.worker_max_tasks,
+                    "use_result_cache": default_config.use_result_cache,
+                    "result_cache_max_mb": default_config.result_cache_max_mb,
+                    "use_successive_halving": default_config.use_successive_halving,
+                    "halving_fidelities": default_config.halving_fidelities,
+                    "halving_promotion_ratio": default_config.halving_promotion_ratio,
+                    "halving_min_survivors": default_config.halving_min_survivors,
+                    "halving_budget": default_config.halving_budget,
+                    "profile_slowest_genomes": default_config.profile_slowest_genomes,
+                    "profile_output_dir": default_config.profile_output_dir,
+                    "fitness_metric": default_config.fitness_metric,
+                    "use_result_store": default_config.use_result_store
                 }
                 with open(self.config_path, 'w') as f:
                     json.dump(config_dict, f, indent=2)
@@ -267,6 +326,8 @@ class EvoTrader:
                     raise ValueError(f"Missing evolution range definition for '{param}' in {strategy_type_name}")
 
         run_id = f"evo_{strategy_type_name.replace('_','-')}_{backtest_config.get('symbol', 'sym')}_{int(time.time())}"
+        # Data may have changed since the last run; fingerprint it afresh
+        self._data_fingerprints.clear()
         
         # _initialize_population now uses the derived parameter_space_for_init
         # The strategy_type_name is passed to be stored in the genome.
@@ -277,6 +338,7 @@ class EvoTrader:
         )
         
         self.history[run_id] = self.current_population.copy()
+        self.run_id = run_id
         self._save_strategies()
         logger.info(f"Started evolution run {run_id} for {strategy_type_name} on {backtest_config.get('symbol')}.")
         return run_id
@@ -355,40 +417,202 @@ class EvoTrader:
             population.append(genome)
         return population
 
-    def run_backtest_generation(self, backtest_config: Dict[str, Any]) -> Dict[str, Any]:
+    def _run_population_backtests(
+        self,
+        backtester: Any,
+        backtest_config: Dict[str, Any],
+        population: List[StrategyGenome]
+    ) -> Dict[str, BacktestResult]:
         """
-        Run backtests for the current generation using asset-specific backtesters.
+        Backtest genomes in one vectorized batch per strategy type.
         
         Args:
+            backtester: Backtester implementing run_population_backtest
             backtest_config: Dict containing asset_class, symbol, start_date, end_date, interval, etc.
+            population: Genomes to backtest
+            
+        Returns:
+            Dictionary mapping genome id to BacktestResult (genomes of unknown types are left out)
         """
-        asset_class = backtest_config.get("asset_class")
-        if not asset_class:
-            raise ValueError("'asset_class' must be provided in backtest_config")
+        genomes_by_type: Dict[str, List[StrategyGenome]] = {}
+        for genome in population:
+            genomes_by_type.setdefault(genome.type, []).append(genome)
         
-        # Check if we should use parallel backtesting
-        use_parallel = self.config.use_parallel_backtesting and self.parallel_backtest_manager is not None
+        population_results = {}
+        for strategy_type, genomes in genomes_by_type.items():
+            strategy_class = self.strategy_factory._registry.get(strategy_type)
+            if not strategy_class:
+                continue
+            logger.debug(f"Running population backtest for {len(genomes)} genomes of type {strategy_type}.")
+            population_results.update(backtester.run_population_backtest(
+                strategy_class=strategy_class,
+                genomes=[(genome.id, genome.parameters) for genome in genomes],
+                asset_class=backtest_config.get("asset_class"),
+                symbol=backtest_config.get("symbol"),
+                start_date=backtest_config.get("start_date"),
+                end_date=backtest_config.get("end_date"),
+                interval=backtest_config.get("interval"),
+                initial_capital=backtest_config.get("initial_capital", 100000.0),
+                commission_pct=backtest_config.get("commission_pct", 0.001),
+                slippage_pct=backtest_config.get("slippage_pct", 0.0005),
+                pruning=backtest_config.get("pruning"),
+                walk_forward=backtest_config.get("walk_forward")
+            ))
+        return population_results
+
+    def _get_data_fingerprint(self, backtest_config: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Fingerprint the market data a backtest config runs on (memoized per evolution run).
         
-        if not use_parallel:
-            # Legacy single-threaded approach
-            backtester = self.backtester_registry.get(asset_class)
-            if not backtester:
-                logger.error(f"No backtester registered for asset class: {asset_class}")
-                raise ValueError(f"Backtester for asset class '{asset_class}' not configured in EvoTrader.")
+        Args:
+            backtest_config: Dict containing asset_class, symbol, start_date, end_date, interval, etc.
+            
+        Returns:
+            Data fingerprint, or None if the data cannot be loaded
+        """
+        fetch_key = tuple(backtest_config.get(key) for key in ("symbol", "asset_class", "start_date", "end_date", "interval"))
+        if fetch_key in self._data_fingerprints:
+            return self._data_fingerprints[fetch_key]
         
-        results = {
-            "generation": self.current_population[0].generation if self.current_population else 0,
-            "population_size": len(self.current_population),
-            "strategies": [],
-            "best_strategy_performance": None, # Storing full best strategy details later
-            "avg_performance": {},
-            "timestamp": datetime.utcnow().isoformat(),
-            "backtest_config": backtest_config
+        backtester = self.backtester_registry.get(backtest_config.get("asset_class"))
+        data_fetcher = getattr(backtester, "data_fetcher", None)
+        if data_fetcher is None:
+            return None
+        try:
+            data = data_fetcher.fetch(*fetch_key)
+        except Exception as e:
+            logger.warning(f"Could not load data to fingerprint {fetch_key}; result cache disabled for this generation: {e}")
+            return None
+        if data is None or data.empty:
+            return None
+        
+        fingerprint = compute_data_fingerprint(
+            data,
+            symbol=backtest_config.get("symbol"),
+            interval=backtest_config.get("interval"),
+            start_date=backtest_config.get("start_date"),
+            end_date=backtest_config.get("end_date")
+        )
+        self._data_fingerprints[fetch_key] = fingerprint
+        return fingerprint
+    
+    def _lookup_cached_results(
+        self,
+        population: List[StrategyGenome],
+        backtest_config: Dict[str, Any],
+        execution_path: str
+    ) -> Tuple[Dict[str, str], Dict[str, BacktestResult]]:
+        """
+        Compute cache keys for a set of genomes and collect cached results.
+        
+        Args:
+            population: Genomes to look up
+            backtest_config: Dict containing asset_class, symbol, start_date, end_date, interval, etc.
+            execution_path: "serial" or "parallel" (the two paths apply different cost defaults)
+            
+        Returns:
+            Tuple of (genome id -> cache key, genome id -> cached BacktestResult)
+        """
+        if self.result_cache is None or not population:
+            return {}, {}
+        fingerprint = self._get_data_fingerprint(backtest_config)
+        if fingerprint is None:
+            return {}, {}
+        
+        # Backtester defaults (intrabar exits, pruning and walk-forward fallbacks, ...) change results too
+        backtester = self.backtester_registry.get(backtest_config.get("asset_class"))
+        key_config = {
+            "backtest_config": backtest_config,
+            "execution_path": execution_path,
+            "backtester": type(backtester).__name__,
+            "backtester_options": backtester.get_result_options() if hasattr(backtester, "get_result_options") else None
         }
+        cache_keys, cached_results = {}, {}
+        for genome in population:
+            key = make_cache_key(genome.type, genome.parameters, fingerprint, key_config)
+            cache_keys[genome.id] = key
+            cached = self.result_cache.get(key)
+            if cached is not None:
+                cached["strategy_id"] = genome.id
+                cached_results[genome.id] = cached
+        return cache_keys, cached_results
+    
+    def _store_cached_results(
+        self,
+        cache_keys: Dict[str, str],
+        backtest_results: Dict[str, BacktestResult],
+        cached_ids: set
+    ) -> None:
+        """Write successful (or pruned), newly computed results to the result cache."""
+        if self.result_cache is None:
+            return
+        for strategy_id, result in backtest_results.items():
+            if strategy_id in cached_ids or strategy_id not in cache_keys:
+                continue
+            if result and result.get("status") in SCORED_STATUSES:
+                # Timings describe the run that produced the result, not later cache hits
+                self.result_cache.put(cache_keys[strategy_id], {k: v for k, v in result.items() if k != "profile"})
+    
+    def _summarize_pruning(self, backtest_results: Dict[str, BacktestResult], generation: int) -> Dict[str, Any]:
+        """
+        Total the bars and seconds early-abort pruning saved in one generation.
+        
+        Args:
+            backtest_results: Newly computed results of the generation (cache hits excluded)
+            generation: Generation number, for logging
+            
+        Returns:
+            Dictionary with the number of pruned genomes, bars saved, seconds saved
+            and a count of prune reasons
+        """
+        summary = {"pruned": 0, "bars_saved": 0, "seconds_saved": 0.0, "reasons": {}}
+        for result in backtest_results.values():
+            pruning = result.get("pruning") if result and result.get("status") == "pruned" else None
+            if not pruning:
+                continue
+            summary["pruned"] += 1
+            summary["bars_saved"] += pruning.get("bars_saved", 0)
+            summary["seconds_saved"] += pruning.get("seconds_saved", 0.0)
+            reason = pruning.get("reason", "unknown")
+            summary["reasons"][reason] = summary["reasons"].get(reason, 0) + 1
+        if summary["pruned"]:
+            logger.info(f"Pruning stopped {summary['pruned']} of {len(backtest_results)} backtests early in generation "
+                        f"{generation}, saving {summary['bars_saved']} bars (~{summary['seconds_saved']:.3f}s)")
+        return summary
+    
+    def _evaluate_genomes(
+        self,
+        population: List[StrategyGenome],
+        backtest_config: Dict[str, Any],
+        use_parallel: bool,
+        generation: int
+    ) -> Tuple[Dict[str, BacktestResult], set]:
+        """
+        Backtest a set of genomes, serving repeated backtests from the result cache.
+        
+        Args:
+            population: Genomes to backtest
+            backtest_config: Dict containing asset_class, symbol, start_date, end_date, interval, etc.
+            use_parallel: Run on the parallel backtest manager instead of the registered backtester
+            generation: Generation number, for logging
+        
+        Returns:
+            Tuple of (genome id -> BacktestResult, ids of genomes served from the cache)
+        """
+        asset_class = backtest_config.get("asset_class")
+        
+        # Serve genomes whose backtest has been run before from the result cache
+        cache_keys, cached_results = self._lookup_cached_results(
+            population, backtest_config, "parallel" if use_parallel else "serial"
+        )
+        pending_population = [genome for genome in population if genome.id not in cached_results]
+        if cached_results:
+            logger.info(f"Result cache: {len(cached_results)} of {len(population)} "
+                        f"genomes served from cache for generation {generation}")
         
         if use_parallel:
             # Prepare a dictionary mapping strategy types to classes
-            strategy_types = set(genome.type for genome in self.current_population)
+            strategy_types = set(genome.type for genome in pending_population)
             strategy_classes = {}
             for strategy_type in strategy_types:
                 metadata = self.strategy_factory.get_strategy_metadata(strategy_type)
@@ -400,94 +624,374 @@ class EvoTrader:
                 if strategy_class:
                     strategy_classes[strategy_type] = strategy_class
             
+            if self.config.use_persistent_worker_pool and self.parallel_backtest_manager.worker_pool is None:
+                self.parallel_backtest_manager.start_pool(
+                    max_workers=self.config.max_parallel_workers,
+                    max_tasks_per_worker=self.config.worker_max_tasks
+                )
+            
             # Run parallel backtests
-            logger.info(f"Running parallel backtests for generation {results['generation']}...")
-            backtest_results = self.parallel_backtest_manager.run_generation_backtests(
-                strategy_genomes=[vars(genome) for genome in self.current_population],
+            logger.info(f"Running parallel backtests for generation {generation}...")
+            computed_results = self.parallel_backtest_manager.run_generation_backtests(
+                strategy_genomes=[vars(genome) for genome in pending_population],
                 strategy_classes=strategy_classes,
                 backtest_config=backtest_config,
-                max_workers=self.config.max_parallel_workers
-            )
-            
-            # Update strategy genomes with results
-            successful_backtests = 0
-            for strategy_genome in self.current_population:
-                result = backtest_results.get(strategy_genome.id)
-                if result and result.get("status") == "success":
-                    strategy_genome.performance = result.get("performance", {})
-                    successful_backtests += 1
-                else:
-                    error_msg = result.get("error_message") if result else "No result returned"
-                    logger.warning(f"Parallel backtest failed for {strategy_genome.id}: {error_msg}")
-                    strategy_genome.performance = {"error": error_msg, "total_return": -999}
-                
-                results["strategies"].append({
-                    "id": strategy_genome.id,
-                    "name": strategy_genome.name,
-                    "performance": strategy_genome.performance
-                })
-            
-            if successful_backtests == 0 and self.current_population:
-                logger.warning(f"All parallel backtests failed for generation {results['generation']}.")
+                max_workers=self.config.max_parallel_workers,
+                batched=self.config.use_batched_backtesting,
+                batch_size=self.config.backtest_batch_size or None,
+                share_data=self.config.share_market_data
+            ) if pending_population else {}
         
         else:
             # Legacy single-threaded approach
-            successful_backtests = 0
-            for strategy_genome in self.current_population:
+            backtester = self.backtester_registry.get(asset_class)
+            population_results = {}
+            if self.config.use_batched_backtesting and hasattr(backtester, "run_population_backtest") and pending_population:
+                population_results = self._run_population_backtests(backtester, backtest_config, pending_population)
+            
+            computed_results = {}
+            for strategy_genome in pending_population:
                 # Get the strategy class from the factory
-                strategy_metadata = self.strategy_factory.get_strategy_metadata(strategy_genome.type)
-                if not strategy_metadata:
-                    logger.error(f"Strategy type '{strategy_genome.type}' not found in registry. Skipping {strategy_genome.id}.")
-                    strategy_genome.performance = {"error": "Strategy class not found", "total_return": -999}
-                    results["strategies"].append({
-                        "id": strategy_genome.id, "name": strategy_genome.name, "performance": strategy_genome.performance
-                    })
-                    continue
-                
-                strategy_class = self.strategy_factory._registry.get(strategy_genome.type)
+                strategy_class = None
+                if self.strategy_factory.get_strategy_metadata(strategy_genome.type):
+                    strategy_class = self.strategy_factory._registry.get(strategy_genome.type)
                 if not strategy_class:
                     logger.error(f"Strategy class for type '{strategy_genome.type}' not found in registry. Skipping {strategy_genome.id}.")
-                    strategy_genome.performance = {"error": "Strategy class not found", "total_return": -999}
-                    results["strategies"].append({
-                        "id": strategy_genome.id, "name": strategy_genome.name, "performance": strategy_genome.performance
-                    })
+                    computed_results[strategy_genome.id] = BacktestResult(
+                        status="error", strategy_id=strategy_genome.id, strategy_type=strategy_genome.type,
+                        parameters=strategy_genome.parameters, performance={}, error_message="Strategy class not found"
+                    )
+                    continue
+                
+                if strategy_genome.id in population_results:
+                    computed_results[strategy_genome.id] = population_results[strategy_genome.id]
                     continue
-    
                 logger.debug(f"Running backtest for genome {strategy_genome.id} ({strategy_genome.type}) with {asset_class} backtester.")
-                backtest_run_result: BacktestResult = backtester.run_backtest(
-                    strategy_id=strategy_genome.id,
-                    strategy_class=strategy_class,
-                    parameters=strategy_genome.parameters,
-                    asset_class=asset_class, # From overall backtest_config
-                    symbol=backtest_config.get("symbol"),
-                    start_date=backtest_config.get("start_date"),
-                    end_date=backtest_config.get("end_date"),
-                    interval=backtest_config.get("interval"),
-                    initial_capital=backtest_config.get("initial_capital", 100000.0), # Get from config or use default
-                    commission_pct=backtest_config.get("commission_pct", 0.001),
-                    slippage_pct=backtest_config.get("slippage_pct", 0.0005)
+                computed_results[strategy_genome.id] = self._run_genome_backtest(
+                    backtester, strategy_genome, strategy_class, backtest_config
                 )
-                
-                if backtest_run_result["status"] == "success":
-                    strategy_genome.performance = backtest_run_result["performance"]
-                    successful_backtests += 1
-                else:
-                    logger.warning(f"Backtest failed for {strategy_genome.id}: {backtest_run_result.get('error_message')}")
-                    # Assign a very poor performance score if backtest fails
-                    strategy_genome.performance = {"error": backtest_run_result.get('error_message', 'Backtest failed'), "total_return": -999}
-    
-                results["strategies"].append({
-                    "id": strategy_genome.id,
-                    "name": strategy_genome.name,
-                    "performance": strategy_genome.performance
-                })
+        
+        self._store_cached_results(cache_keys, computed_results, set(cached_results))
+        computed_results.update(cached_results)
+        return computed_results, set(cached_results)
+
+    @staticmethod
+    def _run_genome_backtest(
+        backtester: BaseBacktester,
+        strategy_genome: StrategyGenome,
+        strategy_class: Any,
+        backtest_config: Dict[str, Any]
+    ) -> BacktestResult:
+        """Run the serial backtest of one genome."""
+        return backtester.run_backtest(
+            strategy_id=strategy_genome.id,
+            strategy_class=strategy_class,
+            parameters=strategy_genome.parameters,
+            asset_class=backtest_config.get("asset_class"), # From overall backtest_config
+            symbol=backtest_config.get("symbol"),
+            start_date=backtest_config.get("start_date"),
+            end_date=backtest_config.get("end_date"),
+            interval=backtest_config.get("interval"),
+            initial_capital=backtest_config.get("initial_capital", 100000.0), # Get from config or use default
+            commission_pct=backtest_config.get("commission_pct", 0.001),
+            slippage_pct=backtest_config.get("slippage_pct", 0.0005),
+            pruning=backtest_config.get("pruning"),
+            walk_forward=backtest_config.get("walk_forward")
+        )
+
+    def _capture_slowest_profiles(
+        self,
+        backtest_results: Dict[str, BacktestResult],
+        backtest_config: Dict[str, Any],
+        generation: int
+    ) -> Dict[str, str]:
+        """
+        Dump cProfile stats of the generation's slowest genomes.
+        
+        The genomes are re-run serially on the registered backtester, so the
+        dumps cover one backtest each whether the generation ran in parallel or not.
+        
+        Args:
+            backtest_results: Newly computed full-configuration results of the generation
+            backtest_config: The generation's backtest config
+            generation: Generation number, used in the dump file names
+        
+        Returns:
+            Dictionary mapping genome id to the written .prof path
+        """
+        backtester = self.backtester_registry.get(backtest_config.get("asset_class"))
+        if backtester is None:
+            logger.warning("No registered backtester to re-run genomes under cProfile; skipping profile capture.")
+            return {}
+        genomes = {genome.id: genome for genome in self.current_population}
+        
+        def rerun(strategy_id: str) -> BacktestResult:
+            genome = genomes[strategy_id]
+            return self._run_genome_backtest(
+                backtester, genome, self.strategy_factory._registry.get(genome.type), backtest_config
+            )
+        
+        strategy_ids = [
+            strategy_id for strategy_id in slowest_strategy_ids(backtest_results, self.config.profile_slowest_genomes)
+            if strategy_id in genomes and self.strategy_factory._registry.get(genomes[strategy_id].type)
+        ]
+        output_dir = self.config.profile_output_dir or os.path.join(self.data_dir, "profiles")
+        return capture_cprofile(strategy_ids, rerun, output_dir, prefix=f"gen{generation}_")
+
+    @staticmethod
+    def _fidelity_backtest_config(backtest_config: Dict[str, Any], fidelity: Any) -> Dict[str, Any]:
+        """
+        Backtest config for one successive-halving fidelity.
+        
+        Args:
+            backtest_config: Full-fidelity backtest config
+            fidelity: Fraction (0, 1] of the date range, ending at end_date, or a
+                      coarser data interval such as "1d" or "1wk"
+        
+        Returns:
+            Backtest config restricted to the fidelity
+        """
+        if isinstance(fidelity, str):
+            return {**backtest_config, "interval": fidelity}
+        if fidelity >= 1:
+            return backtest_config
+        try:
+            start = datetime.fromisoformat(str(backtest_config.get("start_date")))
+            end = datetime.fromisoformat(str(backtest_config.get("end_date")))
+        except ValueError:
+            logger.warning(f"Cannot shorten date range {backtest_config.get('start_date')} - "
+                           f"{backtest_config.get('end_date')}; evaluating fidelity {fidelity} on the full range")
+            return backtest_config
+        window_start = end - (end - start) * fidelity
+        date_format = "%Y-%m-%d" if len(str(backtest_config.get("start_date"))) <= 10 else "%Y-%m-%dT%H:%M:%S"
+        return {**backtest_config, "start_date": window_start.strftime(date_format)}
+
+    @staticmethod
+    def _fidelity_cost(backtest_config: Dict[str, Any], fidelity: Any) -> float:
+        """Cost of one backtest at a fidelity, in full-fidelity backtest equivalents (ratio of bars)."""
+        if isinstance(fidelity, str):
+            asset_class = backtest_config.get("asset_class")
+            return annualization_factor(fidelity, asset_class) / annualization_factor(backtest_config.get("interval"), asset_class)
+        return min(float(fidelity), 1.0)
+
+    def _fitness(self, performance: Optional[Dict[str, Any]], default: float) -> float:
+        """
+        Fitness of a genome's performance (EvolutionConfig.fitness_metric).
+        
+        Args:
+            performance: Genome performance, or None if it has not been backtested
+            default: Fitness of a genome without the metric
+        
+        Returns:
+            The metric value, or default if it is missing or not a number
+        """
+        value = performance.get(self.config.fitness_metric) if performance else None
+        if value is None or (isinstance(value, float) and math.isnan(value)):
+            return default
+        return value
+
+    def _result_fitness(self, result: Optional[BacktestResult]) -> float:
+        """Fitness used to rank genomes between successive-halving stages."""
+        if not result or result.get("status") not in SCORED_STATUSES:
+            return -float('inf')
+        return self._fitness(result.get("performance"), -float('inf'))
+
+    def _run_successive_halving(
+        self,
+        population: List[StrategyGenome],
+        backtest_config: Dict[str, Any],
+        use_parallel: bool,
+        generation: int
+    ) -> Tuple[Dict[str, BacktestResult], Dict[str, int], List[Dict[str, Any]], Dict[str, BacktestResult], int]:
+        """
+        Evaluate a generation by successive halving.
+        
+        Every genome is scored at the cheapest fidelity of
+        EvolutionConfig.halving_fidelities. After each stage only the top
+        halving_promotion_ratio of the candidates (at least halving_min_survivors)
+        advances to the next fidelity, and only the final survivors are backtested
+        on the full configuration. If halving_budget is set, promotions are cut
+        back so the generation costs at most that many full-fidelity backtests.
+        
+        Args:
+            population: Genomes to evaluate
+            backtest_config: Full-fidelity backtest config
+            use_parallel: Run on the parallel backtest manager
+            generation: Generation number, for logging
+        
+        Returns:
+            Tuple of (genome id -> result of the last stage it reached, genome id ->
+            that stage's index, per-stage report, newly computed results keyed
+            "<stage>:<genome id>", number of cache hits)
+        """
+        schedule = [fidelity for fidelity in self.config.halving_fidelities
+                    if isinstance(fidelity, str) or 0 < fidelity < 1] + [1.0]
+        ratio = min(max(self.config.halving_promotion_ratio, 0.0), 1.0)
+        budget = self.config.halving_budget
+        
+        candidates = list(population)
+        final_results: Dict[str, BacktestResult] = {}
+        stage_reached: Dict[str, int] = {}
+        stage_reports: List[Dict[str, Any]] = []
+        computed: Dict[str, BacktestResult] = {}
+        cache_hits = 0
+        cost_used = 0.0
+        for stage, fidelity in enumerate(schedule):
+            cost = self._fidelity_cost(backtest_config, fidelity)
+            if stage > 0:
+                candidates.sort(key=lambda genome: self._result_fitness(final_results.get(genome.id)), reverse=True)
+                keep = max(math.ceil(len(candidates) * ratio), self.config.halving_min_survivors)
+                if budget > 0 and cost > 0:
+                    keep = min(keep, max(int((budget - cost_used) / cost), self.config.halving_min_survivors))
+                candidates = candidates[:min(keep, len(candidates))]
+            if not candidates:
+                break
+            
+            stage_config = self._fidelity_backtest_config(backtest_config, fidelity)
+            started = time.perf_counter()
+            stage_results, cached_ids = self._evaluate_genomes(candidates, stage_config, use_parallel, generation)
+            elapsed = time.perf_counter() - started
+            cost_used += cost * len(candidates)
+            cache_hits += len(cached_ids)
+            
+            for genome in candidates:
+                final_results[genome.id] = stage_results.get(genome.id)
+                stage_reached[genome.id] = stage
+                if genome.id not in cached_ids and genome.id in stage_results:
+                    computed[f"{stage}:{genome.id}"] = stage_results[genome.id]
+            stage_reports.append({
+                "stage": stage,
+                "fidelity": fidelity,
+                "start_date": stage_config.get("start_date"),
+                "interval": stage_config.get("interval"),
+                "genomes": len(candidates),
+                "cache_hits": len(cached_ids),
+                "seconds": elapsed,
+                "genomes_per_second": len(candidates) / elapsed if elapsed > 0 else None
+            })
+            logger.info(f"Successive halving stage {stage} (fidelity {fidelity}) of generation {generation}: "
+                        f"{len(candidates)} genomes in {elapsed:.2f}s")
+        
+        # Survivors of a stage are the genomes evaluated at the next one
+        for report, next_report in zip(stage_reports, stage_reports[1:] + [None]):
+            report["survivors"] = next_report["genomes"] if next_report else report["genomes"]
+        return final_results, stage_reached, stage_reports, computed, cache_hits
+
+    def run_backtest_generation(self, backtest_config: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Run backtests for the current generation using asset-specific backtesters.
+        
+        With EvolutionConfig.use_successive_halving, genomes are first scored on
+        cheaper fidelities and only the best advance to the full backtest (see
+        _run_successive_halving). Genomes eliminated early keep the performance of
+        the last stage they reached, tagged with 'halving_stage', and rank below
+        every genome that got further.
+        
+        Args:
+            backtest_config: Dict containing asset_class, symbol, start_date, end_date, interval, etc.
+                             An optional 'pruning' dict of PruningRules fields (e.g.
+                             {"max_drawdown_pct": 40, "no_trade_bars": 100}) stops obviously
+                             bad genomes early; they are scored with a penalized fitness.
+                             An optional 'walk_forward' dict of WalkForwardConfig fields
+                             (e.g. {"folds": 5, "anchored": true}) adds a robustness_score
+                             over rolling train/test folds; set fitness_metric to
+                             "robustness_score" to evolve on it.
+        """
+        asset_class = backtest_config.get("asset_class")
+        if not asset_class:
+            raise ValueError("'asset_class' must be provided in backtest_config")
+        
+        # Check if we should use parallel backtesting
+        use_parallel = self.config.use_parallel_backtesting and self.parallel_backtest_manager is not None
+        
+        if not use_parallel:
+            # Legacy single-threaded approach
+            backtester = self.backtester_registry.get(asset_class)
+            if not backtester:
+                logger.error(f"No backtester registered for asset class: {asset_class}")
+                raise ValueError(f"Backtester for asset class '{asset_class}' not configured in EvoTrader.")
+        
+        results = {
+            "generation": self.current_population[0].generation if self.current_population else 0,
+            "population_size": len(self.current_population),
+            "strategies": [],
+            "best_strategy_performance": None, # Storing full best strategy details later
+            "avg_performance": {},
+            "timestamp": datetime.utcnow().isoformat(),
+            "backtest_config": backtest_config
+        }
+        
+        stage_reached: Dict[str, int] = {}
+        if self.config.use_successive_halving and self.current_population:
+            backtest_results, stage_reached, stage_reports, computed_results, cache_hits = self._run_successive_halving(
+                self.current_population, backtest_config, use_parallel, results["generation"]
+            )
+            results["successive_halving"] = {"stages": stage_reports}
+            final_stage = len(stage_reports) - 1
+        else:
+            backtest_results, cached_ids = self._evaluate_genomes(
+                self.current_population, backtest_config, use_parallel, results["generation"]
+            )
+            computed_results = {
+                strategy_id: result for strategy_id, result in backtest_results.items() if strategy_id not in cached_ids
+            }
+            cache_hits = len(cached_ids)
+        results["pruning"] = self._summarize_pruning(computed_results, results["generation"])
+        
+        # Where the generation's backtest time went (newly computed results only)
+        results["profile"] = aggregate_profiles(computed_results.values())
+        if results["profile"]["backtests"]:
+            logger.info(f"Generation {results['generation']} backtest profile: {format_profile(results['profile'])}")
+        if self.config.profile_slowest_genomes > 0:
+            # Under successive halving only full-configuration runs are comparable
+            full_results = computed_results if not stage_reached else {
+                key.split(":", 1)[1]: result for key, result in computed_results.items()
+                if key.startswith(f"{final_stage}:")
+            }
+            results["profile"]["cprofile_dumps"] = self._capture_slowest_profiles(
+                full_results, backtest_config, results["generation"]
+            )
+        
+        # Update strategy genomes with results
+        successful_backtests = 0
+        for strategy_genome in self.current_population:
+            result = backtest_results.get(strategy_genome.id)
+            if result and result.get("status") in SCORED_STATUSES:
+                strategy_genome.performance = dict(result.get("performance", {}))
+                successful_backtests += 1
+            else:
+                error_msg = result.get("error_message") if result else "No result returned"
+                logger.warning(f"Backtest failed for {strategy_genome.id}: {error_msg}")
+                # Assign a very poor performance score if backtest fails
+                strategy_genome.performance = {"error": error_msg, "total_return": -999, self.config.fitness_metric: -999}
+            if strategy_genome.id in stage_reached:
+                strategy_genome.performance["halving_stage"] = stage_reached[strategy_genome.id]
+                strategy_genome.performance["halving_final"] = stage_reached[strategy_genome.id] == final_stage
             
-            if successful_backtests == 0 and self.current_population:
-                 logger.warning(f"All backtests failed for generation {results['generation']}. Population may not evolve well.")
+            results["strategies"].append({
+                "id": strategy_genome.id,
+                "name": strategy_genome.name,
+                "performance": strategy_genome.performance
+            })
+        
+        if successful_backtests == 0 and self.current_population:
+            logger.warning(f"All backtests failed for generation {results['generation']}. Population may not evolve well.")
+        
+        if self.result_store is not None:
+            self._store_generation_results(backtest_results, backtest_config, results["generation"])
         
-        # Sort population by performance (total_return or a custom fitness score)
+        if self.result_cache is not None:
+            results["result_cache"] = {
+                "generation_hits": cache_hits,
+                "generation_misses": len(computed_results),
+                **self.result_cache.get_stats()
+            }
+
+        # Sort population by fitness (EvolutionConfig.fitness_metric);
+        # under successive halving, genomes that reached a later stage rank first
         self.current_population.sort(
-            key=lambda s: s.performance.get("total_return", -float('inf')) if s.performance else -float('inf'),
+            key=lambda s: (s.performance.get("halving_stage", 0), self._fitness(s.performance, -float('inf')))
+            if s.performance else (-1, -float('inf')),
             reverse=True
         )
         
@@ -519,9 +1023,12 @@ class EvoTrader:
         # Calculate average performance metrics across successful backtests
         if results["strategies"]:
             # Filter out strategies with errors
+            # Pruned genomes carry a penalized, partial fitness and genomes eliminated by
+            # successive halving were scored on a shorter fidelity; both are left out of the averages
             valid_strategies = [
                 s for s in results["strategies"] 
-                if "error" not in s["performance"] and s["performance"] is not None
+                if s["performance"] is not None and "error" not in s["performance"] and not s["performance"].get("pruned")
+                and s["performance"].get("halving_final", True)
             ]
             
             if valid_strategies:
@@ -532,13 +1039,81 @@ class EvoTrader:
                 avg_performance = {}
                 for metric in all_metrics:
                     values = [s["performance"].get(metric, 0) for s in valid_strategies]
-                    avg_performance[metric] = sum(values) / len(values)
+                    values = [value for value in values if value is not None]  # e.g. an undefined walk-forward efficiency
+                    if values:
+                        avg_performance[metric] = sum(values) / len(values)
                 
                 results["avg_performance"] = avg_performance
 
         self._save_strategies()
         return results
     
+    def _store_generation_results(
+        self,
+        backtest_results: Dict[str, BacktestResult],
+        backtest_config: Dict[str, Any],
+        generation: int
+    ) -> None:
+        """
+        Append a generation's final results to the result store.
+        
+        Args:
+            backtest_results: Result per genome ID (cache hits included, so every generation is complete)
+            backtest_config: The generation's backtest config
+            generation: Generation number
+        """
+        genome_types = {genome.id: genome.type for genome in self.current_population}
+        try:
+            self.result_store.append_many(
+                [
+                    {**result, "strategy_type": genome_types.get(strategy_id, result.get("strategy_type"))}
+                    for strategy_id, result in backtest_results.items() if result
+                ],
+                source="evolution", run_id=self.run_id, generation=generation,
+                **{key: backtest_config.get(key) for key in ("asset_class", "symbol", "interval", "start_date", "end_date")}
+            )
+        except Exception as e:
+            logger.warning(f"Could not store results of generation {generation}: {e}")
+    
+    def validate_finalists(
+        self,
+        backtest_config: Dict[str, Any],
+        validation_config: Optional[ValidationConfig] = None,
+        llm_evaluator: Optional[Any] = None
+    ) -> Dict[str, Any]:
+        """
+        Run the tiered validation pipeline (in-sample -> top-K -> OOS -> Monte
+        Carlo -> LLM review) on the current population.
+        
+        Args:
+            backtest_config: Dict containing asset_class, symbol, start_date, end_date, interval, etc.
+            validation_config: Optional pipeline settings
+            llm_evaluator: Optional LLMEvaluator for the final review stage
+            
+        Returns:
+            Pipeline results with finalists and per-stage latency/throughput
+        """
+        asset_class = backtest_config.get("asset_class")
+        backtester = self.backtester_registry.get(asset_class)
+        if not backtester:
+            raise ValueError(f"Backtester for asset class '{asset_class}' not configured in EvoTrader.")
+        
+        strategy_classes = {
+            genome.type: self.strategy_factory._registry.get(genome.type)
+            for genome in self.current_population
+            if self.strategy_factory._registry.get(genome.type)
+        }
+        pipeline = ValidationPipeline(
+            backtester, strategy_classes, config=validation_config,
+            llm_evaluator=llm_evaluator, result_cache=self.result_cache
+        )
+        return pipeline.run(self.current_population, backtest_config)
+    
+    def shutdown(self) -> None:
+        """Stop the persistent backtest worker pool, if one is running."""
+        if self.parallel_backtest_manager is not None:
+            self.parallel_backtest_manager.shutdown_pool()
+    
     def evolve_generation(self) -> Dict[str, Any]:
         """
         Evolve the current population to create a new generation.
@@ -652,8 +1227,7 @@ class EvoTrader:
         tournament = random.sample(population, tournament_size)
         
         # Return the best strategy from the tournament
-        return max(tournament, 
-                  key=lambda s: s.performance.get("total_return", 0) if s.performance else 0)
+        return max(tournament, key=lambda s: self._fitness(s.performance, 0))
     
     def _roulette_selection(
         self, 
@@ -670,10 +1244,16 @@ class EvoTrader:
         Returns:
             List of selected strategies
         """
-        # Get fitness values (use total return as fitness)
+        # Get fitness values; total return (in percent) is shifted by 100 so a total
+        # loss has zero weight, other metrics are shifted by the population minimum
+        raw_fitness = [self._fitness(s.performance, 0) for s in population]
+        if self.config.fitness_metric == "total_return":
+            offset = 100
+        else:
+            offset = -min([f for f in raw_fitness if f > -999] or [0])
         fitness_values = [
-            max(0.01, s.performance.get("total_return", 0) + 100) if s.performance else 0.01
-            for s in population
+            max(0.01, f + offset) if s.performance else 0.01
+            for s, f in zip(population, raw_fitness)
         ]
         
         # Calculate selection probabilities
@@ -12,6 +12,8 @@ from typing import Dict, List, Any, Optional, Tuple
 from datetime import datetime, timedelta
 import time
 
+from trading_bot.core.data.indicator_window import IndicatorWindow
+
 logger = logging.getLogger(__name__)
 
 class MarketRegime:
@@ -40,7 +42,8 @@ class MarketAdapter:
         lookback_days: int = 90,
         update_frequency_hours: int = 24,
         min_data_points: int = 20,
-        volatility_window: int = 21
+        volatility_window: int = 21,
+        incremental_updates: bool = True
     ):
         """
         Initialize the market adapter.
@@ -53,6 +56,9 @@ class MarketAdapter:
             update_frequency_hours: How often to update market regime analysis
             min_data_points: Minimum data points required for analysis
             volatility_window: Window size for volatility calculations
+            incremental_updates: Fetch only bars added since the previous update and
+                                 extend the regime indicators, when the data fetcher
+                                 supports it (update_many with a bar store)
         """
         self.data_fetcher = data_fetcher
         self.evo_trader = evo_trader
@@ -62,6 +68,7 @@ class MarketAdapter:
         self.update_frequency_hours = update_frequency_hours
         self.min_data_points = min_data_points
         self.volatility_window = volatility_window
+        self.incremental_updates = incremental_updates
         
         # Key market symbols to track for each asset class
         self.market_symbols = {
@@ -73,6 +80,9 @@ class MarketAdapter:
         # Track identified regimes
         self.current_regimes: Dict[str, Dict[str, Any]] = {}
         
+        # Daily bars and regime indicators per (symbol, asset_class), extended on each update
+        self._regime_windows: Dict[Tuple[str, str], IndicatorWindow] = {}
+        
         # Track correlation matrix between assets
         self.correlation_matrix: Optional[pd.DataFrame] = None
         
@@ -114,6 +124,9 @@ class MarketAdapter:
         end_date = now.strftime('%Y-%m-%d')
         start_date = (now - timedelta(days=self.lookback_days)).strftime('%Y-%m-%d')
         
+        # Bars and regime indicators of all tracked symbols
+        fetched = self._refresh_market_data(start_date, end_date)
+        
         # Update regimes for each asset class
         new_regimes = {}
         market_data = {}
@@ -123,29 +136,21 @@ class MarketAdapter:
             asset_data = {}
             
             for symbol in symbols:
-                # Fetch historical data
+                data = fetched.get((symbol, asset_class))
+                if data is None or len(data) < self.min_data_points:
+                    logger.warning(f"Insufficient data for {symbol} ({asset_class}). Skipping.")
+                    continue
+                
                 try:
-                    data = self.data_fetcher.fetch(
-                        symbol=symbol,
-                        asset_class=asset_class,
-                        start_date=start_date,
-                        end_date=end_date,
-                        interval='1d'
-                    )
-                    
-                    if data is None or len(data) < self.min_data_points:
-                        logger.warning(f"Insufficient data for {symbol} ({asset_class}). Skipping.")
-                        continue
-                    
                     # Store data for correlation analysis
                     asset_data[symbol] = data
                     
                     # Identify regime for this symbol
-                    regime = self._identify_regime(data, symbol, asset_class)
+                    regime = self._classify_regime(data, symbol, asset_class)
                     asset_regimes[symbol] = regime
                     
                 except Exception as e:
-                    logger.error(f"Error fetching data for {symbol} ({asset_class}): {e}")
+                    logger.error(f"Error analyzing data for {symbol} ({asset_class}): {e}")
                     continue
             
             # Aggregate regimes for the asset class (majority vote)
@@ -189,6 +194,102 @@ class MarketAdapter:
             "timestamp": now.isoformat()
         }
     
+    def _refresh_market_data(self, start_date: str, end_date: str) -> Dict[Tuple[str, str], pd.DataFrame]:
+        """
+        Daily bars with regime indicators for every tracked symbol.
+        
+        With incremental updates, symbols seen before only fetch the bars
+        added since the previous update and extend their indicator windows;
+        other symbols are fetched over the whole lookback period.
+        
+        Args:
+            start_date: Start of the lookback period (YYYY-MM-DD)
+            end_date: End date, exclusive (YYYY-MM-DD)
+            
+        Returns:
+            Bars and indicators per (symbol, asset_class) with data
+        """
+        requests = [
+            (symbol, asset_class)
+            for asset_class, symbols in self.market_symbols.items()
+            for symbol in symbols
+        ]
+        
+        incremental = (
+            self.incremental_updates
+            and hasattr(self.data_fetcher, "update_many")
+            and getattr(self.data_fetcher, "bar_store", None) is not None
+        )
+        if not incremental:
+            fetched = self._fetch_market_data(start_date, end_date, requests)
+            return {key: self._regime_indicators(data) for key, data in fetched.items()}
+        
+        known = [key for key in requests if key in self._regime_windows]
+        if known:
+            result = self.data_fetcher.update_many(known, interval='1d', start_date=start_date, end_date=end_date)
+            for (symbol, asset_class), error in result.errors.items():
+                logger.error(f"Error updating data for {symbol} ({asset_class}): {error}")
+            for key in known:
+                bars = result.data.get(key)
+                self._regime_windows[key].extend(bars if bars is not None else pd.DataFrame(), since=start_date)
+        
+        new = [key for key in requests if key not in self._regime_windows]
+        for key, data in self._fetch_market_data(start_date, end_date, new).items():
+            window = IndicatorWindow(self._regime_indicators, warmup=max(50, self.volatility_window + 1))
+            window.extend(data)
+            self._regime_windows[key] = window
+        
+        return {
+            key: self._regime_windows[key].data
+            for key in requests
+            if key in self._regime_windows and len(self._regime_windows[key])
+        }
+    
+    def _fetch_market_data(
+        self,
+        start_date: str,
+        end_date: str,
+        requests: List[Tuple[str, str]]
+    ) -> Dict[Tuple[str, str], pd.DataFrame]:
+        """
+        Fetch daily data for the given symbols.
+        
+        Uses the fetcher's concurrent fetch_many when it has one and falls
+        back to fetching symbol by symbol otherwise.
+        
+        Args:
+            start_date: Start date (YYYY-MM-DD)
+            end_date: End date (YYYY-MM-DD)
+            requests: (symbol, asset_class) pairs to fetch
+            
+        Returns:
+            DataFrame per (symbol, asset_class) that could be fetched
+        """
+        if not requests:
+            return {}
+        
+        if hasattr(self.data_fetcher, "fetch_many"):
+            result = self.data_fetcher.fetch_many(requests, start_date, end_date, interval='1d')
+            for (symbol, asset_class), error in result.errors.items():
+                logger.error(f"Error fetching data for {symbol} ({asset_class}): {error}")
+            return result.data
+        
+        fetched = {}
+        for symbol, asset_class in requests:
+            try:
+                data = self.data_fetcher.fetch(
+                    symbol=symbol,
+                    asset_class=asset_class,
+                    start_date=start_date,
+                    end_date=end_date,
+                    interval='1d'
+                )
+                if data is not None:
+                    fetched[(symbol, asset_class)] = data
+            except Exception as e:
+                logger.error(f"Error fetching data for {symbol} ({asset_class}): {e}")
+        return fetched
+    
     def _identify_regime(
         self, 
         data: pd.DataFrame, 
@@ -206,14 +307,49 @@ class MarketAdapter:
         Returns:
             Dictionary with regime identification
         """
-        # Calculate returns and volatility
-        data['returns'] = data['Close'].pct_change() * 100  # in percent
-        data['volatility'] = data['returns'].rolling(window=self.volatility_window).std()
+        return self._classify_regime(self._regime_indicators(data), symbol, asset_class)
+    
+    def _regime_indicators(self, data: pd.DataFrame) -> pd.DataFrame:
+        """
+        Add the per-bar indicators used for regime identification.
+        
+        Each row depends only on that bar and the 50 bars before it, so
+        the indicators can be extended bar by bar (see IndicatorWindow).
         
-        # Calculate SMA for trend detection
-        data['sma_50'] = data['Close'].rolling(window=50).mean()
-        data['sma_20'] = data['Close'].rolling(window=20).mean()
+        Args:
+            data: Historical price data
+            
+        Returns:
+            Copy of data with returns, volatility, sma_50 and sma_20 columns
+        """
+        # Calculate returns and volatility
+        returns = data['Close'].pct_change() * 100  # in percent
+        
+        return data.assign(
+            returns=returns,
+            volatility=returns.rolling(window=self.volatility_window).std(),
+            # Calculate SMA for trend detection
+            sma_50=data['Close'].rolling(window=50).mean(),
+            sma_20=data['Close'].rolling(window=20).mean()
+        )
+    
+    def _classify_regime(
+        self, 
+        data: pd.DataFrame, 
+        symbol: str, 
+        asset_class: str
+    ) -> Dict[str, Any]:
+        """
+        Identify the market regime from price data with regime indicators.
         
+        Args:
+            data: Output of _regime_indicators over the lookback period
+            symbol: Symbol being analyzed
+            asset_class: Asset class of the symbol
+            
+        Returns:
+            Dictionary with regime identification
+        """
         # Calculate recent performance
         recent_return = (data['Close'].iloc[-1] / data['Close'].iloc[-min(len(data), 20)] - 1) * 100
         
@@ -0,0 +1,344 @@
+"""
+Tiered Validation Pipeline for BensBot's Evolution System.
+
+Out-of-sample backtests, Monte Carlo simulation and LLM review are far more
+expensive than an in-sample backtest, and only the best few genomes of a run
+ever need them. The pipeline runs the stages in order of cost:
+
+    in-sample backtest -> top-K filter -> OOS backtest -> Monte Carlo -> LLM review
+
+Each stage only sees the candidates that survived the previous one, stage
+outputs are cached by content (strategy, parameters, data and stage
+settings), and every stage reports its latency and throughput. Candidates
+carry a phase profile: their in-sample backtest profile plus the OOS and
+Monte Carlo time spent on them.
+"""
+
+import logging
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, List, Any, Optional, Tuple
+
+import pandas as pd
+
+from trading_bot.core.backtesting.base_backtester import BaseBacktester, BacktestResult
+from trading_bot.core.backtesting.result_cache import BacktestResultCache, compute_data_fingerprint, make_cache_key
+from trading_bot.core.backtesting.profiling import PHASE_OOS, PHASE_MONTE_CARLO, add_phase_time, aggregate_profiles
+
+logger = logging.getLogger(__name__)
+
+# Stage names, in pipeline order
+STAGE_IN_SAMPLE = "in_sample"
+STAGE_TOP_K = "top_k"
+STAGE_OOS = "oos"
+STAGE_MONTE_CARLO = "monte_carlo"
+STAGE_LLM = "llm"
+PIPELINE_STAGES = (STAGE_IN_SAMPLE, STAGE_TOP_K, STAGE_OOS, STAGE_MONTE_CARLO, STAGE_LLM)
+
+@dataclass
+class ValidationConfig:
+    """Settings of the tiered validation pipeline."""
+    oos_split: float = 0.3                         # Fraction of the date range held out for OOS
+    rank_metric: str = "total_return"              # In-sample metric used by the top-K filter
+    top_k: int = 10                                # Candidates that advance to OOS validation
+    min_oos_return: Optional[float] = None         # Drop candidates whose OOS total return is below this
+    monte_carlo_top_k: int = 5                     # Candidates (best OOS first) that get a Monte Carlo run
+    monte_carlo_simulations: int = 1000            # Simulations per Monte Carlo run
+    min_consistency_score: Optional[float] = None  # Drop candidates whose Monte Carlo consistency is below this
+    llm_top_k: int = 3                             # Finalists sent to the LLM evaluator
+    use_cache: bool = True                         # Cache stage outputs in the result cache
+
+class ValidationPipeline:
+    """
+    Runs validation stages lazily, cheapest first, on a shrinking candidate set.
+    """
+
+    def __init__(
+        self,
+        backtester: BaseBacktester,
+        strategy_classes: Dict[str, Any],
+        config: Optional[ValidationConfig] = None,
+        llm_evaluator: Optional[Any] = None,
+        result_cache: Optional[BacktestResultCache] = None
+    ):
+        """
+        Args:
+            backtester: Backtester for the asset class being validated
+            strategy_classes: Mapping of strategy type to strategy class
+            config: Pipeline settings (defaults to ValidationConfig())
+            llm_evaluator: Optional LLMEvaluator; the LLM stage is skipped without one
+            result_cache: Optional cache for stage outputs
+        """
+        self.backtester = backtester
+        self.strategy_classes = strategy_classes
+        self.config = config or ValidationConfig()
+        self.llm_evaluator = llm_evaluator
+        self.result_cache = result_cache if self.config.use_cache else None
+        self._fingerprint: Optional[Dict[str, Any]] = None
+        self._cache_hits = 0
+
+    def run(self, genomes: List[Any], backtest_config: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Validate a set of genomes.
+
+        Args:
+            genomes: StrategyGenome objects or dictionaries with id, type and parameters
+            backtest_config: Dict containing asset_class, symbol, start_date, end_date, interval, etc.
+
+        Returns:
+            Dictionary with 'finalists' (candidates that passed every stage run),
+            'candidates' (every candidate with the outputs of the stages it reached)
+            and 'stages' (per-stage counts, cache hits, latency and throughput)
+        """
+        candidates = [self._to_candidate(genome) for genome in genomes]
+        in_sample_config, oos_config = self._split_config(backtest_config)
+        self._fingerprint = self._get_fingerprint(backtest_config)
+        stages: List[Dict[str, Any]] = []
+
+        survivors = self._run_stage(stages, STAGE_IN_SAMPLE, candidates,
+                                    lambda batch: self._in_sample_stage(batch, in_sample_config))
+        survivors = self._run_stage(stages, STAGE_TOP_K, survivors, self._top_k_stage)
+        survivors = self._run_stage(stages, STAGE_OOS, survivors,
+                                    lambda batch: self._oos_stage(batch, oos_config))
+        survivors = self._run_stage(stages, STAGE_MONTE_CARLO, survivors,
+                                    lambda batch: self._monte_carlo_stage(batch, backtest_config))
+        if self.llm_evaluator is not None:
+            survivors = self._run_stage(stages, STAGE_LLM, survivors, self._llm_stage)
+        for candidate in candidates:
+            candidate.pop("_equity_curve", None)
+
+        logger.info(f"Validation pipeline on {backtest_config.get('symbol')}: {len(candidates)} candidates, "
+                    f"{len(survivors)} finalists; " +
+                    ", ".join(f"{stage['stage']} {stage['seconds']:.2f}s" for stage in stages))
+        return {
+            "finalists": survivors,
+            "candidates": candidates,
+            "stages": stages,
+            "profile": aggregate_profiles(candidates),
+            "timestamp": datetime.utcnow().isoformat()
+        }
+
+    def _run_stage(
+        self,
+        stages: List[Dict[str, Any]],
+        name: str,
+        candidates: List[Dict[str, Any]],
+        stage_fn: Any
+    ) -> List[Dict[str, Any]]:
+        """Run one stage on the surviving candidates and record its metrics."""
+        started = time.perf_counter()
+        self._cache_hits = 0
+        survivors, evaluated = stage_fn(candidates) if candidates else ([], 0)
+        elapsed = time.perf_counter() - started
+        for candidate in survivors:
+            candidate["stage_reached"] = name
+        stages.append({
+            "stage": name,
+            "candidates_in": len(candidates),
+            "candidates_out": len(survivors),
+            "evaluated": evaluated,
+            "cache_hits": self._cache_hits,
+            "seconds": elapsed,
+            "throughput": evaluated / elapsed if evaluated and elapsed > 0 else None
+        })
+        return survivors
+
+    @staticmethod
+    def _to_candidate(genome: Any) -> Dict[str, Any]:
+        """Normalize a genome into a candidate record."""
+        data = genome if isinstance(genome, dict) else vars(genome)
+        return {
+            "id": data["id"],
+            "type": data["type"],
+            "parameters": data.get("parameters", {}),
+            "stage_reached": None
+        }
+
+    def _split_config(self, backtest_config: Dict[str, Any]) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """Split the backtest date range into in-sample and out-of-sample configs."""
+        start = datetime.fromisoformat(str(backtest_config.get("start_date")))
+        end = datetime.fromisoformat(str(backtest_config.get("end_date")))
+        split = start + (end - start) * (1 - self.config.oos_split)
+        date_format = "%Y-%m-%d" if len(str(backtest_config.get("start_date"))) <= 10 else "%Y-%m-%dT%H:%M:%S"
+        split_date = split.strftime(date_format)
+        # The out-of-sample window is one held-out test window, not split into walk-forward folds
+        oos_config = {key: value for key, value in backtest_config.items() if key != "walk_forward"}
+        return {**backtest_config, "end_date": split_date}, {**oos_config, "start_date": split_date}
+
+    def _get_fingerprint(self, backtest_config: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Fingerprint the full data range, or None if stage outputs cannot be cached."""
+        if self.result_cache is None:
+            return None
+        try:
+            data = self.backtester.data_fetcher.fetch(
+                backtest_config.get("symbol"), backtest_config.get("asset_class"),
+                backtest_config.get("start_date"), backtest_config.get("end_date"), backtest_config.get("interval")
+            )
+        except Exception as e:
+            logger.warning(f"Could not load data to fingerprint; validation cache disabled: {e}")
+            return None
+        if data is None or data.empty:
+            return None
+        return compute_data_fingerprint(
+            data,
+            symbol=backtest_config.get("symbol"),
+            interval=backtest_config.get("interval"),
+            start_date=backtest_config.get("start_date"),
+            end_date=backtest_config.get("end_date")
+        )
+
+    def _cache_key(self, stage: str, candidate: Dict[str, Any], settings: Dict[str, Any]) -> Optional[str]:
+        """Content address of a stage output, or None if caching is off."""
+        if self.result_cache is None or self._fingerprint is None:
+            return None
+        return make_cache_key(candidate["type"], candidate["parameters"], self._fingerprint,
+                              {"validation_stage": stage, **settings})
+
+    def _cache_get(self, key: Optional[str]) -> Any:
+        """Cached stage output, or None on a miss."""
+        cached = self.result_cache.get(key) if key is not None else None
+        if cached is None:
+            return None
+        self._cache_hits += 1
+        return cached.get("output")
+
+    def _cache_put(self, key: Optional[str], output: Any) -> None:
+        if key is not None and output is not None:
+            self.result_cache.put(key, {"output": output})
+
+    def _cached(self, stage: str, candidate: Dict[str, Any], settings: Dict[str, Any], compute: Any) -> Any:
+        """Return a stage output from the cache, computing and storing it on a miss."""
+        key = self._cache_key(stage, candidate, settings)
+        output = self._cache_get(key)
+        if output is None:
+            output = compute()
+            self._cache_put(key, output)
+        return output
+
+    @staticmethod
+    def _profiled(candidate: Dict[str, Any], phase: str, compute: Any) -> Any:
+        """Run compute, adding its wall-clock and CPU time to the candidate's profile."""
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        try:
+            return compute()
+        finally:
+            add_phase_time(candidate, phase, time.perf_counter() - wall_start, time.process_time() - cpu_start)
+
+    def _backtest(self, candidate: Dict[str, Any], stage_config: Dict[str, Any]) -> Optional[BacktestResult]:
+        """Backtest one candidate on a stage's date range."""
+        strategy_class = self.strategy_classes.get(candidate["type"])
+        if strategy_class is None:
+            logger.error(f"Strategy type '{candidate['type']}' not found; cannot validate {candidate['id']}.")
+            return None
+        return self.backtester.run_backtest(
+            strategy_id=candidate["id"],
+            strategy_class=strategy_class,
+            parameters=candidate["parameters"],
+            **stage_config
+        )
+
+    def _in_sample_stage(self, candidates: List[Dict[str, Any]], stage_config: Dict[str, Any]) -> Tuple[List[Dict[str, Any]], int]:
+        """Backtest every candidate in-sample, keeping the equity curve for Monte Carlo."""
+        keep_equity_curves = self.backtester.keep_equity_curves
+        self.backtester.keep_equity_curves = True
+        survivors = []
+        try:
+            for candidate in candidates:
+                def compute(candidate=candidate):
+                    result = self._backtest(candidate, stage_config)
+                    if not result or result.get("status") != "success":
+                        return None
+                    if result.get("profile"):
+                        candidate["profile"] = result["profile"]
+                    return {"performance": dict(result["performance"]), "equity_curve": result.get("equity_curve")}
+                output = self._cached(STAGE_IN_SAMPLE, candidate, {"backtest_config": stage_config}, compute)
+                if output is None:
+                    continue
+                candidate["in_sample"] = output["performance"]
+                candidate["_equity_curve"] = output["equity_curve"]
+                survivors.append(candidate)
+        finally:
+            self.backtester.keep_equity_curves = keep_equity_curves
+        return survivors, len(candidates)
+
+    def _top_k_stage(self, candidates: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], int]:
+        """Keep the top_k candidates by the in-sample rank metric."""
+        metric = self.config.rank_metric
+        ranked = sorted(candidates, key=lambda c: c["in_sample"].get(metric, -float('inf')), reverse=True)
+        return ranked[:self.config.top_k], len(candidates)
+
+    def _oos_stage(self, candidates: List[Dict[str, Any]], stage_config: Dict[str, Any]) -> Tuple[List[Dict[str, Any]], int]:
+        """Backtest the candidates out-of-sample and drop those below min_oos_return."""
+        survivors = []
+        for candidate in candidates:
+            def compute(candidate=candidate):
+                result = self._profiled(candidate, PHASE_OOS, lambda: self._backtest(candidate, stage_config))
+                if not result or result.get("status") != "success":
+                    return None
+                return dict(result["performance"])
+            oos = self._cached(STAGE_OOS, candidate, {"backtest_config": stage_config}, compute)
+            if oos is None:
+                continue
+            candidate["oos"] = oos
+            if self.config.min_oos_return is not None and oos.get("total_return", -float('inf')) < self.config.min_oos_return:
+                continue
+            survivors.append(candidate)
+        survivors.sort(key=lambda c: c["oos"].get("total_return", -float('inf')), reverse=True)
+        return survivors, len(candidates)
+
+    def _monte_carlo_stage(self, candidates: List[Dict[str, Any]], backtest_config: Dict[str, Any]) -> Tuple[List[Dict[str, Any]], int]:
+        """Run Monte Carlo on the in-sample returns of the best OOS candidates."""
+        candidates = candidates[:self.config.monte_carlo_top_k]
+        self.backtester.monte_carlo_simulations = self.config.monte_carlo_simulations
+        initial_capital = backtest_config.get("initial_capital", 100000.0)
+        settings = {"backtest_config": backtest_config, "oos_split": self.config.oos_split,
+                    "simulations": self.config.monte_carlo_simulations}
+        survivors = []
+        for candidate in candidates:
+            def compute(candidate=candidate):
+                curve = candidate.get("_equity_curve")
+                if not curve:
+                    return {}
+                mc_results = self._profiled(candidate, PHASE_MONTE_CARLO, lambda: self.backtester._run_monte_carlo_simulation(
+                    pd.Series(curve, dtype=float), initial_capital, include_plot=False
+                ))
+                return self.backtester._monte_carlo_metrics(mc_results)
+            candidate["monte_carlo"] = self._cached(STAGE_MONTE_CARLO, candidate, settings, compute)
+            consistency = candidate["monte_carlo"].get("consistency_score")
+            if self.config.min_consistency_score is not None and consistency is not None \
+               and consistency < self.config.min_consistency_score:
+                continue
+            survivors.append(candidate)
+        for candidate in survivors:
+            candidate.pop("_equity_curve", None)
+        return survivors, len(candidates)
+
+    def _llm_stage(self, candidates: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], int]:
+        """Send the best finalists to the LLM evaluator, reusing cached reviews."""
+        candidates = candidates[:self.config.llm_top_k]
+        pending: List[Tuple[Dict[str, Any], Dict[str, Any], Optional[str]]] = []
+        for candidate in candidates:
+            performance = {**candidate["in_sample"],
+                           **{f"oos_{key}": value for key, value in candidate.get("oos", {}).items()},
+                           **candidate.get("monte_carlo", {})}
+            key = self._cache_key(STAGE_LLM, candidate, {"performance": performance})
+            evaluation = self._cache_get(key)
+            if evaluation is not None:
+                candidate["llm"] = evaluation
+            else:
+                pending.append((candidate, performance, key))
+
+        if pending:
+            # batch_evaluate paces its API calls to stay under rate limits
+            evaluations = self.llm_evaluator.batch_evaluate([
+                {"id": candidate["id"], "type": candidate["type"], "parameters": candidate["parameters"],
+                 "performance": performance}
+                for candidate, performance, _ in pending
+            ])
+            for (candidate, _, key), evaluation in zip(pending, evaluations):
+                candidate["llm"] = evaluation.get("evaluation", {})
+                if "error" not in candidate["llm"]:
+                    self._cache_put(key, candidate["llm"])
+        return candidates, len(pending)
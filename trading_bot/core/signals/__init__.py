@@ -0,0 +1,16 @@
+"""
+Signal containers shared by strategies and backtesters.
+
+This package imports neither trading_bot.core.strategies nor
+trading_bot.core.backtesting, so both can depend on it without importing
+the strategies package (and running strategy discovery) from inside the
+backtesting package.
+"""
+
+from trading_bot.core.signals.bar_arrays import BarArrays
+from trading_bot.core.signals.sparse_signals import SparseSignals
+
+__all__ = [
+    'BarArrays',
+    'SparseSignals',
+]
@@ -0,0 +1,142 @@
+"""
+Read-Only OHLCV Bar Arrays for BensBot strategies.
+
+Backtesters used to hand every strategy its own copy of the OHLCV frame
+(generate_signals(historical_data.copy())), and strategies such as
+VolatilityStrategy copied it again to attach a dozen temporary indicator
+columns. BarArrays exposes the same bars as contiguous, read-only float64
+arrays plus the index, so a strategy can compute its signals without
+copying or mutating a DataFrame, and one instance is shared by every genome
+evaluated on the same data.
+
+Strategies opt in by overriding BaseStrategy.generate_signals_from_bars;
+the default adapts existing strategies by rebuilding a DataFrame with
+to_frame() and calling generate_signals.
+"""
+
+from typing import Dict, Mapping, Tuple
+
+import numpy as np
+import pandas as pd
+
+# Price/volume columns carried by BarArrays, in frame column order
+BAR_FIELDS = ("Open", "High", "Low", "Close", "Volume")
+
+class BarArrays:
+    """
+    Read-only OHLCV bars as contiguous float64 arrays.
+
+    Arrays taken from a DataFrame share its memory where pandas allows it
+    and are flagged non-writeable, so neither the bars nor the source frame
+    can be changed through them. Columns missing from the source are simply
+    absent (check with `"Volume" in bars`).
+
+    Indexing by column name returns a Series over the index that wraps the
+    array without copying, which lets Features and pandas rolling windows
+    read BarArrays like the OHLCV frame it came from.
+    """
+
+    __slots__ = ("index", "_arrays", "_series")
+
+    def __init__(self, index: pd.Index, arrays: Mapping[str, np.ndarray]):
+        """
+        Args:
+            index: Bar timestamps (or any index), one per bar
+            arrays: Mapping of column name ('Open', 'High', ...) to per-bar values
+
+        Raises:
+            ValueError: If an array is not one-dimensional or its length differs from the index
+        """
+        self.index = index if isinstance(index, pd.Index) else pd.Index(index)
+        self._arrays: Dict[str, np.ndarray] = {}
+        self._series: Dict[str, pd.Series] = {}
+        for name, values in arrays.items():
+            values = np.ascontiguousarray(values, dtype=np.float64)
+            if values.ndim != 1 or len(values) != len(self.index):
+                raise ValueError(f"Bar column {name!r} must be one-dimensional with {len(self.index)} values")
+            if values.flags.writeable:
+                values = values.view()
+                values.flags.writeable = False
+            self._arrays[name] = values
+
+    @classmethod
+    def from_frame(cls, data: pd.DataFrame) -> "BarArrays":
+        """
+        Wrap the OHLCV columns of a DataFrame.
+
+        Float64 columns are used in place; other dtypes are converted once.
+
+        Args:
+            data: OHLCV DataFrame
+
+        Returns:
+            BarArrays over data.index with the BAR_FIELDS columns data has
+        """
+        return cls(data.index, {
+            name: data[name].to_numpy(dtype=np.float64) for name in BAR_FIELDS if name in data.columns
+        })
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._arrays
+
+    def __getitem__(self, name: str) -> pd.Series:
+        """Column as a read-only Series over the index, sharing the array."""
+        series = self._series.get(name)
+        if series is None:
+            series = self._series[name] = pd.Series(self._arrays[name], index=self.index, name=name, copy=False)
+        return series
+
+    @property
+    def columns(self) -> Tuple[str, ...]:
+        """Names of the available columns."""
+        return tuple(self._arrays)
+
+    @property
+    def empty(self) -> bool:
+        """Whether there are no bars."""
+        return len(self.index) == 0
+
+    @property
+    def nbytes(self) -> int:
+        """Memory referenced by the column arrays."""
+        return sum(values.nbytes for values in self._arrays.values())
+
+    def array(self, name: str) -> np.ndarray:
+        """
+        Read-only values of one column.
+
+        Raises:
+            KeyError: If the column is not available
+        """
+        return self._arrays[name]
+
+    @property
+    def open(self) -> np.ndarray:
+        return self._arrays["Open"]
+
+    @property
+    def high(self) -> np.ndarray:
+        return self._arrays["High"]
+
+    @property
+    def low(self) -> np.ndarray:
+        return self._arrays["Low"]
+
+    @property
+    def close(self) -> np.ndarray:
+        return self._arrays["Close"]
+
+    @property
+    def volume(self) -> np.ndarray:
+        return self._arrays["Volume"]
+
+    def to_frame(self) -> pd.DataFrame:
+        """
+        A new, writeable OHLCV DataFrame with copies of the arrays.
+
+        This is the adapter for strategies that only implement generate_signals.
+        """
+        return pd.DataFrame({name: values.copy() for name, values in self._arrays.items()}, index=self.index)
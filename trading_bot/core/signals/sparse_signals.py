@@ -0,0 +1,187 @@
+"""
+Sparse Event-Based Signals for BensBot strategies.
+
+A strategy's dense output holds one signal (and stop/target level) per bar,
+although the simulation engine only acts on the bars where the signal
+changes. SparseSignals keeps just those events: the bar index, the new
+signal (held until the next event) and the stop-loss/take-profit levels
+set on that bar. Memory then scales with the number of signal changes
+instead of the number of bars, and the engine consumes the events directly.
+
+Strategies can emit events natively by overriding
+BaseStrategy.generate_sparse_signals; the default converts generate_signals
+output with SparseSignals.from_frame.
+"""
+
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+@dataclass
+class SparseSignals:
+    """
+    Signal changes of one strategy over n_bars bars.
+
+    Events are normalized on construction: they are sorted by bar, bar 0
+    always has an event (a flat one is added if missing) and events that
+    repeat the previous signal are dropped, since they could not change the
+    position. Levels are only read on entry, which happens on event bars, so
+    levels of other bars are not needed.
+    """
+    n_bars: int
+    bars: np.ndarray                          # Event bar indices, strictly increasing, starting at 0
+    direction: np.ndarray                     # Signal (1, -1, 0) from the event bar until the next event
+    stop_loss: Optional[np.ndarray] = None    # Stop-loss price set on the event bar, NaN where unset
+    take_profit: Optional[np.ndarray] = None  # Take-profit price set on the event bar, NaN where unset
+
+    def __post_init__(self):
+        self.n_bars = int(self.n_bars)
+        bars = np.asarray(self.bars, dtype=np.int64).ravel()
+        direction = np.asarray(self.direction, dtype=float).ravel()
+        levels = [
+            None if values is None else np.asarray(values, dtype=float).ravel()
+            for values in (self.stop_loss, self.take_profit)
+        ]
+        if len(direction) != len(bars) or any(values is not None and len(values) != len(bars) for values in levels):
+            raise ValueError("Sparse signal bars, directions and levels must have the same length")
+        if len(bars) and (bars.min() < 0 or bars.max() >= self.n_bars):
+            raise ValueError(f"Sparse signal bars must lie in [0, {self.n_bars})")
+
+        if len(bars) > 1 and np.any(np.diff(bars) <= 0):
+            order = np.argsort(bars, kind="stable")
+            bars, direction = bars[order], direction[order]
+            levels = [None if values is None else values[order] for values in levels]
+            if np.any(np.diff(bars) == 0):
+                raise ValueError("Sparse signals contain more than one event on the same bar")
+        if self.n_bars > 0 and (len(bars) == 0 or bars[0] != 0):
+            bars = np.concatenate((np.zeros(1, dtype=np.int64), bars))
+            direction = np.concatenate(([0.0], direction))
+            levels = [None if values is None else np.concatenate(([np.nan], values)) for values in levels]
+
+        # NaN != NaN, so events with missing signals are kept (as the dense change points are)
+        keep = np.ones(len(bars), dtype=bool)
+        keep[1:] = direction[1:] != direction[:-1]
+        if not keep.all():
+            bars, direction = bars[keep], direction[keep]
+            levels = [None if values is None else values[keep] for values in levels]
+        self.bars, self.direction = bars, direction
+        self.stop_loss, self.take_profit = levels
+
+    @classmethod
+    def from_dense(
+        cls,
+        signals: np.ndarray,
+        stop_loss: Optional[np.ndarray] = None,
+        take_profit: Optional[np.ndarray] = None
+    ) -> "SparseSignals":
+        """
+        Compress a per-bar signal array (and optional per-bar levels).
+
+        Args:
+            signals: Array of signals (1, -1, 0), one per bar
+            stop_loss: Optional per-bar stop-loss prices, NaN where unset
+            take_profit: Optional per-bar take-profit prices, NaN where unset
+
+        Returns:
+            SparseSignals with one event per signal change (without levels
+            if neither level array sets any)
+        """
+        signals = np.asarray(signals, dtype=float)
+        levels = [None if values is None else np.asarray(values, dtype=float) for values in (stop_loss, take_profit)]
+        if all(values is None or np.isnan(values).all() for values in levels):
+            levels = [None, None]
+        n = len(signals)
+        bars = np.empty(0, dtype=np.int64)
+        if n:
+            bars = np.concatenate((np.zeros(1, dtype=np.int64), np.flatnonzero(signals[1:] != signals[:-1]) + 1))
+
+        def at_events(values: Optional[np.ndarray]) -> Optional[np.ndarray]:
+            return None if values is None else values[bars]
+
+        return cls(n, bars, signals[bars], *(at_events(values) for values in levels))
+
+    @classmethod
+    def from_frame(cls, signals_df: pd.DataFrame) -> "SparseSignals":
+        """
+        Compress generate_signals output.
+
+        Args:
+            signals_df: DataFrame with a 'signal' column and optional 'stop_loss'/'take_profit' columns
+
+        Returns:
+            SparseSignals (without levels if the frame sets none)
+        """
+        levels = []
+        for column in ("stop_loss", "take_profit"):
+            values = None
+            if column in signals_df.columns:
+                values = pd.to_numeric(signals_df[column], errors="coerce").to_numpy(dtype=float)
+            levels.append(values)
+        return cls.from_dense(signals_df["signal"].to_numpy(dtype=float), *levels)
+
+    @property
+    def has_levels(self) -> bool:
+        """Whether any event sets a stop-loss or take-profit level."""
+        return any(
+            values is not None and not np.isnan(values).all() for values in (self.stop_loss, self.take_profit)
+        )
+
+    @property
+    def nbytes(self) -> int:
+        """Memory held by the event arrays."""
+        return sum(
+            values.nbytes for values in (self.bars, self.direction, self.stop_loss, self.take_profit)
+            if values is not None
+        )
+
+    def without_levels(self) -> "SparseSignals":
+        """The same signal events without stop/target levels."""
+        return SparseSignals(self.n_bars, self.bars, self.direction)
+
+    def to_dense(self) -> Tuple[np.ndarray, Optional[np.ndarray], Optional[np.ndarray]]:
+        """
+        Expand to per-bar arrays.
+
+        Returns:
+            Tuple of (signals, stop_loss, take_profit); levels are set on event
+            bars only (NaN elsewhere) and None if the events carry none
+        """
+        lengths = np.diff(np.append(self.bars, self.n_bars))
+        signals = np.repeat(self.direction, lengths)
+
+        def expand(values: Optional[np.ndarray]) -> Optional[np.ndarray]:
+            if values is None:
+                return None
+            dense = np.full(self.n_bars, np.nan)
+            dense[self.bars] = values
+            return dense
+
+        return signals, expand(self.stop_loss), expand(self.take_profit)
+
+    def window(self, start: int, stop: int) -> "SparseSignals":
+        """
+        Events of bars [start, stop), re-indexed from 0.
+
+        A signal that is already in force at start becomes the window's
+        bar-0 event, keeping the levels of the event that set it.
+
+        Args:
+            start: First bar of the window
+            stop: Bar after the last one
+
+        Returns:
+            SparseSignals over stop - start bars
+        """
+        start, stop = max(int(start), 0), min(int(stop), self.n_bars)
+        first = max(int(np.searchsorted(self.bars, start, side="right")) - 1, 0)
+        end = int(np.searchsorted(self.bars, stop, side="left"))
+        bars = self.bars[first:end] - start
+        if len(bars):
+            bars[0] = 0
+
+        def cut(values: Optional[np.ndarray]) -> Optional[np.ndarray]:
+            return None if values is None else values[first:end]
+
+        return SparseSignals(stop - start, bars, self.direction[first:end], cut(self.stop_loss), cut(self.take_profit))
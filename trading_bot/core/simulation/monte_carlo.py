@@ -52,7 +52,8 @@ class MonteCarloSimulator:
     def simulate(
         self,
         returns: pd.Series,
-        initial_capital: float = 10000.0
+        initial_capital: float = 10000.0,
+        include_plot: bool = True
     ) -> Dict[str, Any]:
         """
         Run Monte Carlo simulation on a series of returns.
@@ -60,6 +61,7 @@ class MonteCarloSimulator:
         Args:
             returns: Series of period returns (not cumulative)
             initial_capital: Starting capital amount
+            include_plot: Whether to render the base64 plot of the simulations
             
         Returns:
             Dictionary with simulation results
@@ -84,6 +86,9 @@ class MonteCarloSimulator:
                 # Simple random sampling with replacement
                 simulated_returns = returns.sample(n=len(returns), replace=True)
             
+            # Resampled returns keep their original labels; realign them to the period axis
+            simulated_returns.index = returns.index
+            
             # Convert returns to equity curve
             equity_curve = self._returns_to_equity(simulated_returns, initial_capital)
             simulated_equity_curves.append(equity_curve)
@@ -98,7 +103,7 @@ class MonteCarloSimulator:
             "percentiles": results["percentiles"],
             "drawdown_distribution": results["drawdown_distribution"],
             "final_equity_distribution": results["final_equity_distribution"],
-            "plot_base64": self._generate_plot(simulated_equity_curves, original_equity_curve)
+            "plot_base64": self._generate_plot(simulated_equity_curves, original_equity_curve) if include_plot else None
         }
     
     def _block_bootstrap(self, returns: pd.Series) -> pd.Series:
@@ -6,6 +6,11 @@ This file handles strategy registration and factory initialization.
 # Import the factory
 from trading_bot.core.strategies.strategy_factory import strategy_factory, StrategyFactory
 from trading_bot.core.strategies.base_strategy import BaseStrategy
+from trading_bot.core.signals.bar_arrays import BarArrays
+from trading_bot.core.strategies.incremental import IncrementalStrategyAdapter, IncrementalStrategyRunner
+from trading_bot.core.strategies.feature_cache import FeatureCache, Features, get_feature_cache, configure_feature_cache
+from trading_bot.core.strategies.signal_levels import apply_stop_levels, compute_stop_levels
+from trading_bot.core.signals.sparse_signals import SparseSignals
 
 # Import strategy helpers
 import importlib
@@ -20,8 +25,18 @@ except Exception as e:
 
 # Expose public API
 __all__ = [
+    "BarArrays",
     "BaseStrategy",
+    "FeatureCache",
+    "Features",
+    "configure_feature_cache",
+    "get_feature_cache",
+    "IncrementalStrategyAdapter",
+    "IncrementalStrategyRunner",
+    "SparseSignals",
     "StrategyFactory",
+    "apply_stop_levels",
+    "compute_stop_levels",
     "strategy_factory",
 ]
 
@@ -7,7 +7,11 @@ consistency in how they are handled by the EvoTrader and Backtesting modules.
 """
 from abc import ABC, abstractmethod
 import pandas as pd
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Union
+
+from trading_bot.core.signals.bar_arrays import BarArrays
+from trading_bot.core.strategies.feature_cache import Features, get_feature_cache
+from trading_bot.core.signals.sparse_signals import SparseSignals
 
 class BaseStrategy(ABC):
     """
@@ -96,6 +100,147 @@ class BaseStrategy(ABC):
         """
         pass
 
+    def generate_sparse_signals(self, historical_data: pd.DataFrame) -> SparseSignals:
+        """
+        Generates signals as events: only the bars where the signal changes,
+        with the stop-loss/take-profit levels set on them.
+
+        The default compresses generate_signals output. Strategies that can
+        find their signal changes directly (e.g. indicator crossovers) can
+        override this to skip the per-bar frame.
+
+        Args:
+            historical_data: OHLCV data, as for generate_signals.
+
+        Returns:
+            SparseSignals over len(historical_data) bars.
+        """
+        return SparseSignals.from_frame(self.generate_signals(historical_data))
+
+    @classmethod
+    def supports_sparse_signals(cls) -> bool:
+        """
+        Whether this strategy emits sparse signals natively.
+        Backtesters only request sparse signals from single runs of such
+        strategies; population runs compress every genome's signals.
+        """
+        return cls.generate_sparse_signals is not BaseStrategy.generate_sparse_signals
+
+    def generate_signals_from_bars(self, bars: BarArrays) -> SparseSignals:
+        """
+        Generates signals from read-only bar arrays instead of a DataFrame.
+
+        Backtesters pass strategies that override this one BarArrays instance
+        per data set, shared by every genome, instead of a fresh copy of the
+        OHLCV frame per call. Implementations must not modify the arrays.
+        The default adapts existing strategies: it rebuilds a DataFrame with
+        bars.to_frame() and runs generate_sparse_signals on it.
+
+        Args:
+            bars: OHLCV arrays and index of the data to generate signals for.
+
+        Returns:
+            SparseSignals over len(bars) bars.
+        """
+        return self.generate_sparse_signals(bars.to_frame())
+
+    @classmethod
+    def supports_bar_arrays(cls) -> bool:
+        """
+        Whether this strategy generates signals from BarArrays natively.
+        Backtesters skip copying the OHLCV frame for such strategies.
+        """
+        return cls.generate_signals_from_bars is not BaseStrategy.generate_signals_from_bars
+
+    def generate_panel_signals(self, panel: Dict[str, pd.DataFrame]) -> pd.DataFrame:
+        """
+        Generates signals for a basket of symbols on a shared time axis.
+
+        The default runs generate_signals once per symbol. Strategies whose
+        indicators are column-wise pandas operations can override this to
+        compute every symbol in one vectorized pass.
+
+        Args:
+            panel: Mapping of OHLCV field ('Open', 'High', 'Low', 'Close', 'Volume')
+                   to a (time x symbols) DataFrame; prices are NaN before a
+                   symbol's first bar.
+
+        Returns:
+            A (time x symbols) DataFrame of signals (1, -1, 0) with the panel's
+            index and columns.
+        """
+        close = panel['Close']
+        signals = pd.DataFrame(0, index=close.index, columns=close.columns)
+        for symbol in close.columns:
+            symbol_data = pd.DataFrame({field: frame[symbol] for field, frame in panel.items()})
+            symbol_data = symbol_data[symbol_data['Close'].notna()]
+            if symbol_data.empty:
+                continue
+            symbol_signals = self.generate_signals(symbol_data)['signal']
+            signals[symbol] = symbol_signals.reindex(close.index).fillna(0)
+        return signals
+
+    def get_warmup_period(self) -> int:
+        """
+        Number of bars of history the strategy needs before its signals are meaningful.
+
+        Defaults to the largest integer parameter, which for the built-in strategies
+        is their longest lookback. Override when that is not accurate.
+        """
+        periods = [
+            value for value in self.parameters.values()
+            if isinstance(value, int) and not isinstance(value, bool)
+        ]
+        return max(periods) if periods else 1
+
+    def get_features(self, data: Union[pd.DataFrame, BarArrays]) -> Features:
+        """
+        Indicator view over the given data (a DataFrame or BarArrays), backed
+        by the process-wide feature cache.
+
+        Genomes evaluated on the same data share indicators with equal
+        parameters instead of recomputing them.
+        """
+        return get_feature_cache().features(data)
+
+    @classmethod
+    def supports_incremental(cls) -> bool:
+        """
+        Whether this strategy implements the incremental on_bar protocol natively.
+        Strategies that don't are run bar-by-bar through IncrementalStrategyAdapter.
+        """
+        return cls.on_bar is not BaseStrategy.on_bar
+
+    def initialize(self, warmup_data: pd.DataFrame) -> None:
+        """
+        Prepares incremental state from warm-up history.
+
+        Called once before the first on_bar call, both in streaming backtests and
+        when a live component starts a strategy. Strategies implementing on_bar
+        should build their rolling state (running sums, last values, ...) here.
+
+        Args:
+            warmup_data: OHLCV history preceding the first streamed bar.
+        """
+        pass
+
+    def on_bar(self, bar: pd.Series) -> Optional[Dict[str, Any]]:
+        """
+        Processes one new bar and returns a signal for it.
+
+        Implementations should update their state in O(1) rather than
+        re-scanning history.
+
+        Args:
+            bar: A single OHLCV bar; bar.name is its timestamp.
+
+        Returns:
+            None for no signal, or a signal dictionary such as
+            {"direction": "buy" | "sell", "size": 0.1, "stop_loss": ..., "take_profit": ...}
+            where only "direction" is required.
+        """
+        raise NotImplementedError(f"{self.__class__.__name__} does not implement the incremental on_bar protocol")
+
     def get_info(self) -> Dict[str, Any]:
         """
         Returns information about the strategy instance.
@@ -1,9 +1,13 @@
 """
 Placeholder for an Equity Trend Following Strategy.
 """
+from trading_bot.core.signals.bar_arrays import BarArrays
 from trading_bot.core.strategies.base_strategy import BaseStrategy
+from trading_bot.core.signals.sparse_signals import SparseSignals
+import numpy as np
 import pandas as pd
-from typing import Dict, Any
+from collections import deque
+from typing import Dict, Any, Optional
 
 class EquityTrendStrategy(BaseStrategy):
     def __init__(self, strategy_id: str, parameters: Dict[str, Any]):
@@ -35,7 +39,7 @@ class EquityTrendStrategy(BaseStrategy):
         
         # Avoid trading on the very first period where SMAs might be unstable or equal
         if len(signals) > 1:
-            signals['signal'].iloc[0] = 0 
+            signals.iloc[0, signals.columns.get_loc('signal')] = 0
             # More sophisticated logic might be needed to handle initial conditions
 
         # signals['short_sma'] = short_sma # Optional: include indicators in output
@@ -43,6 +47,71 @@ class EquityTrendStrategy(BaseStrategy):
 
         return signals
 
+    def generate_panel_signals(self, panel: Dict[str, pd.DataFrame]) -> pd.DataFrame:
+        # Same rules as generate_signals, with the SMAs of all symbols computed column-wise
+        close = panel['Close']
+        short_sma = close.rolling(window=self.parameters['short_sma_period'], min_periods=1).mean()
+        long_sma = close.rolling(window=self.parameters['long_sma_period'], min_periods=1).mean()
+        signals = pd.DataFrame(0, index=close.index, columns=close.columns)
+        signals[short_sma > long_sma] = 1
+        signals[short_sma < long_sma] = -1
+        # No signal on each symbol's first bar
+        first_bars = close.notna() & close.shift(1).isna()
+        signals[first_bars] = 0
+        return signals
+
+    def generate_sparse_signals(self, historical_data: pd.DataFrame) -> SparseSignals:
+        # Same rules as generate_signals, keeping only the bars where the SMA order flips
+        if 'Close' not in historical_data.columns:
+            return SparseSignals(len(historical_data), [], [])
+        close = historical_data['Close']
+        short_sma = close.rolling(window=self.parameters['short_sma_period'], min_periods=1).mean().to_numpy()
+        long_sma = close.rolling(window=self.parameters['long_sma_period'], min_periods=1).mean().to_numpy()
+        signal = np.where(short_sma > long_sma, 1.0, np.where(short_sma < long_sma, -1.0, 0.0))
+        if len(signal) > 1:
+            signal[0] = 0.0
+        return SparseSignals.from_dense(signal)
+
+    def generate_signals_from_bars(self, bars: BarArrays) -> SparseSignals:
+        # The sparse rules only read the Close column, which BarArrays serves without copying
+        return self.generate_sparse_signals(bars)
+
+    def initialize(self, warmup_data: pd.DataFrame) -> None:
+        # Rolling windows and running sums for O(1) SMA updates in on_bar
+        self._short_closes = deque(maxlen=self.parameters['short_sma_period'])
+        self._long_closes = deque(maxlen=self.parameters['long_sma_period'])
+        self._short_sum = 0.0
+        self._long_sum = 0.0
+        self._bars_seen = 0
+        if 'Close' in warmup_data.columns:
+            for close in warmup_data['Close'].tolist():
+                self._update_smas(close)
+
+    def _update_smas(self, close: float):
+        """Push a close into both windows and return (short_sma, long_sma)."""
+        for window, attr in ((self._short_closes, '_short_sum'), (self._long_closes, '_long_sum')):
+            total = getattr(self, attr)
+            if len(window) == window.maxlen:
+                total -= window[0]
+            window.append(close)
+            setattr(self, attr, total + close)
+        self._bars_seen += 1
+        return self._short_sum / len(self._short_closes), self._long_sum / len(self._long_closes)
+
+    def on_bar(self, bar: pd.Series) -> Optional[Dict[str, Any]]:
+        if not hasattr(self, '_short_closes'):
+            self.initialize(pd.DataFrame(columns=['Close']))
+        short_sma, long_sma = self._update_smas(float(bar['Close']))
+
+        # Same rules as generate_signals: nothing on the very first bar, then SMA crossover state
+        if self._bars_seen <= 1:
+            return None
+        if short_sma > long_sma:
+            return {"direction": "buy"}
+        if short_sma < long_sma:
+            return {"direction": "sell"}
+        return None
+
 if __name__ == '__main__':
     # Example Usage (requires historical_data_fetcher and pandas)
     # from trading_bot.core.data.historical_data_fetcher import HistoricalDataFetcher
@@ -7,7 +7,6 @@ bullish and trending market regimes.
 
 import logging
 import pandas as pd
-import numpy as np
 from typing import Dict, Any, List, Optional
 
 from trading_bot.core.strategies.multi_asset_strategy import MultiAssetStrategy
@@ -141,38 +140,34 @@ class MomentumEquityStrategy(MultiAssetStrategy):
         volatility_lookback = self.parameters.get("volatility_lookback", 63)
         atr_period = self.parameters.get("atr_period", 14)
         
+        features = self.get_features(df)
+        
         # Momentum (relative performance over period)
-        df['momentum'] = df['Close'] / df['Close'].shift(momentum_period) - 1
+        df['momentum'] = features.momentum(momentum_period)
         
         # Moving averages
-        df['sma_50'] = df['Close'].rolling(window=50).mean()
-        df['sma_200'] = df['Close'].rolling(window=200).mean()
+        df['sma_50'] = features.sma(50)
+        df['sma_200'] = features.sma(200)
         
         # Volume indicators
         if 'Volume' in df.columns:
-            df['volume_sma'] = df['Volume'].rolling(window=20).mean()
+            df['volume_sma'] = features.sma(20, 'Volume')
             df['volume_ratio'] = df['Volume'] / df['volume_sma']
         else:
             df['volume_ratio'] = 1.0  # Neutral if no volume data
         
         # Volatility indicators
-        df['returns'] = df['Close'].pct_change()
-        df['volatility'] = df['returns'].rolling(window=volatility_lookback).std() * np.sqrt(252)  # Annualized
-        df['avg_volatility'] = df['volatility'].rolling(window=volatility_lookback*2).mean()
+        df['returns'] = features.returns()
+        df['volatility'] = features.realized_volatility(volatility_lookback)  # Annualized
+        df['avg_volatility'] = features.volatility_ma(volatility_lookback, volatility_lookback*2)
         df['vol_ratio'] = df['volatility'] / df['avg_volatility']
         
-        # ATR for stops
-        df['tr'] = np.maximum(
-            df['High'] - df['Low'],
-            np.maximum(
-                abs(df['High'] - df['Close'].shift(1)),
-                abs(df['Low'] - df['Close'].shift(1))
-            )
-        )
-        df['atr'] = df['tr'].rolling(window=atr_period).mean()
+        # ATR for stops (NaN on the first bar, which has no previous close)
+        df['tr'] = features.true_range(skipna=False)
+        df['atr'] = features.atr(atr_period, skipna=False)
         
         # Pullback indicators
-        df['high_watermark'] = df['Close'].rolling(window=20).max()
+        df['high_watermark'] = features.rolling_max(20, 'Close')
         df['pullback_pct'] = (df['high_watermark'] - df['Close']) / df['high_watermark'] * 100
         
         # Market regime indicators
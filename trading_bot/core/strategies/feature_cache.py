@@ -0,0 +1,296 @@
+"""
+Indicator/Feature Cache for BensBot strategies.
+
+Genomes of a population mostly share the same data and many of the same
+integer lookbacks, yet every genome used to recompute its rolling windows,
+ATR, channels and momentum from scratch. Strategies now request indicators
+through a Features view bound to their input data; each indicator is
+computed once per (data fingerprint, indicator name, parameters) and then
+served from a bounded, process-wide LRU cache. Worker processes each hold
+their own cache, which persistent pool workers keep warm between chunks.
+"""
+
+import hashlib
+import logging
+import threading
+import numpy as np
+import pandas as pd
+from collections import OrderedDict
+from typing import Dict, Any, Callable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Columns whose content identifies a data set for indicator purposes
+FINGERPRINT_COLUMNS = ("Open", "High", "Low", "Close", "Volume")
+
+DEFAULT_MAX_CACHE_MB = 256.0
+
+class FeatureCache:
+    """
+    Bounded LRU cache of indicator Series keyed by (data fingerprint, name, parameters).
+    """
+
+    def __init__(self, max_size_mb: float = DEFAULT_MAX_CACHE_MB):
+        """
+        Args:
+            max_size_mb: Maximum memory held by cached indicator values, in megabytes
+        """
+        self.max_size_bytes = int(max_size_mb * 1024 * 1024)
+        self._entries: "OrderedDict[Tuple, pd.Series]" = OrderedDict()
+        self._size_bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def fingerprint(data: Any) -> str:
+        """
+        Hash the index and price/volume columns of a DataFrame.
+
+        BarArrays of the same bars hash identically, so frame and array
+        callers share cached indicators.
+
+        Args:
+            data: OHLCV DataFrame or BarArrays
+
+        Returns:
+            Hex digest identifying the data content
+        """
+        digest = hashlib.blake2b(digest_size=16)
+        index = data.index
+        if isinstance(index, pd.DatetimeIndex):
+            digest.update(index.asi8.tobytes())
+        else:
+            digest.update(pd.util.hash_pandas_object(index).to_numpy().tobytes())
+        for column in FINGERPRINT_COLUMNS:
+            if column in data.columns:
+                digest.update(column.encode())
+                digest.update(np.ascontiguousarray(data[column].to_numpy(dtype=float)).tobytes())
+        return digest.hexdigest()
+
+    def get_or_compute(
+        self,
+        fingerprint: str,
+        name: str,
+        params: Tuple,
+        compute: Callable[[], pd.Series]
+    ) -> pd.Series:
+        """
+        Return a cached indicator or compute and cache it.
+
+        Args:
+            fingerprint: Data fingerprint from fingerprint()
+            name: Indicator name
+            params: Hashable indicator parameters
+            compute: Function producing the indicator Series
+
+        Returns:
+            Indicator Series (shared with the cache; do not modify in place)
+        """
+        key = (fingerprint, name, params)
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return cached
+            self.misses += 1
+
+        value = compute()
+        size = int(value.memory_usage(index=False, deep=False))
+        with self._lock:
+            if key not in self._entries and size <= self.max_size_bytes:
+                self._entries[key] = value
+                self._size_bytes += size
+                while self._size_bytes > self.max_size_bytes:
+                    _, evicted = self._entries.popitem(last=False)
+                    self._size_bytes -= int(evicted.memory_usage(index=False, deep=False))
+                    self.evictions += 1
+        return value
+
+    def features(self, data: Any) -> "Features":
+        """
+        Bind the cache to a DataFrame or BarArrays.
+
+        Args:
+            data: OHLCV DataFrame or BarArrays the indicators are computed on
+
+        Returns:
+            Features view serving indicators for this data
+        """
+        return Features(self, data)
+
+    def clear(self) -> None:
+        """Drop all cached indicators."""
+        with self._lock:
+            self._entries.clear()
+            self._size_bytes = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Return hit/miss counters and memory use.
+
+        Returns:
+            Dictionary with hits, misses, hit_rate, evictions, entries and size_mb
+        """
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "entries": len(self._entries),
+            "size_mb": self._size_bytes / (1024 * 1024)
+        }
+
+class Features:
+    """
+    Indicators for one DataFrame (or BarArrays), served from a FeatureCache.
+
+    Every method returns a Series aligned to the bound data's index.
+    Formulas match the ones the strategies previously computed inline, so
+    cached and uncached results are identical.
+    """
+
+    def __init__(self, cache: FeatureCache, data: Any):
+        """
+        Args:
+            cache: Backing FeatureCache
+            data: OHLCV DataFrame or BarArrays (only its index and price/volume columns are read)
+        """
+        self.cache = cache
+        self.data = data
+        self.data_fingerprint = cache.fingerprint(data)
+
+    def _get(self, name: str, params: Tuple, compute: Callable[[], pd.Series]) -> pd.Series:
+        value = self.cache.get_or_compute(self.data_fingerprint, name, params, compute)
+        # Re-label with this frame's index so assignment needs no alignment; copy-on-write keeps the cache intact
+        return value.set_axis(self.data.index)
+
+    # Price transforms
+
+    def returns(self, column: str = "Close") -> pd.Series:
+        """Simple percentage returns of a column."""
+        return self._get("returns", (column,), lambda: self.data[column].pct_change())
+
+    def diff(self, column: str = "Close") -> pd.Series:
+        """First difference of a column."""
+        return self._get("diff", (column,), lambda: self.data[column].diff())
+
+    def momentum(self, period: int, column: str = "Close") -> pd.Series:
+        """Rate of change over a period: price / price.shift(period) - 1."""
+        return self._get(
+            "momentum", (column, period),
+            lambda: self.data[column] / self.data[column].shift(period) - 1
+        )
+
+    # Rolling statistics
+
+    def sma(self, period: int, column: str = "Close") -> pd.Series:
+        """Simple moving average."""
+        return self._get("sma", (column, period), lambda: self.data[column].rolling(window=period).mean())
+
+    def rolling_std(self, period: int, column: str = "Close") -> pd.Series:
+        """Rolling sample standard deviation."""
+        return self._get("rolling_std", (column, period), lambda: self.data[column].rolling(window=period).std())
+
+    def rolling_max(self, period: int, column: str = "High") -> pd.Series:
+        """Rolling maximum (e.g. upper breakout channel)."""
+        return self._get("rolling_max", (column, period), lambda: self.data[column].rolling(window=period).max())
+
+    def rolling_min(self, period: int, column: str = "Low") -> pd.Series:
+        """Rolling minimum (e.g. lower breakout channel)."""
+        return self._get("rolling_min", (column, period), lambda: self.data[column].rolling(window=period).min())
+
+    def ema(self, span: int, column: str = "Close") -> pd.Series:
+        """Exponential moving average (adjust=False)."""
+        return self._get("ema", (column, span), lambda: self.data[column].ewm(span=span, adjust=False).mean())
+
+    def wma(self, period: int, column: str = "Close") -> pd.Series:
+        """Linearly weighted moving average."""
+        def compute() -> pd.Series:
+            weights = np.arange(1, period + 1)
+            return self.data[column].rolling(window=period).apply(
+                lambda x: np.sum(weights * x) / weights.sum(), raw=True)
+        return self._get("wma", (column, period), compute)
+
+    # Volatility
+
+    def realized_volatility(self, period: int, periods_per_year: int = 252) -> pd.Series:
+        """Annualized rolling standard deviation of close-to-close returns."""
+        return self._get(
+            "realized_volatility", (period, periods_per_year),
+            lambda: self.returns().rolling(window=period).std() * np.sqrt(periods_per_year)
+        )
+
+    def volatility_ma(self, period: int, ma_period: int, periods_per_year: int = 252) -> pd.Series:
+        """Rolling mean of the realized volatility."""
+        return self._get(
+            "volatility_ma", (period, ma_period, periods_per_year),
+            lambda: self.realized_volatility(period, periods_per_year).rolling(window=ma_period).mean()
+        )
+
+    def true_range(self, skipna: bool = True) -> pd.Series:
+        """
+        True range.
+
+        Args:
+            skipna: Ignore the missing previous close on the first bar (row-wise max)
+                    instead of propagating NaN (element-wise np.maximum)
+        """
+        def compute() -> pd.Series:
+            high, low, prev_close = self.data['High'], self.data['Low'], self.data['Close'].shift()
+            if skipna:
+                ranges = pd.concat([high - low, abs(high - prev_close), abs(low - prev_close)], axis=1)
+                return ranges.max(axis=1)
+            return np.maximum(high - low, np.maximum(abs(high - prev_close), abs(low - prev_close)))
+        return self._get("true_range", (skipna,), compute)
+
+    def atr(self, period: int, skipna: bool = True) -> pd.Series:
+        """Average true range (simple rolling mean of the true range)."""
+        return self._get(
+            "atr", (period, skipna),
+            lambda: self.true_range(skipna).rolling(window=period).mean()
+        )
+
+    # Oscillators
+
+    def rsi(self, period: int, column: str = "Close") -> pd.Series:
+        """Relative strength index from simple rolling averages of gains and losses."""
+        def compute() -> pd.Series:
+            delta = self.diff(column)
+            gain = delta.where(delta > 0, 0)
+            loss = -delta.where(delta < 0, 0)
+            avg_gain = gain.rolling(window=period).mean()
+            avg_loss = loss.rolling(window=period).mean()
+            rs = avg_gain / avg_loss.replace(0, 0.00001)
+            return 100 - (100 / (1 + rs))
+        return self._get("rsi", (column, period), compute)
+
+_default_cache: Optional[FeatureCache] = None
+_default_cache_lock = threading.Lock()
+
+def get_feature_cache() -> FeatureCache:
+    """Return this process's shared FeatureCache, creating it on first use."""
+    global _default_cache
+    if _default_cache is None:
+        with _default_cache_lock:
+            if _default_cache is None:
+                _default_cache = FeatureCache()
+    return _default_cache
+
+def configure_feature_cache(max_size_mb: float = DEFAULT_MAX_CACHE_MB) -> FeatureCache:
+    """
+    Replace this process's shared FeatureCache with a new, empty one.
+
+    Args:
+        max_size_mb: Memory bound of the new cache in megabytes
+
+    Returns:
+        The new FeatureCache
+    """
+    global _default_cache
+    with _default_cache_lock:
+        _default_cache = FeatureCache(max_size_mb=max_size_mb)
+    return _default_cache
@@ -11,6 +11,7 @@ import numpy as np
 from typing import Dict, Any
 
 from trading_bot.core.strategies.multi_asset_strategy import MultiAssetStrategy
+from trading_bot.core.strategies.signal_levels import apply_stop_levels
 
 logger = logging.getLogger(__name__)
 
@@ -228,28 +229,21 @@ class MeanReversionStrategy(MultiAssetStrategy):
         bb_std_dev = self.parameters.get("bb_std_dev", 2.0)
         lookback_period = self.parameters.get("lookback_period", 20)
         
-        # RSI calculation
-        delta = df['Close'].diff()
-        gain = delta.where(delta > 0, 0)
-        loss = -delta.where(delta < 0, 0)
+        features = self.get_features(df)
         
-        avg_gain = gain.rolling(window=rsi_period).mean()
-        avg_loss = loss.rolling(window=rsi_period).mean()
-        
-        # Avoid division by zero
-        rs = avg_gain / avg_loss.replace(0, 0.00001)
-        df['RSI'] = 100 - (100 / (1 + rs))
+        # RSI calculation (simple rolling averages of gains and losses)
+        df['RSI'] = features.rsi(rsi_period)
         
         # Bollinger Bands
-        df['BB_MA'] = df['Close'].rolling(window=bb_period).mean()
-        df['BB_STD'] = df['Close'].rolling(window=bb_period).std()
+        df['BB_MA'] = features.sma(bb_period)
+        df['BB_STD'] = features.rolling_std(bb_period)
         df['BB_Upper'] = df['BB_MA'] + (df['BB_STD'] * bb_std_dev)
         df['BB_Lower'] = df['BB_MA'] - (df['BB_STD'] * bb_std_dev)
         df['BB_Width'] = (df['BB_Upper'] - df['BB_Lower']) / df['BB_MA']
         
         # Z-Score (how many std devs price is from its mean)
-        df['Mean'] = df['Close'].rolling(window=lookback_period).mean()
-        df['STD'] = df['Close'].rolling(window=lookback_period).std()
+        df['Mean'] = features.sma(lookback_period)
+        df['STD'] = features.rolling_std(lookback_period)
         df['Z_Score'] = (df['Close'] - df['Mean']) / df['STD'].replace(0, 0.00001)
         
         # Distance from mean as percentage
@@ -323,26 +317,8 @@ class MeanReversionStrategy(MultiAssetStrategy):
         stop_loss_pct = self.parameters.get("stop_loss_pct", 2.0) / 100
         take_profit_pct = self.parameters.get("take_profit_pct", 3.0) / 100
         
-        df['stop_loss'] = None
-        df['take_profit'] = None
-        
-        # For each buy signal, set stop-loss and take-profit
-        buy_signals = df[df['signal'] == 1].index
-        buy_prices = df.loc[buy_signals, 'Close']
-        
-        for i, idx in enumerate(buy_signals):
-            price = buy_prices.iloc[i]
-            df.loc[idx, 'stop_loss'] = price * (1 - stop_loss_pct)
-            df.loc[idx, 'take_profit'] = price * (1 + take_profit_pct)
-        
-        # For each sell signal, set stop-loss and take-profit (reversed for shorts)
-        sell_signals = df[df['signal'] == -1].index
-        sell_prices = df.loc[sell_signals, 'Close']
-        
-        for i, idx in enumerate(sell_signals):
-            price = sell_prices.iloc[i]
-            df.loc[idx, 'stop_loss'] = price * (1 + stop_loss_pct)
-            df.loc[idx, 'take_profit'] = price * (1 - take_profit_pct)
+        # Levels for buys, mirrored around price for sells
+        apply_stop_levels(df, stop_loss_pct, take_profit_pct)
         
         # Return only necessary columns
         result_columns = ['signal', 'stop_loss', 'take_profit']
@@ -382,18 +358,11 @@ class MeanReversionStrategy(MultiAssetStrategy):
             stop_loss_pct = self.parameters.get("stop_loss_pct", 2.0) / 100
             take_profit_pct = self.parameters.get("take_profit_pct", 3.0) / 100
             
-            # Update stop-loss and take-profit for gap trades
-            gap_up_indices = signals_df[gap_up_signals].index
-            for idx in gap_up_indices:
-                price = df.loc[idx, 'Open']
-                signals_df.loc[idx, 'stop_loss'] = price * (1 + stop_loss_pct)
-                signals_df.loc[idx, 'take_profit'] = df.loc[idx, 'prev_close']  # Target the previous close
-            
-            gap_down_indices = signals_df[gap_down_signals].index
-            for idx in gap_down_indices:
-                price = df.loc[idx, 'Open']
-                signals_df.loc[idx, 'stop_loss'] = price * (1 - stop_loss_pct)
-                signals_df.loc[idx, 'take_profit'] = df.loc[idx, 'prev_close']  # Target the previous close
+            # Stops are set off the open; gap trades target the previous close
+            signals_df.loc[gap_up_signals, 'stop_loss'] = df['Open'] * (1 + stop_loss_pct)
+            signals_df.loc[gap_up_signals, 'take_profit'] = df['prev_close']
+            signals_df.loc[gap_down_signals, 'stop_loss'] = df['Open'] * (1 - stop_loss_pct)
+            signals_df.loc[gap_down_signals, 'take_profit'] = df['prev_close']
         
         return signals_df
     
@@ -440,22 +409,17 @@ class MeanReversionStrategy(MultiAssetStrategy):
             
             # Adjust stop-loss distances based on volatility
             stop_loss_pct = self.parameters.get("stop_loss_pct", 3.5) / 100
-            for i, idx in enumerate(signals_df.index):
-                if pd.notnull(signals_df.loc[idx, 'stop_loss']):
-                    vol_mult = 1.0
-                    if idx in df.index:
-                        if df.loc[idx, 'volatility_regime'] == 'high':
-                            vol_mult = 1.3  # Wider stops in high vol
-                        elif df.loc[idx, 'volatility_regime'] == 'low':
-                            vol_mult = 0.8  # Tighter stops in low vol
-                    
-                    # Adjust the stop loss
-                    if signals_df.loc[idx, 'signal'] == 1:  # Long position
-                        price = historical_data.loc[idx, 'Close']
-                        signals_df.loc[idx, 'stop_loss'] = price * (1 - stop_loss_pct * vol_mult)
-                    elif signals_df.loc[idx, 'signal'] == -1:  # Short position
-                        price = historical_data.loc[idx, 'Close']
-                        signals_df.loc[idx, 'stop_loss'] = price * (1 + stop_loss_pct * vol_mult)
+            vol_mult = np.select(
+                [df['volatility_regime'] == 'high', df['volatility_regime'] == 'low'],
+                [1.3, 0.8],  # Wider stops in high vol, tighter stops in low vol
+                default=1.0
+            )
+            price = historical_data['Close']
+            has_stop = signals_df['stop_loss'].notna()
+            long_stops = has_stop & (signals_df['signal'] == 1)
+            short_stops = has_stop & (signals_df['signal'] == -1)
+            signals_df.loc[long_stops, 'stop_loss'] = price * (1 - stop_loss_pct * vol_mult)
+            signals_df.loc[short_stops, 'stop_loss'] = price * (1 + stop_loss_pct * vol_mult)
         
         return signals_df
     
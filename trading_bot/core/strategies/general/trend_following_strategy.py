@@ -11,6 +11,7 @@ import numpy as np
 from typing import Dict, Any
 
 from trading_bot.core.strategies.multi_asset_strategy import MultiAssetStrategy
+from trading_bot.core.strategies.signal_levels import apply_stop_levels
 
 logger = logging.getLogger(__name__)
 
@@ -178,22 +179,19 @@ class TrendFollowingStrategy(MultiAssetStrategy):
         smoothing = self.parameters.get("trend_smoothing", 0.3)
         
         # Calculate moving averages based on the asset class
+        features = self.get_features(df)
         if ma_type == "sma":
             # Simple Moving Average
-            df['fast_ma'] = df['Close'].rolling(window=fast_period).mean()
-            df['slow_ma'] = df['Close'].rolling(window=slow_period).mean()
+            df['fast_ma'] = features.sma(fast_period)
+            df['slow_ma'] = features.sma(slow_period)
         elif ma_type == "ema":
             # Exponential Moving Average
-            df['fast_ma'] = df['Close'].ewm(span=fast_period, adjust=False).mean()
-            df['slow_ma'] = df['Close'].ewm(span=slow_period, adjust=False).mean()
+            df['fast_ma'] = features.ema(fast_period)
+            df['slow_ma'] = features.ema(slow_period)
         elif ma_type == "wma":
             # Weighted Moving Average (linear weights)
-            weights_fast = np.arange(1, fast_period + 1)
-            weights_slow = np.arange(1, slow_period + 1)
-            df['fast_ma'] = df['Close'].rolling(window=fast_period).apply(
-                lambda x: np.sum(weights_fast * x) / weights_fast.sum(), raw=True)
-            df['slow_ma'] = df['Close'].rolling(window=slow_period).apply(
-                lambda x: np.sum(weights_slow * x) / weights_slow.sum(), raw=True)
+            df['fast_ma'] = features.wma(fast_period)
+            df['slow_ma'] = features.wma(slow_period)
         
         # Calculate trend/strength indicators
         df['ma_diff'] = df['fast_ma'] - df['slow_ma']
@@ -207,7 +205,7 @@ class TrendFollowingStrategy(MultiAssetStrategy):
         
         # Volume filter
         if use_volume and 'Volume' in df.columns:
-            df['volume_ma'] = df['Volume'].rolling(window=volume_period).mean()
+            df['volume_ma'] = features.sma(volume_period, 'Volume')
             volume_filter = df['Volume'] > df['volume_ma']
         else:
             volume_filter = pd.Series(True, index=df.index)
@@ -225,23 +223,10 @@ class TrendFollowingStrategy(MultiAssetStrategy):
         df.loc[df['cross_above'] & volume_filter, 'signal'] = 1  # Buy
         df.loc[df['cross_below'], 'signal'] = -1  # Sell
         
-        # Calculate stop-loss and take-profit levels
-        if 'signal' in df.columns:
-            # Find all buy signals
-            buy_signals = df[df['signal'] == 1].index
-            buy_prices = df.loc[buy_signals, 'Close']
-            
-            # Calculate stop-loss and take-profit prices
-            stop_loss_pct = self.parameters.get("stop_loss_pct", 2.0) / 100
-            take_profit_pct = self.parameters.get("take_profit_pct", 4.0) / 100
-            
-            df['stop_loss'] = None
-            df['take_profit'] = None
-            
-            for i, idx in enumerate(buy_signals):
-                price = buy_prices.iloc[i]
-                df.loc[idx, 'stop_loss'] = price * (1 - stop_loss_pct)
-                df.loc[idx, 'take_profit'] = price * (1 + take_profit_pct)
+        # Calculate stop-loss and take-profit levels (long entries only; sells close positions)
+        stop_loss_pct = self.parameters.get("stop_loss_pct", 2.0) / 100
+        take_profit_pct = self.parameters.get("take_profit_pct", 4.0) / 100
+        apply_stop_levels(df, stop_loss_pct, take_profit_pct, include_shorts=False)
         
         # Drop intermediate columns to keep the result clean
         result_columns = ['signal', 'stop_loss', 'take_profit']
@@ -8,12 +8,22 @@ and aims to thrive in periods of high uncertainty across asset classes.
 import logging
 import pandas as pd
 import numpy as np
-from typing import Dict, Any
+from typing import Dict, Any, Tuple, Union
 
+from trading_bot.core.signals.bar_arrays import BarArrays
 from trading_bot.core.strategies.multi_asset_strategy import MultiAssetStrategy
+from trading_bot.core.strategies.signal_levels import compute_stop_levels
+from trading_bot.core.signals.sparse_signals import SparseSignals
 
 logger = logging.getLogger(__name__)
 
+def _shift(values: np.ndarray) -> np.ndarray:
+    """Values of the previous bar (NaN on the first), like Series.shift(1)."""
+    shifted = np.empty(len(values))
+    shifted[:1] = np.nan
+    shifted[1:] = values[:-1]
+    return shifted
+
 class VolatilityStrategy(MultiAssetStrategy):
     """
     A volatility-based strategy that works across equity, crypto, and forex markets.
@@ -230,9 +240,13 @@ class VolatilityStrategy(MultiAssetStrategy):
         
         return changes
     
-    def _calculate_indicators(self, df: pd.DataFrame) -> pd.DataFrame:
+    def _calculate_indicators(self, data: Union[pd.DataFrame, BarArrays]) -> Dict[str, np.ndarray]:
         """
         Calculate volatility and related indicators.
+
+        Only the OHLC columns of data are read, so a DataFrame or read-only
+        BarArrays can be passed without copying it; the indicators are
+        returned as arrays instead of being attached as columns.
         """
         # Get parameters
         vol_lookback = self.parameters.get("volatility_lookback", 21)
@@ -241,124 +255,90 @@ class VolatilityStrategy(MultiAssetStrategy):
         breakout_period = self.parameters.get("breakout_period", 20)
         momentum_period = self.parameters.get("momentum_period", 10)
         
-        # Calculate historical and realized volatility
-        # Daily returns
-        df['returns'] = df['Close'].pct_change()
-        
-        # Realized volatility (standard deviation of returns)
-        df['realized_vol'] = df['returns'].rolling(window=vol_lookback).std() * np.sqrt(252)  # Annualized
+        features = self.get_features(data)
         
-        # Volatility moving average
-        df['volatility_ma'] = df['realized_vol'].rolling(window=vol_ma_period).mean()
+        # Realized volatility (annualized standard deviation of returns) and its moving average
+        realized_vol = features.realized_volatility(vol_lookback).to_numpy()
+        volatility_ma = features.volatility_ma(vol_lookback, vol_ma_period).to_numpy()
         
         # Volatility ratio (current vol / average vol)
         # This identifies regime changes
-        df['volatility_ratio'] = df['realized_vol'] / df['volatility_ma']
-        
-        # ATR calculation for stop loss positioning
-        df['high_low'] = df['High'] - df['Low']
-        df['high_close'] = abs(df['High'] - df['Close'].shift())
-        df['low_close'] = abs(df['Low'] - df['Close'].shift())
-        df['tr'] = df[['high_low', 'high_close', 'low_close']].max(axis=1)
-        df['atr'] = df['tr'].rolling(window=atr_period).mean()
-        
-        # Breakout detection
-        df['upper_channel'] = df['High'].rolling(window=breakout_period).max()
-        df['lower_channel'] = df['Low'].rolling(window=breakout_period).min()
+        with np.errstate(divide="ignore", invalid="ignore"):
+            volatility_ratio = realized_vol / volatility_ma
         
-        # Channel width as percentage of price
-        df['channel_width'] = (df['upper_channel'] - df['lower_channel']) / df['Close']
-        
-        # Momentum indicators
-        df['momentum'] = df['Close'] / df['Close'].shift(momentum_period) - 1
-        
-        # Identify volatility regimes
+        # Identify volatility regimes; bars without a ratio count as normal
         vol_high_threshold = self.parameters.get("volatility_high_threshold", 1.5)
         vol_low_threshold = self.parameters.get("volatility_low_threshold", 0.7)
+        high_vol = volatility_ratio > vol_high_threshold
+        low_vol = ~high_vol & (volatility_ratio < vol_low_threshold)
         
-        df['volatility_regime'] = np.where(
-            df['volatility_ratio'] > vol_high_threshold, 
-            'high', 
-            np.where(
-                df['volatility_ratio'] < vol_low_threshold, 
-                'low', 
-                'normal'
-            )
-        )
-        
-        return df
+        return {
+            "volatility_ratio": volatility_ratio,
+            "high_vol": high_vol,
+            "low_vol": low_vol,
+            "normal_vol": ~high_vol & ~low_vol,
+            # ATR for stop loss positioning
+            "atr": features.atr(atr_period).to_numpy(),
+            # Breakout channels
+            "upper_channel": features.rolling_max(breakout_period, 'High').to_numpy(),
+            "lower_channel": features.rolling_min(breakout_period, 'Low').to_numpy(),
+            # Momentum
+            "momentum": features.momentum(momentum_period).to_numpy()
+        }
     
-    def _generate_signals_generic(self, historical_data: pd.DataFrame) -> pd.DataFrame:
-        """
-        Generate signals based on volatility regime and breakout/momentum detection.
+    def _generic_signal_arrays(
+        self,
+        data: Union[pd.DataFrame, BarArrays]
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
         """
-        if historical_data.empty:
-            logger.warning("Empty historical data provided")
-            return pd.DataFrame(index=[], columns=['signal'])
-        
-        # Copy data to avoid modifying original
-        df = historical_data.copy()
+        Signal, stop-loss and take-profit arrays of the generic volatility rules.
         
-        # Calculate indicators
-        df = self._calculate_indicators(df)
+        Args:
+            data: Non-empty OHLCV DataFrame or BarArrays (not modified)
+            
+        Returns:
+            Tuple of (signal, stop_loss, take_profit) arrays, one value per bar
+        """
+        indicators = self._calculate_indicators(data)
+        close = data['Close'].to_numpy(dtype=float)
+        prev_close = _shift(close)
+        momentum = indicators["momentum"]
         
         # Get parameters
-        breakout_multiplier = self.parameters.get("breakout_multiplier", 1.5)
         momentum_threshold = self.parameters.get("momentum_threshold", 1.0)
-        use_regime_filter = self.parameters.get("use_regime_filter", True)
         trade_only_high_vol = self.parameters.get("trade_only_high_vol", False)
         
         # Initialize signals
-        df['signal'] = 0
-        
-        # Generate signals based on volatility regime
-        
-        # High volatility regime
-        high_vol_mask = df['volatility_regime'] == 'high'
+        signal = np.zeros(len(close), dtype=np.int64)
         
         # In high volatility:
         # 1. Look for breakouts
         # 2. Favor momentum in the direction of breakout
+        high_vol = indicators["high_vol"]
         
         # Upside breakout: price breaks above upper channel with strong momentum
         upside_breakout = (
-            (df['Close'] > df['upper_channel'].shift(1) * (1 + 0.01)) &  # 1% above previous upper channel
-            (df['momentum'] > momentum_threshold / 100) &                # Positive momentum
-            (df['Close'] > df['Close'].shift(1))                         # Still moving up
+            (close > _shift(indicators["upper_channel"]) * (1 + 0.01)) &  # 1% above previous upper channel
+            (momentum > momentum_threshold / 100) &                        # Positive momentum
+            (close > prev_close)                                           # Still moving up
         )
         
         # Downside breakout: price breaks below lower channel with strong momentum
         downside_breakout = (
-            (df['Close'] < df['lower_channel'].shift(1) * (1 - 0.01)) &  # 1% below previous lower channel
-            (df['momentum'] < -momentum_threshold / 100) &               # Negative momentum
-            (df['Close'] < df['Close'].shift(1))                         # Still moving down
+            (close < _shift(indicators["lower_channel"]) * (1 - 0.01)) &  # 1% below previous lower channel
+            (momentum < -momentum_threshold / 100) &                       # Negative momentum
+            (close < prev_close)                                           # Still moving down
         )
         
-        # Low volatility regime
-        low_vol_mask = df['volatility_regime'] == 'low'
+        # High volatility: breakout trading
+        signal[high_vol & upside_breakout] = 1      # Buy on upside breakout in high vol
+        signal[high_vol & downside_breakout] = -1   # Sell on downside breakout in high vol
         
-        # Normal volatility regime
-        normal_vol_mask = df['volatility_regime'] == 'normal'
-        
-        # Apply signals based on regime
-        if trade_only_high_vol:
-            # Only trade in high volatility
-            df.loc[high_vol_mask & upside_breakout, 'signal'] = 1      # Buy on upside breakout in high vol
-            df.loc[high_vol_mask & downside_breakout, 'signal'] = -1   # Sell on downside breakout in high vol
-        else:
-            # Trade in all regimes but with different tactics
-            
-            # High volatility: breakout trading
-            df.loc[high_vol_mask & upside_breakout, 'signal'] = 1      # Buy on upside breakout in high vol
-            df.loc[high_vol_mask & downside_breakout, 'signal'] = -1   # Sell on downside breakout in high vol
-            
+        if not trade_only_high_vol:
             # Normal volatility: momentum following
-            momentum_up = df['momentum'] > momentum_threshold / 100
-            momentum_down = df['momentum'] < -momentum_threshold / 100
-            
-            if not use_regime_filter or (use_regime_filter and any(normal_vol_mask)):
-                df.loc[normal_vol_mask & momentum_up, 'signal'] = 1       # Buy on strong momentum in normal vol
-                df.loc[normal_vol_mask & momentum_down, 'signal'] = -1    # Sell on negative momentum in normal vol
+            normal_vol = indicators["normal_vol"]
+            signal[normal_vol & (momentum > momentum_threshold / 100)] = 1     # Buy on strong momentum in normal vol
+            signal[normal_vol & (momentum < -momentum_threshold / 100)] = -1   # Sell on negative momentum in normal vol
         
         # Apply stop loss - can be fixed or ATR-based
         use_atr_stops = self.parameters.get("use_atr_stops", True)
@@ -366,154 +346,134 @@ class VolatilityStrategy(MultiAssetStrategy):
         stop_loss_pct = self.parameters.get("stop_loss_pct", 2.0) / 100
         take_profit_pct = self.parameters.get("take_profit_pct", 3.0) / 100
         
-        df['stop_loss'] = None
-        df['take_profit'] = None
+        # ATR stops are capped at twice the fixed percentage; shorts mirror longs around price
+        stop_loss, take_profit = compute_stop_levels(
+            signal, close, stop_loss_pct, take_profit_pct,
+            atr=indicators["atr"] if use_atr_stops else None,
+            atr_multiplier=atr_stop_multiplier
+        )
+        return signal, stop_loss, take_profit
+    
+    def _apply_gap_analysis(
+        self,
+        data: Union[pd.DataFrame, BarArrays],
+        signal: np.ndarray,
+        stop_loss: np.ndarray,
+        take_profit: np.ndarray
+    ) -> None:
+        """
+        Equity gap analysis: adjusts generic signal arrays in place.
         
-        # For each buy signal, set stop loss and take profit
-        buy_signals = df[df['signal'] == 1].index
-        for idx in buy_signals:
-            price = df.loc[idx, 'Close']
-            
-            if use_atr_stops and 'atr' in df.columns and not pd.isna(df.loc[idx, 'atr']):
-                stop_distance = df.loc[idx, 'atr'] * atr_stop_multiplier
-                stop_loss = price - stop_distance
-                
-                # If ATR is very large, cap stop loss at fixed percentage
-                if (price - stop_loss) / price > stop_loss_pct * 2:
-                    stop_loss = price * (1 - stop_loss_pct)
-            else:
-                stop_loss = price * (1 - stop_loss_pct)
-            
-            take_profit = price * (1 + take_profit_pct)
-            
-            df.loc[idx, 'stop_loss'] = stop_loss
-            df.loc[idx, 'take_profit'] = take_profit
+        Significant overnight gaps can signal volatility: gaps in the signal
+        direction widen the target, gaps against it cancel the signal, and
+        large gaps followed through intraday become signals of their own.
+        """
+        if len(signal) <= 1:
+            return
+        
+        open_prices = data['Open'].to_numpy(dtype=float)
+        close = data['Close'].to_numpy(dtype=float)
+        
+        # Calculate overnight gaps
+        prev_close = _shift(close)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            gap = pd.Series((open_prices - prev_close) / prev_close * 100)
+        abs_gap = gap.abs()
+        
+        # Average gap size and gap volatility (stddev of gap size) over the lookback
+        gap_lookback = 20
+        avg_gap_size = abs_gap.rolling(window=gap_lookback).mean()
+        gap_vol = gap.rolling(window=gap_lookback).std()
+        
+        # Relative gap size (today's gap vs average)
+        relative_gap = (abs_gap / avg_gap_size).to_numpy()
+        gap_pct = gap.to_numpy()
+        
+        # Large gaps signal high volatility and potential continuation
+        large_gap_up = (gap_pct > 1.0) & (relative_gap > 1.5)
+        large_gap_down = (gap_pct < -1.0) & (relative_gap > 1.5)
+        
+        # In high gap volatility, strengthen existing signals
+        high_gap_vol = (gap_vol > gap_vol.rolling(window=63).mean() * 1.5).to_numpy()
+        
+        # For signals on gap days, adjust take profit if the gap is in the direction of the signal
+        gap_long = high_gap_vol & (signal == 1) & large_gap_up
+        gap_short = high_gap_vol & (signal == -1) & large_gap_down
+        against_gap = high_gap_vol & (((signal == 1) & large_gap_down) | ((signal == -1) & large_gap_up))
+        
+        # Widen take profit by 25% on strong gap in signal direction
+        take_profit[gap_long] = close[gap_long] * (1 + ((take_profit[gap_long] / close[gap_long]) - 1) * 1.25)
+        take_profit[gap_short] = close[gap_short] * (1 - (1 - (take_profit[gap_short] / close[gap_short])) * 1.25)
+        
+        # Filter out signals against the gap direction
+        signal[against_gap] = 0
+        stop_loss[against_gap] = np.nan
+        take_profit[against_gap] = np.nan
+        
+        # Additionally, consider gaps as independent signals
+        # A persistent gap in one direction could be a breakaway gap indicating trend continuation
+        
+        # If a large gap is followed by strong price action in same direction,
+        # and we don't already have a signal, generate one
+        no_signal = signal == 0
+        no_signal[0] = False
+        breakaway_up = no_signal & large_gap_up & (close > open_prices * 1.005)
+        breakaway_down = no_signal & ~breakaway_up & large_gap_down & (close < open_prices * 0.995)
         
-        # For each sell signal, set stop loss and take profit (reversed for shorts)
-        sell_signals = df[df['signal'] == -1].index
-        for idx in sell_signals:
-            price = df.loc[idx, 'Close']
-            
-            if use_atr_stops and 'atr' in df.columns and not pd.isna(df.loc[idx, 'atr']):
-                stop_distance = df.loc[idx, 'atr'] * atr_stop_multiplier
-                stop_loss = price + stop_distance
-                
-                # If ATR is very large, cap stop loss at fixed percentage
-                if (stop_loss - price) / price > stop_loss_pct * 2:
-                    stop_loss = price * (1 + stop_loss_pct)
-            else:
-                stop_loss = price * (1 + stop_loss_pct)
-            
-            take_profit = price * (1 - take_profit_pct)
-            
-            df.loc[idx, 'stop_loss'] = stop_loss
-            df.loc[idx, 'take_profit'] = take_profit
+        stop_loss_pct = self.parameters.get("stop_loss_pct", 2.0) / 100
+        take_profit_pct = self.parameters.get("take_profit_pct", 3.0) / 100
+        signal[breakaway_up] = 1
+        stop_loss[breakaway_up] = close[breakaway_up] * (1 - stop_loss_pct)
+        take_profit[breakaway_up] = close[breakaway_up] * (1 + take_profit_pct)
+        signal[breakaway_down] = -1
+        stop_loss[breakaway_down] = close[breakaway_down] * (1 + stop_loss_pct)
+        take_profit[breakaway_down] = close[breakaway_down] * (1 - take_profit_pct)
+    
+    def _generate_signals_generic(self, historical_data: pd.DataFrame) -> pd.DataFrame:
+        """
+        Generate signals based on volatility regime and breakout/momentum detection.
+        """
+        if historical_data.empty:
+            logger.warning("Empty historical data provided")
+            return pd.DataFrame(index=[], columns=['signal'])
         
-        # Return only necessary columns
-        result_columns = ['signal', 'stop_loss', 'take_profit']
-        return df[result_columns]
+        signal, stop_loss, take_profit = self._generic_signal_arrays(historical_data)
+        return pd.DataFrame(
+            {'signal': signal, 'stop_loss': stop_loss, 'take_profit': take_profit},
+            index=historical_data.index
+        )
     
     def _generate_signals_equity(self, historical_data: pd.DataFrame) -> pd.DataFrame:
         """
         Equity-specific volatility signal generation.
         
-        For equities, adds VIX-like indicators and gap analysis.
+        For equities, adds gap analysis to the generic signals.
         """
-        # Copy data to avoid modifying original
-        df = historical_data.copy()
+        if historical_data.empty:
+            return self._generate_signals_generic(historical_data)
         
-        # First, get generic signals
-        signals_df = self._generate_signals_generic(historical_data)
+        signal, stop_loss, take_profit = self._generic_signal_arrays(historical_data)
+        self._apply_gap_analysis(historical_data, signal, stop_loss, take_profit)
+        return pd.DataFrame(
+            {'signal': signal, 'stop_loss': stop_loss, 'take_profit': take_profit},
+            index=historical_data.index
+        )
+    
+    def generate_signals_from_bars(self, bars: BarArrays) -> SparseSignals:
+        """
+        Generate signals from read-only bar arrays.
         
-        # For equities, add gap analysis (significant overnight gaps can signal volatility)
-        if len(df) > 1:
-            # Calculate overnight gaps
-            df['prev_close'] = df['Close'].shift(1)
-            df['gap_pct'] = (df['Open'] - df['prev_close']) / df['prev_close'] * 100
-            
-            # Calculate average gap size over lookback
-            gap_lookback = 20
-            df['avg_gap_size'] = df['gap_pct'].abs().rolling(window=gap_lookback).mean()
-            
-            # Calculate gap volatility (stddev of gap size)
-            df['gap_vol'] = df['gap_pct'].rolling(window=gap_lookback).std()
-            
-            # Relative gap size (today's gap vs average)
-            df['relative_gap'] = df['gap_pct'].abs() / df['avg_gap_size']
-            
-            # Large gaps signal high volatility and potential continuation
-            large_gap_up = (df['gap_pct'] > 1.0) & (df['relative_gap'] > 1.5)
-            large_gap_down = (df['gap_pct'] < -1.0) & (df['relative_gap'] > 1.5)
-            
-            # In high gap volatility, strengthen existing signals
-            high_gap_vol = df['gap_vol'] > df['gap_vol'].rolling(window=63).mean() * 1.5
-            
-            # For signals on gap days, increase signal if gap is in direction of signal
-            for idx in df[high_gap_vol].index:
-                if idx in signals_df.index:
-                    # For bullish signals with gap up, strengthen signal
-                    if signals_df.loc[idx, 'signal'] == 1 and large_gap_up.loc[idx]:
-                        # Keep the signal at 1 (maximum), but consider adjusting take profit
-                        if pd.notnull(signals_df.loc[idx, 'take_profit']):
-                            # Widen take profit by 25% on strong gap in signal direction
-                            current_tp = signals_df.loc[idx, 'take_profit']
-                            current_price = df.loc[idx, 'Close']
-                            tp_pct = (current_tp / current_price) - 1
-                            new_tp = current_price * (1 + tp_pct * 1.25)
-                            signals_df.loc[idx, 'take_profit'] = new_tp
-                    
-                    # For bearish signals with gap down, strengthen signal
-                    elif signals_df.loc[idx, 'signal'] == -1 and large_gap_down.loc[idx]:
-                        # Keep the signal at -1 (maximum), but consider adjusting take profit
-                        if pd.notnull(signals_df.loc[idx, 'take_profit']):
-                            # Widen take profit by 25% on strong gap in signal direction
-                            current_tp = signals_df.loc[idx, 'take_profit']
-                            current_price = df.loc[idx, 'Close']
-                            tp_pct = 1 - (current_tp / current_price)
-                            new_tp = current_price * (1 - tp_pct * 1.25)
-                            signals_df.loc[idx, 'take_profit'] = new_tp
-                    
-                    # For signals against gap direction, weaken or filter out
-                    elif signals_df.loc[idx, 'signal'] == 1 and large_gap_down.loc[idx]:
-                        # Filter out bullish signals on big gap down days
-                        signals_df.loc[idx, 'signal'] = 0
-                        signals_df.loc[idx, 'stop_loss'] = None
-                        signals_df.loc[idx, 'take_profit'] = None
-                    
-                    elif signals_df.loc[idx, 'signal'] == -1 and large_gap_up.loc[idx]:
-                        # Filter out bearish signals on big gap up days
-                        signals_df.loc[idx, 'signal'] = 0
-                        signals_df.loc[idx, 'stop_loss'] = None
-                        signals_df.loc[idx, 'take_profit'] = None
-            
-            # Additionally, consider gaps as independent signals
-            # A persistent gap in one direction could be a breakaway gap indicating trend continuation
-            
-            # If a large gap is followed by strong price action in same direction,
-            # and we don't already have a signal, generate one
-            for i, idx in enumerate(df.index):
-                if i > 0 and idx in signals_df.index and signals_df.loc[idx, 'signal'] == 0:
-                    # Large gap up followed by strong close (potential breakaway gap up)
-                    if large_gap_up.loc[idx] and df.loc[idx, 'Close'] > df.loc[idx, 'Open'] * 1.005:
-                        signals_df.loc[idx, 'signal'] = 1
-                        # Set stop and take profit
-                        price = df.loc[idx, 'Close']
-                        stop_loss_pct = self.parameters.get("stop_loss_pct", 2.0) / 100
-                        take_profit_pct = self.parameters.get("take_profit_pct", 3.0) / 100
-                        signals_df.loc[idx, 'stop_loss'] = price * (1 - stop_loss_pct)
-                        signals_df.loc[idx, 'take_profit'] = price * (1 + take_profit_pct)
-                    
-                    # Large gap down followed by weak close (potential breakaway gap down)
-                    elif large_gap_down.loc[idx] and df.loc[idx, 'Close'] < df.loc[idx, 'Open'] * 0.995:
-                        signals_df.loc[idx, 'signal'] = -1
-                        # Set stop and take profit
-                        price = df.loc[idx, 'Close']
-                        stop_loss_pct = self.parameters.get("stop_loss_pct", 2.0) / 100
-                        take_profit_pct = self.parameters.get("take_profit_pct", 3.0) / 100
-                        signals_df.loc[idx, 'stop_loss'] = price * (1 + stop_loss_pct)
-                        signals_df.loc[idx, 'take_profit'] = price * (1 - take_profit_pct)
+        The generic and equity rules run directly on the arrays, without
+        copying the data or attaching indicator columns. Composite, crypto
+        and forex signals go through the DataFrame adapter.
+        """
+        if bars.empty or self.sub_strategies or self.asset_class in ("crypto", "forex"):
+            return super().generate_signals_from_bars(bars)
         
-        return signals_df
+        signal, stop_loss, take_profit = self._generic_signal_arrays(bars)
+        if self.asset_class == "equity":
+            self._apply_gap_analysis(bars, signal, stop_loss, take_profit)
+        return SparseSignals.from_dense(signal, stop_loss, take_profit)
     
     def _generate_signals_crypto(self, historical_data: pd.DataFrame) -> pd.DataFrame:
         """
@@ -556,21 +516,12 @@ class VolatilityStrategy(MultiAssetStrategy):
             # Strong recovery = up day after big down day
             recovery_signal = (df['recovery_day']) & (df['pct_change'] > 2.0)
             
-            # Apply to our signals
-            for idx in df[recovery_signal].index:
-                if idx in signals_df.index:
-                    # Strong post-crash recoveries are good buying opportunities
-                    signals_df.loc[idx, 'signal'] = 1
-                    
-                    # Set ambitious stops and targets for these recovery trades
-                    price = df.loc[idx, 'Close']
-                    # Wider stop to allow for volatility
-                    stop_loss = price * 0.92  # 8% stop for recovery trades
-                    # Ambitious target
-                    take_profit = price * 1.15  # 15% target for recovery trades
-                    
-                    signals_df.loc[idx, 'stop_loss'] = stop_loss
-                    signals_df.loc[idx, 'take_profit'] = take_profit
+            # Strong post-crash recoveries are good buying opportunities, with
+            # a wider 8% stop to allow for volatility and an ambitious 15% target
+            recovery_price = df.loc[recovery_signal, 'Close']
+            signals_df.loc[recovery_signal, 'signal'] = 1
+            signals_df.loc[recovery_signal, 'stop_loss'] = recovery_price * 0.92
+            signals_df.loc[recovery_signal, 'take_profit'] = recovery_price * 1.15
             
             # Also look for volatility compression before explosive moves
             # Calculate Bollinger Band Width Ratio
@@ -582,34 +533,19 @@ class VolatilityStrategy(MultiAssetStrategy):
             # Volatility explosion (rapid increase from compressed state)
             df['vol_explosion'] = (df['vol_compressed'].shift(1)) & (df['rolling_vol_20d'] > df['rolling_vol_20d'].shift(1) * 1.5)
             
-            # Generate signals for volatility breakouts
-            for i, idx in enumerate(df.index[1:], 1):
-                if df.loc[idx, 'vol_explosion'] and idx in signals_df.index:
-                    # If we have a volatility explosion and price is moving up
-                    if df.loc[idx, 'pct_change'] > 0:
-                        # Volatility explosion to the upside
-                        signals_df.loc[idx, 'signal'] = 1
-                        
-                        # Set adaptive stops and targets
-                        price = df.loc[idx, 'Close']
-                        stop_loss = price * (1 - df.loc[idx, 'rolling_vol_20d'] / 100 * 2)  # 2x daily vol as stop
-                        take_profit = price * (1 + df.loc[idx, 'rolling_vol_20d'] / 100 * 4)  # 4x daily vol as target
-                        
-                        signals_df.loc[idx, 'stop_loss'] = stop_loss
-                        signals_df.loc[idx, 'take_profit'] = take_profit
-                    
-                    # If we have a volatility explosion and price is moving down
-                    elif df.loc[idx, 'pct_change'] < 0:
-                        # Volatility explosion to the downside
-                        signals_df.loc[idx, 'signal'] = -1
-                        
-                        # Set adaptive stops and targets
-                        price = df.loc[idx, 'Close']
-                        stop_loss = price * (1 + df.loc[idx, 'rolling_vol_20d'] / 100 * 2)  # 2x daily vol as stop
-                        take_profit = price * (1 - df.loc[idx, 'rolling_vol_20d'] / 100 * 4)  # 4x daily vol as target
-                        
-                        signals_df.loc[idx, 'stop_loss'] = stop_loss
-                        signals_df.loc[idx, 'take_profit'] = take_profit
+            # Generate signals for volatility breakouts, with adaptive stops and
+            # targets at 2x and 4x daily volatility
+            explosion = df['vol_explosion'].fillna(False).astype(bool) & (np.arange(len(df)) > 0)
+            explosion_up = explosion & (df['pct_change'] > 0)
+            explosion_down = explosion & (df['pct_change'] < 0)
+            daily_vol = df['rolling_vol_20d'] / 100
+            
+            signals_df.loc[explosion_up, 'signal'] = 1
+            signals_df.loc[explosion_up, 'stop_loss'] = df['Close'] * (1 - daily_vol * 2)
+            signals_df.loc[explosion_up, 'take_profit'] = df['Close'] * (1 + daily_vol * 4)
+            signals_df.loc[explosion_down, 'signal'] = -1
+            signals_df.loc[explosion_down, 'stop_loss'] = df['Close'] * (1 + daily_vol * 2)
+            signals_df.loc[explosion_down, 'take_profit'] = df['Close'] * (1 - daily_vol * 4)
         
         return signals_df
     
@@ -623,121 +559,82 @@ class VolatilityStrategy(MultiAssetStrategy):
         # First, get generic signals
         signals_df = self._generate_signals_generic(historical_data)
         
-        # For forex, extreme volatility often happens around news events
-        df = historical_data.copy()
-        
         # Forex session-specific analysis
-        if len(df) > 0 and isinstance(df.index, pd.DatetimeIndex):
-            # Extract hour information from the index
-            hours = df.index.hour
-            
-            # Define trading sessions
-            # Asian session: 0-8 UTC 
-            # European session: 8-16 UTC
-            # American session: 13-21 UTC
-            df['asian_session'] = (hours >= 0) & (hours < 8)
-            df['european_session'] = (hours >= 8) & (hours < 16)
-            df['american_session'] = (hours >= 13) & (hours < 21)
-            
-            # Session overlaps (typically higher volatility)
-            df['session_overlap'] = df['european_session'] & df['american_session']
-            
-            # Calculate session-specific volatility
-            if len(df) > 20:
-                # Returns by session
-                df['returns'] = df['Close'].pct_change()
-                
-                # Session-specific volatility
-                df['asian_vol'] = df['returns'].where(df['asian_session']).rolling(window=20, min_periods=5).std()
-                df['euro_vol'] = df['returns'].where(df['european_session']).rolling(window=20, min_periods=5).std()
-                df['us_vol'] = df['returns'].where(df['american_session']).rolling(window=20, min_periods=5).std()
-                df['overlap_vol'] = df['returns'].where(df['session_overlap']).rolling(window=20, min_periods=5).std()
-                
-                # Identify high volatility sessions relative to their typical values
-                df['asian_high_vol'] = df['asian_vol'] > df['asian_vol'].rolling(window=60, min_periods=10).mean() * 1.5
-                df['euro_high_vol'] = df['euro_vol'] > df['euro_vol'].rolling(window=60, min_periods=10).mean() * 1.5
-                df['us_high_vol'] = df['us_vol'] > df['us_vol'].rolling(window=60, min_periods=10).mean() * 1.5
-                df['overlap_high_vol'] = df['overlap_vol'] > df['overlap_vol'].rolling(window=60, min_periods=10).mean() * 1.5
-                
-                # Calculate intraday volatility ratio
-                # This helps identify volatility clusters within sessions
-                df['intraday_vol'] = (df['High'] - df['Low']) / df['Open']
-                df['intraday_vol_ratio'] = df['intraday_vol'] / df['intraday_vol'].rolling(window=20).mean()
-                
-                # Extreme volatility days (top 5% of intraday ranges)
-                df['extreme_range_day'] = df['intraday_vol'] > df['intraday_vol'].rolling(window=60).quantile(0.95)
-                
-                # Determine if we're in a high volatility cluster
-                # This could be during key economic announcements or central bank decisions
-                df['vol_cluster'] = (df['intraday_vol_ratio'] > 1.5) & (df['intraday_vol_ratio'].rolling(window=3).mean() > 1.3)
-                
-                # Adjust signals based on session volatility
-                for idx in df.index:
-                    if idx in signals_df.index:
-                        # For signals during overlap sessions with high volatility
-                        if df.loc[idx, 'session_overlap'] and df.loc[idx, 'overlap_high_vol']:
-                            # We want to be aggressive with trend following during high-vol overlap periods
-                            if signals_df.loc[idx, 'signal'] != 0:
-                                # Keep the signal direction but adjust stops to be tighter
-                                # This is typically higher risk, higher reward
-                                price = df.loc[idx, 'Close']
-                                current_stop = signals_df.loc[idx, 'stop_loss']
-                                
-                                # Make stop half as wide during volatile overlap periods
-                                if pd.notnull(current_stop) and signals_df.loc[idx, 'signal'] == 1:
-                                    # Tighten long stop loss
-                                    old_stop_distance = price - current_stop
-                                    new_stop = price - (old_stop_distance * 0.7)
-                                    signals_df.loc[idx, 'stop_loss'] = new_stop
-                                elif pd.notnull(current_stop) and signals_df.loc[idx, 'signal'] == -1:
-                                    # Tighten short stop loss
-                                    old_stop_distance = current_stop - price
-                                    new_stop = price + (old_stop_distance * 0.7)
-                                    signals_df.loc[idx, 'stop_loss'] = new_stop
-                        
-                        # For Asian session with low volatility, be cautious
-                        if df.loc[idx, 'asian_session'] and not df.loc[idx, 'asian_high_vol']:
-                            # Asian session typically has lower liquidity and false breakouts
-                            # Filter out weak signals
-                            if abs(df.loc[idx, 'returns']) < df['returns'].rolling(window=20).std():
-                                signals_df.loc[idx, 'signal'] = 0
-                                signals_df.loc[idx, 'stop_loss'] = None
-                                signals_df.loc[idx, 'take_profit'] = None
-                        
-                        # For extreme volatility days, be extra cautious or aggressive
-                        if df.loc[idx, 'extreme_range_day']:
-                            # On extreme days, either filter out signals or be more aggressive
-                            # For now, let's filter out signals if we're not in a clear trend
-                            momentum = df.loc[idx, 'returns'] * 10  # Simple momentum metric
-                            
-                            # If we have a signal but weak momentum, consider filtering
-                            if abs(momentum) < 0.5:
-                                signals_df.loc[idx, 'signal'] = 0
-                                signals_df.loc[idx, 'stop_loss'] = None
-                                signals_df.loc[idx, 'take_profit'] = None
-                
-                # Also, consider additional signals for volatility clusters
-                # These could be trend continuation plays during strong momentum
-                for i, idx in enumerate(df.index):
-                    if i > 0 and idx in signals_df.index and signals_df.loc[idx, 'signal'] == 0:
-                        if df.loc[idx, 'vol_cluster']:
-                            # If in volatility cluster with strong directional momentum
-                            if df.loc[idx, 'returns'] > df['returns'].rolling(window=20).std() * 2:
-                                # Strong up momentum in vol cluster - buy signal
-                                signals_df.loc[idx, 'signal'] = 1
-                                
-                                # Set tight stops for these volatile conditions
-                                price = df.loc[idx, 'Close']
-                                signals_df.loc[idx, 'stop_loss'] = price * 0.995  # 0.5% stop
-                                signals_df.loc[idx, 'take_profit'] = price * 1.01  # 1.0% target
-                            
-                            elif df.loc[idx, 'returns'] < -df['returns'].rolling(window=20).std() * 2:
-                                # Strong down momentum in vol cluster - sell signal
-                                signals_df.loc[idx, 'signal'] = -1
-                                
-                                # Set tight stops for these volatile conditions
-                                price = df.loc[idx, 'Close']
-                                signals_df.loc[idx, 'stop_loss'] = price * 1.005  # 0.5% stop
-                                signals_df.loc[idx, 'take_profit'] = price * 0.99  # 1.0% target
-        
-        return signals_df 
\ No newline at end of file
+        if len(historical_data) <= 20 or not isinstance(historical_data.index, pd.DatetimeIndex):
+            return signals_df
+        
+        # Define trading sessions
+        # Asian session: 0-8 UTC 
+        # European session: 8-16 UTC
+        # American session: 13-21 UTC
+        hours = historical_data.index.hour
+        asian_session = np.asarray((hours >= 0) & (hours < 8))
+        european_session = np.asarray((hours >= 8) & (hours < 16))
+        american_session = np.asarray((hours >= 13) & (hours < 21))
+        
+        # Session overlaps (typically higher volatility)
+        session_overlap = european_session & american_session
+        
+        close = historical_data['Close']
+        returns = close.pct_change()
+        returns_std = returns.rolling(window=20).std()
+        
+        def session_high_vol(session: np.ndarray) -> np.ndarray:
+            # Session-specific volatility relative to its typical value
+            session_vol = returns.where(session).rolling(window=20, min_periods=5).std()
+            return (session_vol > session_vol.rolling(window=60, min_periods=10).mean() * 1.5).to_numpy()
+        
+        asian_high_vol = session_high_vol(asian_session)
+        overlap_high_vol = session_high_vol(session_overlap)
+        
+        # Intraday volatility ratio helps identify volatility clusters within sessions
+        intraday_vol = (historical_data['High'] - historical_data['Low']) / historical_data['Open']
+        intraday_vol_ratio = intraday_vol / intraday_vol.rolling(window=20).mean()
+        
+        # Extreme volatility days (top 5% of intraday ranges)
+        extreme_range_day = (intraday_vol > intraday_vol.rolling(window=60).quantile(0.95)).to_numpy()
+        
+        # High volatility clusters, e.g. around economic announcements or central bank decisions
+        vol_cluster = ((intraday_vol_ratio > 1.5) & (intraday_vol_ratio.rolling(window=3).mean() > 1.3)).to_numpy()
+        
+        signal = signals_df['signal'].to_numpy().copy()
+        stop_loss = signals_df['stop_loss'].to_numpy(dtype=float).copy()
+        take_profit = signals_df['take_profit'].to_numpy(dtype=float).copy()
+        price = close.to_numpy(dtype=float)
+        ret = returns.to_numpy(dtype=float)
+        ret_std = returns_std.to_numpy(dtype=float)
+        
+        # Trend following during high-vol overlap periods keeps the signal
+        # direction but moves the stop to 70% of its distance from price
+        tighten = session_overlap & overlap_high_vol & (signal != 0) & ~np.isnan(stop_loss)
+        stop_loss[tighten] = price[tighten] + (stop_loss[tighten] - price[tighten]) * 0.7
+        
+        with np.errstate(invalid="ignore"):
+            abs_returns = np.abs(ret)
+            # The Asian session has lower liquidity and false breakouts: filter weak moves in calm markets
+            weak_asian = asian_session & ~asian_high_vol & (abs_returns < ret_std)
+            # On extreme range days, filter signals without clear momentum
+            weak_extreme = extreme_range_day & (abs_returns * 10 < 0.5)
+        filtered = weak_asian | weak_extreme
+        signal[filtered] = 0
+        stop_loss[filtered] = np.nan
+        take_profit[filtered] = np.nan
+        
+        # Trend continuation plays in volatility clusters with strong directional momentum,
+        # with tight 0.5% stops and 1% targets
+        candidates = (signal == 0) & vol_cluster
+        candidates[0] = False
+        with np.errstate(invalid="ignore"):
+            cluster_up = candidates & (ret > ret_std * 2)
+            cluster_down = candidates & ~cluster_up & (ret < -ret_std * 2)
+        cluster_signal = np.where(cluster_up, 1, np.where(cluster_down, -1, 0))
+        cluster_stop, cluster_target = compute_stop_levels(cluster_signal, price, 0.005, 0.01)
+        entered = cluster_up | cluster_down
+        signal[entered] = cluster_signal[entered]
+        stop_loss[entered] = cluster_stop[entered]
+        take_profit[entered] = cluster_target[entered]
+        
+        return pd.DataFrame(
+            {'signal': signal, 'stop_loss': stop_loss, 'take_profit': take_profit},
+            index=historical_data.index
+        )
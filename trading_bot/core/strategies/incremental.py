@@ -0,0 +1,255 @@
+"""
+Incremental (bar-by-bar) strategy execution for BensBot.
+
+Strategies normally produce signals for a whole DataFrame at once. For
+streaming use a strategy is instead warmed up once and then fed one bar at a
+time through ``on_bar``. Only the RealBacktester streaming mode drives
+strategies this way so far; live execution still receives finished signals
+from the executors. Strategies that only implement ``generate_signals`` (or
+the older single-signal ``generate_signal``) are wrapped in an adapter that
+evaluates them over a bounded rolling window, so each bar costs O(window)
+instead of O(history).
+"""
+
+import logging
+import pandas as pd
+import numpy as np
+from typing import Dict, Any, List, Optional, Iterator, Tuple
+
+from trading_bot.core.strategies.base_strategy import BaseStrategy
+
+logger = logging.getLogger(__name__)
+
+# Smallest rolling window given to adapted strategies (about one year of daily bars)
+MIN_ADAPTER_WINDOW = 252
+
+class BarWindow:
+    """
+    Fixed-capacity rolling window of bars backed by preallocated arrays.
+
+    Appends are amortized O(1): rows are written into a buffer twice the
+    capacity and the live tail is shifted to the front only when the buffer
+    fills up. Values are stored as float64, so every column must be numeric;
+    use numeric_columns() to pick the columns of a frame or bar.
+    """
+
+    def __init__(self, columns: List[str], capacity: int):
+        """
+        Args:
+            columns: Column names of the bars (e.g. Open, High, Low, Close, Volume)
+            capacity: Maximum number of bars kept
+        """
+        self.columns = list(columns)
+        self.capacity = max(1, int(capacity))
+        self._values = np.empty((2 * self.capacity, len(self.columns)), dtype=float)
+        self._index = np.empty(2 * self.capacity, dtype=object)
+        self._start = 0
+        self._end = 0
+
+    def __len__(self) -> int:
+        return self._end - self._start
+
+    @staticmethod
+    def numeric_columns(data: Any) -> List[str]:
+        """
+        Return the columns of a DataFrame (or entries of a bar Series) a BarWindow can hold.
+
+        Args:
+            data: DataFrame of bars, or a single bar as a Series
+
+        Returns:
+            Names of the numeric (and boolean) columns, in their original order
+        """
+        if isinstance(data, pd.DataFrame):
+            return list(data.select_dtypes(include=["number", "bool"]).columns)
+        return [name for name, value in data.items()
+                if isinstance(value, (int, float, np.number, np.bool_))]
+
+    def append(self, timestamp: Any, values: Any) -> None:
+        """
+        Add one bar, dropping the oldest bar if the window is full.
+
+        Args:
+            timestamp: Bar timestamp
+            values: Bar values in column order (sequence or Series)
+        """
+        if self._end == len(self._values):
+            # Move the most recent capacity - 1 rows to the front
+            keep = self.capacity - 1
+            self._values[:keep] = self._values[self._end - keep:self._end]
+            self._index[:keep] = self._index[self._end - keep:self._end]
+            self._start, self._end = 0, keep
+        try:
+            self._values[self._end] = values
+        except (TypeError, ValueError) as e:
+            raise ValueError(
+                f"BarWindow only stores numeric columns {self.columns}; got {values!r}"
+            ) from e
+        self._index[self._end] = timestamp
+        self._end += 1
+        if self._end - self._start > self.capacity:
+            self._start += 1
+
+    def append_bar(self, bar: pd.Series) -> None:
+        """Add one bar given as a Series whose name is its timestamp."""
+        self.append(bar.name, [bar[column] for column in self.columns])
+
+    def extend(self, data: pd.DataFrame) -> None:
+        """Add the most recent bars of a DataFrame."""
+        tail = data[self.columns].iloc[-self.capacity:]
+        try:
+            values = tail.to_numpy(dtype=float)
+        except (TypeError, ValueError) as e:
+            raise ValueError(f"BarWindow only stores numeric columns {self.columns}") from e
+        for timestamp, row in zip(tail.index, values):
+            self.append(timestamp, row)
+
+    def to_frame(self) -> pd.DataFrame:
+        """Return the current window as a DataFrame (oldest bar first)."""
+        return pd.DataFrame(
+            self._values[self._start:self._end],
+            index=pd.Index(self._index[self._start:self._end]),
+            columns=self.columns
+        )
+
+def signal_row_to_dict(row: pd.Series) -> Optional[Dict[str, Any]]:
+    """
+    Convert one row of a generate_signals DataFrame into an on_bar signal.
+
+    Args:
+        row: Row with a 'signal' column and optional 'stop_loss' / 'take_profit'
+
+    Returns:
+        Signal dictionary, or None when the row holds no signal
+    """
+    signal = row.get('signal', 0)
+    if pd.isna(signal) or signal == 0:
+        return None
+
+    result = {"direction": "buy" if signal > 0 else "sell"}
+    for key in ("stop_loss", "take_profit"):
+        value = row.get(key)
+        if value is not None and pd.notnull(value):
+            result[key] = float(value)
+    return result
+
+class IncrementalStrategyAdapter:
+    """
+    Runs a strategy without native on_bar support through the incremental protocol.
+
+    Each bar is appended to a bounded BarWindow and the wrapped strategy is
+    evaluated on that window only. Indicators whose lookback fits inside the
+    window give the same signals as a full-history run. Non-numeric columns
+    (symbols, labels) are not kept, so the wrapped strategy only sees numeric
+    bar data.
+    """
+
+    def __init__(self, strategy: Any, window: Optional[int] = None):
+        """
+        Args:
+            strategy: Strategy implementing generate_signals or generate_signal
+            window: Number of bars the strategy sees per evaluation
+                    (default: twice its warm-up period, at least MIN_ADAPTER_WINDOW)
+        """
+        self.strategy = strategy
+        self.strategy_id = getattr(strategy, "strategy_id", None)
+        if window is None:
+            warmup = strategy.get_warmup_period() if hasattr(strategy, "get_warmup_period") else 1
+            window = max(2 * warmup, MIN_ADAPTER_WINDOW)
+        self.window = window
+        self._bars: Optional[BarWindow] = None
+
+    def initialize(self, warmup_data: pd.DataFrame) -> None:
+        """Seed the rolling window with warm-up history."""
+        if warmup_data.empty:
+            # Column dtypes of an empty frame say nothing; take them from the first bar
+            self._bars = None
+            return
+        self._bars = BarWindow(BarWindow.numeric_columns(warmup_data), self.window)
+        self._bars.extend(warmup_data)
+
+    def on_bar(self, bar: pd.Series) -> Optional[Dict[str, Any]]:
+        """Append a bar and evaluate the wrapped strategy on the current window."""
+        if self._bars is None:
+            self._bars = BarWindow(BarWindow.numeric_columns(bar), self.window)
+        self._bars.append_bar(bar)
+        window_data = self._bars.to_frame()
+
+        # Older strategies expose a single-signal API that already returns a dict
+        generate_signal = getattr(self.strategy, "generate_signal", None)
+        if callable(generate_signal):
+            return generate_signal(window_data)
+
+        signals = self.strategy.generate_signals(window_data)
+        if signals is None or signals.empty:
+            return None
+        return signal_row_to_dict(signals.iloc[-1])
+
+def as_incremental(strategy: Any, window: Optional[int] = None) -> Any:
+    """
+    Return an object implementing initialize/on_bar for the given strategy.
+
+    Args:
+        strategy: Strategy instance
+        window: Rolling window for the adapter (ignored for native strategies)
+
+    Returns:
+        The strategy itself if it implements on_bar, otherwise an IncrementalStrategyAdapter
+    """
+    if isinstance(strategy, BaseStrategy) and strategy.supports_incremental():
+        return strategy
+    return IncrementalStrategyAdapter(strategy, window=window)
+
+class IncrementalStrategyRunner:
+    """
+    Drives a strategy bar by bar.
+
+    Used by the RealBacktester streaming mode, and meant for any feed that
+    delivers bars one at a time: call warm_up() once with the available
+    history, then update() for every new bar. stream() does both over a
+    historical DataFrame.
+    """
+
+    def __init__(self, strategy: Any, window: Optional[int] = None):
+        """
+        Args:
+            strategy: Strategy instance (native on_bar or adapted)
+            window: Rolling window used when the strategy has to be adapted
+        """
+        self.strategy = strategy
+        self.handler = as_incremental(strategy, window=window)
+        self.bars_processed = 0
+
+    @property
+    def is_native(self) -> bool:
+        """Whether the strategy implements on_bar itself."""
+        return self.handler is self.strategy
+
+    def warm_up(self, history: pd.DataFrame) -> None:
+        """Initialize the strategy with historical bars."""
+        self.handler.initialize(history)
+        self.bars_processed = 0
+
+    def update(self, bar: pd.Series) -> Optional[Dict[str, Any]]:
+        """Feed one new bar and return the strategy's signal for it."""
+        self.bars_processed += 1
+        return self.handler.on_bar(bar)
+
+    def stream(
+        self,
+        data: pd.DataFrame,
+        warmup_bars: int = 1
+    ) -> Iterator[Tuple[int, pd.Series, Optional[Dict[str, Any]]]]:
+        """
+        Warm up on the first bars of a DataFrame and stream the rest.
+
+        Args:
+            data: Historical OHLCV data
+            warmup_bars: Number of leading bars used only for warm-up
+
+        Yields:
+            Tuples of (bar position, bar, signal)
+        """
+        self.warm_up(data.iloc[:warmup_bars])
+        for offset, (_, bar) in enumerate(data.iloc[warmup_bars:].iterrows()):
+            yield warmup_bars + offset, bar, self.update(bar)
@@ -0,0 +1,103 @@
+"""
+Stop-Loss / Take-Profit Level Helpers for BensBot strategies.
+
+Strategies attach protective levels to every signal bar. Doing this with a
+per-index df.loc loop over object columns is slow for signal-dense
+parameterizations, so the levels are computed here as whole-column float
+operations: NaN where there is no signal, the level otherwise.
+"""
+
+import numpy as np
+import pandas as pd
+from typing import Optional, Tuple, Union
+
+def compute_stop_levels(
+    signal: Union[pd.Series, np.ndarray],
+    price: Union[pd.Series, np.ndarray],
+    stop_loss_pct: float,
+    take_profit_pct: float,
+    atr: Optional[Union[pd.Series, np.ndarray]] = None,
+    atr_multiplier: float = 2.0,
+    max_stop_multiple: float = 2.0,
+    include_shorts: bool = True
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Compute stop-loss and take-profit prices for every long and short signal.
+
+    Stops are a fixed percentage of price, or ATR * atr_multiplier away from
+    price when an ATR is given. An ATR stop wider than max_stop_multiple times
+    the fixed percentage, or a missing ATR value, falls back to the fixed
+    percentage stop. Take-profits are always a fixed percentage.
+
+    Args:
+        signal: Signal column or array (1 buy, -1 sell, 0 none)
+        price: Reference price, usually the close
+        stop_loss_pct: Fixed stop distance as a fraction of price (0.02 = 2%)
+        take_profit_pct: Target distance as a fraction of price
+        atr: Optional ATR series (or array) for volatility-based stops
+        atr_multiplier: Number of ATRs between price and the stop
+        max_stop_multiple: Cap on ATR stops, in multiples of stop_loss_pct
+        include_shorts: Also set levels on sell signals (mirrored around price)
+
+    Returns:
+        Tuple of (stop_loss, take_profit) float arrays, NaN on bars without a signal
+    """
+    signal_values = np.asarray(signal)
+    price_values = np.asarray(price, dtype=float)
+    longs = signal_values == 1
+    shorts = (signal_values == -1) if include_shorts else np.zeros(len(signal_values), dtype=bool)
+
+    long_stop = price_values * (1 - stop_loss_pct)
+    short_stop = price_values * (1 + stop_loss_pct)
+    if atr is not None:
+        stop_distance = np.asarray(atr, dtype=float) * atr_multiplier
+        has_atr = ~np.isnan(stop_distance)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            atr_long_stop = price_values - stop_distance
+            atr_short_stop = price_values + stop_distance
+            long_ok = has_atr & ~((price_values - atr_long_stop) / price_values > stop_loss_pct * max_stop_multiple)
+            short_ok = has_atr & ~((atr_short_stop - price_values) / price_values > stop_loss_pct * max_stop_multiple)
+        long_stop = np.where(long_ok, atr_long_stop, long_stop)
+        short_stop = np.where(short_ok, atr_short_stop, short_stop)
+
+    stop_loss = np.full(len(price_values), np.nan)
+    take_profit = np.full(len(price_values), np.nan)
+    stop_loss[longs] = long_stop[longs]
+    take_profit[longs] = price_values[longs] * (1 + take_profit_pct)
+    stop_loss[shorts] = short_stop[shorts]
+    take_profit[shorts] = price_values[shorts] * (1 - take_profit_pct)
+    return stop_loss, take_profit
+
+def apply_stop_levels(
+    df: pd.DataFrame,
+    stop_loss_pct: float,
+    take_profit_pct: float,
+    price_column: str = "Close",
+    atr_column: Optional[str] = None,
+    atr_multiplier: float = 2.0,
+    max_stop_multiple: float = 2.0,
+    include_shorts: bool = True
+) -> pd.DataFrame:
+    """
+    Write float 'stop_loss' and 'take_profit' columns for the 'signal' column of df.
+
+    Args:
+        df: DataFrame with a 'signal' column and the price (and optional ATR) columns
+        stop_loss_pct: Fixed stop distance as a fraction of price
+        take_profit_pct: Target distance as a fraction of price
+        price_column: Column holding the reference price
+        atr_column: Column holding the ATR; ignored if None or absent from df
+        atr_multiplier: Number of ATRs between price and the stop
+        max_stop_multiple: Cap on ATR stops, in multiples of stop_loss_pct
+        include_shorts: Also set levels on sell signals
+
+    Returns:
+        The same DataFrame, modified in place
+    """
+    atr = df[atr_column] if atr_column is not None and atr_column in df.columns else None
+    df['stop_loss'], df['take_profit'] = compute_stop_levels(
+        df['signal'], df[price_column], stop_loss_pct, take_profit_pct,
+        atr=atr, atr_multiplier=atr_multiplier,
+        max_stop_multiple=max_stop_multiple, include_shorts=include_shorts
+    )
+    return df